@@ -0,0 +1,6 @@
+"""publ-data-manager 벤치마크 패키지
+
+프로젝트 루트에서 모듈로 실행합니다:
+
+    python -m benchmarks.bench_field_projection
+"""
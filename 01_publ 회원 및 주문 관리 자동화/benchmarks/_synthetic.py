@@ -0,0 +1,145 @@
+"""벤치마크용 합성 데이터 생성
+
+실제 Airtable 테이블과 publ CSV와 같은 필드 구성을 가진 레코드를 만듭니다.
+값은 시드 고정 난수로 생성하여 실행마다 같은 결과를 냅니다.
+"""
+
+import random
+from typing import Any, Iterator
+
+# Airtable 레코드 1페이지 크기 (API 고정값)
+PAGE_SIZE = 100
+
+PRODUCTS = [
+    'KM-CMDS-OBM-ME-1', 'KM-CMDS-OBM-ME-3', 'KM-CMDS-OBM-ME-12',
+    'KM-CMDS-LIVE-2025', 'KM-CMDS-EBOOK-01', 'KM-CMDS-VOD-BASIC',
+]
+PAYMENT_TYPES = ['Regular Payment', 'One-time Payment']
+PAYMENT_METHODS = ['Card', 'Kakao Pay', 'Naver Pay', 'Bank Transfer']
+REFUND_STATUSES = ['Requested', 'Processing', 'Refunded', 'Rejected']
+
+
+def _code(rng: random.Random, prefix: str = 'SUB') -> str:
+    alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+    body = ''.join(rng.choice(alphabet) for _ in range(16))
+    tail = ''.join(rng.choice(alphabet) for _ in range(5))
+    return f"{prefix}{body}-{tail}"
+
+
+def _record_id(rng: random.Random) -> str:
+    alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+    return 'rec' + ''.join(rng.choice(alphabet) for _ in range(14))
+
+
+def _datetime(rng: random.Random) -> str:
+    return (
+        f"20{rng.randint(22, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} "
+        f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+    )
+
+
+def member_codes(count: int, seed: int = 1) -> list[str]:
+    """회원 코드 목록 생성"""
+    rng = random.Random(seed)
+    return [_code(rng) for _ in range(count)]
+
+
+def airtable_members(count: int, seed: int = 1) -> list[dict[str, Any]]:
+    """Airtable Members 레코드 생성 (전체 필드 + Linked Record 포함)"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        signup = _datetime(rng)
+        records.append({
+            'id': _record_id(rng),
+            'createdTime': '2025-01-01T00:00:00.000Z',
+            'fields': {
+                'Member Code': _code(rng),
+                'Username': f"user{i:06d}",
+                'E-mail': f"user{i:06d}@gmail.com",
+                'Country': 'South Korea',
+                'Name': f"회원{i:06d}",
+                'Gender': rng.choice(['Male', 'Female', '']),
+                'Birth year': str(rng.randint(1960, 2005)),
+                'Personal email address': f"personal{i:06d}@naver.com",
+                'Mobile number': f"010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+                'Sign-up Date': signup,
+                'Sign-up Date (ISO)': signup.replace(' ', 'T') + '.000Z',
+                'Is Active': True,
+                'Orders': [_record_id(rng) for _ in range(rng.randint(0, 8))],
+                'MemberProducts': [_record_id(rng) for _ in range(rng.randint(0, 3))],
+            },
+        })
+    return records
+
+
+def airtable_orders(count: int, seed: int = 2) -> list[dict[str, Any]]:
+    """Airtable Orders 레코드 생성 (전체 필드 + Linked Record 포함)"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        paid = _datetime(rng)
+        member_code = _code(rng)
+        product = rng.choice(PRODUCTS)
+        records.append({
+            'id': _record_id(rng),
+            'createdTime': '2025-01-01T00:00:00.000Z',
+            'fields': {
+                'Order Number': f"ORD{i:010d}",
+                'Product name': product,
+                'Type': 'Subscription',
+                'Price': rng.choice([9900, 29000, 99000, 290000]),
+                'Name': f"회원{i:06d}",
+                'E-mail': f"user{i:06d}@gmail.com",
+                'Member Code': member_code,
+                'Payment Type': rng.choice(PAYMENT_TYPES),
+                'Payment Method': rng.choice(PAYMENT_METHODS),
+                'Date and Time of Payment': paid,
+                'Date and Time of Payment (ISO)': paid.replace(' ', 'T') + '.000Z',
+                'Member': [_record_id(rng)],
+                'MemberProducts': [_record_id(rng)],
+                'Refunds': [],
+                'is_refunded': 0,
+            },
+        })
+    return records
+
+
+def iter_csv_orders(count: int, seed: int = 3) -> Iterator[dict[str, str]]:
+    """publ 주문 CSV 행 생성 (문자열 값, 한 행씩 - 큰 CSV 파일 작성용)"""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            'Order Number': f"ORD{i:010d}",
+            'Product name': rng.choice(PRODUCTS),
+            'Type': 'Subscription',
+            'Price': f"{rng.choice([9900, 29000, 99000, 290000]):,}원",
+            'Name': f"회원{i:06d}",
+            'E-mail': f"user{i:06d}@gmail.com",
+            'Member Code': _code(rng),
+            'Payment Type': rng.choice(PAYMENT_TYPES),
+            'Payment Method': rng.choice(PAYMENT_METHODS),
+            'Date and Time of Payment': _datetime(rng),
+        }
+
+
+def csv_orders(count: int, seed: int = 3) -> list[dict[str, str]]:
+    """publ 주문 CSV 행 생성 (문자열 값)"""
+    return list(iter_csv_orders(count, seed))
+
+
+def pages(records: list[dict[str, Any]], page_size: int = PAGE_SIZE) -> list[list[dict[str, Any]]]:
+    """레코드를 Airtable 응답 페이지 단위로 분할"""
+    return [records[i:i + page_size] for i in range(0, len(records), page_size)]
+
+
+def project(records: list[dict[str, Any]], fields: list[str]) -> list[dict[str, Any]]:
+    """Airtable `fields[]` 파라미터와 같은 방식으로 필드를 제한한 레코드 반환"""
+    return [
+        {
+            'id': record['id'],
+            'createdTime': record['createdTime'],
+            'fields': {k: v for k, v in record['fields'].items() if k in fields},
+        }
+        for record in records
+    ]
@@ -0,0 +1,85 @@
+"""전체 이력 주문 CSV 읽기 벤치마크 (행 단위 vs 열 단위)
+
+같은 합성 주문 CSV(*_orders_all.csv 형식)를 다음 방식으로 끝까지 읽어 가격/날짜 변환까지 마친 시간을 비교합니다.
+
+- 행 단위: iter_rows (셀마다 parse_price / to_iso_datetime 호출)
+- 열 단위 python: csv.reader + 열별 고유값 변환
+- 열 단위 arrow: pyarrow.csv + compute 커널 (pyarrow가 설치된 경우만)
+
+실행:
+    python -m benchmarks.bench_columnar
+    python -m benchmarks.bench_columnar --sizes 10000 100000
+"""
+
+import argparse
+import csv
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from src import config
+from src.airtable import columnar
+from src.airtable.csv_reader import iter_rows
+
+from . import _synthetic
+
+
+def _write_csv(path: Path, count: int) -> None:
+    """합성 주문 CSV 작성 (publ 내보내기처럼 UTF-8 BOM)"""
+    rows = _synthetic.iter_csv_orders(count)
+    first = next(rows)
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(first))
+        writer.writeheader()
+        writer.writerow(first)
+        writer.writerows(rows)
+
+
+def _timed(read: Callable[[], Iterator[Any]]) -> tuple[float, int]:
+    """모든 행을 읽는 시간 (초)과 가격 합계 (방식 간 결과 확인용)"""
+    started = time.perf_counter()
+    total = sum(row.price for row in read())
+    return time.perf_counter() - started, total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='전체 이력 주문 CSV 읽기 벤치마크')
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000], help='주문 행 수'
+    )
+    args = parser.parse_args()
+
+    # 행 단위 기준선은 iter_rows의 열 단위 전환 없이 측정
+    config.CSV_COLUMNAR_ENABLED = False
+    backends = ['python'] + (['arrow'] if columnar.pa is not None else [])
+    cases: list[tuple[str, Callable[[str], Iterator[Any]]]] = [
+        ('행 단위 (iter_rows)', lambda path: iter_rows(path, 'orders')),
+    ] + [
+        (f"열 단위 ({backend})", lambda path, backend=backend: columnar.iter_rows_columnar(path, 'orders', backend=backend))
+        for backend in backends
+    ]
+    if columnar.pa is None:
+        print("pyarrow 없음: arrow 백엔드 생략")
+
+    print(f"{'주문 수':>10} {'방식':<24} {'초':>8} {'행/초':>12} {'배속':>6}")
+    print('-' * 64)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = Path(tmp) / f"bench_{size}_orders_all.csv"
+            _write_csv(path, size)
+
+            baseline = None
+            expected = None
+            for name, read in cases:
+                seconds, total = _timed(lambda: read(str(path)))
+                if expected is None:
+                    baseline, expected = seconds, total
+                elif total != expected:
+                    raise AssertionError(f"{name}: 결과가 행 단위와 다름")
+                print(f"{size:>10,} {name:<24} {seconds:>8.2f} {size / seconds:>12,.0f} {baseline / seconds:>5.1f}x")
+            path.unlink()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""테이블 모델 메모리 벤치마크
+
+같은 레코드를 기존 방식(record_id -> 레코드 딕셔너리)과 CompactTable(열 리스트)로
+보관했을 때 레코드당 바이트를 비교합니다. 키 인덱스(키 -> 레코드 ID)도 함께 만듭니다.
+
+- 레코드는 JSON에서 디코딩하여 실제 API 응답처럼 문자열이 공유되지 않은 상태로 생성
+- 메모리: 구조를 만든 뒤 tracemalloc 현재 사용량 (보관 구조 + 인덱스, 버려진 응답 객체 제외)
+
+실행:
+    python -m benchmarks.bench_compact
+    python -m benchmarks.bench_compact --orders 100000
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Any, Callable
+
+from src.airtable.compact import CompactTable
+
+from . import _synthetic
+
+
+def _retained(build: Callable[[], Any]) -> int:
+    """build() 결과가 유지하는 메모리 (바이트)"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def _decode(records: list[dict[str, Any]]) -> Callable[[], list[dict[str, Any]]]:
+    raw = json.dumps(records)
+    return lambda: json.loads(raw)
+
+
+def _dict_model(load: Callable[[], list[dict[str, Any]]], key_field: str) -> Any:
+    """기존 방식: record_id -> 레코드, 키 -> record_id"""
+    records = {record['id']: record for record in load()}
+    keys = {record['fields'][key_field]: record_id for record_id, record in records.items()}
+    return records, keys
+
+
+def _compact_model(load: Callable[[], list[dict[str, Any]]], key_field: str) -> Any:
+    """CompactTable + 양방향 키 인덱스"""
+    table = CompactTable(load())
+    return table, table.key_index(key_field)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='테이블 모델 메모리 벤치마크')
+    parser.add_argument('--orders', type=int, default=30_000, help='Orders 레코드 수')
+    args = parser.parse_args()
+
+    cases = [
+        ('Orders 전체 필드', _synthetic.airtable_orders(args.orders), 'Order Number'),
+        ('Orders 동기화 필드', _synthetic.project(
+            _synthetic.airtable_orders(args.orders),
+            ['Order Number', 'Member Code', 'Product name', 'MemberProducts']
+        ), 'Order Number'),
+        ('Members 전체 필드', _synthetic.airtable_members(args.orders), 'Member Code'),
+    ]
+
+    print(f"레코드 {args.orders}개")
+    print()
+    print(f"{'테이블':<20} {'dict B/rec':>12} {'compact B/rec':>14} {'비율':>8}")
+    print('-' * 58)
+    for label, records, key_field in cases:
+        load = _decode(records)
+        count = len(records)
+        dict_bytes = _retained(lambda: _dict_model(load, key_field))
+        compact_bytes = _retained(lambda: _compact_model(load, key_field))
+        print(f"{label:<20} {dict_bytes / count:>12.0f} {compact_bytes / count:>14.0f} "
+              f"{dict_bytes / compact_bytes:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
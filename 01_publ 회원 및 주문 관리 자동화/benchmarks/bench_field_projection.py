@@ -0,0 +1,94 @@
+"""필드 프로젝션(fields[]) 벤치마크
+
+전체 필드 조회와 필요한 필드만 조회했을 때의 응답 크기와 예상 지연시간을 비교합니다.
+
+- 응답 크기: 합성 레코드를 Airtable 응답 형식(JSON)으로 직렬화한 바이트 수
+- 디코딩 시간: 실제 json.loads 측정값
+- 전송 지연: 페이지당 왕복시간(RTT) + 바이트 / 대역폭 모델 (실측 아님)
+
+실행:
+    python -m benchmarks.bench_field_projection
+    python -m benchmarks.bench_field_projection --members 20000 --orders 50000 --rtt-ms 300
+"""
+
+import argparse
+import json
+import time
+from typing import Any
+
+from src import config
+from src.airtable.records import SYNC_FIELDS
+
+from . import _synthetic
+
+
+def _measure(records: list[dict[str, Any]]) -> tuple[int, float]:
+    """페이지별 응답 바이트 합계와 디코딩 시간(초) 측정"""
+    total_bytes = 0
+    decode_seconds = 0.0
+    for page in _synthetic.pages(records):
+        payload = json.dumps({'records': page, 'offset': 'itr0000000000000/rec0000000000000'})
+        raw = payload.encode('utf-8')
+        total_bytes += len(raw)
+        start = time.perf_counter()
+        json.loads(raw)
+        decode_seconds += time.perf_counter() - start
+    return total_bytes, decode_seconds
+
+
+def _row(
+    label: str,
+    records: list[dict[str, Any]],
+    fields: list[str],
+    rtt_ms: float,
+    bandwidth_mbps: float
+) -> None:
+    page_count = len(_synthetic.pages(records))
+    full_bytes, full_decode = _measure(records)
+    proj_bytes, proj_decode = _measure(_synthetic.project(records, fields))
+
+    bytes_per_sec = bandwidth_mbps * 1_000_000 / 8
+    full_latency = page_count * rtt_ms / 1000 + full_bytes / bytes_per_sec
+    proj_latency = page_count * rtt_ms / 1000 + proj_bytes / bytes_per_sec
+
+    print(f"{label:<34} {page_count:>6} "
+          f"{full_bytes / 1024:>10.0f} {proj_bytes / 1024:>10.0f} {full_bytes / proj_bytes:>6.1f}x "
+          f"{full_decode * 1000:>9.1f} {proj_decode * 1000:>9.1f} "
+          f"{full_latency:>9.1f} {proj_latency:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Airtable 필드 프로젝션 벤치마크')
+    parser.add_argument('--members', type=int, default=10_000, help='Members 레코드 수')
+    parser.add_argument('--orders', type=int, default=30_000, help='Orders 레코드 수')
+    parser.add_argument('--rtt-ms', type=float, default=250.0, help='페이지 요청당 왕복시간 (ms)')
+    parser.add_argument('--bandwidth-mbps', type=float, default=20.0, help='다운로드 대역폭 (Mbps)')
+    args = parser.parse_args()
+
+    members = _synthetic.airtable_members(args.members)
+    orders = _synthetic.airtable_orders(args.orders)
+
+    print(f"Members {args.members}개, Orders {args.orders}개, "
+          f"RTT {args.rtt_ms:.0f}ms, 대역폭 {args.bandwidth_mbps:.0f}Mbps (지연은 모델 추정값)")
+    print()
+    print(f"{'조회':<34} {'pages':>6} {'full KB':>10} {'proj KB':>10} {'ratio':>7} "
+          f"{'full dec':>9} {'proj dec':>9} {'full s':>9} {'proj s':>9}")
+    print('-' * 112)
+
+    _row("get_existing_by_key(Members)", members, ['Member Code'],
+         args.rtt_ms, args.bandwidth_mbps)
+    _row("check_airtable_duplicates(Members)", members, ['Member Code'],
+         args.rtt_ms, args.bandwidth_mbps)
+    _row("backfill_is_active(Members)", members, ['Is Active'],
+         args.rtt_ms, args.bandwidth_mbps)
+    _row("get_existing_orders(Orders)", orders, ['Order Number'],
+         args.rtt_ms, args.bandwidth_mbps)
+    _row("TableSnapshot.for_sync(Members)", members,
+         SYNC_FIELDS['members'] + list(config.REQUIRED_FIELDS.get('members', {})),
+         args.rtt_ms, args.bandwidth_mbps)
+    _row("TableSnapshot.for_sync(Orders)", orders, SYNC_FIELDS['orders'],
+         args.rtt_ms, args.bandwidth_mbps)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""가격/날짜 변환 마이크로 벤치마크 (셀 단위 vs 열 단위)
+
+합성 주문 CSV의 가격/결제 시각 열을 다음 방식으로 변환한 시간을 비교합니다.
+
+- 기존 셀 단위: 셀마다 strptime 형식 순회 / str.replace 연쇄 (변경 전 to_iso_datetime/parse_price)
+- 셀 단위: 현재 to_iso_datetime/parse_price (publ 고정폭 형식은 슬라이싱)
+- 열 단위: normalize_datetimes/normalize_prices와 같은 BoundedMemo (반복 값은 메모 조회)
+
+열 단위는 방식마다 빈 메모로 시작합니다 (이전 크기의 결과를 재사용하지 않음).
+
+실행:
+    python -m benchmarks.bench_normalize
+    python -m benchmarks.bench_normalize --sizes 10000 100000
+"""
+
+import argparse
+import time
+from datetime import datetime
+from typing import Any, Callable
+
+from src import config
+from src.utils import BoundedMemo, parse_price, to_iso_datetime
+
+from . import _synthetic
+
+
+def _legacy_price(value: str) -> int:
+    cleaned = value.replace(',', '').replace('원', '').strip()
+    return int(cleaned) if cleaned else 0
+
+
+def _legacy_datetime(value: str) -> str | None:
+    if not value or not value.strip():
+        return None
+    value = value.strip()
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M'):
+        try:
+            return datetime.strptime(value, fmt).strftime('%Y-%m-%dT%H:%M:%S') + config.TIMEZONE
+        except ValueError:
+            continue
+    return None
+
+
+def _timed(convert: Callable[[list[str]], list[Any]], values: list[str]) -> tuple[float, list[Any]]:
+    started = time.perf_counter()
+    result = convert(values)
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='가격/날짜 변환 마이크로 벤치마크')
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000], help='주문 행 수'
+    )
+    args = parser.parse_args()
+
+    cases: dict[str, list[tuple[str, Callable[[list[str]], list[Any]]]]] = {
+        '가격': [
+            ('기존 셀 단위', lambda values: [_legacy_price(value) for value in values]),
+            ('셀 단위 (parse_price)', lambda values: [parse_price(value) for value in values]),
+            ('열 단위 (메모)', lambda values: BoundedMemo(parse_price).map(values)),
+        ],
+        '날짜': [
+            ('기존 셀 단위', lambda values: [_legacy_datetime(value) for value in values]),
+            ('셀 단위 (고정폭)', lambda values: [to_iso_datetime(value) for value in values]),
+            ('열 단위 (메모)', lambda values: BoundedMemo(to_iso_datetime).map(values)),
+        ],
+    }
+    headers = {'가격': 'Price', '날짜': 'Date and Time of Payment'}
+
+    print(f"{'주문 수':>10} {'열':<4} {'방식':<22} {'초':>8} {'셀/초':>12} {'배속':>6}")
+    print('-' * 70)
+    for size in args.sizes:
+        rows = _synthetic.csv_orders(size)
+        for column, column_cases in cases.items():
+            values = [row[headers[column]] for row in rows]
+            baseline = expected = None
+            for name, convert in column_cases:
+                seconds, result = _timed(convert, values)
+                if expected is None:
+                    baseline, expected = seconds, result
+                elif result != expected:
+                    raise AssertionError(f"{column} {name}: 결과가 기존 셀 단위와 다름")
+                print(f"{size:>10,} {column:<4} {name:<22} {seconds:>8.3f} {size / seconds:>12,.0f} {baseline / seconds:>5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""페이지 스트리밍 메모리 벤치마크
+
+table.all()로 전체 레코드 리스트를 만든 뒤 인덱스를 만드는 방식과
+table.iterate()로 페이지를 받으며 인덱스를 만드는 방식의 최대 메모리를 비교합니다.
+
+- 응답 페이지는 매번 JSON에서 디코딩하여 실제 API 응답처럼 새 객체로 생성
+- 최대 메모리: tracemalloc 측정값 (인덱스 포함)
+
+실행:
+    python -m benchmarks.bench_streaming
+    python -m benchmarks.bench_streaming --orders 100000
+"""
+
+import argparse
+import json
+import tracemalloc
+from typing import Any, Callable, Iterator
+from unittest.mock import MagicMock
+
+from src.airtable.records import get_existing_by_key
+
+from . import _synthetic
+
+
+def _fake_table(records: list[dict[str, Any]]) -> MagicMock:
+    """페이지 단위 JSON 응답을 흉내내는 테이블"""
+    encoded_pages = [json.dumps(page) for page in _synthetic.pages(records)]
+
+    def iterate(**kwargs: Any) -> Iterator[list[dict[str, Any]]]:
+        for raw in encoded_pages:
+            yield json.loads(raw)
+
+    def all_records(**kwargs: Any) -> list[dict[str, Any]]:
+        return [record for page in iterate(**kwargs) for record in page]
+
+    table = MagicMock()
+    table.iterate.side_effect = iterate
+    table.all.side_effect = all_records
+    return table
+
+
+def _peak(fn: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def _materialised_index(table: MagicMock) -> dict[str, str]:
+    """기존 방식: 전체 리스트 생성 후 인덱스"""
+    return {
+        record['fields'].get('Order Number'): record['id']
+        for record in table.all()
+        if record['fields'].get('Order Number')
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='페이지 스트리밍 메모리 벤치마크')
+    parser.add_argument('--orders', type=int, default=30_000, help='Orders 레코드 수')
+    args = parser.parse_args()
+
+    records = _synthetic.airtable_orders(args.orders)
+    table = _fake_table(records)
+    del records
+
+    full = _peak(lambda: _materialised_index(table))
+    streamed = _peak(lambda: get_existing_by_key(table, 'Order Number'))
+
+    print(f"Orders {args.orders}개 (전체 필드 응답 기준)")
+    print()
+    print(f"{'방식':<32} {'peak MB':>10}")
+    print('-' * 44)
+    print(f"{'table.all() + 인덱스':<32} {full / 1024 / 1024:>10.1f}")
+    print(f"{'iterate() 스트리밍 인덱스':<32} {streamed / 1024 / 1024:>10.1f}")
+    print(f"{'비율':<32} {full / streamed:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
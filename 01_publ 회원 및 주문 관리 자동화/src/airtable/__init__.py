@@ -4,27 +4,36 @@
 """
 
 from .client import get_api, get_table
-from .csv_reader import read_csv, find_csv
+from .journal import WriteJournal
+from .quarantine import Quarantine
+from .csv_reader import ROW_SCHEMAS, ParsedCsvCache, csv_cache, iter_rows, read_csv, find_csv
+from .delta import ExportDelta, compute_delta, load_delta, mark_synced
 from .records import (
+    TableSnapshot,
+    find_by_keys,
     get_existing_by_key,
     get_existing_orders,
     get_existing_member_products,
     get_pending_refunds,
 )
-from .validators import check_airtable_duplicates, check_csv_duplicates
+from .mirror import AirtableMirror, refresh_mirror
+from .plan import apply_plan, build_plan, load_plan, log_plan, save_plan
+from .resume import resume_writes, retry_quarantined
+from .validators import check_airtable_duplicates, check_csv_duplicates, verify_inserts
 
 # Sync functions
 from .sync import (
     sync_members,
     sync_orders,
     sync_refunds,
+    report_refund_write_error,
     sync_products,
     sync_member_products,
     update_orders_member_products_link,
 )
 
 # Schema, History, Maintenance
-from .schema import ensure_tables_exist
+from .schema import SchemaCache, ensure_tables_exist
 from .history import record_sync_history
 from .maintenance import (
     backfill_iso_dates,
@@ -38,25 +47,54 @@ __all__ = [
     # Client
     'get_api',
     'get_table',
+    # Journal
+    'WriteJournal',
+    'Quarantine',
     # CSV
     'read_csv',
+    'iter_rows',
+    'ROW_SCHEMAS',
+    'ParsedCsvCache',
+    'csv_cache',
     'find_csv',
+    # Delta
+    'ExportDelta',
+    'compute_delta',
+    'load_delta',
+    'mark_synced',
     # Records
+    'TableSnapshot',
+    'find_by_keys',
     'get_existing_by_key',
     'get_existing_orders',
     'get_existing_member_products',
     'get_pending_refunds',
+    # Mirror
+    'AirtableMirror',
+    'refresh_mirror',
+    # Plan
+    'apply_plan',
+    'build_plan',
+    'load_plan',
+    'log_plan',
+    'save_plan',
+    # Resume
+    'resume_writes',
+    'retry_quarantined',
     # Validators
     'check_airtable_duplicates',
     'check_csv_duplicates',
+    'verify_inserts',
     # Sync
     'sync_members',
     'sync_orders',
     'sync_refunds',
+    'report_refund_write_error',
     'sync_products',
     'sync_member_products',
     'update_orders_member_products_link',
     # Schema, History, Maintenance
+    'SchemaCache',
     'ensure_tables_exist',
     'record_sync_history',
     'backfill_iso_dates',
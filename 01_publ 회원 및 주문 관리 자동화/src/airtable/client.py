@@ -3,18 +3,41 @@
 Airtable API 연결 및 테이블 접근을 담당합니다.
 """
 
+import threading
+
 from pyairtable import Api, Table
 
 from .. import config
+from .ratelimit import ThrottledApi
+
+# 프로세스 전체가 공유하는 API 클라이언트 (모든 모듈의 요청이 하나의 한도를 나눠 씀)
+_shared_api: ThrottledApi | None = None
+_shared_api_lock = threading.Lock()
+
 
+def get_api() -> ThrottledApi:
+    """Airtable API 클라이언트 가져오기
 
-def get_api() -> Api:
-    """Airtable API 클라이언트 생성
+    프로세스 안의 모든 호출이 같은 ThrottledApi를 공유하므로
+    동시 조회/쓰기와 히스토리·유지보수 요청이 config.AIRTABLE_REQUESTS_PER_SECOND 한도를
+    함께 쓰고, 429/5xx 백오프도 함께 적용됩니다.
 
     Returns:
         Airtable API 클라이언트 인스턴스
     """
-    return Api(config.AIRTABLE_API_KEY)
+    global _shared_api
+    with _shared_api_lock:
+        if _shared_api is None:
+            _shared_api = ThrottledApi(
+                config.AIRTABLE_API_KEY,
+                config.AIRTABLE_REQUESTS_PER_SECOND,
+                min_requests_per_second=config.AIRTABLE_MIN_REQUESTS_PER_SECOND,
+                ramp_step=config.AIRTABLE_RAMP_STEP,
+                max_retries=config.AIRTABLE_MAX_RETRIES,
+                backoff_seconds=config.AIRTABLE_BACKOFF_SECONDS,
+                backoff_max_seconds=config.AIRTABLE_BACKOFF_MAX_SECONDS,
+            )
+        return _shared_api
 
 
 def get_table(api: Api, table_name: str) -> Table:
@@ -0,0 +1,205 @@
+"""열 단위(columnar) CSV 읽기 - 전체 이력 주문 CSV용
+
+run_init_orders가 만드는 *_orders_all.csv는 주문 이력 전체를 담고 있어, 행마다 셀별로
+parse_price/to_iso_datetime을 호출하는 iter_rows가 가장 느린 경로입니다.
+이 모듈은 CSV를 배치(batch_rows행) 단위로 읽어 행 스키마(ROW_SCHEMAS)의 열마다 한 번에 변환한 뒤
+같은 행 타입(namedtuple)으로 돌려줍니다. 결과는 iter_rows와 같습니다.
+
+백엔드:
+- arrow (pyarrow가 설치된 경우): CSV 디코딩을 pyarrow.csv 스트리밍 리더가 처리하고,
+  가격(쉼표/'원' 제거 -> 정수)과 publ 날짜 형식(YYYY-MM-DD HH:MM[:SS] -> ISO)은 compute 커널로 변환
+  (커널이 처리하지 못하는 값만 Python 변환 함수로 처리)
+- python (기본): csv.reader로 디코딩, 가격/날짜 열은 normalize_prices/normalize_datetimes(메모)로,
+  나머지 열은 고유값만 한 번씩 변환하여 매핑 (반복 값이 많은 열은 고유값 수만큼만 변환)
+
+config.CSV_COLUMNAR_ENABLED이면 iter_rows가 config.CSV_COLUMNAR_PATTERN에 맞는 파일을 이 모듈로 읽습니다.
+
+Example:
+    >>> for row in iter_rows_columnar('downloads/260101_090000_orders_all.csv', 'orders'):
+    ...     row.order_number, row.price, row.payment_iso
+"""
+
+import csv
+from itertools import islice
+from typing import Any, Callable, Iterator
+
+from .. import config
+from ..utils import normalize_datetimes, normalize_prices, parse_price, to_iso_datetime
+
+from .csv_reader import ROW_SCHEMAS, RowSchema, _text
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow 없으면 순수 Python 경로
+    pa = None
+
+BACKEND: str = 'arrow' if pa is not None else 'python'
+
+# publ 날짜 형식 (YYYY-MM-DD HH:MM 또는 YYYY-MM-DD HH:MM:SS, 범위 밖 값은 Python 경로)
+_PUBL_DATETIME = r'^[1-9]\d{3}-\d{2}-\d{2} ([01]\d|2[0-3]):[0-5]\d(:[0-5]\d)?$'
+
+# 셀 변환 함수 -> 열 변환 함수 (배치 간 공유 메모)
+_COLUMN_NORMALIZERS: dict[Callable[[str], Any], Callable[[list[str]], list[Any]]] = {
+    parse_price: normalize_prices,
+    to_iso_datetime: normalize_datetimes,
+}
+
+
+def _parse_unique(parse: Callable[[str], Any], values: list[str]) -> list[Any]:
+    """열 변환: 고유값마다 한 번만 변환하여 매핑"""
+    if parse is _text:
+        return values
+    normalize = _COLUMN_NORMALIZERS.get(parse)
+    if normalize:
+        return normalize(values)
+    parsed: dict[str, Any] = {}
+    for value in values:
+        if value not in parsed:
+            parsed[value] = parse(value)
+    return [parsed[value] for value in values]
+
+
+def _python_batches(file_path: str, schema: RowSchema, batch_rows: int) -> Iterator[list[list[Any]]]:
+    """csv.reader 디코딩 -> 스키마 열별 변환값 리스트 (배치 단위)"""
+    with open(file_path, 'r', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        positions = {name: index for index, name in enumerate(header)}
+        rows = (values for values in reader if values)
+        while True:
+            batch = list(islice(rows, batch_rows))
+            if not batch:
+                return
+            columns = []
+            for column in schema.columns:
+                index = positions.get(column.header)
+                if index is None:
+                    values = [''] * len(batch)
+                else:
+                    values = [row[index] if index < len(row) else '' for row in batch]
+                columns.append(_parse_unique(column.parse, values))
+            yield columns
+
+
+def _arrow_prices(array: Any) -> list[int]:
+    """가격 열 변환 (parse_price와 같은 결과, 커널이 못 읽는 값이 있으면 고유값 변환)"""
+    cleaned = pc.utf8_trim_whitespace(
+        pc.replace_substring(pc.replace_substring(array, ',', ''), '원', '')
+    )
+    cleaned = pc.if_else(pc.equal(cleaned, ''), '0', cleaned)
+    try:
+        return pc.cast(cleaned, pa.int64()).to_pylist()
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return normalize_prices(array.to_pylist())
+
+
+def _arrow_datetimes(array: Any) -> list[str | None]:
+    """날짜 열 변환 (to_iso_datetime과 같은 결과)
+
+    publ 형식 값은 strptime/strftime 커널로, 그 밖의 빈 값이 아닌 값은 to_iso_datetime으로 변환합니다.
+    """
+    text = pc.utf8_trim_whitespace(array)
+    publ = pc.match_substring_regex(text, _PUBL_DATETIME)
+    with_seconds = pc.if_else(
+        pc.equal(pc.utf8_length(text), 16), pc.binary_join_element_wise(text, ':00', ''), text
+    )
+    parsed = pc.strptime(with_seconds, format='%Y-%m-%d %H:%M:%S', unit='s', error_is_null=True)
+    # strptime 커널은 없는 날짜(2월 30일 등)를 다음 날로 넘기므로 되돌린 문자열이 같은 값만 사용
+    valid = pc.equal(pc.strftime(parsed, format='%Y-%m-%d %H:%M:%S'), with_seconds)
+    iso = pc.binary_join_element_wise(pc.strftime(parsed, format='%Y-%m-%dT%H:%M:%S'), config.TIMEZONE, '')
+    result = pc.if_else(pc.and_(publ, valid), iso, pa.scalar(None, pa.string())).to_pylist()
+
+    others = pc.and_(pc.invert(publ), pc.not_equal(text, ''))
+    if pc.any(others).as_py():
+        indices = pc.indices_nonzero(others)
+        converted = normalize_datetimes(pc.take(array, indices).to_pylist())
+        for index, value in zip(indices.to_pylist(), converted):
+            result[index] = value
+    return result
+
+
+def _arrow_batches(file_path: str, schema: RowSchema, batch_rows: int) -> Iterator[list[list[Any]]]:
+    """pyarrow.csv 스트리밍 디코딩 -> 스키마 열별 변환값 리스트 (블록 단위)"""
+    headers = list(dict.fromkeys(column.header for column in schema.columns))
+    reader = pa_csv.open_csv(
+        file_path,
+        read_options=pa_csv.ReadOptions(block_size=max(1 << 20, batch_rows * 256)),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={header: pa.string() for header in headers},
+            include_columns=headers,
+            include_missing_columns=True,
+            strings_can_be_null=False,
+            quoted_strings_can_be_null=False,
+        ),
+    )
+    kernels = {parse_price: _arrow_prices, to_iso_datetime: _arrow_datetimes}
+    for batch in reader:
+        if not batch.num_rows:
+            continue
+        arrays = {
+            header: batch.column(header).cast(pa.string()).fill_null('')
+            for header in headers
+        }
+        columns = []
+        for column in schema.columns:
+            array = arrays[column.header]
+            kernel = kernels.get(column.parse)
+            if kernel:
+                columns.append(kernel(array))
+            else:
+                columns.append(_parse_unique(column.parse, array.to_pylist()))
+        yield columns
+
+
+def iter_column_batches(
+    file_path: str,
+    table_key: str,
+    batch_rows: int = config.CSV_COLUMNAR_BATCH_ROWS,
+    backend: str | None = None
+) -> Iterator[list[list[Any]]]:
+    """CSV를 배치 단위 열 리스트로 읽기 (열 순서 = ROW_SCHEMAS[table_key].columns)
+
+    Args:
+        file_path: CSV 파일 경로 (UTF-8 BOM 인코딩)
+        table_key: ROW_SCHEMAS 키 ('members', 'orders', 'refunds')
+        batch_rows: 배치 행 수 (arrow 백엔드는 블록 크기 기준이라 대략적인 값)
+        backend: 'arrow' | 'python' (None이면 BACKEND)
+
+    Yields:
+        열별 변환값 리스트의 리스트 (빈 줄 제외)
+
+    Raises:
+        ValueError: pyarrow 없이 arrow 백엔드 요청
+    """
+    backend = backend or BACKEND
+    if backend == 'arrow' and pa is None:
+        raise ValueError("arrow 백엔드에는 pyarrow가 필요합니다")
+    read = _arrow_batches if backend == 'arrow' else _python_batches
+    yield from read(file_path, ROW_SCHEMAS[table_key], batch_rows)
+
+
+def iter_rows_columnar(
+    file_path: str,
+    table_key: str,
+    batch_rows: int = config.CSV_COLUMNAR_BATCH_ROWS,
+    backend: str | None = None
+) -> Iterator[Any]:
+    """열 단위로 읽어 iter_rows와 같은 행(namedtuple)을 반환
+
+    Args:
+        file_path: CSV 파일 경로
+        table_key: ROW_SCHEMAS 키
+        batch_rows: 배치 행 수
+        backend: 'arrow' | 'python' (None이면 BACKEND)
+
+    Yields:
+        타입 변환된 행
+    """
+    row_type = ROW_SCHEMAS[table_key].row_type
+    for columns in iter_column_batches(file_path, table_key, batch_rows, backend):
+        yield from map(row_type, *columns)
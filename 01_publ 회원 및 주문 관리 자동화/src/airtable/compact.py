@@ -0,0 +1,262 @@
+"""메모리 절약형 테이블 모델
+
+Airtable 레코드를 {id, fields: {...}} 딕셔너리 대신 열(column) 리스트로 보관합니다.
+레코드마다 만들어지던 딕셔너리 2개(레코드 + fields)가 없어지고,
+열 값은 리스트 슬롯 1개(8바이트)만 차지합니다.
+
+- 레코드 ID, Linked Record ID, 문자열 값은 sys.intern으로 공유
+  (상품명/결제 수단처럼 반복되는 값과 인덱스의 키가 같은 문자열 객체를 참조)
+- Linked Record 리스트는 튜플로 보관
+- 조회 시에는 기존과 같은 형식의 레코드 딕셔너리를 그때그때 만들어 반환
+
+Example:
+    >>> table = CompactTable(records)
+    >>> table.get('rec...')                      # {id, createdTime, fields}
+    >>> index = table.key_index('Member Code')
+    >>> index['SUB...']                          # Member Code -> record_id
+    >>> index.key_of('rec...')                   # record_id -> Member Code
+"""
+
+import sys
+from typing import Any, Callable, Iterable, Iterator, Mapping
+
+# 필드 값이 없는 칸 (Airtable은 빈 필드를 응답에서 생략하므로 None과 구분)
+_MISSING: Any = object()
+
+
+def _is_record_ids(value: Any) -> bool:
+    return isinstance(value, list) and bool(value) and all(
+        isinstance(v, str) and v.startswith('rec') for v in value
+    )
+
+
+def _pack(value: Any) -> Any:
+    """보관용 값 변환 (문자열 공유, Linked Record 리스트 -> 공유 ID 튜플)"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if _is_record_ids(value):
+        return tuple(sys.intern(v) for v in value)
+    return value
+
+
+def _unpack(value: Any) -> Any:
+    """조회용 값 변환 (튜플 -> 리스트)"""
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+class KeyIndex(Mapping[str, str]):
+    """고유 키 <-> 레코드 ID 양방향 인덱스
+
+    Mapping으로는 get_existing_by_key와 같은 키 -> 레코드 ID 매핑이고
+    (빈 키 제외, 중복 키는 마지막 레코드), key_of()로 반대 방향을 조회합니다.
+    """
+
+    def __init__(self, lookup: Callable[[str], Any] | None = None) -> None:
+        """
+        Args:
+            lookup: 레코드 ID -> 키 조회 함수 (있으면 역방향 딕셔너리를 만들지 않음)
+        """
+        self._by_key: dict[str, str] = {}
+        self._by_id: dict[str, str] | None = None if lookup else {}
+        self._lookup = lookup
+
+    def add(self, record_id: str, key: Any) -> None:
+        """레코드 1개 반영 (빈 키는 무시)"""
+        if not key:
+            return
+        if isinstance(key, str):
+            key = sys.intern(key)
+        record_id = sys.intern(record_id)
+        self._by_key[key] = record_id
+        if self._by_id is not None:
+            self._by_id[record_id] = key
+
+    def key_of(self, record_id: str, default: Any = None) -> Any:
+        """레코드 ID -> 고유 키"""
+        if self._by_id is not None:
+            return self._by_id.get(record_id, default)
+        return self._lookup(record_id) or default
+
+    def __getitem__(self, key: str) -> str:
+        return self._by_key[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._by_key)
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._by_key
+
+    def __repr__(self) -> str:
+        return f"KeyIndex({self._by_key!r})"
+
+
+class CompactTable:
+    """열 단위로 보관하는 레코드 테이블
+
+    레코드 순서는 추가 순서를 유지하고, 같은 ID를 다시 넣으면 그 자리의 값을 교체합니다.
+    fields가 다른 레코드가 섞여도 되며, 처음 보는 필드는 열을 새로 추가합니다.
+    """
+
+    def __init__(self, records: Iterable[dict[str, Any]] = ()) -> None:
+        """
+        Args:
+            records: Airtable 레코드 이터러블 [{id, fields, createdTime}]
+        """
+        self._ids: list[str] = []
+        self._created: list[str | None] = []
+        self._columns: dict[str, list[Any]] = {}
+        self._positions: dict[str, int] = {}
+        for record in records:
+            self.put(record)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, record_id: object) -> bool:
+        return record_id in self._positions
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """레코드를 하나씩 만들어 반환 (순회 중 교체된 값도 반영)"""
+        for position in range(len(self._ids)):
+            yield self._record(position)
+
+    @property
+    def fields(self) -> list[str]:
+        """보관 중인 필드 목록"""
+        return list(self._columns)
+
+    def put(self, record: dict[str, Any]) -> None:
+        """레코드 추가 (같은 ID가 있으면 교체)
+
+        Args:
+            record: Airtable 레코드 {id, fields, createdTime}
+        """
+        record_id = sys.intern(record['id'])
+        position = self._positions.get(record_id)
+        if position is None:
+            position = len(self._ids)
+            self._positions[record_id] = position
+            self._ids.append(record_id)
+            self._created.append(record.get('createdTime'))
+            for column in self._columns.values():
+                column.append(_MISSING)
+        elif record.get('createdTime'):
+            self._created[position] = record['createdTime']
+
+        fields = record.get('fields', {})
+        for name, column in self._columns.items():
+            column[position] = _pack(fields[name]) if name in fields else _MISSING
+        for name in fields.keys() - self._columns.keys():
+            column = [_MISSING] * len(self._ids)
+            column[position] = _pack(fields[name])
+            self._columns[name] = column
+
+    def patch(self, record_id: str, fields: dict[str, Any]) -> None:
+        """주어진 필드만 교체 (없는 ID는 무시)
+
+        Args:
+            record_id: 레코드 ID
+            fields: 교체할 필드 (나머지 필드는 유지)
+        """
+        position = self._positions.get(record_id)
+        if position is None:
+            return
+        for name, value in fields.items():
+            column = self._columns.get(name)
+            if column is None:
+                column = self._columns[name] = [_MISSING] * len(self._ids)
+            column[position] = _pack(value)
+
+    def rekey(self, old_id: str, new_id: str) -> None:
+        """레코드 ID 변경 (자리와 필드 유지, 없는 ID는 무시)
+
+        Args:
+            old_id: 기존 레코드 ID
+            new_id: 새 레코드 ID
+        """
+        position = self._positions.pop(old_id, None)
+        if position is None:
+            return
+        new_id = sys.intern(new_id)
+        self._positions[new_id] = position
+        self._ids[position] = new_id
+
+    def get(self, record_id: str) -> dict[str, Any] | None:
+        """레코드 ID로 조회 (없으면 None)"""
+        position = self._positions.get(record_id)
+        return self._record(position) if position is not None else None
+
+    def _record(self, position: int) -> dict[str, Any]:
+        return {
+            'id': self._ids[position],
+            'createdTime': self._created[position],
+            'fields': {
+                name: _unpack(column[position])
+                for name, column in self._columns.items()
+                if column[position] is not _MISSING
+            },
+        }
+
+    def key_index(self, key_field: str) -> KeyIndex:
+        """키 필드 기준 양방향 인덱스 생성 (레코드 딕셔너리를 만들지 않음)
+
+        키 -> ID 딕셔너리만 만들고, ID -> 키는 테이블의 키 열에서 조회합니다.
+
+        Args:
+            key_field: 고유 키 필드명
+
+        Returns:
+            키 <-> 레코드 ID 인덱스
+        """
+        column = self._columns.get(key_field)
+        if column is None:
+            return KeyIndex()
+
+        def lookup(record_id: str) -> Any:
+            # 역방향은 열에서 바로 조회 (테이블에 반영된 최신 값)
+            position = self._positions.get(record_id)
+            key = column[position] if position is not None else None
+            return None if key is _MISSING else key
+
+        index = KeyIndex(lookup)
+        for position, record_id in enumerate(self._ids):
+            key = column[position]
+            if key is not _MISSING:
+                index.add(record_id, key)
+        return index
+
+    def by_key(self, key_field: str) -> 'RecordsByKey':
+        """키 필드 -> 레코드 매핑 뷰 생성
+
+        Args:
+            key_field: 고유 키 필드명
+
+        Returns:
+            키 -> {id, fields} 매핑 (조회할 때 레코드를 만듦)
+        """
+        return RecordsByKey(self, self.key_index(key_field))
+
+
+class RecordsByKey(Mapping[str, dict[str, Any]]):
+    """CompactTable을 키 -> 레코드 딕셔너리처럼 조회하는 뷰"""
+
+    def __init__(self, table: CompactTable, index: KeyIndex) -> None:
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, key: str) -> dict[str, Any]:
+        return self.table.get(self.index[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.index
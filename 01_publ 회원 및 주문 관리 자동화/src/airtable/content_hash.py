@@ -0,0 +1,70 @@
+"""행 내용 해시 (변경 감지)
+
+CSV 행을 Airtable 필드로 변환한 값의 해시를 레코드의 'Sync Hash' 필드에 함께 저장합니다.
+다음 실행에서는 필드를 하나씩 비교하지 않고 해시만 비교하여,
+CSV 내용이 바뀐 기존 레코드만 batch_update로 보냅니다.
+
+- 해시 대상: CSV에서 오는 필드만 (Linked Record, 수동 관리 필드 제외)
+- 빈 값(None, '')은 필드가 없는 것과 같게 취급 (Airtable은 빈 필드를 응답에서 생략)
+- Sync Hash가 없는 기존 레코드(기능 도입 전 레코드)는 최초 1회 전체 필드를 업데이트
+
+Example:
+    >>> fields = with_hash(_member_fields(row))
+    >>> fields['Sync Hash']                 # '3f2a...'
+    >>> changed_records(latest, existing, hashes)   # 해시가 다른 레코드의 [{id, fields}]
+"""
+
+import hashlib
+import json
+from typing import Any, Mapping
+
+# 레코드에 저장하는 해시 필드 (singleLineText, ensure_tables_exist가 생성)
+SYNC_HASH_FIELD = 'Sync Hash'
+
+
+def content_hash(fields: Mapping[str, Any]) -> str:
+    """필드 딕셔너리의 안정적인 해시 (필드 순서와 무관)
+
+    Args:
+        fields: 레코드 필드 딕셔너리 (SYNC_HASH_FIELD는 제외하고 계산)
+
+    Returns:
+        16자리 16진수 문자열
+    """
+    values = {
+        name: value for name, value in fields.items()
+        if name != SYNC_HASH_FIELD and value not in (None, '')
+    }
+    payload = json.dumps(values, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def with_hash(fields: dict[str, Any]) -> dict[str, Any]:
+    """필드에 SYNC_HASH_FIELD 추가한 새 딕셔너리 반환"""
+    return {**fields, SYNC_HASH_FIELD: content_hash(fields)}
+
+
+def changed_records(
+    latest: Mapping[str, dict[str, Any]],
+    existing: Mapping[str, str],
+    hashes: Mapping[str, str | None]
+) -> list[dict[str, Any]]:
+    """저장된 해시와 내용이 다른 기존 레코드의 수정 목록
+
+    Args:
+        latest: 고유 키 -> CSV 필드 (키당 1개, CSV 중복은 호출 전에 마지막 행으로 정리)
+        existing: 고유 키 -> record_id (Airtable 기존 레코드)
+        hashes: 고유 키 -> 저장된 Sync Hash (없으면 None)
+
+    Returns:
+        [{id, fields}] (fields는 CSV 필드 전체 + 새 Sync Hash)
+    """
+    records = []
+    for key, fields in latest.items():
+        record_id = existing.get(key)
+        if not record_id:
+            continue
+        fields = with_hash(fields)
+        if hashes.get(key) != fields[SYNC_HASH_FIELD]:
+            records.append({'id': record_id, 'fields': fields})
+    return records
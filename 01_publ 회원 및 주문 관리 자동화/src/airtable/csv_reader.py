@@ -1,13 +1,289 @@
 """CSV 파일 읽기 모듈
 
 publ.biz에서 다운로드한 CSV 파일을 읽고 처리합니다.
+
+Members/Orders/Refunds CSV는 테이블별로 선언한 행 스키마(RowSchema)로 한 줄씩 읽습니다 (iter_rows).
+- 행은 딕셔너리 대신 namedtuple (열 이름 키 없이 값만 보관)
+- 가격/날짜/출생연도 변환은 읽을 때 한 번만 수행 (동기화 단계에서 다시 파싱하지 않음)
+- 파싱한 행은 프로세스 공용 캐시(csv_cache)에 보관하여 여러 단계가 같은 파일을 다시 디코딩하지 않음
+  (csv_cache.max_mb보다 큰 CSV(orders_all.csv 등)는 보관하지 않고 한 줄씩 스트리밍)
+- row.get('Member Code')처럼 CSV 헤더 이름으로도 값 조회 가능 (중복 검사 등 키 기반 처리용)
+
+Example:
+    >>> for row in iter_rows(find_csv('*_orders*.csv'), 'orders'):
+    ...     row.order_number, row.price, row.payment_iso   # 'O1', 1000, '2024-12-27T15:30:00+09:00'
 """
 
 import csv
 import glob
-from typing import Any
+import os
+from collections import namedtuple
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Callable, Iterator, Mapping, NamedTuple
 
 from .. import config
+from ..utils import parse_price, to_iso_datetime
+
+
+def _text(value: str) -> str:
+    """문자열 그대로 (원본 텍스트 필드)"""
+    return value
+
+
+def _birth_year(value: str) -> str:
+    """출생연도 문자열 정규화 ('1990.0' -> '1990', 숫자가 아니면 그대로)"""
+    number = value.strip()
+    if number.endswith('.0'):
+        number = number[:-2]
+    return number if number.isdigit() else value
+
+
+class Column(NamedTuple):
+    """행 스키마의 열 선언"""
+
+    attr: str
+    header: str
+    parse: Callable[[str], Any] = _text
+
+
+class RowSchema:
+    """CSV 헤더 -> 타입 변환된 행(namedtuple) 선언
+
+    같은 헤더를 여러 열이 쓸 수 있습니다 (예: 원본 날짜 텍스트 + ISO 변환값).
+    CSV에 없는 헤더의 열은 빈 문자열로 변환합니다.
+    """
+
+    def __init__(self, name: str, columns: list[Column]) -> None:
+        """
+        Args:
+            name: 행 타입 이름
+            columns: 열 선언 목록 (행 속성 순서)
+        """
+        self.columns = columns
+        headers: dict[str, str] = {}
+        for column in columns:
+            headers.setdefault(column.header, column.attr)
+
+        def get(row: Any, header: str, default: Any = None) -> Any:
+            """CSV 헤더 이름으로 값 조회 (딕셔너리 행과 같은 방식)"""
+            attr = headers.get(header)
+            return getattr(row, attr) if attr else default
+
+        base = namedtuple(name, [column.attr for column in columns])
+        self.row_type = type(name, (base,), {'__slots__': (), 'get': get})
+
+    def parser(self, header: list[str]) -> Callable[[list[str]], Any]:
+        """CSV 헤더 행 기준 값 리스트 -> 행 변환 함수"""
+        positions = {name: index for index, name in enumerate(header)}
+        plan = [(positions.get(column.header), column.parse) for column in self.columns]
+        make = self.row_type._make
+
+        def parse(values: list[str]) -> Any:
+            return make(
+                parse_value(values[index] if index is not None and index < len(values) else '')
+                for index, parse_value in plan
+            )
+
+        return parse
+
+    def from_mapping(self, data: Mapping[str, Any]) -> Any:
+        """헤더 -> 값 딕셔너리로 행 생성 (None은 빈 문자열)"""
+        header = list(data)
+        return self.parser(header)([
+            '' if data[name] is None else str(data[name]) for name in header
+        ])
+
+
+# 테이블별 행 스키마 (config.TABLES 키)
+ROW_SCHEMAS: dict[str, RowSchema] = {
+    'members': RowSchema('MemberRow', [
+        Column('member_code', 'Member Code'),
+        Column('username', 'Username'),
+        Column('email', 'E-mail'),
+        Column('country', 'Country'),
+        Column('name', 'Name'),
+        Column('gender', 'Gender'),
+        Column('birth_year', 'Birth year', _birth_year),
+        Column('personal_email', 'Personal email address'),
+        Column('mobile', 'Mobile number'),
+        Column('signup_date', 'Sign-up Date'),
+        Column('signup_iso', 'Sign-up Date', to_iso_datetime),
+    ]),
+    'orders': RowSchema('OrderRow', [
+        Column('order_number', 'Order Number'),
+        Column('product_name', 'Product name'),
+        Column('type', 'Type'),
+        Column('price', 'Price', parse_price),
+        Column('name', 'Name'),
+        Column('email', 'E-mail'),
+        Column('member_code', 'Member Code'),
+        Column('payment_type', 'Payment Type'),
+        Column('payment_method', 'Payment Method'),
+        Column('payment_date', 'Date and Time of Payment'),
+        Column('payment_iso', 'Date and Time of Payment', to_iso_datetime),
+    ]),
+    'refunds': RowSchema('RefundRow', [
+        Column('order_number', 'Order Number'),
+        Column('refund_status', 'Refund Status'),
+        Column('refund_price', 'Refund Request Price', parse_price),
+        Column('username', 'Username'),
+        Column('member_code', 'Member Code'),
+        Column('refund_date', 'Refund Request Date'),
+        Column('refund_iso', 'Refund Request Date', to_iso_datetime),
+    ]),
+}
+
+
+def _read_rows(file_path: str, table_key: str) -> Iterator[Any]:
+    """CSV 파일을 테이블 행 스키마로 한 줄씩 읽기 (캐시 없음)
+
+    config.CSV_COLUMNAR_PATTERN에 맞는 파일(전체 이력 주문 CSV)은 열 단위로 읽습니다 (columnar 모듈, 결과 동일).
+    """
+    if config.CSV_COLUMNAR_ENABLED and fnmatch(Path(file_path).name, config.CSV_COLUMNAR_PATTERN):
+        from .columnar import iter_rows_columnar
+        yield from iter_rows_columnar(file_path, table_key)
+        return
+
+    with open(file_path, 'r', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        parse = ROW_SCHEMAS[table_key].parser(header)
+        for values in reader:
+            if values:
+                yield parse(values)
+
+
+class ParsedCsvCache:
+    """프로세스 단위 파싱된 CSV 캐시
+
+    같은 내보내기를 여러 단계(Members 중복 검사/신규/변경 감지, Products/MemberProducts/Orders,
+    분석 리포트)가 읽어도 파일은 한 번만 디코딩합니다.
+    - 키: (절대 경로, 테이블 키), 파일 크기/수정 시각이 바뀌면 다시 읽음
+    - max_bytes보다 큰 파일(전체 이력 주문 CSV 등)은 보관하지 않고 매번 스트리밍
+    - 파생 인덱스(고유 키 -> 행, 키 -> 행 리스트)도 파일별로 한 번만 생성
+    """
+
+    def __init__(self, max_bytes: int = config.CSV_CACHE_MAX_BYTES) -> None:
+        """
+        Args:
+            max_bytes: 보관할 최대 파일 크기 (바이트)
+        """
+        self.max_bytes = max_bytes
+        self.reads = 0
+        self._files: dict[tuple[str, str], tuple[tuple[int, int], tuple[Any, ...]]] = {}
+        self._indexes: dict[tuple[str, str, str, str], tuple[tuple[int, int], Any]] = {}
+
+    @staticmethod
+    def _signature(path: str) -> tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def rows(self, file_path: str, table_key: str) -> tuple[Any, ...] | None:
+        """파싱된 행 전체 (처음 요청할 때만 파일을 읽음)
+
+        Args:
+            file_path: CSV 파일 경로
+            table_key: ROW_SCHEMAS 키
+
+        Returns:
+            행 튜플 (파일이 max_bytes보다 크면 None -> 호출자가 스트리밍)
+        """
+        path = os.path.abspath(file_path)
+        signature = self._signature(path)
+        if signature[0] > self.max_bytes:
+            return None
+        cached = self._files.get((path, table_key))
+        if cached and cached[0] == signature:
+            return cached[1]
+        self.reads += 1
+        rows = tuple(_read_rows(file_path, table_key))
+        self._files[(path, table_key)] = (signature, rows)
+        return rows
+
+    def iter_rows(self, file_path: str, table_key: str) -> Iterator[Any]:
+        """캐시된 행 (보관하지 않는 큰 파일은 스트리밍)"""
+        rows = self.rows(file_path, table_key)
+        return iter(rows) if rows is not None else _read_rows(file_path, table_key)
+
+    def _derived(
+        self,
+        kind: str,
+        file_path: str,
+        table_key: str,
+        header: str,
+        build: Callable[[Iterator[Any]], Any]
+    ) -> Any:
+        """파일별 파생 인덱스 (파일이 바뀌면 다시 생성)"""
+        path = os.path.abspath(file_path)
+        key = (kind, path, table_key, header)
+        signature = self._signature(path)
+        cached = self._indexes.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+        value = build(self.iter_rows(file_path, table_key))
+        self._indexes[key] = (signature, value)
+        return value
+
+    def index(self, file_path: str, table_key: str, header: str) -> dict[str, Any]:
+        """고유 키 -> 행 (키가 빈 행 제외, 중복 키는 마지막 행)
+
+        Args:
+            file_path: CSV 파일 경로
+            table_key: ROW_SCHEMAS 키
+            header: 키 열의 CSV 헤더 (예: 'Order Number')
+        """
+        return self._derived(
+            'index', file_path, table_key, header,
+            lambda rows: {row.get(header): row for row in rows if row.get(header)}
+        )
+
+    def groups(self, file_path: str, table_key: str, header: str) -> dict[str, list[Any]]:
+        """키 -> 행 리스트 (키가 빈 행 제외, CSV 순서)
+
+        Args:
+            file_path: CSV 파일 경로
+            table_key: ROW_SCHEMAS 키
+            header: 키 열의 CSV 헤더 (예: 'Member Code')
+        """
+        def build(rows: Iterator[Any]) -> dict[str, list[Any]]:
+            grouped: dict[str, list[Any]] = {}
+            for row in rows:
+                key = row.get(header)
+                if key:
+                    grouped.setdefault(key, []).append(row)
+            return grouped
+
+        return self._derived('groups', file_path, table_key, header, build)
+
+    def clear(self) -> None:
+        """보관한 행/인덱스 모두 버림 (실행 종료 시 메모리 반환)"""
+        self._files.clear()
+        self._indexes.clear()
+
+
+# 프로세스 공용 캐시 (iter_rows가 사용, 동기화 실행이 끝나면 비움)
+csv_cache = ParsedCsvCache()
+
+
+def iter_rows(file_path: str, table_key: str) -> Iterator[Any]:
+    """CSV 파일을 테이블 행 스키마로 한 줄씩 읽기 (UTF-8 BOM 인코딩)
+
+    config.CSV_CACHE_ENABLED이면 프로세스 공용 캐시(csv_cache)를 거치므로, 같은 파일을 여러 번 읽어도
+    디코딩은 한 번만 합니다 (큰 파일은 캐시하지 않고 스트리밍).
+
+    Args:
+        file_path: CSV 파일 경로
+        table_key: ROW_SCHEMAS 키 ('members', 'orders', 'refunds')
+
+    Returns:
+        타입 변환된 행 이터레이터 (빈 줄은 건너뜀)
+    """
+    if config.CSV_CACHE_ENABLED:
+        return csv_cache.iter_rows(file_path, table_key)
+    return _read_rows(file_path, table_key)
 
 
 def read_csv(file_path: str) -> list[dict[str, Any]]:
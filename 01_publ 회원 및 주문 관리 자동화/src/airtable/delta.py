@@ -0,0 +1,273 @@
+"""연속 publ 내보내기(CSV) 간 변경분(delta)
+
+매 실행은 새 CSV 전체를 Airtable 테이블과 대조하지만, 실제로 전날 내보내기와 다른 행은 몇 개뿐입니다.
+이 모듈은 새 CSV를 마지막으로 깨끗하게 동기화된 내보내기(archive/YYYYMMDD/)와 고유 키로 비교하여
+추가/변경된 행만 동기화 단계에 넘깁니다. 변경분이 없는 테이블의 단계는 건너뜁니다.
+
+- 비교 기준: 오류/저널 미확인 배치/격리 레코드 없이 끝난 실행의 CSV 파일명을 상태 파일
+  (.csv_delta_state.json)에 기록하고, 다음 실행에서 archive에서 그 파일을 찾아 사용
+  (실패한 실행은 기록하지 않으므로 다음 실행이 마지막 성공 실행 이후의 변경을 모두 다시 보냄)
+- 행 비교: 이전 CSV를 고유 키 -> 행(iter_rows, 타입 변환 완료) 해시 인덱스로 만든 뒤 새 CSV를 한 줄씩 대조
+- 삭제된 행(이전에만 있는 키)은 보고만 함 (동기화는 레코드를 삭제하지 않음)
+- 기준 파일이 없거나 full_sync_days가 지나면 전체 동기화 (Airtable 수동 수정/삭제 반영)
+
+상태 파일 형식:
+    {"files": {"members": "260101_090000_members.csv", ...}, "full_synced_at": "2026-01-01T09:05:00+09:00"}
+"""
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple
+
+from .. import config
+from ..logger import logger
+
+from .csv_reader import csv_cache, find_csv, iter_rows
+
+
+class TableDelta(NamedTuple):
+    """테이블 1개의 내보내기 변경분"""
+
+    table_key: str
+    previous: str
+    current: str
+    rows: list[Any]
+    added: int
+    changed: int
+    removed: list[str]
+    unchanged: int
+
+
+def compute_delta(previous_path: str | Path, current_path: str | Path, table_key: str) -> TableDelta:
+    """이전/새 CSV를 고유 키로 비교
+
+    고유 키가 빈 행은 동기화 대상이 아니므로 제외합니다.
+
+    Args:
+        previous_path: 이전 내보내기 CSV 경로
+        current_path: 새 내보내기 CSV 경로
+        table_key: config.TABLES 키 ('members', 'orders', 'refunds')
+
+    Returns:
+        TableDelta (rows: 추가/변경된 행, 새 CSV 순서)
+    """
+    key_header = config.TABLES[table_key]['unique_key']
+    previous: dict[str, Any] = {}
+    for row in iter_rows(str(previous_path), table_key):
+        key = row.get(key_header)
+        if key:
+            previous[key] = row
+
+    rows = []
+    added = changed = unchanged = 0
+    seen: set[str] = set()
+    for row in iter_rows(str(current_path), table_key):
+        key = row.get(key_header)
+        if not key:
+            continue
+        seen.add(key)
+        before = previous.get(key)
+        if before is None:
+            added += 1
+            rows.append(row)
+        elif before != row:
+            changed += 1
+            rows.append(row)
+        else:
+            unchanged += 1
+
+    return TableDelta(
+        table_key=table_key,
+        previous=Path(previous_path).name,
+        current=Path(current_path).name,
+        rows=rows,
+        added=added,
+        changed=changed,
+        removed=[key for key in previous if key not in seen],
+        unchanged=unchanged,
+    )
+
+
+class ExportDelta:
+    """이번 실행의 테이블별 변경분 (동기화 단계가 CSV 대신 읽음)"""
+
+    def __init__(self, tables: dict[str, TableDelta]) -> None:
+        """
+        Args:
+            tables: 테이블 키 -> 변경분 (기준 파일이 없는 테이블은 없음 = 전체 CSV)
+        """
+        self.tables = tables
+        self._indexes: dict[tuple[str, str, str], Any] = {}
+
+    def _delta_rows(self, file_path: str, table_key: str) -> list[Any] | None:
+        """이 파일의 추가/변경된 행 (변경분이 없는 테이블/다른 파일이면 None)"""
+        delta = self.tables.get(table_key)
+        if delta is None or Path(file_path).name != delta.current:
+            return None
+        return delta.rows
+
+    def iter_rows(self, file_path: str, table_key: str) -> Iterable[Any]:
+        """iter_rows 대체: 변경분이 있는 테이블은 추가/변경된 행만, 없으면 CSV 전체"""
+        rows = self._delta_rows(file_path, table_key)
+        return iter_rows(file_path, table_key) if rows is None else iter(rows)
+
+    def index(self, file_path: str, table_key: str, header: str) -> dict[str, Any]:
+        """ParsedCsvCache.index 대체: 변경분이 있는 테이블은 추가/변경된 행의 고유 키 -> 행"""
+        rows = self._delta_rows(file_path, table_key)
+        if rows is None:
+            return csv_cache.index(file_path, table_key, header)
+        key = ('index', table_key, header)
+        if key not in self._indexes:
+            self._indexes[key] = {row.get(header): row for row in rows if row.get(header)}
+        return self._indexes[key]
+
+    def groups(self, file_path: str, table_key: str, header: str) -> dict[str, list[Any]]:
+        """ParsedCsvCache.groups 대체: 변경분이 있는 테이블은 추가/변경된 행의 키 -> 행 리스트"""
+        rows = self._delta_rows(file_path, table_key)
+        if rows is None:
+            return csv_cache.groups(file_path, table_key, header)
+        key = ('groups', table_key, header)
+        if key not in self._indexes:
+            grouped: dict[str, list[Any]] = {}
+            for row in rows:
+                if row.get(header):
+                    grouped.setdefault(row.get(header), []).append(row)
+            self._indexes[key] = grouped
+        return self._indexes[key]
+
+    def unchanged(self, table_key: str) -> bool:
+        """이전 내보내기와 비교하여 추가/변경된 행이 없는 테이블인지 확인"""
+        delta = self.tables.get(table_key)
+        return delta is not None and not delta.rows
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        """테이블 키 -> {'added', 'changed', 'removed', 'unchanged'}"""
+        return {
+            table_key: {
+                'added': delta.added,
+                'changed': delta.changed,
+                'removed': len(delta.removed),
+                'unchanged': delta.unchanged,
+            }
+            for table_key, delta in self.tables.items()
+        }
+
+
+def _load_state(path: Path) -> dict[str, Any]:
+    """상태 파일 읽기 (없거나 깨졌으면 빈 딕셔너리)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _current_exports() -> dict[str, str]:
+    """테이블 키 -> downloads의 최신 CSV 경로 (파일이 없는 테이블 제외)"""
+    files = {}
+    for table_key, table_config in config.TABLES.items():
+        try:
+            files[table_key] = find_csv(table_config['file_pattern'])
+        except FileNotFoundError:
+            continue
+    return files
+
+
+def find_archived(file_name: str) -> Path | None:
+    """archive/YYYYMMDD/ 에서 파일명으로 이전 내보내기 찾기 (여러 개면 가장 최근 폴더)"""
+    matches = sorted(config.ARCHIVE_DIR.glob(f"*/{file_name}"))
+    return matches[-1] if matches else None
+
+
+def load_delta(
+    path: Path = config.DELTA_STATE_FILE,
+    full_sync_days: float = config.CSV_DELTA_FULL_SYNC_DAYS
+) -> ExportDelta | None:
+    """마지막으로 동기화된 내보내기와 비교한 변경분 계산
+
+    Args:
+        path: 상태 파일 경로
+        full_sync_days: 마지막 전체 동기화 후 이 기간이 지나면 전체 동기화 (일)
+
+    Returns:
+        ExportDelta (전체 동기화할 차례면 None)
+    """
+    logger.info(f"\n{'='*50}")
+    logger.info("CSV 변경분 계산 (이전 내보내기 대비)")
+    logger.info(f"{'='*50}")
+
+    state = _load_state(path)
+    if not state.get('files') or not state.get('full_synced_at'):
+        logger.info("이전 동기화 기록 없음: 전체 동기화")
+        return None
+
+    full_synced_at = datetime.fromisoformat(state['full_synced_at'])
+    if datetime.now().astimezone() - full_synced_at >= timedelta(days=full_sync_days):
+        logger.info(f"마지막 전체 동기화 후 {full_sync_days}일 경과: 전체 동기화")
+        return None
+
+    tables = {}
+    for table_key, current_path in _current_exports().items():
+        previous_name = state['files'].get(table_key)
+        previous_path = find_archived(previous_name) if previous_name else None
+        if previous_path is None:
+            logger.info(f"  - {table_key}: 이전 내보내기 없음 ({previous_name}) - CSV 전체 동기화")
+            continue
+
+        delta = compute_delta(previous_path, current_path, table_key)
+        tables[table_key] = delta
+        logger.info(
+            f"  - {table_key}: 추가 {delta.added}개, 변경 {delta.changed}개, "
+            f"삭제 {len(delta.removed)}개, 동일 {delta.unchanged}개 (기준: {delta.previous})"
+        )
+        if delta.removed:
+            logger.info(f"    CSV에서 사라진 키 (Airtable 레코드는 유지): {', '.join(delta.removed[:3])}")
+
+    return ExportDelta(tables)
+
+
+def _sync_clean(results: dict[str, Any]) -> bool:
+    """오류/미확인 배치/격리 레코드/쓰기 실패 없이 끝난 동기화인지 확인"""
+    if 'error' in results:
+        return False
+    if any(isinstance(result, dict) and 'error' in result for result in results.values()):
+        return False
+    if results.get('journal', {}).get('pending') or results.get('quarantine', {}).get('records'):
+        return False
+    return not any(table['failed'] for table in results.get('writes', {}).values())
+
+
+def mark_synced(
+    results: dict[str, Any],
+    delta: ExportDelta | None,
+    path: Path = config.DELTA_STATE_FILE
+) -> bool:
+    """깨끗하게 끝난 동기화의 CSV 파일명을 다음 실행의 비교 기준으로 기록
+
+    실패한 실행은 기록하지 않습니다 (이전 기준이 그대로 남아 다음 실행이 변경을 다시 보냄).
+
+    Args:
+        results: sync_all_to_airtable 결과
+        delta: 이번 실행의 변경분 (None이면 전체 동기화 -> full_synced_at 갱신)
+        path: 상태 파일 경로
+
+    Returns:
+        기록 여부
+    """
+    if not _sync_clean(results):
+        logger.info("동기화가 깨끗하게 끝나지 않아 CSV 비교 기준을 유지합니다")
+        return False
+
+    state = _load_state(path)
+    files = state.get('files', {})
+    files.update({table_key: Path(file_path).name for table_key, file_path in _current_exports().items()})
+    state['files'] = files
+    if delta is None:
+        state['full_synced_at'] = datetime.now().astimezone().isoformat(timespec='seconds')
+
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=1)
+    tmp_path.replace(path)
+    return True
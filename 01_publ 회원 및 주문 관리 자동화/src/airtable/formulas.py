@@ -0,0 +1,202 @@
+"""Airtable 필터 조건(filterByFormula) 빌더
+
+"작업이 필요한 레코드"를 고르는 조건을 하나의 객체로 표현합니다.
+같은 조건을 두 가지 방식으로 평가할 수 있습니다.
+
+- to_formula(): Airtable 서버 필터용 formula 문자열 (조건에 맞는 레코드만 응답)
+- matches(): 이미 메모리에 있는 레코드 필드에 대한 Python 평가
+
+Example:
+    >>> where = And(IsEmpty('Orders'), NotEmpty('Order Number'))
+    >>> where.to_formula()
+    "AND(NOT({Orders}), NOT(NOT({Order Number})))"
+    >>> table.all(formula=where.to_formula(), fields=['Order Number'])
+"""
+
+from typing import Any, Iterable
+
+
+def field_ref(name: str) -> str:
+    """필드 참조 문자열 생성 ({Field Name})
+
+    Args:
+        name: 필드명
+
+    Returns:
+        formula용 필드 참조
+    """
+    return '{' + name.replace('}', '\\}') + '}'
+
+
+def quote(value: Any) -> str:
+    """formula용 리터럴 생성
+
+    Args:
+        value: 문자열, 숫자 또는 bool 값
+
+    Returns:
+        formula 리터럴 (문자열은 작은따옴표로 감싸고 이스케이프)
+    """
+    if isinstance(value, bool):
+        return 'TRUE()' if value else 'FALSE()'
+    if isinstance(value, (int, float)):
+        return str(value)
+    escaped = str(value).replace('\\', '\\\\').replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+class Predicate:
+    """필터 조건 기본 클래스"""
+
+    def to_formula(self) -> str:
+        """Airtable filterByFormula 문자열 반환"""
+        raise NotImplementedError
+
+    def matches(self, fields: dict[str, Any]) -> bool:
+        """레코드 필드가 조건에 맞는지 확인"""
+        raise NotImplementedError
+
+    @property
+    def fields(self) -> set[str]:
+        """조건 평가에 필요한 필드 집합"""
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_formula()!r})"
+
+
+class IsEmpty(Predicate):
+    """필드가 비어있음 (없음, 빈 문자열, 체크 해제, 빈 Linked Record)"""
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+
+    def to_formula(self) -> str:
+        return f"NOT({field_ref(self.field)})"
+
+    def matches(self, fields: dict[str, Any]) -> bool:
+        return not fields.get(self.field)
+
+    @property
+    def fields(self) -> set[str]:
+        return {self.field}
+
+
+class Equals(Predicate):
+    """필드 값이 주어진 값과 같음"""
+
+    def __init__(self, field: str, value: Any) -> None:
+        self.field = field
+        self.value = value
+
+    def to_formula(self) -> str:
+        return f"{field_ref(self.field)}={quote(self.value)}"
+
+    def matches(self, fields: dict[str, Any]) -> bool:
+        return fields.get(self.field) == self.value
+
+    @property
+    def fields(self) -> set[str]:
+        return {self.field}
+
+
+class Contains(Predicate):
+    """텍스트 필드가 주어진 문자열을 포함함"""
+
+    def __init__(self, field: str, text: str) -> None:
+        self.field = field
+        self.text = text
+
+    def to_formula(self) -> str:
+        return f"FIND({quote(self.text)}, {field_ref(self.field)})>0"
+
+    def matches(self, fields: dict[str, Any]) -> bool:
+        return self.text in (fields.get(self.field) or '')
+
+    @property
+    def fields(self) -> set[str]:
+        return {self.field}
+
+
+class Not(Predicate):
+    """조건 부정"""
+
+    def __init__(self, predicate: Predicate) -> None:
+        self.predicate = predicate
+
+    def to_formula(self) -> str:
+        return f"NOT({self.predicate.to_formula()})"
+
+    def matches(self, fields: dict[str, Any]) -> bool:
+        return not self.predicate.matches(fields)
+
+    @property
+    def fields(self) -> set[str]:
+        return self.predicate.fields
+
+
+class And(Predicate):
+    """모든 조건 만족"""
+
+    def __init__(self, *predicates: Predicate) -> None:
+        self.predicates = predicates
+
+    def to_formula(self) -> str:
+        if not self.predicates:
+            return 'TRUE()'
+        return f"AND({', '.join(p.to_formula() for p in self.predicates)})"
+
+    def matches(self, fields: dict[str, Any]) -> bool:
+        return all(p.matches(fields) for p in self.predicates)
+
+    @property
+    def fields(self) -> set[str]:
+        return set().union(*(p.fields for p in self.predicates))
+
+
+class Or(Predicate):
+    """하나 이상의 조건 만족"""
+
+    def __init__(self, *predicates: Predicate) -> None:
+        self.predicates = predicates
+
+    def to_formula(self) -> str:
+        if not self.predicates:
+            return 'FALSE()'
+        return f"OR({', '.join(p.to_formula() for p in self.predicates)})"
+
+    def matches(self, fields: dict[str, Any]) -> bool:
+        return any(p.matches(fields) for p in self.predicates)
+
+    @property
+    def fields(self) -> set[str]:
+        return set().union(*(p.fields for p in self.predicates))
+
+
+def NotEmpty(field: str) -> Predicate:
+    """필드에 값이 있음"""
+    return Not(IsEmpty(field))
+
+
+def In(field: str, values: Iterable[Any]) -> Predicate:
+    """필드 값이 목록 중 하나와 같음"""
+    return Or(*(Equals(field, value) for value in values))
+
+
+def NotIn(field: str, values: Iterable[Any]) -> Predicate:
+    """필드 값이 목록의 어떤 값과도 같지 않음 (빈 값 포함)"""
+    return Not(In(field, values))
+
+
+def modified_after(timestamp: str) -> str:
+    """마지막 수정 시각이 주어진 시각 이후인 레코드 formula
+
+    서버에서만 평가할 수 있으므로 Predicate가 아닌 문자열로 반환합니다.
+
+    Args:
+        timestamp: ISO 8601 UTC 시각 (예: 2026-01-09T03:00:00Z)
+
+    Returns:
+        filterByFormula 문자열
+    """
+    return f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE({quote(timestamp)}))"
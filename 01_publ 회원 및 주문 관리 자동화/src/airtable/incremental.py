@@ -0,0 +1,87 @@
+"""증분 조회 시점 계산
+
+RecordCache(JSON 캐시)와 AirtableMirror(SQLite 미러)가 함께 쓰는
+워터마크 / 여유 시간 / 전체 재확인(reconcile) 주기 계산을 한 곳에 모읍니다.
+
+- 워터마크: 다음 증분 조회의 기준 시각 (조회 시작 시각 - WATERMARK_OVERLAP)
+- reconcile: 증분 조회로 알 수 없는 변경(레코드 삭제, 계산 필드 변경)을 반영하는 주기적 전체 조회
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from .formulas import modified_after
+
+# 증분 조회 워터마크 여유 시간 (로컬/서버 시계 차이 및 조회 중 수정 대비)
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+# 상태 저장용 UTC 시각 형식
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def format_utc(dt: datetime) -> str:
+    """UTC 시각을 상태 저장 형식으로 변환"""
+    return dt.strftime(TIME_FORMAT)
+
+
+def parse_utc(text: str) -> datetime:
+    """상태 저장 형식 문자열을 UTC 시각으로 변환"""
+    return datetime.strptime(text, TIME_FORMAT).replace(tzinfo=timezone.utc)
+
+
+class IncrementalWindow:
+    """테이블 1회 조회의 시점 정보 (전체 조회 / 증분 조회 결정)
+
+    저장된 워터마크가 없거나 마지막 전체 조회 후 reconcile 주기가 지났으면 전체 조회,
+    아니면 워터마크 이후 수정된 레코드만 조회합니다.
+
+    LAST_MODIFIED_TIME()은 사용자가 수정한 필드만 반영하므로 Formula / Rollup / Lookup
+    필드 값이 바뀐 레코드와 삭제된 레코드는 증분 조회에 나타나지 않습니다.
+    주기적인 전체 조회가 이 두 가지를 함께 바로잡습니다.
+
+    Example:
+        >>> window = IncrementalWindow(state.get('watermark'), state.get('reconciled_at'), interval)
+        >>> if window.full_refresh:
+        ...     records = table.all()                                  # 기존 데이터 교체
+        ... else:
+        ...     records = table.all(formula=window.delta_formula())    # 기존 데이터에 병합
+        >>> state.update(window.next_state())
+    """
+
+    def __init__(
+        self,
+        watermark: str | None,
+        reconciled_at: str | None,
+        reconcile_interval: timedelta
+    ) -> None:
+        """
+        Args:
+            watermark: 저장된 워터마크 (없으면 전체 조회)
+            reconciled_at: 마지막 전체 조회 시각
+            reconcile_interval: 전체 조회 주기
+        """
+        self.started = datetime.now(timezone.utc)
+        self.watermark = watermark
+        self.reconciled_at = reconciled_at
+        self.reconcile_interval = reconcile_interval
+
+    @property
+    def full_refresh(self) -> bool:
+        """이번 조회를 전체 조회로 해야 하는지"""
+        if self.watermark is None or self.reconciled_at is None:
+            return True
+        return self.started - parse_utc(self.reconciled_at) >= self.reconcile_interval
+
+    def delta_formula(self) -> str:
+        """워터마크 이후 수정된 레코드 formula"""
+        return modified_after(self.watermark)
+
+    def next_state(self) -> dict[str, str]:
+        """조회 완료 후 저장할 상태
+
+        Returns:
+            {'watermark': ..., 'reconciled_at': ...}
+        """
+        return {
+            'watermark': format_utc(self.started - WATERMARK_OVERLAP),
+            'reconciled_at': format_utc(self.started) if self.full_refresh else self.reconciled_at,
+        }
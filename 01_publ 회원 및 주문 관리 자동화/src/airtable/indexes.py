@@ -0,0 +1,170 @@
+"""단일 패스 다중 인덱스 빌더
+
+테이블 레코드를 한 번만 순회하면서 여러 인덱스를 동시에 채웁니다.
+각 인덱스는 필요한 필드를 선언하고, scan_table()은 필드 합집합으로
+테이블을 한 번 조회(또는 스냅샷에서 한 번 순회)합니다.
+
+Example:
+    >>> indexes = scan_table(refunds_table, {
+    ...     'existing': KeyMap('Order Number'),
+    ...     'pending': FilteredMap(PENDING_REFUND, 'Order Number', {'status': 'Refund Status'}),
+    ... }, snapshot)
+    >>> indexes['existing']   # Order Number -> record_id
+    >>> indexes['pending']    # Order Number -> {id, status}
+"""
+
+from collections import defaultdict
+from typing import Any, Iterable
+
+from pyairtable import Table
+
+from .compact import KeyIndex
+from .formulas import Predicate
+from .records import TableSnapshot
+
+
+class IndexSpec:
+    """인덱스 기본 클래스"""
+
+    @property
+    def fields(self) -> set[str]:
+        """인덱스를 채우는 데 필요한 필드 집합"""
+        raise NotImplementedError
+
+    def add(self, record: dict[str, Any]) -> None:
+        """레코드 1개 반영"""
+        raise NotImplementedError
+
+    def result(self) -> Any:
+        """완성된 인덱스 반환"""
+        raise NotImplementedError
+
+
+class KeyMap(IndexSpec):
+    """고유 키 <-> 레코드 ID (get_existing_by_key와 같은 형식, 빈 키 제외)
+
+    결과는 KeyIndex이므로 key_of(record_id)로 Linked Record ID를 키 값으로 바꿀 수 있습니다.
+    """
+
+    def __init__(self, key_field: str) -> None:
+        self.key_field = key_field
+        self._index = KeyIndex()
+
+    @property
+    def fields(self) -> set[str]:
+        return {self.key_field}
+
+    def add(self, record: dict[str, Any]) -> None:
+        self._index.add(record['id'], record['fields'].get(self.key_field))
+
+    def result(self) -> KeyIndex:
+        return self._index
+
+
+class ValueMap(IndexSpec):
+    """고유 키 -> 다른 필드 값 (빈 키 제외, 값이 없으면 None)"""
+
+    def __init__(self, key_field: str, value_field: str) -> None:
+        self.key_field = key_field
+        self.value_field = value_field
+        self._map: dict[str, Any] = {}
+
+    @property
+    def fields(self) -> set[str]:
+        return {self.key_field, self.value_field}
+
+    def add(self, record: dict[str, Any]) -> None:
+        key = record['fields'].get(self.key_field)
+        if key:
+            self._map[key] = record['fields'].get(self.value_field)
+
+    def result(self) -> dict[str, Any]:
+        return self._map
+
+
+class DuplicateGroups(IndexSpec):
+    """키 값 -> 레코드 ID 목록 (2개 이상인 키만)"""
+
+    def __init__(self, key_field: str) -> None:
+        self.key_field = key_field
+        self._groups: dict[str, list[str]] = defaultdict(list)
+
+    @property
+    def fields(self) -> set[str]:
+        return {self.key_field}
+
+    def add(self, record: dict[str, Any]) -> None:
+        key = record['fields'].get(self.key_field)
+        if key:
+            self._groups[key].append(record['id'])
+
+    def result(self) -> dict[str, list[str]]:
+        return {key: ids for key, ids in self._groups.items() if len(ids) > 1}
+
+
+class FilteredMap(IndexSpec):
+    """조건에 맞는 레코드만 키 -> {id, 값 필드...} 로 수집 (예: 미결정 환불 상태)"""
+
+    def __init__(self, where: Predicate, key_field: str, values: dict[str, str] | None = None) -> None:
+        """
+        Args:
+            where: 필터 조건
+            key_field: 결과 딕셔너리 키 필드
+            values: 결과 이름 -> 필드명 (예: {'status': 'Refund Status'})
+        """
+        self.where = where
+        self.key_field = key_field
+        self.values = values or {}
+        self._map: dict[str, dict[str, Any]] = {}
+
+    @property
+    def fields(self) -> set[str]:
+        return {self.key_field} | set(self.values.values()) | self.where.fields
+
+    def add(self, record: dict[str, Any]) -> None:
+        fields = record['fields']
+        key = fields.get(self.key_field)
+        if key and self.where.matches(fields):
+            self._map[key] = {
+                'id': record['id'],
+                **{name: fields.get(field) for name, field in self.values.items()}
+            }
+
+    def result(self) -> dict[str, dict[str, Any]]:
+        return self._map
+
+
+def build_indexes(records: Iterable[dict[str, Any]], specs: dict[str, IndexSpec]) -> dict[str, Any]:
+    """레코드를 한 번 순회하며 모든 인덱스 채우기
+
+    Args:
+        records: 레코드 이터러블 (한 번만 순회)
+        specs: 인덱스 이름 -> 인덱스 스펙
+
+    Returns:
+        인덱스 이름 -> 완성된 인덱스
+    """
+    for record in records:
+        for spec in specs.values():
+            spec.add(record)
+    return {name: spec.result() for name, spec in specs.items()}
+
+
+def scan_table(
+    table: Table,
+    specs: dict[str, IndexSpec],
+    snapshot: TableSnapshot | None = None
+) -> dict[str, Any]:
+    """테이블을 한 번 조회하여 여러 인덱스 생성
+
+    Args:
+        table: Airtable 테이블 객체
+        specs: 인덱스 이름 -> 인덱스 스펙
+        snapshot: 실행 단위 스냅샷 (없으면 페이지 스트리밍)
+
+    Returns:
+        인덱스 이름 -> 완성된 인덱스
+    """
+    snapshot = snapshot or TableSnapshot(retain=False)
+    fields = sorted(set().union(*(spec.fields for spec in specs.values())))
+    return build_indexes(snapshot.iter_records(table, fields), specs)
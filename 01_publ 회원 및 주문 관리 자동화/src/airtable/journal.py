@@ -0,0 +1,184 @@
+"""쓰기 저널 (중단 후 재개용)
+
+배치 쓰기 요청을 보내기 전에 계획한 배치를, 응답을 받은 뒤 확인된 레코드 ID를
+로컬 파일(.airtable_journal.jsonl)에 한 줄씩 덧붙여 기록합니다 (append-only JSON Lines).
+프로세스가 도중에 종료되면 확인(ack)되지 않은 배치만 남으므로,
+`python -m src.main --resume`이 그 배치만 다시 보냅니다 (src/airtable/resume.py).
+
+- plan: 배치를 보내기 전에 기록 (실행 1회의 배치를 모두 기록한 뒤 fsync)
+- ack: 배치 응답을 받으면 레코드 ID와 함께 기록
+- fail: 배치가 실패하면 오류 메시지와 함께 기록 (재개 대상)
+- 실행이 끝날 때 확인되지 않은 배치가 없으면 파일 삭제
+
+ack는 fsync하지 않으므로 OS가 멈추면 마지막 ack가 사라질 수 있습니다.
+그런 배치는 재개 시 다시 보내지만, 생성은 고유 키로 이미 생성된 레코드를 확인한 뒤
+없는 것만 보내고, 수정/업서트는 같은 값을 다시 써도 결과가 같습니다.
+
+파일 형식 (한 줄에 하나):
+    {"event": "plan", "seq": 1, "table": "Members", "op": "create",
+     "key_field": "Member Code", "records": [...]}
+    {"event": "ack", "seq": 1, "ids": ["rec..."]}
+    {"event": "fail", "seq": 2, "error": "..."}
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from .. import config
+from ..logger import logger
+
+# 테이블별 고유 키 (재개 시 생성 배치를 이 키로 대조, config.AIRTABLE_TABLES 키 기준)
+NATURAL_KEYS: dict[str, str] = {
+    'members': 'Member Code',
+    'orders': 'Order Number',
+    'refunds': 'Order Number',
+    'products': 'Product Code',
+    'member_products': 'MemberProducts Code',
+}
+
+
+def natural_key(table_name: str) -> str | None:
+    """Airtable 테이블명 -> 고유 키 필드 (없으면 None)"""
+    for table_key, key_field in NATURAL_KEYS.items():
+        if config.AIRTABLE_TABLES.get(table_key) == table_name:
+            return key_field
+    return None
+
+
+class WriteJournal:
+    """append-only 배치 쓰기 저널 (스레드 안전)"""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Args:
+            path: 저널 파일 경로 (있으면 이어서 기록)
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._next_seq = max((entry['seq'] for entry in self._entries()), default=0) + 1
+
+    @classmethod
+    def begin(cls, path: Path) -> 'WriteJournal':
+        """새 동기화 실행용 저널 시작 (이전 저널은 버림)
+
+        새 실행은 CSV 전체를 기존 키와 다시 대조하므로 이전 실행의 미확인 배치도 함께 처리합니다.
+
+        Args:
+            path: 저널 파일 경로
+
+        Returns:
+            빈 저널
+        """
+        previous = cls(path)
+        pending = previous.pending()
+        if pending:
+            records = sum(len(entry['records']) for entry in pending)
+            logger.warning(
+                f"이전 실행의 미확인 배치 {len(pending)}개 ({records}개 레코드): "
+                f"이번 동기화가 키 확인 후 다시 처리합니다"
+            )
+        previous.discard()
+        return cls(path)
+
+    def _entries(self) -> list[dict[str, Any]]:
+        """저널 전체 읽기 (중단으로 잘린 마지막 줄은 무시)"""
+        if not self.path.exists():
+            return []
+        entries = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        return entries
+
+    def _append(self, entries: list[dict[str, Any]], sync: bool = False) -> None:
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+
+    def plan(
+        self,
+        table_name: str,
+        op: str,
+        batches: list[list[dict[str, Any]]],
+        key_fields: list[str] | None = None
+    ) -> list[int]:
+        """보낼 배치 기록 (전송 전)
+
+        Args:
+            table_name: Airtable 테이블명
+            op: 'create' | 'update' | 'upsert'
+            batches: 배치 리스트 (각 배치는 요청 1회의 레코드)
+            key_fields: 업서트 매칭 필드 (op='upsert')
+
+        Returns:
+            배치별 일련번호 (ack/fail에 사용)
+        """
+        with self._lock:
+            seqs = list(range(self._next_seq, self._next_seq + len(batches)))
+            self._next_seq += len(batches)
+            self._append([
+                {
+                    'event': 'plan',
+                    'seq': seq,
+                    'table': table_name,
+                    'op': op,
+                    'key_field': natural_key(table_name),
+                    'key_fields': key_fields,
+                    'records': batch,
+                }
+                for seq, batch in zip(seqs, batches)
+            ], sync=True)
+        return seqs
+
+    def ack(self, seq: int, ids: list[str]) -> None:
+        """배치 성공 기록"""
+        with self._lock:
+            self._append([{'event': 'ack', 'seq': seq, 'ids': ids}])
+
+    def fail(self, seq: int, error: Exception | str) -> None:
+        """배치 실패 기록 (재개 대상으로 남음)"""
+        with self._lock:
+            self._append([{'event': 'fail', 'seq': seq, 'error': str(error)}])
+
+    def pending(self) -> list[dict[str, Any]]:
+        """확인되지 않은 배치 (plan 순서)
+
+        Returns:
+            plan 항목 리스트 {seq, table, op, key_field, key_fields, records}
+        """
+        plans: dict[int, dict[str, Any]] = {}
+        for entry in self._entries():
+            if entry.get('event') == 'plan':
+                plans[entry['seq']] = entry
+            elif entry.get('event') == 'ack':
+                plans.pop(entry['seq'], None)
+        return list(plans.values())
+
+    def discard(self) -> None:
+        """저널 파일 삭제"""
+        self.path.unlink(missing_ok=True)
+
+    def close(self) -> int:
+        """실행 종료 처리 (미확인 배치가 없으면 파일 삭제)
+
+        Returns:
+            남은 미확인 배치 수
+        """
+        pending = self.pending()
+        if pending:
+            logger.warning(
+                f"미확인 배치 {len(pending)}개가 저널에 남았습니다: "
+                f"python -m src.main --resume 으로 재전송할 수 있습니다"
+            )
+        else:
+            self.discard()
+        return len(pending)
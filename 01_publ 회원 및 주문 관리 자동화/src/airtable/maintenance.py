@@ -7,16 +7,14 @@ from pyairtable import Api
 
 from .. import config
 from ..logger import logger
-from ..utils import batch_iterator, to_iso_datetime
+from ..utils import normalize_datetimes
 
 from .client import get_api, get_table
-from .records import get_existing_orders
+from .formulas import And, Contains, IsEmpty, Not, NotEmpty, Or
+from .records import TableSnapshot, find_by_keys, get_existing_by_key
 
-# Airtable 배치 크기 (API 제한)
-AIRTABLE_BATCH_SIZE = 10
 
-
-def backfill_iso_dates(api: Api = None) -> dict[str, int]:
+def backfill_iso_dates(api: Api = None, snapshot: TableSnapshot | None = None) -> dict[str, int]:
     """기존 레코드의 (ISO) 날짜 필드를 채우는 백필 함수
 
     각 테이블에서 원본 날짜 필드는 있지만 (ISO) 필드가 비어있는 레코드를 찾아
@@ -24,12 +22,14 @@ def backfill_iso_dates(api: Api = None) -> dict[str, int]:
 
     Args:
         api: Airtable API 클라이언트 (없으면 새로 생성)
+        snapshot: 실행 단위 스냅샷 (없으면 페이지 스트리밍)
 
     Returns:
         테이블별 업데이트된 레코드 수
     """
     if api is None:
         api = get_api()
+    snapshot = snapshot or TableSnapshot(retain=False)
 
     logger.info(f"\n{'='*60}")
     logger.info("ISO 날짜 필드 백필 시작")
@@ -50,39 +50,41 @@ def backfill_iso_dates(api: Api = None) -> dict[str, int]:
         logger.info(f"{'='*50}")
 
         table = get_table(api, table_name)
-        all_records = table.all()
-        logger.info(f"전체 레코드: {len(all_records)}")
-
-        records_to_update = []
-
-        for record in all_records:
+        # 원본은 있는데 ISO가 없는 레코드만 페이지 단위로 조회하며 업데이트 목록 생성
+        candidates = snapshot.iter_select(
+            table,
+            And(NotEmpty(original_field), IsEmpty(iso_field)),
+            [original_field, iso_field]
+        )
+
+        # 원본은 있는데 ISO가 없는 경우만 모아 날짜 열을 한 번에 변환 (YYYY-MM-DD HH:MM:SS 형식)
+        pending = []
+        candidate_count = 0
+        for record in candidates:
+            candidate_count += 1
             fields = record['fields']
-            original_value = fields.get(original_field)
-            iso_value = fields.get(iso_field)
-
-            # 원본은 있는데 ISO가 없는 경우만 처리
-            if original_value and not iso_value:
-                # 먼저 표준 변환 시도 (YYYY-MM-DD HH:MM:SS 형식)
-                iso_converted = to_iso_datetime(original_value)
-
-                # 변환 실패 시, 이미 ISO 형식인지 확인 (T와 +/- 포함)
-                if not iso_converted and 'T' in original_value:
-                    # 이미 ISO 형식이면 그대로 사용
-                    iso_converted = original_value
-
-                if iso_converted:
-                    records_to_update.append({
-                        'id': record['id'],
-                        'fields': {iso_field: iso_converted}
-                    })
+            if fields.get(original_field) and not fields.get(iso_field):
+                pending.append((record['id'], fields[original_field]))
 
+        records_to_update = []
+        converted = normalize_datetimes(original_value for _, original_value in pending)
+        for (record_id, original_value), iso_converted in zip(pending, converted):
+            # 변환 실패 시, 이미 ISO 형식인지 확인 (T와 +/- 포함)
+            if not iso_converted and 'T' in original_value:
+                # 이미 ISO 형식이면 그대로 사용
+                iso_converted = original_value
+
+            if iso_converted:
+                records_to_update.append({
+                    'id': record_id,
+                    'fields': {iso_field: iso_converted}
+                })
+
+        logger.info(f"ISO 누락 레코드: {candidate_count}")
         logger.info(f"업데이트 대상: {len(records_to_update)}")
 
         if records_to_update:
-            updated = 0
-            for batch in batch_iterator(records_to_update, AIRTABLE_BATCH_SIZE):
-                table.batch_update(batch)
-                updated += len(batch)
+            updated = len(snapshot.batch_update(table, records_to_update))
             logger.info(f"업데이트 완료: {updated}개")
             results[table_name] = updated
         else:
@@ -95,7 +97,7 @@ def backfill_iso_dates(api: Api = None) -> dict[str, int]:
     return results
 
 
-def fix_member_products_codes(api: Api = None) -> int:
+def fix_member_products_codes(api: Api = None, snapshot: TableSnapshot | None = None) -> int:
     """MemberProducts 테이블의 잘못된 MemberProducts Code 필드를 수정
 
     MemberProducts Code 형식: MemberCode_ProductCode
@@ -103,12 +105,14 @@ def fix_member_products_codes(api: Api = None) -> int:
 
     Args:
         api: Airtable API 클라이언트 (없으면 새로 생성)
+        snapshot: 실행 단위 스냅샷 (없으면 페이지 스트리밍)
 
     Returns:
         수정된 레코드 수
     """
     if api is None:
         api = get_api()
+    snapshot = snapshot or TableSnapshot(retain=False)
 
     logger.info(f"\n{'='*60}")
     logger.info("MemberProducts Code 필드 수정")
@@ -118,28 +122,29 @@ def fix_member_products_codes(api: Api = None) -> int:
     members_table = get_table(api, config.AIRTABLE_TABLES['members'])
     products_table = get_table(api, config.AIRTABLE_TABLES['products'])
 
-    # Members: record_id -> Member Code
-    members_by_id: dict[str, str] = {}
-    for record in members_table.all():
-        member_code = record['fields'].get('Member Code')
-        if member_code:
-            members_by_id[record['id']] = member_code
-
-    # Products: record_id -> Product Code
-    products_by_id: dict[str, str] = {}
-    for record in products_table.all():
-        product_code = record['fields'].get('Product Code')
-        if product_code:
-            products_by_id[record['id']] = product_code
-
-    logger.info(f"Members: {len(members_by_id)}개")
-    logger.info(f"Products: {len(products_by_id)}개")
-
-    # MemberProducts에서 잘못된 코드 찾기
-    all_records = member_products_table.all()
+    # 코드에 '_'가 없는 (잘못된 형식) 레코드만 조회
+    invalid_records = snapshot.select(
+        member_products_table,
+        Not(Contains('MemberProducts Code', '_')),
+        ['MemberProducts Code', 'Member', 'Product']
+    )
+    logger.info(f"잘못된 형식 코드: {len(invalid_records)}개")
+
+    if not invalid_records:
+        logger.info("수정할 레코드가 없습니다.")
+        return 0
+
+    # Member Code / Product Code <-> record_id (key_of로 Linked Record ID -> 코드)
+    members = get_existing_by_key(members_table, 'Member Code', snapshot)
+    products = get_existing_by_key(products_table, 'Product Code', snapshot)
+
+    logger.info(f"Members: {len(members)}개")
+    logger.info(f"Products: {len(products)}개")
+
+    # Linked Record로 올바른 코드 계산
     records_to_update = []
 
-    for record in all_records:
+    for record in invalid_records:
         code = record['fields'].get('MemberProducts Code', '')
 
         # 코드에 '_'가 없으면 잘못된 형식
@@ -151,8 +156,8 @@ def fix_member_products_codes(api: Api = None) -> int:
                 member_id = member_links[0]
                 product_id = product_links[0]
 
-                member_code = members_by_id.get(member_id)
-                product_code = products_by_id.get(product_id)
+                member_code = members.key_of(member_id)
+                product_code = products.key_of(product_id)
 
                 if member_code and product_code:
                     new_code = f"{member_code}_{product_code}"
@@ -168,47 +173,38 @@ def fix_member_products_codes(api: Api = None) -> int:
         return 0
 
     # 배치 업데이트
-    updated = 0
-    for batch in batch_iterator(records_to_update, AIRTABLE_BATCH_SIZE):
-        member_products_table.batch_update(batch)
-        updated += len(batch)
+    updated = len(snapshot.batch_update(member_products_table, records_to_update))
 
     logger.info(f"수정 완료: {updated}개")
     return updated
 
 
-def backfill_is_active(api: Api = None) -> int:
+def backfill_is_active(api: Api = None, snapshot: TableSnapshot | None = None) -> int:
     """기존 Members 레코드의 'Is Active' 필드를 True로 설정
 
     'Is Active'가 설정되지 않은 모든 회원을 활성 상태로 변경합니다.
 
     Args:
         api: Airtable API 클라이언트 (없으면 새로 생성)
+        snapshot: 실행 단위 스냅샷 (없으면 페이지 스트리밍)
 
     Returns:
         업데이트된 레코드 수
     """
     if api is None:
         api = get_api()
+    snapshot = snapshot or TableSnapshot(retain=False)
 
     logger.info(f"\n{'='*60}")
     logger.info("Members 'Is Active' 필드 백필")
     logger.info("=" * 60)
 
     table = get_table(api, config.AIRTABLE_TABLES['members'])
-    all_records = table.all()
-    logger.info(f"전체 회원: {len(all_records)}")
-
-    records_to_update = []
-
-    for record in all_records:
-        is_active = record['fields'].get('Is Active')
-        # Is Active가 None이거나 False인 경우 업데이트 대상
-        if not is_active:
-            records_to_update.append({
-                'id': record['id'],
-                'fields': {'Is Active': True}
-            })
+    # Is Active가 None이거나 False인 회원만 조회
+    records_to_update = [
+        {'id': record['id'], 'fields': {'Is Active': True}}
+        for record in snapshot.iter_select(table, IsEmpty('Is Active'), ['Is Active'])
+    ]
 
     logger.info(f"업데이트 대상: {len(records_to_update)}")
 
@@ -217,16 +213,17 @@ def backfill_is_active(api: Api = None) -> int:
         return 0
 
     # 배치 업데이트
-    updated = 0
-    for batch in batch_iterator(records_to_update, AIRTABLE_BATCH_SIZE):
-        table.batch_update(batch)
-        updated += len(batch)
+    updated = len(snapshot.batch_update(table, records_to_update))
 
     logger.info(f"업데이트 완료: {updated}개")
     return updated
 
 
-def validate_required_fields(api: Api = None, auto_fix: bool = True) -> dict[str, dict]:
+def validate_required_fields(
+    api: Api = None,
+    auto_fix: bool = True,
+    snapshot: TableSnapshot | None = None
+) -> dict[str, dict]:
     """테이블별 필수 필드 누락 검증 및 자동 복구
 
     config.REQUIRED_FIELDS에 정의된 필수 필드가 누락된 레코드를 감지하고,
@@ -234,13 +231,14 @@ def validate_required_fields(api: Api = None, auto_fix: bool = True) -> dict[str
 
     Args:
         api: Airtable API 클라이언트 (없으면 새로 생성)
+        snapshot: 실행 단위 스냅샷 (없으면 페이지 스트리밍)
         auto_fix: True면 누락된 필드를 자동으로 기본값으로 설정
 
     Returns:
         테이블별 검증 결과 딕셔너리
         {
             'members': {
-                'total': 전체 레코드 수,
+                'candidates': 필수 필드 중 하나 이상 비어있는 레코드 수,
                 'missing': {'Is Active': 누락 수, ...},
                 'fixed': {'Is Active': 복구 수, ...}  # auto_fix=True인 경우
             }
@@ -248,6 +246,7 @@ def validate_required_fields(api: Api = None, auto_fix: bool = True) -> dict[str
     """
     if api is None:
         api = get_api()
+    snapshot = snapshot or TableSnapshot(retain=False)
 
     logger.info(f"\n{'='*60}")
     logger.info("필수 필드 검증" + (" (자동 복구 활성화)" if auto_fix else ""))
@@ -266,13 +265,21 @@ def validate_required_fields(api: Api = None, auto_fix: bool = True) -> dict[str
         logger.info(f"\n[{table_name}] 검증 중...")
 
         table = get_table(api, table_name)
-        all_records = table.all()
-        total = len(all_records)
-
-        logger.info(f"  전체 레코드: {total}")
+        # 필수 필드 중 하나라도 비어있는 레코드만 조회
+        candidates = snapshot.select(
+            table,
+            Or(*(IsEmpty(field_name) for field_name in required_fields)),
+            list(required_fields)
+        )
+        # 전체 레코드 수는 테이블이 스냅샷에 적재된 경우에만 알 수 있음 (로그 전용)
+        total = snapshot.loaded_count(table)
+
+        if total is not None:
+            logger.info(f"  전체 레코드: {total}")
+        logger.info(f"  누락 후보 레코드: {len(candidates)}")
 
         results[table_key] = {
-            'total': total,
+            'candidates': len(candidates),
             'missing': {},
             'fixed': {}
         }
@@ -281,7 +288,7 @@ def validate_required_fields(api: Api = None, auto_fix: bool = True) -> dict[str
         for field_name, (default_value, description) in required_fields.items():
             records_to_update = []
 
-            for record in all_records:
+            for record in candidates:
                 field_value = record['fields'].get(field_name)
                 # 값이 None이거나 빈 값인 경우 누락으로 판단
                 if field_value is None or field_value == '' or field_value is False:
@@ -300,10 +307,7 @@ def validate_required_fields(api: Api = None, auto_fix: bool = True) -> dict[str
 
                 if auto_fix and records_to_update:
                     # 배치 업데이트로 복구
-                    fixed = 0
-                    for batch in batch_iterator(records_to_update, AIRTABLE_BATCH_SIZE):
-                        table.batch_update(batch)
-                        fixed += len(batch)
+                    fixed = len(snapshot.batch_update(table, records_to_update))
 
                     results[table_key]['fixed'][field_name] = fixed
                     logger.info(f"    → {fixed}개 자동 복구 완료 (기본값: {default_value})")
@@ -330,7 +334,7 @@ def validate_required_fields(api: Api = None, auto_fix: bool = True) -> dict[str
     return results
 
 
-def backfill_refunds_orders_link(api: Api = None) -> int:
+def backfill_refunds_orders_link(api: Api = None, snapshot: TableSnapshot | None = None) -> int:
     """기존 Refunds 레코드의 Orders Linked Record 복구
 
     Orders 필드가 비어있는 Refunds 레코드를 찾아
@@ -338,12 +342,14 @@ def backfill_refunds_orders_link(api: Api = None) -> int:
 
     Args:
         api: Airtable API 클라이언트 (없으면 새로 생성)
+        snapshot: 실행 단위 스냅샷 (없으면 페이지 스트리밍)
 
     Returns:
         업데이트된 레코드 수
     """
     if api is None:
         api = get_api()
+    snapshot = snapshot or TableSnapshot(retain=False)
 
     logger.info(f"\n{'='*60}")
     logger.info("Refunds → Orders Linked Record 복구")
@@ -352,27 +358,32 @@ def backfill_refunds_orders_link(api: Api = None) -> int:
     refunds_table = get_table(api, config.AIRTABLE_TABLES['refunds'])
     orders_table = get_table(api, config.AIRTABLE_TABLES['orders'])
 
-    # Orders: Order Number -> record_id 매핑
-    existing_orders = get_existing_orders(orders_table)
-    logger.info(f"Orders: {len(existing_orders)}개")
+    # Orders 필드가 비어있는 Refunds만 조회
+    unlinked_refunds = snapshot.select(
+        refunds_table,
+        And(IsEmpty('Orders'), NotEmpty('Order Number')),
+        ['Order Number', 'Orders']
+    )
+    logger.info(f"연결 안 된 Refunds: {len(unlinked_refunds)}개")
 
-    # Refunds 전체 조회
-    all_refunds = refunds_table.all()
-    logger.info(f"Refunds 전체: {len(all_refunds)}개")
+    if not unlinked_refunds:
+        logger.info("복구할 레코드가 없습니다.")
+        return 0
+
+    # Orders: Order Number -> record_id 매핑 (필요한 주문만 조회)
+    existing_orders = find_by_keys(
+        orders_table,
+        'Order Number',
+        [record['fields']['Order Number'] for record in unlinked_refunds],
+        snapshot
+    )
+    logger.info(f"매칭된 Orders: {len(existing_orders)}개")
 
-    # Orders 필드가 비어있는 Refunds 필터링
     records_to_update = []
     missing_orders = []
 
-    for record in all_refunds:
-        # 이미 Orders가 연결되어 있으면 건너뛰기
-        if record['fields'].get('Orders'):
-            continue
-
-        order_number = record['fields'].get('Order Number')
-        if not order_number:
-            continue
-
+    for record in unlinked_refunds:
+        order_number = record['fields']['Order Number']
         order_id = existing_orders.get(order_number)
         if order_id:
             records_to_update.append({
@@ -392,10 +403,7 @@ def backfill_refunds_orders_link(api: Api = None) -> int:
         return 0
 
     # 배치 업데이트
-    updated = 0
-    for batch in batch_iterator(records_to_update, AIRTABLE_BATCH_SIZE):
-        refunds_table.batch_update(batch)
-        updated += len(batch)
+    updated = len(snapshot.batch_update(refunds_table, records_to_update))
 
     logger.info(f"복구 완료: {updated}개")
     return updated
@@ -0,0 +1,453 @@
+"""Airtable 로컬 SQLite 미러
+
+Members, Orders, Refunds, Products, MemberProducts, SyncHistory 테이블의
+전체 필드를 로컬 SQLite 파일에 보관합니다.
+
+- 동기화 후 LAST_MODIFIED_TIME() 기준 증분 갱신 (reconcile_hours마다 테이블 전체 교체)
+- 고유 키(Member Code, Order Number, MemberProducts Code 등)와 Linked Record 필드에 인덱스
+- 오프라인이거나 API 호출 한도에 걸렸을 때도 조회 가능
+
+SQLite 구조:
+    records(table_key, id, key, fields, created_time)   # fields는 JSON 문자열
+    links(table_key, record_id, field, linked_id)       # Linked Record 필드 펼침
+    mirror_state(table_key, watermark, reconciled_at)   # 테이블별 증분 갱신 상태
+
+주의:
+    LAST_MODIFIED_TIME()은 Formula / Rollup / Lookup 필드 변경을 반영하지 않으므로
+    계산 필드(예: MemberProducts의 Subscription Status, Expiry Date, Last Payment Date)는
+    최대 reconcile_hours 동안 이전 값일 수 있습니다. 최신 값이 필요하면
+    reconcile_hours를 줄이거나 Airtable API로 직접 조회하세요.
+
+실행:
+    python -m src.airtable.mirror --refresh
+    python -m src.airtable.mirror --lookup members SUB0000000000000000-AAAAA
+    python -m src.airtable.mirror --sql "SELECT key, COUNT(*) FROM records WHERE table_key='members' GROUP BY key HAVING COUNT(*) > 1"
+"""
+
+import argparse
+import json
+import sqlite3
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Iterator
+
+from pyairtable import Api
+
+from .. import config
+from ..logger import logger
+
+from .client import get_api, get_table
+from .incremental import IncrementalWindow
+from .records import TableSnapshot
+
+# 미러 대상 테이블 (config.AIRTABLE_TABLES 키) -> 고유 키 필드 (None이면 키 없음)
+MIRROR_TABLES: dict[str, str | None] = {
+    'members': 'Member Code',
+    'orders': 'Order Number',
+    'refunds': 'Order Number',
+    'products': 'Product Code',
+    'member_products': 'MemberProducts Code',
+    'sync_history': None,
+}
+
+# 고유 키 외에 자주 조회하는 단일 값 필드 (JSON 식 인덱스 생성)
+INDEXED_FIELDS: dict[str, list[str]] = {
+    'orders': ['Member Code', 'Product name'],
+    'member_products': ['Member Code'],
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    table_key TEXT NOT NULL,
+    id TEXT NOT NULL,
+    key TEXT,
+    fields TEXT NOT NULL,
+    created_time TEXT,
+    PRIMARY KEY (table_key, id)
+);
+CREATE INDEX IF NOT EXISTS idx_records_key ON records (table_key, key);
+
+CREATE TABLE IF NOT EXISTS links (
+    table_key TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    field TEXT NOT NULL,
+    linked_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_links_target ON links (table_key, field, linked_id);
+CREATE INDEX IF NOT EXISTS idx_links_record ON links (table_key, record_id);
+
+CREATE TABLE IF NOT EXISTS mirror_state (
+    table_key TEXT PRIMARY KEY,
+    watermark TEXT NOT NULL,
+    reconciled_at TEXT NOT NULL
+);
+"""
+
+
+def _json_path(field: str) -> str:
+    """json_extract용 경로 ($."Field Name")"""
+    return '$."' + field.replace('"', '\\"') + '"'
+
+
+def _index_name(table_key: str, field: str) -> str:
+    slug = ''.join(c if c.isalnum() else '_' for c in field.lower())
+    return f"idx_{table_key}_{slug}"
+
+
+def _linked_ids(value: Any) -> list[str]:
+    """Linked Record 필드 값이면 레코드 ID 목록 반환 (아니면 빈 리스트)"""
+    if isinstance(value, list) and value and all(
+        isinstance(v, str) and v.startswith('rec') for v in value
+    ):
+        return value
+    return []
+
+
+class AirtableMirror:
+    """Airtable 테이블의 로컬 SQLite 미러
+
+    Example:
+        >>> with AirtableMirror() as mirror:
+        ...     mirror.refresh(api)                          # 증분 갱신
+        ...     mirror.get_by_key('members', 'SUB...')       # 로컬 조회
+        ...     mirror.linked_from('orders', 'Member', 'rec...')
+    """
+
+    def __init__(self, db_path: Path | str = config.MIRROR_FILE, reconcile_hours: float = 24) -> None:
+        """
+        Args:
+            db_path: SQLite 파일 경로 (':memory:' 가능)
+            reconcile_hours: 전체 교체 주기 (시간)
+        """
+        self.db_path = db_path
+        self.reconcile_interval = timedelta(hours=reconcile_hours)
+        if db_path != ':memory:':
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def __enter__(self) -> 'AirtableMirror':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """SQLite 연결 종료"""
+        self.conn.close()
+
+    def _create_schema(self) -> None:
+        self.conn.executescript(_SCHEMA)
+        for table_key, fields in INDEXED_FIELDS.items():
+            for field in fields:
+                self.conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_index_name(table_key, field)} "
+                    f"ON records (json_extract(fields, '{_json_path(field)}')) "
+                    f"WHERE table_key = '{table_key}'"
+                )
+        self.conn.commit()
+
+    # ------------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------------
+
+    def _state(self, table_key: str) -> sqlite3.Row | None:
+        return self.conn.execute(
+            "SELECT watermark, reconciled_at FROM mirror_state WHERE table_key = ?",
+            (table_key,)
+        ).fetchone()
+
+    def upsert(self, table_key: str, records: list[dict[str, Any]]) -> None:
+        """레코드 저장 (같은 ID는 교체, Linked Record 인덱스 갱신)
+
+        Args:
+            table_key: config.AIRTABLE_TABLES 키
+            records: Airtable 레코드 리스트 [{id, fields, createdTime}]
+        """
+        key_field = MIRROR_TABLES.get(table_key)
+        for record in records:
+            fields = record.get('fields', {})
+            self.conn.execute(
+                "INSERT OR REPLACE INTO records (table_key, id, key, fields, created_time) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    table_key,
+                    record['id'],
+                    fields.get(key_field) if key_field else None,
+                    json.dumps(fields, ensure_ascii=False),
+                    record.get('createdTime'),
+                )
+            )
+            self.conn.execute(
+                "DELETE FROM links WHERE table_key = ? AND record_id = ?",
+                (table_key, record['id'])
+            )
+            self.conn.executemany(
+                "INSERT INTO links (table_key, record_id, field, linked_id) VALUES (?, ?, ?, ?)",
+                [
+                    (table_key, record['id'], field, linked_id)
+                    for field, value in fields.items()
+                    for linked_id in _linked_ids(value)
+                ]
+            )
+
+    def delete(self, table_key: str, record_ids: list[str]) -> None:
+        """레코드 삭제
+
+        Args:
+            table_key: config.AIRTABLE_TABLES 키
+            record_ids: 삭제할 레코드 ID 목록
+        """
+        params = [(table_key, record_id) for record_id in record_ids]
+        self.conn.executemany("DELETE FROM records WHERE table_key = ? AND id = ?", params)
+        self.conn.executemany("DELETE FROM links WHERE table_key = ? AND record_id = ?", params)
+
+    def refresh_table(self, api: Api, table_key: str) -> int:
+        """테이블 1개 갱신
+
+        처음과 reconcile_hours마다 전체 조회하여 테이블을 교체하고(삭제된 레코드와
+        계산 필드 변경 반영), 그 사이에는 워터마크 이후 수정된 레코드만 조회합니다.
+        교체는 커밋 전까지 하나의 트랜잭션이므로 실패하면 이전 데이터가 유지됩니다.
+
+        Args:
+            api: Airtable API 클라이언트
+            table_key: config.AIRTABLE_TABLES 키
+
+        Returns:
+            저장된(신규/수정) 레코드 수
+        """
+        table = get_table(api, config.AIRTABLE_TABLES[table_key])
+        state = self._state(table_key)
+        window = IncrementalWindow(
+            state['watermark'] if state else None,
+            state['reconciled_at'] if state else None,
+            self.reconcile_interval
+        )
+
+        if window.full_refresh:
+            options = {}
+            self.conn.execute("DELETE FROM records WHERE table_key = ?", (table_key,))
+            self.conn.execute("DELETE FROM links WHERE table_key = ?", (table_key,))
+        else:
+            options = {'formula': window.delta_formula()}
+
+        # 페이지 단위로 저장 (전체 테이블을 메모리에 올리지 않음)
+        saved = 0
+        for page in table.iterate(**options):
+            self.upsert(table_key, page)
+            saved += len(page)
+
+        next_state = window.next_state()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO mirror_state (table_key, watermark, reconciled_at) "
+            "VALUES (?, ?, ?)",
+            (table_key, next_state['watermark'], next_state['reconciled_at'])
+        )
+        self.conn.commit()
+        return saved
+
+    def refresh(self, api: Api | None = None, table_keys: list[str] | None = None) -> dict[str, int]:
+        """미러 대상 테이블 증분 갱신
+
+        한 테이블이 실패해도 나머지 테이블은 계속 갱신합니다.
+
+        Args:
+            api: Airtable API 클라이언트 (없으면 새로 생성)
+            table_keys: 갱신할 테이블 키 목록 (없으면 MIRROR_TABLES 전체)
+
+        Returns:
+            테이블별 저장된 레코드 수 (실패한 테이블은 -1)
+        """
+        if api is None:
+            api = get_api()
+
+        logger.info(f"\n{'='*50}")
+        logger.info("로컬 미러 갱신")
+        logger.info(f"{'='*50}")
+
+        results: dict[str, int] = {}
+        for table_key in table_keys or list(MIRROR_TABLES):
+            try:
+                results[table_key] = self.refresh_table(api, table_key)
+                logger.info(f"  - {config.AIRTABLE_TABLES[table_key]}: {results[table_key]}개 갱신 "
+                            f"(전체 {self.count(table_key)}개)")
+            except Exception as e:
+                self.conn.rollback()
+                logger.warning(f"  - {config.AIRTABLE_TABLES[table_key]} 갱신 실패: {e}")
+                results[table_key] = -1
+        return results
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> dict[str, Any]:
+        return {
+            'id': row['id'],
+            'createdTime': row['created_time'],
+            'fields': json.loads(row['fields']),
+        }
+
+    def count(self, table_key: str) -> int:
+        """테이블 레코드 수"""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM records WHERE table_key = ?", (table_key,)
+        ).fetchone()[0]
+
+    def last_refreshed(self, table_key: str) -> str | None:
+        """마지막 갱신 기준 시각 (UTC, 갱신 전이면 None)"""
+        state = self._state(table_key)
+        return state['watermark'] if state else None
+
+    def records(self, table_key: str) -> Iterator[dict[str, Any]]:
+        """테이블 전체 레코드 (Airtable 레코드 형식)"""
+        for row in self.conn.execute(
+            "SELECT id, fields, created_time FROM records WHERE table_key = ?", (table_key,)
+        ):
+            yield self._to_record(row)
+
+    def get_by_key(self, table_key: str, key: str) -> dict[str, Any] | None:
+        """고유 키로 레코드 1개 조회 (중복이면 첫 번째)"""
+        row = self.conn.execute(
+            "SELECT id, fields, created_time FROM records WHERE table_key = ? AND key = ?",
+            (table_key, key)
+        ).fetchone()
+        return self._to_record(row) if row else None
+
+    def key_map(self, table_key: str) -> dict[str, str]:
+        """고유 키 -> 레코드 ID 매핑 (get_existing_by_key와 같은 형식)"""
+        return {
+            row['key']: row['id']
+            for row in self.conn.execute(
+                "SELECT key, id FROM records WHERE table_key = ? AND key IS NOT NULL AND key != ''",
+                (table_key,)
+            )
+        }
+
+    def duplicates(self, table_key: str) -> dict[str, list[str]]:
+        """고유 키가 중복된 레코드 (키 -> 레코드 ID 목록, 2개 이상만)"""
+        result: dict[str, list[str]] = {}
+        for row in self.conn.execute(
+            "SELECT key, GROUP_CONCAT(id) AS ids FROM records "
+            "WHERE table_key = ? AND key IS NOT NULL AND key != '' "
+            "GROUP BY key HAVING COUNT(*) > 1",
+            (table_key,)
+        ):
+            result[row['key']] = row['ids'].split(',')
+        return result
+
+    def find(self, table_key: str, field: str, value: Any) -> list[dict[str, Any]]:
+        """필드 값이 같은 레코드 조회
+
+        고유 키는 key 인덱스, INDEXED_FIELDS는 JSON 식 인덱스를 사용합니다.
+
+        Args:
+            table_key: config.AIRTABLE_TABLES 키
+            field: 필드명
+            value: 찾을 값
+
+        Returns:
+            레코드 리스트
+        """
+        if field == MIRROR_TABLES.get(table_key):
+            rows = self.conn.execute(
+                "SELECT id, fields, created_time FROM records WHERE table_key = ? AND key = ?",
+                (table_key, value)
+            )
+        else:
+            # 부분 인덱스를 쓰려면 table_key 조건이 리터럴이어야 함
+            if table_key not in MIRROR_TABLES:
+                raise KeyError(table_key)
+            rows = self.conn.execute(
+                f"SELECT id, fields, created_time FROM records "
+                f"WHERE table_key = '{table_key}' "
+                f"AND json_extract(fields, '{_json_path(field)}') = ?",
+                (value,)
+            )
+        return [self._to_record(row) for row in rows]
+
+    def linked_from(self, table_key: str, field: str, linked_id: str) -> list[dict[str, Any]]:
+        """Linked Record 필드에 주어진 레코드 ID를 가진 레코드 조회
+
+        Example:
+            >>> mirror.linked_from('orders', 'Member', member_record_id)  # 회원의 주문
+        """
+        rows = self.conn.execute(
+            "SELECT r.id, r.fields, r.created_time FROM links l "
+            "JOIN records r ON r.table_key = l.table_key AND r.id = l.record_id "
+            "WHERE l.table_key = ? AND l.field = ? AND l.linked_id = ?",
+            (table_key, field, linked_id)
+        )
+        return [self._to_record(row) for row in rows]
+
+    def query(self, sql: str, params: tuple | dict = ()) -> list[sqlite3.Row]:
+        """임의 SQL 조회 (ad-hoc 분석용)"""
+        return self.conn.execute(sql, params).fetchall()
+
+    def snapshot(
+        self,
+        table_keys: list[str] | None = None,
+        snapshot: TableSnapshot | None = None
+    ) -> TableSnapshot:
+        """미러 데이터로 채운 TableSnapshot 생성
+
+        유지보수 함수에 넘기면 조회는 로컬에서, 수정은 Airtable API로 처리합니다.
+
+        Args:
+            table_keys: 적재할 테이블 키 목록 (없으면 MIRROR_TABLES 전체)
+            snapshot: 채울 스냅샷 (없으면 새로 생성, 예: TableSnapshot.for_plan())
+
+        Returns:
+            전체 필드가 적재된 스냅샷
+        """
+        snapshot = snapshot or TableSnapshot()
+        for table_key in table_keys or list(MIRROR_TABLES):
+            snapshot.seed(config.AIRTABLE_TABLES[table_key], list(self.records(table_key)))
+        return snapshot
+
+
+def refresh_mirror(api: Api | None = None) -> dict[str, int]:
+    """설정 파일 기준으로 로컬 미러 갱신
+
+    Args:
+        api: Airtable API 클라이언트 (없으면 새로 생성)
+
+    Returns:
+        테이블별 저장된 레코드 수
+    """
+    with AirtableMirror(config.MIRROR_FILE, config.AIRTABLE_MIRROR_RECONCILE_HOURS) as mirror:
+        return mirror.refresh(api)
+
+
+def main() -> None:
+    """CLI 엔트리포인트"""
+    parser = argparse.ArgumentParser(description='Airtable 로컬 SQLite 미러')
+    parser.add_argument('--refresh', action='store_true', help='미러 증분 갱신 (API 호출)')
+    parser.add_argument('--lookup', nargs=2, metavar=('TABLE', 'KEY'),
+                        help='고유 키로 레코드 조회 (예: members SUB...)')
+    parser.add_argument('--sql', type=str, help='임의 SQL 조회')
+    args = parser.parse_args()
+
+    with AirtableMirror(config.MIRROR_FILE, config.AIRTABLE_MIRROR_RECONCILE_HOURS) as mirror:
+        if args.refresh:
+            mirror.refresh()
+
+        if args.lookup:
+            table_key, key = args.lookup
+            record = mirror.get_by_key(table_key, key)
+            print(json.dumps(record, ensure_ascii=False, indent=2) if record else '없음')
+
+        if args.sql:
+            for row in mirror.query(args.sql):
+                print(dict(row))
+
+        if not (args.refresh or args.lookup or args.sql):
+            for table_key in MIRROR_TABLES:
+                print(f"{config.AIRTABLE_TABLES[table_key]}: {mirror.count(table_key)}개 "
+                      f"(갱신 기준: {mirror.last_refreshed(table_key) or '없음'})")
+
+
+if __name__ == '__main__':
+    main()
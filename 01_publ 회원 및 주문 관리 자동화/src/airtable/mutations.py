@@ -0,0 +1,217 @@
+"""실행 단위 쓰기 대기열
+
+동기화 1회 실행 동안 여러 단계가 같은 레코드를 수정할 때
+(예: 환불 상태 업데이트 후 Orders 연결 복구, 필수 필드 복구) 요청을 바로 보내지 않고
+레코드 ID별로 필드를 병합해 두었다가 실행 끝에 한 번만 보냅니다.
+
+- 수정: 같은 레코드 ID의 필드를 병합 (나중 값 우선)
+- 생성(지연): 임시 ID(pending:...)를 부여하고, 임시 ID에 대한 수정은 생성 필드에 합침
+- flush(): 테이블별로 생성 -> 수정 순서로 10개씩 꽉 채운 배치로 전송
+
+생성 ID가 다른 단계의 Linked Record에 필요한 테이블(Members, Products, MemberProducts,
+Orders)은 바로 생성하고, 이후 단계가 ID를 쓰지 않는 생성만 지연합니다.
+계획(plan) 모드는 allow_pending_links=True로 모든 생성을 지연하고, 임시 ID를 Linked Record로
+참조한 변경 목록을 changes()로 꺼내 파일로 저장합니다 (plan.py가 적용 시 실제 ID로 바꿈).
+
+Example:
+    >>> queue = MutationQueue()
+    >>> queue.update(refunds_table, [{'id': 'rec1', 'fields': {'Refund Status': 'Refunded'}}])
+    >>> queue.update(refunds_table, [{'id': 'rec1', 'fields': {'Orders': ['recO1']}}])
+    >>> queue.flush(writer)     # rec1 수정 요청 1회 (두 필드 함께)
+"""
+
+from typing import Any
+
+from pyairtable import Table
+
+from .writer import BatchWriteError, BatchWriter
+
+# 지연 생성 레코드의 임시 ID 접두사 (Airtable 레코드 ID는 'rec'로 시작)
+PENDING_PREFIX = 'pending:'
+
+
+def is_pending_id(record_id: str) -> bool:
+    """지연 생성 레코드의 임시 ID인지 확인"""
+    return record_id.startswith(PENDING_PREFIX)
+
+
+def _check_no_pending_links(fields: dict[str, Any]) -> None:
+    """임시 ID를 Linked Record 값으로 쓰지 않았는지 확인 (전송 시 Airtable이 거부)
+
+    Raises:
+        ValueError: 필드 값에 임시 ID가 포함된 경우
+    """
+    for name, value in fields.items():
+        if isinstance(value, list) and any(isinstance(v, str) and is_pending_id(v) for v in value):
+            raise ValueError(f"'{name}' 필드가 아직 생성되지 않은 레코드를 참조합니다: {value}")
+
+
+class _TableQueue:
+    """테이블 1개의 대기 중인 생성/수정"""
+
+    def __init__(self, table: Table) -> None:
+        self.table = table
+        # 임시 ID -> 생성할 필드 (입력 순서 유지)
+        self.creates: dict[str, dict[str, Any]] = {}
+        # 레코드 ID -> 병합된 수정 필드 (입력 순서 유지)
+        self.updates: dict[str, dict[str, Any]] = {}
+        # 받은 수정 요청 레코드 수 (병합 전)
+        self.update_ops = 0
+
+
+class MutationQueue:
+    """레코드 ID별로 병합하는 쓰기 대기열"""
+
+    def __init__(self, allow_pending_links: bool = False) -> None:
+        """
+        Args:
+            allow_pending_links: True면 임시 ID를 Linked Record 값으로 허용 (계획 모드 전용, flush 불가)
+        """
+        self._tables: dict[str, _TableQueue] = {}
+        self._next_id = 0
+        self.allow_pending_links = allow_pending_links
+
+    def _queue(self, table: Table) -> _TableQueue:
+        queue = self._tables.get(table.name)
+        if queue is None:
+            queue = self._tables[table.name] = _TableQueue(table)
+        return queue
+
+    def __len__(self) -> int:
+        """대기 중인 레코드 수 (생성 + 수정)"""
+        return sum(len(q.creates) + len(q.updates) for q in self._tables.values())
+
+    def counts(self) -> dict[str, dict[str, int]]:
+        """테이블별 대기 수
+
+        Returns:
+            테이블명 -> {'creates': 생성 수, 'updates': 병합된 수정 레코드 수, 'update_ops': 병합 전 수정 요청 수}
+        """
+        return {
+            name: {'creates': len(q.creates), 'updates': len(q.updates), 'update_ops': q.update_ops}
+            for name, q in self._tables.items()
+        }
+
+    def changes(self) -> list[dict[str, Any]]:
+        """대기 중인 변경 목록 (전송하지 않음, 테이블은 처음 쓰인 순서)
+
+        Returns:
+            [{'table': 테이블명, 'creates': [{id: 임시 ID, fields}], 'updates': [{id, fields}]}]
+        """
+        return [
+            {
+                'table': name,
+                'creates': [{'id': record_id, 'fields': dict(fields)} for record_id, fields in q.creates.items()],
+                'updates': [{'id': record_id, 'fields': dict(fields)} for record_id, fields in q.updates.items()],
+            }
+            for name, q in self._tables.items()
+        ]
+
+    def create(self, table: Table, records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """생성 대기 (임시 ID 부여)
+
+        Args:
+            table: Airtable 테이블 객체
+            records: 생성할 필드 딕셔너리 리스트
+
+        Returns:
+            임시 레코드 리스트 [{id: 'pending:...', fields}]
+        """
+        queue = self._queue(table)
+        pending = []
+        for fields in records:
+            if not self.allow_pending_links:
+                _check_no_pending_links(fields)
+            record_id = f"{PENDING_PREFIX}{table.name}:{self._next_id}"
+            self._next_id += 1
+            queue.creates[record_id] = dict(fields)
+            pending.append({'id': record_id, 'fields': dict(fields)})
+        return pending
+
+    def update(self, table: Table, records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """수정 대기 (같은 레코드 ID는 필드 병합, 임시 ID는 생성 필드에 합침)
+
+        Args:
+            table: Airtable 테이블 객체
+            records: 수정할 레코드 리스트 [{id, fields}]
+
+        Returns:
+            받은 레코드 리스트 [{id, fields}] (이번 수정 필드만)
+        """
+        queue = self._queue(table)
+        for record in records:
+            record_id = record['id']
+            if not self.allow_pending_links:
+                _check_no_pending_links(record['fields'])
+            queue.update_ops += 1
+            if record_id in queue.creates:
+                queue.creates[record_id].update(record['fields'])
+            else:
+                queue.updates.setdefault(record_id, {}).update(record['fields'])
+        return [{'id': record['id'], 'fields': dict(record['fields'])} for record in records]
+
+    def flush(self, writer: BatchWriter) -> dict[str, dict[str, Any]]:
+        """대기 중인 쓰기를 모두 전송하고 대기열 비우기
+
+        테이블별로 생성 -> 수정 순서로 보내며, 일부가 실패해도 나머지는 끝까지 보냅니다.
+
+        Args:
+            writer: 배치 쓰기
+
+        Raises:
+            ValueError: 임시 ID 참조를 허용한 대기열 (계획 모드는 plan.apply_plan으로 적용)
+
+        Returns:
+            테이블명 -> {
+                'created': 생성된 레코드 리스트,
+                'pending_ids': created와 같은 순서의 임시 ID 리스트,
+                'create_ops': 생성 대기 레코드 수,
+                'updated': 수정된 레코드 수,
+                'update_ops': 병합 전 수정 요청 레코드 수,
+                'requests': 보낸 배치 요청 수,
+                'errors': BatchWriteError 리스트 (실패가 없으면 빈 리스트),
+            }
+        """
+        if self.allow_pending_links:
+            raise ValueError("임시 ID 참조를 허용한 대기열은 flush할 수 없습니다 (apply_plan 사용)")
+        results: dict[str, dict[str, Any]] = {}
+        tables, self._tables = self._tables, {}
+        for name, queue in tables.items():
+            result: dict[str, Any] = {
+                'created': [],
+                'pending_ids': [],
+                'create_ops': len(queue.creates),
+                'updated': 0,
+                'update_ops': queue.update_ops,
+                'requests': 0,
+                'errors': [],
+            }
+            results[name] = result
+
+            if queue.creates:
+                pending_ids = list(queue.creates)
+                result['requests'] += -(-len(pending_ids) // writer.batch_size)
+                try:
+                    result['created'] = writer.create(queue.table, list(queue.creates.values()))
+                    result['pending_ids'] = pending_ids
+                except BatchWriteError as e:
+                    # 성공한 배치의 임시 ID만 남김 (결과는 입력 순서)
+                    written = {id(fields) for fields in e.succeeded(list(queue.creates.values()))}
+                    result['created'] = e.records
+                    result['pending_ids'] = [
+                        pending_id for pending_id in pending_ids
+                        if id(queue.creates[pending_id]) in written
+                    ]
+                    result['errors'].append(e)
+
+            if queue.updates:
+                result['requests'] += -(-len(queue.updates) // writer.batch_size)
+                try:
+                    result['updated'] = len(writer.update(queue.table, [
+                        {'id': record_id, 'fields': fields}
+                        for record_id, fields in queue.updates.items()
+                    ]))
+                except BatchWriteError as e:
+                    result['updated'] = len(e.records)
+                    result['errors'].append(e)
+        return results
@@ -0,0 +1,231 @@
+"""동기화 계획(plan) 파일
+
+계획 단계는 CSV + 테이블 스냅샷으로 동기화 단계를 그대로 실행하되 API에 쓰지 않고
+(TableSnapshot.for_plan), 쓰기 대기열에 쌓인 변경 목록을 JSON 파일로 저장합니다.
+적용 단계는 그 파일만으로 BatchWriter를 통해 변경을 보냅니다 (CSV/스냅샷 재계산 없음).
+
+- 생성 레코드는 임시 ID(pending:...)를 가지며, 다른 레코드의 Linked Record가 임시 ID를 참조할 수 있음
+- 적용 순서: 테이블별 생성(계획에 처음 나온 테이블 순서) -> 테이블별 수정
+  (생성할 때마다 임시 ID -> 실제 ID 매핑을 채워 다음 테이블의 Linked Record를 바꿈)
+- 같은 계획을 다시 적용해도 안전: 생성은 고유 키(NATURAL_KEYS)로 이미 있는 레코드를 찾아
+  건너뛰고 그 ID를 매핑에 사용, 수정은 같은 값을 다시 써도 결과가 같음
+
+파일 형식:
+    {
+        "version": 1,
+        "created_at": "2026-10-17T09:00:00+09:00",
+        "source": {"snapshot": "mirror" | "api", "csv": {"members": "..._members.csv", ...}},
+        "stages": {"members": {"Members": {"create": 3, "update": 1}}, ...},
+        "errors": {"products": "..."},
+        "tables": [{"table": "Members", "creates": [{id, fields}], "updates": [{id, fields}]}, ...]
+    }
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from pyairtable import Api
+
+from ..logger import logger
+
+from .client import get_table
+from .journal import natural_key
+from .mutations import is_pending_id
+from .records import find_by_keys
+from .writer import BatchWriteError, BatchWriter
+
+PLAN_VERSION = 1
+
+
+def build_plan(
+    changes: list[dict[str, Any]],
+    stages: dict[str, dict[str, dict[str, int]]],
+    source: dict[str, Any],
+    errors: dict[str, str] | None = None
+) -> dict[str, Any]:
+    """계획 딕셔너리 생성
+
+    Args:
+        changes: MutationQueue.changes() 결과
+        stages: 단계 이름 -> 테이블명 -> {'create', 'update'} 수
+        source: 계획에 쓴 입력 (스냅샷 종류, CSV 파일명)
+        errors: 단계 이름 -> 오류 메시지 (실패한 단계의 변경은 계획에 없음)
+
+    Returns:
+        계획 딕셔너리 (save_plan으로 저장)
+    """
+    return {
+        'version': PLAN_VERSION,
+        'created_at': datetime.now().astimezone().isoformat(timespec='seconds'),
+        'source': source,
+        'stages': stages,
+        'errors': errors or {},
+        'tables': [entry for entry in changes if entry['creates'] or entry['updates']],
+    }
+
+
+def save_plan(plan: dict[str, Any], path: Path) -> None:
+    """계획 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+    path = Path(path)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(plan, f, ensure_ascii=False, indent=1, default=str)
+    tmp_path.replace(path)
+
+
+def load_plan(path: Path) -> dict[str, Any]:
+    """계획 파일 읽기
+
+    Raises:
+        ValueError: 지원하지 않는 계획 버전
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        plan = json.load(f)
+    if plan.get('version') != PLAN_VERSION:
+        raise ValueError(f"지원하지 않는 계획 버전: {plan.get('version')}")
+    return plan
+
+
+def log_plan(plan: dict[str, Any]) -> dict[str, dict[str, int]]:
+    """계획 요약 로그 (단계별/테이블별 생성·수정 수)
+
+    Returns:
+        테이블명 -> {'create': 생성 수, 'update': 수정 레코드 수}
+    """
+    logger.info(f"계획 생성 시각: {plan['created_at']} (스냅샷: {plan['source'].get('snapshot')})")
+    for stage, tables in plan['stages'].items():
+        for table_name, counts in tables.items():
+            logger.info(f"  [{stage}] {table_name}: 생성 {counts['create']}개, 수정 {counts['update']}건")
+    for stage, error in plan['errors'].items():
+        logger.warning(f"  [{stage}] 실패 (계획에 없음): {error}")
+
+    totals = {
+        entry['table']: {'create': len(entry['creates']), 'update': len(entry['updates'])}
+        for entry in plan['tables']
+    }
+    for table_name, counts in totals.items():
+        logger.info(f"  {table_name} 합계: 생성 {counts['create']}개, 수정 {counts['update']}개 (레코드별 병합)")
+    return totals
+
+
+def _resolve(value: Any, id_map: dict[str, str]) -> Any:
+    """Linked Record 리스트의 임시 ID -> 실제 ID (매핑이 없으면 KeyError)"""
+    if isinstance(value, list):
+        return [id_map[v] if isinstance(v, str) and is_pending_id(v) else v for v in value]
+    return value
+
+
+def _resolve_fields(fields: dict[str, Any], id_map: dict[str, str]) -> dict[str, Any] | None:
+    """필드의 임시 ID 참조를 실제 ID로 변환 (생성되지 않은 레코드를 참조하면 None)"""
+    try:
+        return {name: _resolve(value, id_map) for name, value in fields.items()}
+    except KeyError:
+        return None
+
+
+def _apply_creates(
+    api: Api,
+    writer: BatchWriter,
+    entry: dict[str, Any],
+    id_map: dict[str, str],
+    result: dict[str, int]
+) -> None:
+    """테이블 1개의 생성 적용 (이미 있는 고유 키는 건너뛰고 ID만 매핑)"""
+    table = get_table(api, entry['table'])
+    key_field = natural_key(entry['table'])
+
+    ready = []
+    for record in entry['creates']:
+        fields = _resolve_fields(record['fields'], id_map)
+        if fields is None:
+            result['skipped'] += 1
+        else:
+            ready.append((record['id'], fields))
+
+    existing = find_by_keys(table, key_field, [fields.get(key_field) for _, fields in ready]) if key_field else {}
+    to_create = []
+    for pending_id, fields in ready:
+        if key_field and fields.get(key_field) in existing:
+            id_map[pending_id] = existing[fields[key_field]]
+            result['existing'] += 1
+        else:
+            to_create.append((pending_id, fields))
+
+    inputs = [fields for _, fields in to_create]
+    try:
+        created = writer.create(table, inputs)
+        written = inputs
+    except BatchWriteError as e:
+        logger.error(f"  {entry['table']} 생성 실패: {len(e.failed_records)}개 - {e}")
+        created = e.records
+        written = e.succeeded(inputs)
+        result['failed'] += len(e.failed_records)
+
+    pending_by_fields = {id(fields): pending_id for pending_id, fields in to_create}
+    for fields, record in zip(written, created):
+        id_map[pending_by_fields[id(fields)]] = record['id']
+    result['created'] += len(created)
+
+
+def _apply_updates(
+    api: Api,
+    writer: BatchWriter,
+    entry: dict[str, Any],
+    id_map: dict[str, str],
+    result: dict[str, int]
+) -> None:
+    """테이블 1개의 수정 적용"""
+    table = get_table(api, entry['table'])
+    records = []
+    for record in entry['updates']:
+        record_id = id_map.get(record['id']) if is_pending_id(record['id']) else record['id']
+        fields = _resolve_fields(record['fields'], id_map)
+        if record_id is None or fields is None:
+            result['skipped'] += 1
+        else:
+            records.append({'id': record_id, 'fields': fields})
+
+    try:
+        result['updated'] += len(writer.update(table, records))
+    except BatchWriteError as e:
+        logger.error(f"  {entry['table']} 수정 실패: {len(e.failed_records)}개 - {e}")
+        result['updated'] += len(e.records)
+        result['failed'] += len(e.failed_records)
+
+
+def apply_plan(api: Api, plan: dict[str, Any], writer: BatchWriter | None = None) -> dict[str, dict[str, int]]:
+    """계획 적용
+
+    생성에 실패한 레코드를 참조하는 레코드(Linked Record 또는 수정 대상)는 건너뛰고 skipped로 셉니다.
+    같은 계획을 다시 적용하면 이미 생성된 레코드는 고유 키로 찾아 다시 만들지 않습니다.
+
+    Args:
+        api: Airtable API 클라이언트
+        plan: load_plan() 결과
+        writer: 배치 쓰기 (없으면 설정 기본값으로 생성)
+
+    Returns:
+        테이블명 -> {'created', 'existing', 'updated', 'skipped', 'failed'}
+    """
+    writer = writer or BatchWriter()
+    id_map: dict[str, str] = {}
+    results = {
+        entry['table']: {'created': 0, 'existing': 0, 'updated': 0, 'skipped': 0, 'failed': 0}
+        for entry in plan['tables']
+    }
+
+    for entry in plan['tables']:
+        if entry['creates']:
+            _apply_creates(api, writer, entry, id_map, results[entry['table']])
+    for entry in plan['tables']:
+        if entry['updates']:
+            _apply_updates(api, writer, entry, id_map, results[entry['table']])
+
+    for table_name, result in results.items():
+        logger.info(
+            f"  - {table_name}: 생성 {result['created']}개 (이미 있음 {result['existing']}개), "
+            f"수정 {result['updated']}개, 건너뜀 {result['skipped']}개, 실패 {result['failed']}개"
+        )
+    return results
@@ -0,0 +1,124 @@
+"""격리 파일 (값 오류로 거부된 레코드)
+
+배치 쓰기가 레코드 값 때문에 거부되면(422, 예: Single Select에 없는 'Refund Status' 옵션)
+BatchWriter가 배치를 반으로 나누어 다시 보내 문제 레코드만 남기고 나머지는 반영합니다.
+끝까지 거부된 레코드는 오류와 함께 로컬 파일(.airtable_quarantine.jsonl)에 한 줄씩 기록합니다.
+
+- 다음 전체 동기화는 CSV를 다시 대조하므로 격리된 레코드도 다시 처리 (실행 시작 시 이전 파일은 버림)
+- `python -m src.main --retry-quarantine`: Airtable을 고친 뒤(옵션 추가 등) 격리된 레코드만 다시 전송
+- 실행이 끝날 때 격리된 레코드가 없으면 파일 삭제
+
+파일 형식 (한 줄에 레코드 하나, 쓰기 저널의 plan 항목과 같은 키):
+    {"table": "Refunds", "op": "create", "key_field": "Order Number", "key_fields": null,
+     "records": [{...}], "error": "422 Client Error: ... INVALID_MULTIPLE_CHOICE_OPTIONS ..."}
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+from ..logger import logger
+
+from .journal import natural_key
+
+
+def is_record_error(error: Exception) -> bool:
+    """레코드 값 때문에 거부된 요청인지 확인 (422, 같은 값을 다시 보내도 실패)"""
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) == 422
+
+
+class Quarantine:
+    """append-only 격리 레코드 파일 (스레드 안전)"""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Args:
+            path: 격리 파일 경로 (있으면 이어서 기록)
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def begin(cls, path: Path) -> 'Quarantine':
+        """새 동기화 실행용 격리 파일 시작 (이전 파일은 버림)
+
+        새 실행은 CSV 전체를 다시 대조하므로 이전 실행에서 격리된 레코드도 다시 보냅니다.
+
+        Args:
+            path: 격리 파일 경로
+
+        Returns:
+            빈 격리 파일
+        """
+        previous = cls(path)
+        entries = previous.entries()
+        if entries:
+            logger.info(f"이전 실행의 격리 레코드 {len(entries)}개: 이번 동기화가 다시 처리합니다")
+        previous.discard()
+        return cls(path)
+
+    def add(
+        self,
+        table_name: str,
+        op: str,
+        records: list[dict[str, Any]],
+        error: Exception | str,
+        key_fields: list[str] | None = None
+    ) -> None:
+        """거부된 레코드 기록 (레코드마다 한 줄)
+
+        Args:
+            table_name: Airtable 테이블명
+            op: 'create' | 'update' | 'upsert'
+            records: 거부된 레코드 리스트
+            error: 거부 오류
+            key_fields: 업서트 매칭 필드 (op='upsert')
+        """
+        key_field = natural_key(table_name)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for record in records:
+                    entry = {
+                        'table': table_name,
+                        'op': op,
+                        'key_field': key_field,
+                        'key_fields': key_fields,
+                        'records': [record],
+                        'error': str(error),
+                    }
+                    f.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+
+    def entries(self) -> list[dict[str, Any]]:
+        """격리된 레코드 전체 (기록 순서, 잘린 마지막 줄은 무시)"""
+        if not self.path.exists():
+            return []
+        entries = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        return entries
+
+    def discard(self) -> None:
+        """격리 파일 삭제"""
+        self.path.unlink(missing_ok=True)
+
+    def close(self) -> int:
+        """실행 종료 처리 (격리된 레코드가 없으면 파일 삭제)
+
+        Returns:
+            격리된 레코드 수
+        """
+        entries = self.entries()
+        if entries:
+            logger.warning(
+                f"값 오류로 거부된 레코드 {len(entries)}개를 {self.path.name}에 격리했습니다: "
+                f"Airtable을 고친 뒤 python -m src.main --retry-quarantine 으로 다시 보낼 수 있습니다"
+            )
+        else:
+            self.discard()
+        return len(entries)
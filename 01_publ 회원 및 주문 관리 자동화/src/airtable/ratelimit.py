@@ -0,0 +1,348 @@
+"""Airtable API 호출 속도 제한
+
+Airtable은 Base당 초당 5회 요청으로 제한하고, 넘으면 429를 반환합니다.
+여러 스레드가 같은 Base를 동시에 조회/수정할 때도 이 한도를 넘지 않도록
+모든 요청이 하나의 토큰 버킷을 거치게 합니다.
+
+- RateLimitedApi: 고정 속도 토큰 버킷
+- ThrottledApi: 429/5xx 재시도(지수 백오프 + 지터), 속도 자동 감소/회복, 요청 통계
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable
+
+import requests
+from pyairtable import Api
+
+
+class RateLimiter:
+    """스레드 안전 토큰 버킷
+
+    초당 rate개의 토큰이 채워지고, 최대 burst개까지 쌓입니다.
+    acquire()는 자기 차례의 토큰이 생길 때까지 대기합니다.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> None:
+        """
+        Args:
+            rate: 초당 허용 요청 수
+            burst: 한 번에 허용할 최대 요청 수 (기본값: rate)
+            clock: 현재 시각 함수 (테스트용)
+            sleep: 대기 함수 (테스트용)
+        """
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """토큰 1개 사용 (없으면 대기)
+
+        토큰이 부족하면 먼저 예약(음수 잔고)하고 채워질 때까지 대기하므로
+        동시에 들어온 요청도 도착 순서대로 1/rate초 간격으로 통과합니다.
+
+        Returns:
+            대기한 시간 (초)
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            delay = max(0.0, -self._tokens / self.rate)
+        if delay > 0:
+            self._sleep(delay)
+        return delay
+
+
+class RateLimitedApi(Api):
+    """모든 요청 전에 RateLimiter 토큰을 받는 Airtable API 클라이언트
+
+    같은 인스턴스를 공유하는 모든 스레드의 요청이 하나의 한도를 나눠 씁니다.
+    """
+
+    def __init__(self, api_key: str, requests_per_second: float = 5, **kwargs: Any) -> None:
+        """
+        Args:
+            api_key: Airtable API 키
+            requests_per_second: 초당 허용 요청 수
+            **kwargs: pyairtable.Api 옵션
+        """
+        super().__init__(api_key, **kwargs)
+        self.limiter = RateLimiter(requests_per_second)
+        self._local = threading.local()
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> Any:
+        # URL이 길면 Api.request가 POST로 바꿔 self.request를 다시 호출하므로
+        # 바깥 호출에서만 토큰을 받음 (HTTP 요청 1회 = 토큰 1개)
+        if getattr(self._local, 'in_request', False):
+            return super().request(method, url, *args, **kwargs)
+
+        self._local.in_request = True
+        try:
+            self.limiter.acquire()
+            return super().request(method, url, *args, **kwargs)
+        finally:
+            self._local.in_request = False
+
+
+# 재시도 대상 HTTP 상태 코드 (429: 요청 한도 초과, 5xx: 일시적 서버 오류)
+THROTTLED_STATUS = 429
+SERVER_ERROR_STATUSES = frozenset({500, 502, 503, 504})
+
+# 5xx를 재시도해도 중복 쓰기가 생기지 않는 메서드 (POST는 listRecords 조회만 재시도)
+IDEMPOTENT_METHODS = frozenset({'GET', 'PATCH', 'PUT', 'DELETE'})
+
+# 지연 시간 이동 평균이 최저 지연의 이 배수를 넘으면 속도를 올리지 않음
+LATENCY_SLOWDOWN = 2.0
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """응답에 따라 속도를 조절하는 토큰 버킷
+
+    - 429/5xx: 속도를 절반으로 낮추고(최저 min_rate) 쌓인 토큰을 비움
+      (동시에 실패한 요청들이 연달아 낮추지 않도록 1초에 한 번만)
+    - 성공: 지연 시간이 평소 수준이면 요청마다 ramp_step씩 max_rate까지 회복
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float = 1.0,
+        ramp_step: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> None:
+        """
+        Args:
+            rate: 최대 초당 요청 수 (시작 속도)
+            min_rate: 낮출 수 있는 최저 초당 요청 수
+            ramp_step: 성공 응답 1건마다 올리는 초당 요청 수
+            clock: 현재 시각 함수 (테스트용)
+            sleep: 대기 함수 (테스트용)
+        """
+        super().__init__(rate, clock=clock, sleep=sleep)
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.ramp_step = ramp_step
+        self.lowest_rate = rate
+        self.latency: float | None = None
+        self.best_latency: float | None = None
+        self._slowed_at: float | None = None
+
+    def on_success(self, latency: float) -> None:
+        """성공 응답 반영 (지연 시간 기록, 속도 회복)
+
+        Args:
+            latency: 요청 지연 시간 (초)
+        """
+        with self._lock:
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            self.best_latency = latency if self.best_latency is None else min(self.best_latency, latency)
+            if self.rate >= self.max_rate or self.latency > LATENCY_SLOWDOWN * self.best_latency:
+                return
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.ramp_step)
+
+    def on_throttled(self) -> None:
+        """429/5xx 응답 반영 (속도 감소)"""
+        with self._lock:
+            now = self._clock()
+            if self._slowed_at is not None and now - self._slowed_at < 1.0:
+                return
+            self._slowed_at = now
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.lowest_rate = min(self.lowest_rate, self.rate)
+            self._tokens = min(self._tokens, 0.0)
+
+
+class ThrottleStats:
+    """ThrottledApi 요청 카운터 (스레드 안전)"""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self.failed = 0
+        self.waited = 0.0
+        self.backoff = 0.0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.first_at: float | None = None
+        self.last_at: float | None = None
+        self._lock = threading.Lock()
+
+    def record(self, started: float, finished: float, waited: float, status: int | None = None) -> None:
+        """HTTP 요청 1회 기록
+
+        Args:
+            started: 요청 시작 시각 (토큰 대기 후)
+            finished: 응답 수신 시각
+            waited: 토큰 대기 시간 (초)
+            status: 실패 응답의 HTTP 상태 코드 (성공이면 None)
+        """
+        latency = finished - started
+        with self._lock:
+            self.requests += 1
+            self.waited += waited
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            self.first_at = started if self.first_at is None else min(self.first_at, started)
+            self.last_at = finished if self.last_at is None else max(self.last_at, finished)
+            if status == THROTTLED_STATUS:
+                self.throttled += 1
+            elif status in SERVER_ERROR_STATUSES:
+                self.server_errors += 1
+
+    def record_retry(self, delay: float) -> None:
+        with self._lock:
+            self.retries += 1
+            self.backoff += delay
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failed += 1
+
+
+class ThrottledApi(RateLimitedApi):
+    """429/5xx에 적응하는 Airtable API 클라이언트
+
+    RateLimitedApi처럼 모든 요청이 하나의 토큰 버킷을 거치고, 추가로
+    - 429/5xx 응답은 지터(jitter)를 준 지수 백오프 후 재시도 (재시도도 토큰 1개)
+    - 응답 결과와 지연 시간으로 AdaptiveRateLimiter의 속도를 낮추고 다시 올림
+    - stats(): 요청 수, 429/5xx 횟수, 재시도, 대기 시간, 최저 속도, 한도 대비 사용률
+
+    pyairtable 기본 재시도(urllib3 Retry)는 토큰 없이 429를 재시도하므로 끕니다.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        requests_per_second: float = 5,
+        min_requests_per_second: float = 1.0,
+        ramp_step: float = 0.05,
+        max_retries: int = 5,
+        backoff_seconds: float = 1.0,
+        backoff_max_seconds: float = 30.0,
+        **kwargs: Any
+    ) -> None:
+        """
+        Args:
+            api_key: Airtable API 키
+            requests_per_second: 최대 초당 요청 수
+            min_requests_per_second: 429/5xx 후 낮출 수 있는 최저 초당 요청 수
+            ramp_step: 성공 응답 1건마다 회복하는 초당 요청 수
+            max_retries: 요청당 최대 재시도 횟수
+            backoff_seconds: 첫 재시도 대기 시간 (재시도마다 2배)
+            backoff_max_seconds: 재시도 대기 시간 상한
+            **kwargs: pyairtable.Api 옵션
+        """
+        kwargs.setdefault('retry_strategy', None)
+        super().__init__(api_key, requests_per_second, **kwargs)
+        self.limiter = AdaptiveRateLimiter(requests_per_second, min_requests_per_second, ramp_step)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.throttle_stats = ThrottleStats()
+        self._clock: Callable[[], float] = time.monotonic
+        self._sleep: Callable[[float], None] = time.sleep
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> Any:
+        # GET -> POST 폴백으로 다시 들어온 호출은 바깥 재시도 루프가 처리
+        if getattr(self._local, 'in_request', False):
+            return Api.request(self, method, url, *args, **kwargs)
+
+        self._local.in_request = True
+        try:
+            return self._request_with_retry(method, url, args, kwargs)
+        finally:
+            self._local.in_request = False
+
+    def _request_with_retry(self, method: str, url: str, args: tuple, kwargs: dict[str, Any]) -> Any:
+        attempt = 0
+        while True:
+            waited = self.limiter.acquire()
+            started = self._clock()
+            try:
+                result = Api.request(self, method, url, *args, **kwargs)
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                self.throttle_stats.record(started, self._clock(), waited, status)
+                if not self._retryable(method, url, status) or attempt >= self.max_retries:
+                    self.throttle_stats.record_failure()
+                    raise
+                self.limiter.on_throttled()
+                delay = self._backoff(attempt, e.response)
+                self.throttle_stats.record_retry(delay)
+                self._sleep(delay)
+                attempt += 1
+                continue
+
+            finished = self._clock()
+            self.throttle_stats.record(started, finished, waited)
+            self.limiter.on_success(finished - started)
+            return result
+
+    @staticmethod
+    def _retryable(method: str, url: str, status: int | None) -> bool:
+        if status == THROTTLED_STATUS:
+            return True
+        if status in SERVER_ERROR_STATUSES:
+            return method.upper() in IDEMPOTENT_METHODS or url.endswith('/listRecords')
+        return False
+
+    def _backoff(self, attempt: int, response: requests.Response | None) -> float:
+        """재시도 대기 시간 (상한의 절반 + 무작위 지터, Retry-After 헤더 우선)"""
+        cap = min(self.backoff_max_seconds, self.backoff_seconds * 2 ** attempt)
+        delay = cap / 2 + random.uniform(0, cap / 2)
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return delay
+
+    def stats(self) -> dict[str, Any]:
+        """요청 통계
+
+        Returns:
+            requests, retries, throttled(429), server_errors(5xx), failed(재시도 후 실패),
+            waited/backoff(초), latency_avg/latency_max(초), rate/lowest_rate/max_rate(초당 요청),
+            elapsed(첫 요청 ~ 마지막 응답, 초), utilization(실제 초당 요청 / max_rate)
+        """
+        s = self.throttle_stats
+        with s._lock:
+            elapsed = (s.last_at - s.first_at) if s.first_at is not None else 0.0
+            return {
+                'requests': s.requests,
+                'retries': s.retries,
+                'throttled': s.throttled,
+                'server_errors': s.server_errors,
+                'failed': s.failed,
+                'waited': s.waited,
+                'backoff': s.backoff,
+                'latency_avg': s.latency_total / s.requests if s.requests else 0.0,
+                'latency_max': s.latency_max,
+                'rate': self.limiter.rate,
+                'lowest_rate': self.limiter.lowest_rate,
+                'max_rate': self.limiter.max_rate,
+                'elapsed': elapsed,
+                'utilization': s.requests / elapsed / self.limiter.max_rate if elapsed > 0 else 0.0,
+            }
@@ -3,69 +3,725 @@
 기존 레코드 조회 및 매핑 기능을 제공합니다.
 """
 
-from typing import Any
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Iterator
 
 from pyairtable import Table
 
+from .. import config
+from ..logger import logger
+from ..utils import batch_iterator
 
-def get_existing_by_key(table: Table, key_field: str) -> dict[str, str]:
+from .compact import CompactTable, KeyIndex
+from .content_hash import SYNC_HASH_FIELD
+from .formulas import Predicate, And, In, NotEmpty, NotIn
+from .incremental import IncrementalWindow
+from .journal import WriteJournal
+from .quarantine import Quarantine
+from .schema import SchemaCache
+from .mutations import MutationQueue, is_pending_id
+from .writer import BatchWriteError, BatchWriter
+
+# 더 이상 상태가 바뀌지 않는 환불 상태
+FINAL_REFUND_STATUSES = ['Refunded', 'Rejected']
+
+# 처리 중인(미결정) 환불: 주문번호가 있고 최종 상태가 아닌 환불
+PENDING_REFUND = And(NotEmpty('Order Number'), NotIn('Refund Status', FINAL_REFUND_STATUSES))
+
+# 키 목록 조회 시 formula 1개에 넣는 최대 키 수 (URL 길이 제한 대비)
+KEYS_PER_FORMULA = 100
+
+
+# 변경 감지용 해시 필드 (config.SYNC_DETECT_CHANGES가 꺼져 있으면 조회하지 않음)
+_HASH_FIELDS: list[str] = [SYNC_HASH_FIELD] if config.SYNC_DETECT_CHANGES else []
+
+# 동기화 파이프라인 전체 단계가 읽는 테이블별 필드 (config.AIRTABLE_TABLES 키 기준)
+# 스냅샷은 이 필드만 조회하여 응답 크기를 줄입니다.
+SYNC_FIELDS: dict[str, list[str]] = {
+    'members': ['Member Code', *_HASH_FIELDS],
+    'orders': ['Order Number', 'Member Code', 'Product name', 'MemberProducts', *_HASH_FIELDS],
+    'refunds': ['Order Number', 'Refund Status', 'Orders'],
+    'products': ['Product Code'],
+    'member_products': ['MemberProducts Code'],
+}
+
+
+def iter_records(table: Table, **options: Any) -> Iterator[dict[str, Any]]:
+    """테이블 레코드를 페이지 단위로 받아 하나씩 반환
+
+    table.all()과 달리 전체 리스트를 만들지 않으므로
+    메모리에는 현재 페이지(최대 100개)만 유지됩니다.
+
+    Args:
+        table: Airtable 테이블 객체
+        **options: table.iterate() 옵션 (fields, formula 등)
+
+    Yields:
+        레코드 {id, fields, createdTime}
+    """
+    for page in table.iterate(**options):
+        yield from page
+
+
+class RecordCache:
+    """테이블별 로컬 레코드 캐시 (증분 조회용)
+
+    테이블마다 마지막 조회 시각(워터마크)과 레코드를 JSON 파일로 보관합니다.
+    다음 조회에서는 LAST_MODIFIED_TIME()이 워터마크 이후인 레코드만 받아 병합합니다.
+    삭제된 레코드와 Formula / Rollup / Lookup 필드 변경은 증분 조회로 알 수 없으므로
+    reconcile_hours마다 전체 조회하여 캐시를 교체합니다 (IncrementalWindow 참고).
+
+    캐시 파일 형식:
+        {
+            "fields": [...] | null,      # 캐시된 필드 (null이면 전체 필드)
+            "watermark": "...Z",         # 다음 증분 조회 기준 시각 (UTC)
+            "reconciled_at": "...Z",     # 마지막 전체 조회 시각 (UTC)
+            "records": {record_id: record}
+        }
+    """
+
+    def __init__(self, cache_dir: Path, reconcile_hours: float = 24) -> None:
+        """
+        Args:
+            cache_dir: 캐시 파일 디렉토리
+            reconcile_hours: 전체 조회 주기 (시간)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.reconcile_interval = timedelta(hours=reconcile_hours)
+
+    def _path(self, table: Table) -> Path:
+        return self.cache_dir / f"{table.name}.json"
+
+    def _read(self, table: Table) -> dict[str, Any] | None:
+        path = self._path(table)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, table: Table, state: dict[str, Any]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(table)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        tmp_path.replace(path)
+
+    def invalidate(self, table: Table) -> None:
+        """테이블 캐시 삭제 (다음 조회는 전체 조회)"""
+        self._path(table).unlink(missing_ok=True)
+
+    def fetch(self, table: Table, fields: list[str] | None) -> dict[str, dict[str, Any]]:
+        """캐시 + 증분 조회로 테이블 레코드 반환
+
+        캐시가 없거나, 캐시된 필드가 요청 필드를 포함하지 않거나,
+        reconcile_hours가 지났으면 전체 조회합니다. 증분 조회는 항상 캐시된 필드 전체로
+        요청하므로, 요청 필드가 캐시 필드의 일부여도 변경된 레코드에서 다른 캐시 필드가
+        사라지지 않습니다.
+
+        Args:
+            table: Airtable 테이블 객체
+            fields: 필요한 필드 목록 (None이면 전체 필드)
+
+        Returns:
+            record_id -> record 딕셔너리 (레코드에는 요청 필드 이상의 캐시 필드가 포함될 수 있음)
+        """
+        state = self._read(table)
+        if state is None or not self._covers(state, fields):
+            state = {'fields': None if fields is None else sorted(fields)}
+
+        window = IncrementalWindow(
+            state.get('watermark'), state.get('reconciled_at'), self.reconcile_interval
+        )
+        # 항상 캐시된 필드 전체로 조회 (요청 필드만 조회하면 병합 시 나머지 필드가 사라짐)
+        options = {} if state['fields'] is None else {'fields': state['fields']}
+        if window.full_refresh:
+            state['records'] = {record['id']: record for record in iter_records(table, **options)}
+        else:
+            for record in iter_records(table, formula=window.delta_formula(), **options):
+                state['records'][record['id']] = record
+
+        state.update(window.next_state())
+        self._write(table, state)
+        return state['records']
+
+    @staticmethod
+    def _covers(state: dict[str, Any], fields: list[str] | None) -> bool:
+        cached_fields = state.get('fields')
+        if cached_fields is None:
+            return 'watermark' in state
+        return fields is not None and set(fields) <= set(cached_fields) and 'watermark' in state
+
+
+class TableSnapshot:
+    """동기화 1회 실행 동안 공유하는 테이블 스냅샷
+
+    각 테이블은 처음 요청될 때 한 번만 조회하고, 이후 조회는 메모리에서 처리합니다.
+    batch_create/batch_update는 BatchWriter로 10개씩 동시에 보내고, 결과를 스냅샷에
+    바로 반영하므로 다음 단계는 재조회 없이 최신 데이터를 볼 수 있습니다.
+
+    조회 시 필요한 필드만 요청합니다 (field projection). 이미 적재된 필드로
+    충족되지 않는 요청이 오면 필드 합집합으로 한 번 더 조회합니다.
+
+    retain=False이면 테이블을 적재하지 않고 매 조회마다 페이지를 스트리밍합니다.
+    한 번만 읽는 단독 실행 함수는 이 모드로 메모리를 1페이지 + 결과 인덱스로 제한합니다.
+    동기화 파이프라인(for_sync)은 여러 단계가 같은 테이블을 다시 읽으므로
+    프로젝션된 필드로 테이블 전체를 적재합니다 (RecordCache 사용 시 JSON 캐시도 동일).
+    적재된 테이블은 CompactTable(열 단위 보관)로 유지하고, 조회할 때 레코드 딕셔너리를 만듭니다.
+
+    queue(MutationQueue)가 있으면 batch_update와 batch_create(defer=True)는 바로 보내지 않고
+    레코드 ID별로 병합해 두었다가 flush()에서 한 번에 보냅니다. 대기 중인 값은 스냅샷에
+    바로 반영되므로 다음 단계는 이미 예약된 수정을 다시 만들지 않습니다.
+
+    planning=True(for_plan)이면 API에 쓰지 않습니다. 모든 생성은 임시 ID로 대기열에만 기록하고
+    (다음 단계는 임시 ID를 Linked Record로 사용), 업서트는 스냅샷의 키로 생성/수정을 나눠 기록합니다.
+
+    Example:
+        >>> snapshot = TableSnapshot()
+        >>> members = snapshot.records(members_table, ['Member Code'])  # API 조회
+        >>> members = snapshot.records(members_table, ['Member Code'])  # 메모리 조회
+        >>> snapshot.batch_create(members_table, new_records)  # 생성 + 스냅샷 반영
+    """
+
+    def __init__(
+        self,
+        field_hints: dict[str, list[str]] | None = None,
+        cache: RecordCache | None = None,
+        retain: bool = True,
+        writer: BatchWriter | None = None,
+        queue: MutationQueue | None = None
+    ) -> None:
+        """
+        Args:
+            field_hints: 테이블명 -> 미리 함께 조회할 필드 목록
+                (이후 단계에서 필요한 필드를 첫 조회에 포함시켜 재조회 방지)
+            cache: 증분 조회용 로컬 캐시 (없으면 매번 전체 조회)
+            retain: False면 조회 결과를 적재하지 않고 스트리밍 (seed된 테이블은 메모리 사용)
+            writer: 배치 쓰기 (없으면 설정 기본값으로 생성)
+            queue: 쓰기 대기열 (없으면 수정을 바로 전송)
+        """
+        # table_name -> 적재된 레코드 (열 단위 보관)
+        self._tables: dict[str, CompactTable] = {}
+        # table_name -> 적재된 필드 집합 (None이면 전체 필드)
+        self._fields: dict[str, set[str] | None] = {}
+        self._field_hints = field_hints or {}
+        self._cache = cache
+        self._retain = retain
+        self._writer = writer or BatchWriter()
+        self.queue = queue
+        self.planning = False
+
+    @classmethod
+    def for_sync(
+        cls,
+        journal: WriteJournal | None = None,
+        quarantine: Quarantine | None = None,
+        schema: SchemaCache | None = None
+    ) -> 'TableSnapshot':
+        """동기화 파이프라인 전체 단계가 쓰는 필드를 미리 선언한 스냅샷 생성
+
+        config.AIRTABLE_CACHE_ENABLED이면 증분 조회 캐시를 사용합니다.
+        수정은 쓰기 대기열에 모았다가 실행 끝의 flush()에서 보냅니다.
+
+        Args:
+            journal: 배치 쓰기를 기록할 저널 (없으면 기록하지 않음)
+            quarantine: 값 오류로 거부된 레코드를 기록할 격리 파일 (없으면 기록하지 않음)
+            schema: 새 Single Select 옵션 확인용 스키마 캐시 (없으면 확인하지 않음)
+
+        Returns:
+            SYNC_FIELDS와 config.REQUIRED_FIELDS를 합친 필드 힌트를 가진 스냅샷
+        """
+        hints: dict[str, list[str]] = {}
+        for table_key, fields in SYNC_FIELDS.items():
+            required = list(config.REQUIRED_FIELDS.get(table_key, {}))
+            hints[config.AIRTABLE_TABLES[table_key]] = fields + required
+
+        cache = None
+        if config.AIRTABLE_CACHE_ENABLED:
+            cache = RecordCache(config.CACHE_DIR, config.AIRTABLE_CACHE_RECONCILE_HOURS)
+        writer = BatchWriter(journal=journal, quarantine=quarantine, schema=schema)
+        return cls(hints, cache, writer=writer, queue=MutationQueue())
+
+    @classmethod
+    def for_plan(cls) -> 'TableSnapshot':
+        """계획(plan) 전용 스냅샷 생성 (조회는 for_sync와 같고, 쓰기는 대기열에만 기록)
+
+        Returns:
+            planning=True이고 임시 ID 참조를 허용하는 대기열을 가진 스냅샷
+        """
+        snapshot = cls.for_sync()
+        snapshot.queue = MutationQueue(allow_pending_links=True)
+        snapshot.planning = True
+        return snapshot
+
+    def prefetch(self, tables: list[Table], max_workers: int = 5) -> dict[str, float]:
+        """여러 테이블을 동시에 적재 (필드 힌트 기준)
+
+        테이블별 조회는 스레드 풀에서 병렬로 실행되며, 요청 속도는
+        API 클라이언트의 RateLimiter가 제한합니다. 실패한 테이블은 적재하지 않고
+        건너뛰므로 해당 단계에서 다시 조회합니다.
+
+        Args:
+            tables: 적재할 테이블 목록
+            max_workers: 동시 조회 스레드 수
+
+        Returns:
+            적재에 성공한 테이블명 -> 소요 시간 (초)
+        """
+        def load(table: Table) -> float:
+            started = time.perf_counter()
+            self._load(table, self._field_hints.get(table.name) or None)
+            return time.perf_counter() - started
+
+        pending = [table for table in tables if not self.is_loaded(table)]
+        durations: dict[str, float] = {}
+        if not pending:
+            return durations
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(load, table): table for table in pending}
+            for future in as_completed(futures):
+                table = futures[future]
+                try:
+                    durations[table.name] = future.result()
+                except Exception as e:
+                    logger.warning(f"{table.name} 사전 조회 실패 (단계에서 다시 조회): {e}")
+        return durations
+
+    def is_loaded(self, table: Table) -> bool:
+        """테이블이 이미 스냅샷에 적재되었는지 확인"""
+        return table.name in self._tables
+
+    def loaded_count(self, table: Table) -> int | None:
+        """적재된 레코드 수 (적재 전이면 None)"""
+        cached = self._tables.get(table.name)
+        return len(cached) if cached is not None else None
+
+    def seed(self, table_name: str, records: list[dict[str, Any]]) -> None:
+        """외부에서 받은 전체 필드 레코드로 테이블 적재 (API 조회 없음)
+
+        Args:
+            table_name: Airtable 테이블 이름
+            records: 레코드 리스트 [{id, fields, ...}]
+        """
+        self._tables[table_name] = CompactTable(records)
+        self._fields[table_name] = None
+
+    def _covers(self, table: Table, fields: list[str] | None) -> bool:
+        """적재된 필드가 요청 필드를 모두 포함하는지 확인"""
+        if table.name not in self._tables:
+            return False
+        loaded = self._fields.get(table.name)
+        if loaded is None:
+            return True
+        return fields is not None and set(fields) <= loaded
+
+    def records(self, table: Table, fields: list[str] | None = None) -> list[dict[str, Any]]:
+        """테이블 레코드 조회 (필요한 필드가 적재되지 않았을 때만 API 호출)
+
+        Args:
+            table: Airtable 테이블 객체
+            fields: 필요한 필드 목록 (None이면 전체 필드)
+
+        Returns:
+            레코드 리스트 [{id, fields, ...}]
+        """
+        return list(self.iter_records(table, fields))
+
+    def iter_records(
+        self,
+        table: Table,
+        fields: list[str] | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """테이블 레코드를 하나씩 반환
+
+        retain=False이고 적재되지 않은 테이블은 페이지 단위로 스트리밍합니다.
+        적재된 테이블은 복사 없이 스냅샷을 직접 순회합니다 (레코드 딕셔너리는 순회할 때 생성).
+
+        Args:
+            table: Airtable 테이블 객체
+            fields: 필요한 필드 목록 (None이면 전체 필드)
+
+        Yields:
+            레코드 {id, fields, ...}
+        """
+        if not self._covers(table, fields):
+            if not self._retain:
+                options = {} if fields is None else {'fields': sorted(fields)}
+                yield from iter_records(table, **options)
+                return
+            self._load(table, fields)
+        yield from self._tables[table.name]
+
+    def key_index(self, table: Table, key_field: str) -> KeyIndex:
+        """고유 키 <-> 레코드 ID 인덱스
+
+        적재된 테이블은 레코드 딕셔너리를 만들지 않고 키 열에서 바로 만듭니다.
+
+        Args:
+            table: Airtable 테이블 객체
+            key_field: 고유 키 필드명
+
+        Returns:
+            키 <-> 레코드 ID 양방향 인덱스
+        """
+        if self._covers(table, [key_field]) or self._retain:
+            if not self._covers(table, [key_field]):
+                self._load(table, [key_field])
+            return self._tables[table.name].key_index(key_field)
+
+        index = KeyIndex()
+        for record in iter_records(table, fields=[key_field]):
+            index.add(record['id'], record['fields'].get(key_field))
+        return index
+
+    def _load(self, table: Table, fields: list[str] | None) -> None:
+        """요청 필드 + 기존 적재 필드 + 힌트 필드로 테이블 조회"""
+        if fields is None or (table.name in self._fields and self._fields[table.name] is None):
+            wanted = None
+        else:
+            wanted = set(fields) | self._fields.get(table.name, set())
+            wanted |= set(self._field_hints.get(table.name, []))
+
+        if self._cache is not None:
+            records = self._cache.fetch(table, sorted(wanted) if wanted is not None else None)
+            self._tables[table.name] = CompactTable(records.values())
+        else:
+            options = {} if wanted is None else {'fields': sorted(wanted)}
+            self._tables[table.name] = CompactTable(iter_records(table, **options))
+        self._fields[table.name] = wanted
+
+    def select(
+        self,
+        table: Table,
+        where: Predicate,
+        fields: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """조건에 맞는 레코드만 조회
+
+        테이블이 이미 적재되어 있으면 메모리에서 필터링하고,
+        아니면 filterByFormula로 서버에서 필터링한 결과만 받습니다.
+        서버 필터 결과는 일부 레코드이므로 스냅샷에 적재하지 않습니다.
+
+        Args:
+            table: Airtable 테이블 객체
+            where: 필터 조건
+            fields: 결과에 필요한 필드 목록 (조건 필드는 자동 포함)
+
+        Returns:
+            조건에 맞는 레코드 리스트
+        """
+        return list(self.iter_select(table, where, fields))
+
+    def iter_select(
+        self,
+        table: Table,
+        where: Predicate,
+        fields: list[str] | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """조건에 맞는 레코드를 하나씩 반환 (select의 스트리밍 버전)
+
+        Args:
+            table: Airtable 테이블 객체
+            where: 필터 조건
+            fields: 결과에 필요한 필드 목록 (조건 필드는 자동 포함)
+
+        Yields:
+            조건에 맞는 레코드
+        """
+        wanted = sorted(set(fields or []) | where.fields)
+        if self._covers(table, wanted):
+            candidates = iter(self._tables[table.name])
+        else:
+            candidates = iter_records(table, formula=where.to_formula(), fields=wanted)
+        # 서버 필터 결과도 같은 조건으로 한 번 더 확인 (formula와 Python 평가 차이 방지)
+        for record in candidates:
+            if where.matches(record['fields']):
+                yield record
+
+    def refresh(
+        self,
+        table: Table,
+        fields: list[str] | None = None,
+        from_server: bool = False
+    ) -> list[dict[str, Any]]:
+        """테이블을 다시 조회하여 스냅샷 갱신
+
+        Args:
+            table: Airtable 테이블 객체
+            fields: 필요한 필드 목록 (None이면 기존 적재 필드 유지)
+            from_server: True면 증분 조회 캐시를 비우고 서버에서 전체 재조회
+                (캐시는 reconcile_hours 전까지 삭제된 레코드를 포함할 수 있음)
+
+        Returns:
+            갱신된 레코드 리스트
+        """
+        if from_server and self._cache is not None:
+            self._cache.invalidate(table)
+        self._tables.pop(table.name, None)
+        if fields is None and table.name in self._fields:
+            loaded = self._fields.pop(table.name)
+            fields = sorted(loaded) if loaded is not None else None
+        return self.records(table, fields)
+
+    def apply(self, table: Table, records: list[dict[str, Any]]) -> None:
+        """생성/수정된 레코드를 스냅샷에 반영
+
+        아직 적재되지 않은 테이블은 무시합니다 (다음 조회 시 최신 상태로 적재됨).
+
+        Args:
+            table: Airtable 테이블 객체
+            records: batch_create/batch_update가 반환한 레코드 리스트
+        """
+        cached = self._tables.get(table.name)
+        if cached is None:
+            return
+        for record in records:
+            cached.put(record)
+
+    def batch_create(
+        self,
+        table: Table,
+        records: list[dict[str, Any]],
+        defer: bool = False
+    ) -> list[dict[str, Any]]:
+        """레코드 생성 후 스냅샷에 반영
+
+        Args:
+            table: Airtable 테이블 객체
+            records: 생성할 필드 딕셔너리 리스트 (개수 제한 없음, 10개씩 나누어 전송)
+            defer: True이고 쓰기 대기열이 있으면 flush()까지 생성을 미룸
+                (이후 단계가 생성된 레코드 ID를 Linked Record로 쓰지 않는 경우만,
+                계획 모드는 항상 미룸)
+
+        Returns:
+            생성된 레코드 리스트 (입력 순서, 생성을 미룬 경우 임시 ID 레코드)
+
+        Raises:
+            BatchWriteError: 일부 배치 실패 (성공한 레코드는 스냅샷에 반영됨)
+        """
+        if (defer or self.planning) and self.queue is not None:
+            pending = self.queue.create(table, records)
+            self.apply(table, pending)
+            return pending
+        try:
+            created = self._writer.create(table, records)
+        except BatchWriteError as e:
+            self.apply(table, e.records)
+            raise
+        self.apply(table, created)
+        return created
+
+    def batch_update(self, table: Table, records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """레코드 수정 후 스냅샷에 반영
+
+        쓰기 대기열이 있으면 바로 보내지 않고 대기열에 병합한 뒤 수정 필드만 스냅샷에 반영합니다.
+
+        Args:
+            table: Airtable 테이블 객체
+            records: 수정할 레코드 리스트 [{id, fields}] (개수 제한 없음, 10개씩 나누어 전송)
+
+        Returns:
+            수정된 레코드 리스트 (입력 순서, 대기열 사용 시 [{id, fields}] 수정 필드만)
+
+        Raises:
+            BatchWriteError: 일부 배치 실패 (성공한 레코드는 스냅샷에 반영됨)
+        """
+        if self.queue is not None:
+            queued = self.queue.update(table, records)
+            cached = self._tables.get(table.name)
+            if cached is not None:
+                for record in queued:
+                    cached.patch(record['id'], record['fields'])
+            return queued
+        try:
+            updated = self._writer.update(table, records)
+        except BatchWriteError as e:
+            self.apply(table, e.records)
+            raise
+        self.apply(table, updated)
+        return updated
+
+    def batch_upsert(
+        self,
+        table: Table,
+        records: list[dict[str, Any]],
+        key_fields: list[str]
+    ) -> dict[str, list]:
+        """키 필드 기준 생성 또는 수정 후 스냅샷에 반영
+
+        Args:
+            table: Airtable 테이블 객체
+            records: 필드 딕셔너리 리스트 (key_fields 필드 필수, 키 중복 없음)
+            key_fields: 매칭 필드 목록 (fieldsToMergeOn)
+
+        Returns:
+            {'records', 'createdRecords', 'updatedRecords'} (BatchWriter.upsert 참고)
+
+        Raises:
+            BatchWriteError: 일부 배치 실패 (성공한 레코드는 스냅샷에 반영됨)
+        """
+        if self.planning:
+            return self._plan_upsert(table, records, key_fields)
+        try:
+            result = self._writer.upsert(table, records, key_fields)
+        except BatchWriteError as e:
+            self.apply(table, e.records)
+            raise
+        self.apply(table, result['records'])
+        return result
+
+    def _plan_upsert(
+        self,
+        table: Table,
+        records: list[dict[str, Any]],
+        key_fields: list[str]
+    ) -> dict[str, list]:
+        """계획 모드 업서트: 스냅샷의 키로 생성(임시 ID)/수정을 나눠 대기열에 기록"""
+        if len(key_fields) != 1:
+            raise ValueError(f"계획 모드 업서트는 키 필드 1개만 지원합니다: {key_fields}")
+        key_field = key_fields[0]
+        index = self.key_index(table, key_field)
+
+        creates = [fields for fields in records if fields[key_field] not in index]
+        updates = [
+            {'id': index[fields[key_field]], 'fields': fields}
+            for fields in records if fields[key_field] in index
+        ]
+        created = iter(self.batch_create(table, creates))
+        self.batch_update(table, updates)
+
+        result_records = [
+            {'id': index[fields[key_field]], 'fields': fields} if fields[key_field] in index
+            else next(created)
+            for fields in records
+        ]
+        return {
+            'records': result_records,
+            'createdRecords': [record['id'] for record in result_records if is_pending_id(record['id'])],
+            'updatedRecords': [record['id'] for record in updates],
+        }
+
+    def flush(self) -> dict[str, dict[str, Any]]:
+        """쓰기 대기열 전송 (대기열이 없으면 빈 결과)
+
+        지연 생성된 레코드는 스냅샷에서 임시 ID를 실제 ID로 바꿉니다.
+
+        Returns:
+            MutationQueue.flush() 결과 (테이블명 -> 생성/수정/요청 수, 오류)
+        """
+        if self.queue is None:
+            return {}
+        results = self.queue.flush(self._writer)
+        for table_name, result in results.items():
+            cached = self._tables.get(table_name)
+            if cached is None:
+                continue
+            for pending_id, record in zip(result['pending_ids'], result['created']):
+                cached.rekey(pending_id, record['id'])
+                cached.put(record)
+        return results
+
+
+def get_existing_by_key(
+    table: Table,
+    key_field: str,
+    snapshot: TableSnapshot | None = None
+) -> KeyIndex:
     """Airtable 테이블에서 기존 레코드 조회 (범용)
 
     Args:
         table: Airtable 테이블 객체
         key_field: 고유 키 필드명
+        snapshot: 실행 단위 스냅샷 (없으면 테이블 직접 조회)
+
+    Returns:
+        key_value -> record_id 매핑 (key_of()로 record_id -> key_value 조회 가능)
+    """
+    snapshot = snapshot or TableSnapshot(retain=False)
+    return snapshot.key_index(table, key_field)
+
+
+def find_by_keys(
+    table: Table,
+    key_field: str,
+    keys: list[str],
+    snapshot: TableSnapshot | None = None
+) -> dict[str, str]:
+    """주어진 키 값에 해당하는 레코드만 조회
+
+    전체 테이블 대신 필요한 키만 formula로 조회합니다.
+    테이블이 스냅샷에 이미 적재되어 있으면 메모리에서 찾습니다.
+
+    Args:
+        table: Airtable 테이블 객체
+        key_field: 고유 키 필드명
+        keys: 찾을 키 값 목록
+        snapshot: 실행 단위 스냅샷 (없으면 테이블 직접 조회)
 
     Returns:
-        key_value -> record_id 매핑 딕셔너리
+        key_value -> record_id 매핑 딕셔너리 (찾은 키만 포함)
     """
-    return {
-        record['fields'].get(key_field): record['id']
-        for record in table.all()
-        if record['fields'].get(key_field)
-    }
+    snapshot = snapshot or TableSnapshot(retain=False)
+    unique_keys = sorted(set(k for k in keys if k))
+    result: dict[str, str] = {}
+    for chunk in batch_iterator(unique_keys, KEYS_PER_FORMULA):
+        for record in snapshot.iter_select(table, In(key_field, chunk), [key_field]):
+            result[record['fields'][key_field]] = record['id']
+    return result
 
 
-def get_existing_orders(table: Table) -> dict[str, str]:
+def get_existing_orders(table: Table, snapshot: TableSnapshot | None = None) -> KeyIndex:
     """Airtable에서 기존 주문 레코드 조회
 
     Args:
         table: Airtable Orders 테이블 객체
+        snapshot: 실행 단위 스냅샷 (없으면 테이블 직접 조회)
 
     Returns:
         order_number -> record_id 매핑 딕셔너리
     """
-    return get_existing_by_key(table, 'Order Number')
+    return get_existing_by_key(table, 'Order Number', snapshot)
 
 
-def get_existing_member_products(table: Table) -> dict[str, str]:
+def get_existing_member_products(table: Table, snapshot: TableSnapshot | None = None) -> KeyIndex:
     """Airtable에서 기존 MemberProducts 레코드 조회
 
     Args:
         table: Airtable MemberProducts 테이블 객체
+        snapshot: 실행 단위 스냅샷 (없으면 테이블 직접 조회)
 
     Returns:
         MemberProducts Code -> record_id 매핑 딕셔너리
     """
-    return get_existing_by_key(table, 'MemberProducts Code')
+    return get_existing_by_key(table, 'MemberProducts Code', snapshot)
 
 
-def get_pending_refunds(table: Table) -> dict[str, dict[str, Any]]:
+def get_pending_refunds(table: Table, snapshot: TableSnapshot | None = None) -> dict[str, dict[str, Any]]:
     """Airtable에서 미결정 상태 환불 레코드 조회
 
     Refunded, Rejected가 아닌 환불만 조회 (상태 변경 추적용)
 
     Args:
         table: Airtable Refunds 테이블 객체
+        snapshot: 실행 단위 스냅샷 (없으면 테이블 직접 조회)
 
     Returns:
         order_number -> {id, status} 매핑 딕셔너리
     """
-    final_statuses = {'Refunded', 'Rejected'}
+    snapshot = snapshot or TableSnapshot(retain=False)
     result = {}
-    for record in table.all():
+    for record in snapshot.iter_select(table, PENDING_REFUND, ['Order Number', 'Refund Status']):
         order_number = record['fields'].get('Order Number')
         status = record['fields'].get('Refund Status')
-        if order_number and status not in final_statuses:
+        if order_number:
             result[order_number] = {
                 'id': record['id'],
                 'status': status
@@ -0,0 +1,200 @@
+"""중단된 쓰기 재개 모듈
+
+쓰기 저널(journal.py)에 확인(ack)되지 않고 남은 배치만 다시 보냅니다.
+테이블 전체를 다시 조회하지 않습니다.
+
+- 생성: 배치 레코드의 고유 키(NATURAL_KEYS)만 서버에서 조회하여
+  이미 생성된 레코드(응답을 받기 전에 중단된 경우)는 건너뛰고 없는 것만 생성
+- 수정/업서트: 같은 값을 다시 보내도 결과가 같으므로 그대로 재전송
+
+격리 파일(quarantine.py)에 남은 레코드도 같은 방식으로 다시 보낼 수 있습니다 (retry_quarantined).
+"""
+
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+from pyairtable import Api
+
+from .. import config
+from ..logger import logger
+
+from .client import get_table
+from .journal import WriteJournal
+from .quarantine import Quarantine, is_record_error
+from .records import find_by_keys
+from .schema import SchemaCache
+from .writer import BatchWriteError, BatchWriter
+
+
+def _select_schema(api: Api) -> SchemaCache | None:
+    """새 Single Select 옵션 확인용 스키마 캐시 (config.AIRTABLE_ADD_SELECT_OPTIONS가 꺼져 있으면 None)"""
+    return SchemaCache(api) if config.AIRTABLE_ADD_SELECT_OPTIONS else None
+
+
+def _find_created(api: Api, pending: list[dict[str, Any]]) -> dict[tuple[str, str], dict[str, str]]:
+    """생성 배치의 고유 키 중 이미 생성된 레코드 조회 (테이블당 키 목록만)
+
+    Returns:
+        (테이블명, 키 필드) -> {키 값: record_id}
+    """
+    keys: dict[tuple[str, str], list[str]] = defaultdict(list)
+    for entry in pending:
+        if entry['op'] == 'create' and entry['key_field']:
+            keys[(entry['table'], entry['key_field'])].extend(
+                fields.get(entry['key_field']) for fields in entry['records']
+            )
+    return {
+        (table_name, key_field): find_by_keys(get_table(api, table_name), key_field, values)
+        for (table_name, key_field), values in keys.items()
+    }
+
+
+def _replay(
+    api: Api,
+    writer: BatchWriter,
+    entry: dict[str, Any],
+    created: dict[tuple[str, str], dict[str, str]]
+) -> tuple[list[str], int]:
+    """배치 1개 재전송
+
+    Returns:
+        (배치 레코드 ID 리스트, 실제로 보낸 레코드 수)
+    """
+    table = get_table(api, entry['table'])
+    records = entry['records']
+
+    if entry['op'] == 'update':
+        return [record['id'] for record in writer.update(table, records)], len(records)
+    if entry['op'] == 'upsert':
+        result = writer.upsert(table, records, entry['key_fields'])
+        return [record['id'] for record in result['records']], len(records)
+
+    key_field = entry['key_field']
+    existing = created.get((entry['table'], key_field), {})
+    missing = [fields for fields in records if fields.get(key_field) not in existing]
+    new_ids = iter(record['id'] for record in writer.create(table, missing))
+    ids = [
+        existing[fields[key_field]] if fields.get(key_field) in existing else next(new_ids)
+        for fields in records
+    ]
+    return ids, len(missing)
+
+
+def resume_writes(api: Api, path: Path = config.JOURNAL_FILE) -> dict[str, int]:
+    """저널의 미확인 배치 재전송
+
+    고유 키가 없는 테이블의 생성 배치는 중복 생성 위험이 있어 다시 보내지 않고 저널에 남깁니다.
+
+    Args:
+        api: Airtable API 클라이언트
+        path: 저널 파일 경로
+
+    Returns:
+        {'batches': 미확인 배치 수, 'replayed': 재전송 성공 배치 수,
+         'sent': 보낸 레코드 수, 'skipped': 이미 반영되어 건너뛴 레코드 수, 'failed': 실패 배치 수}
+    """
+    logger.info(f"\n{'='*50}")
+    logger.info("중단된 쓰기 재개")
+    logger.info(f"{'='*50}")
+
+    journal = WriteJournal(path)
+    pending = journal.pending()
+    results = {'batches': len(pending), 'replayed': 0, 'sent': 0, 'skipped': 0, 'failed': 0}
+    logger.info(f"미확인 배치: {len(pending)}개")
+    if not pending:
+        journal.close()
+        return results
+
+    created = _find_created(api, pending)
+    writer = BatchWriter(schema=_select_schema(api))
+    for entry in pending:
+        if entry['op'] == 'create' and not entry['key_field']:
+            logger.warning(f"  - {entry['table']} 생성 배치 #{entry['seq']}: 고유 키가 없어 건너뜀")
+            results['failed'] += 1
+            continue
+        try:
+            ids, sent = _replay(api, writer, entry, created)
+        except Exception as e:
+            logger.error(f"  - {entry['table']} {entry['op']} 배치 #{entry['seq']} 실패: {e}")
+            journal.fail(entry['seq'], e)
+            results['failed'] += 1
+            continue
+        journal.ack(entry['seq'], ids)
+        results['replayed'] += 1
+        results['sent'] += sent
+        results['skipped'] += len(entry['records']) - sent
+
+    logger.info(
+        f"재개 완료: 배치 {results['replayed']}개, 전송 {results['sent']}개 레코드, "
+        f"이미 반영 {results['skipped']}개, 실패 {results['failed']}개"
+    )
+    journal.close()
+    return results
+
+
+def _group_quarantined(entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """격리 레코드를 (테이블, 작업, 매칭 필드)별로 묶음 (재전송 배치 수를 줄임)"""
+    groups: dict[tuple, dict[str, Any]] = {}
+    for entry in entries:
+        group_key = (entry['table'], entry['op'], tuple(entry['key_fields'] or ()))
+        group = groups.setdefault(group_key, {**entry, 'records': []})
+        group['records'].extend(entry['records'])
+    return list(groups.values())
+
+
+def retry_quarantined(api: Api, path: Path = config.QUARANTINE_FILE) -> dict[str, int]:
+    """격리된 레코드만 다시 전송
+
+    Airtable 쪽을 고친 뒤(Single Select 옵션 추가 등) 실행합니다.
+    다시 거부된 레코드와 일시적 오류로 보내지 못한 레코드는 격리 파일에 남습니다.
+
+    Args:
+        api: Airtable API 클라이언트
+        path: 격리 파일 경로
+
+    Returns:
+        {'records': 격리 레코드 수, 'sent': 반영된 레코드 수,
+         'skipped': 이미 생성되어 건너뛴 레코드 수, 'failed': 다시 격리된 레코드 수}
+    """
+    logger.info(f"\n{'='*50}")
+    logger.info("격리 레코드 재전송")
+    logger.info(f"{'='*50}")
+
+    entries = Quarantine(path).entries()
+    results = {'records': len(entries), 'sent': 0, 'skipped': 0, 'failed': 0}
+    logger.info(f"격리 레코드: {len(entries)}개")
+    if not entries:
+        return results
+
+    # 재전송 중 다시 거부된 레코드는 새 파일에 기록했다가 끝나면 교체 (중단 시 기존 파일 유지)
+    retry = Quarantine(Path(path).with_suffix('.retry'))
+    retry.discard()
+    writer = BatchWriter(quarantine=retry, schema=_select_schema(api))
+    groups = _group_quarantined(entries)
+    created = _find_created(api, groups)
+
+    for entry in groups:
+        try:
+            _, sent = _replay(api, writer, entry, created)
+        except BatchWriteError as e:
+            for batch, error in e.failures:
+                if not is_record_error(error):
+                    retry.add(entry['table'], entry['op'], batch, error, entry['key_fields'])
+            results['sent'] += len(e.records)
+            results['failed'] += len(e.failed_records)
+            logger.error(f"  - {entry['table']} {entry['op']}: {len(e.failed_records)}개 실패 - {e}")
+            continue
+        results['sent'] += sent
+        results['skipped'] += len(entry['records']) - sent
+
+    if retry.path.exists():
+        retry.path.replace(path)
+    else:
+        Quarantine(path).discard()
+
+    logger.info(
+        f"재전송 완료: 반영 {results['sent']}개, 이미 생성 {results['skipped']}개, "
+        f"다시 격리 {results['failed']}개"
+    )
+    return results
@@ -1,13 +1,163 @@
 """Airtable 스키마 관리 모듈
 
 테이블 생성 및 스키마 관리 기능을 제공합니다.
+
+스키마(테이블/필드/Single Select 옵션)는 SchemaCache가 로컬 파일(.airtable_schema.json)에
+저장하여 실행마다 다시 조회하지 않습니다.
+- 저장 후 config.AIRTABLE_SCHEMA_CACHE_HOURS가 지나면 다시 조회
+- 테이블/필드를 생성하면 다시 조회, 값 오류로 거부된 쓰기가 있으면 파일을 버림 (다음 실행에서 조회)
+- BatchWriter가 보낼 값 중 스키마에 없는 Single Select 옵션을 찾아, 그 값을 담은 배치만
+  typecast로 보내 Airtable이 옵션을 추가하게 함 (옵션 누락으로 배치가 실패하지 않음)
 """
 
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
 from pyairtable import Api
 
 from .. import config
 from ..logger import logger
 
+from .content_hash import SYNC_HASH_FIELD
+
+# Sync Hash(변경 감지) 필드를 두는 테이블 (config.AIRTABLE_TABLES 키)
+SYNC_HASH_TABLES = ['members', 'orders']
+
+# 옵션 목록을 가진 필드 타입
+SELECT_FIELD_TYPES = {'singleSelect', 'multipleSelects'}
+
+
+class SchemaCache:
+    """로컬 파일에 저장하는 Base 스키마 (테이블 -> 필드 -> 타입/옵션)
+
+    Example:
+        >>> schema = SchemaCache(api)
+        >>> schema.tables()                           # 필요할 때 파일 또는 API에서 적재
+        >>> schema.missing_choices('Refunds', [{'Refund Status': 'Partial'}])
+        {'Refund Status': {'Partial'}}
+    """
+
+    def __init__(
+        self,
+        api: Api,
+        path: Path = config.SCHEMA_FILE,
+        max_age_hours: float = config.AIRTABLE_SCHEMA_CACHE_HOURS
+    ) -> None:
+        """
+        Args:
+            api: Airtable API 클라이언트
+            path: 스키마 파일 경로
+            max_age_hours: 파일을 그대로 쓰는 최대 시간 (지나면 다시 조회)
+        """
+        self.api = api
+        self.path = Path(path)
+        self.max_age = timedelta(hours=max_age_hours)
+        self._data: dict[str, Any] | None = None
+
+    def _read(self) -> dict[str, Any] | None:
+        """저장된 스키마 (없거나 다른 Base이거나 오래되었으면 None)"""
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            fetched_at = datetime.fromisoformat(data['fetched_at'])
+        except (ValueError, KeyError):
+            return None
+        if data.get('base_id') != config.AIRTABLE_BASE_ID or datetime.now() - fetched_at > self.max_age:
+            return None
+        return data
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, ensure_ascii=False)
+        tmp_path.replace(self.path)
+
+    def refresh(self) -> dict[str, Any]:
+        """API로 스키마를 다시 조회하여 저장
+
+        Returns:
+            테이블명 -> {'id', 'fields': {필드명: {'id', 'type', 'choices'}}}
+        """
+        schema = self.api.base(config.AIRTABLE_BASE_ID).schema(force=True)
+        tables = {}
+        for table in schema.tables:
+            fields = {}
+            for field in table.fields:
+                choices = None
+                if field.type in SELECT_FIELD_TYPES:
+                    choices = [choice.name for choice in field.options.choices]
+                fields[field.name] = {'id': field.id, 'type': field.type, 'choices': choices}
+            tables[table.name] = {'id': table.id, 'fields': fields}
+
+        self._data = {
+            'base_id': config.AIRTABLE_BASE_ID,
+            'fetched_at': datetime.now().isoformat(timespec='seconds'),
+            'tables': tables,
+        }
+        self._save()
+        logger.info(f"스키마 조회: 테이블 {len(tables)}개")
+        return tables
+
+    def tables(self) -> dict[str, Any]:
+        """테이블명 -> 테이블 스키마 (파일이 유효하면 API 호출 없음)"""
+        if self._data is None:
+            self._data = self._read()
+        if self._data is None:
+            return self.refresh()
+        return self._data['tables']
+
+    def table_id(self, table_name: str) -> str | None:
+        """테이블 ID (없으면 None)"""
+        table = self.tables().get(table_name)
+        return table['id'] if table else None
+
+    def field_names(self, table_name: str) -> set[str]:
+        """테이블의 필드 이름 집합 (테이블이 없으면 빈 집합)"""
+        return set(self.tables().get(table_name, {}).get('fields', {}))
+
+    def missing_choices(self, table_name: str, records: list[dict[str, Any]]) -> dict[str, set[str]]:
+        """보낼 값 중 스키마에 없는 Single/Multiple Select 옵션
+
+        Args:
+            table_name: Airtable 테이블명
+            records: 필드 딕셔너리 리스트
+
+        Returns:
+            필드명 -> 새 옵션 집합 (없으면 빈 딕셔너리)
+        """
+        fields = self.tables().get(table_name, {}).get('fields', {})
+        select_fields = {
+            name: set(field['choices']) for name, field in fields.items() if field['choices'] is not None
+        }
+        missing: dict[str, set[str]] = {}
+        for record in records:
+            for name, known in select_fields.items():
+                value = record.get(name)
+                values = value if isinstance(value, list) else [value]
+                new = {v for v in values if isinstance(v, str) and v and v not in known}
+                if new:
+                    missing.setdefault(name, set()).update(new)
+        return missing
+
+    def add_choices(self, table_name: str, choices: dict[str, set[str]]) -> None:
+        """Airtable에 추가된 옵션을 저장된 스키마에 반영"""
+        fields = self.tables().get(table_name, {}).get('fields', {})
+        for name, values in choices.items():
+            field = fields.get(name)
+            if field and field['choices'] is not None:
+                field['choices'].extend(sorted(set(values) - set(field['choices'])))
+        self._save()
+
+    def invalidate(self) -> None:
+        """저장된 스키마 버림 (다음 접근 시 다시 조회)"""
+        self._data = None
+        self.path.unlink(missing_ok=True)
+
 
 def _create_products_table(base) -> bool:
     """Products 테이블 생성
@@ -89,28 +239,60 @@ def _create_member_products_table(base, members_table_id: str | None, products_t
         return False
 
 
-def ensure_tables_exist(api: Api) -> dict[str, bool]:
+def _ensure_sync_hash_fields(base, schema: SchemaCache) -> bool:
+    """Members/Orders에 Sync Hash 필드가 없으면 생성
+
+    Args:
+        base: Airtable Base 객체
+        schema: Base 스키마 캐시
+
+    Returns:
+        필드를 하나 이상 생성했는지 여부
+    """
+    created = False
+    for table_key in SYNC_HASH_TABLES:
+        table_name = config.AIRTABLE_TABLES[table_key]
+        if table_name not in schema.tables() or SYNC_HASH_FIELD in schema.field_names(table_name):
+            continue
+        try:
+            base.table(table_name).create_field(
+                SYNC_HASH_FIELD,
+                'singleLineText',
+                description='동기화 변경 감지용 CSV 내용 해시 (자동 관리, 수정하지 마세요)'
+            )
+            logger.info(f"{table_name}.{SYNC_HASH_FIELD} 필드 생성 완료")
+            created = True
+        except Exception as e:
+            logger.error(f"{table_name}.{SYNC_HASH_FIELD} 필드 생성 실패: {e}")
+    return created
+
+
+def ensure_tables_exist(api: Api, schema: SchemaCache | None = None) -> dict[str, bool]:
     """Products와 MemberProducts 테이블이 존재하는지 확인하고 없으면 생성
 
-    pyairtable 3.x의 Base.schema() API를 사용하여 테이블 생성
+    스키마는 SchemaCache에서 읽으므로 저장된 스키마가 유효하면 API를 호출하지 않고,
+    테이블/필드를 생성한 경우에만 다시 조회합니다.
 
     Args:
         api: Airtable API 클라이언트
+        schema: Base 스키마 캐시 (없으면 새로 생성)
+
+    config.SYNC_DETECT_CHANGES이면 Members/Orders의 Sync Hash 필드도 확인하여 생성합니다.
 
     Returns:
-        테이블별 생성 여부 딕셔너리
+        테이블별 생성 여부 딕셔너리 (+ 'sync_hash': Sync Hash 필드 생성 여부)
     """
     logger.info(f"\n{'='*50}")
     logger.info("테이블 존재 확인")
     logger.info(f"{'='*50}")
 
-    results = {'products': False, 'member_products': False}
+    results = {'products': False, 'member_products': False, 'sync_hash': False}
+    schema = schema or SchemaCache(api)
 
     # 기존 테이블 목록 조회
     try:
         base = api.base(config.AIRTABLE_BASE_ID)
-        schema = base.schema()
-        existing_tables = {table.name for table in schema.tables}
+        existing_tables = set(schema.tables())
         logger.info(f"기존 테이블: {', '.join(existing_tables)}")
     except Exception as e:
         logger.error(f"스키마 조회 실패: {e}")
@@ -121,6 +303,8 @@ def ensure_tables_exist(api: Api) -> dict[str, bool]:
     if products_name not in existing_tables:
         logger.info(f"\n{products_name} 테이블 생성 중...")
         results['products'] = _create_products_table(base)
+        if results['products']:
+            schema.refresh()
     else:
         logger.info(f"{products_name} 테이블 이미 존재")
 
@@ -129,22 +313,19 @@ def ensure_tables_exist(api: Api) -> dict[str, bool]:
     if member_products_name not in existing_tables:
         logger.info(f"\n{member_products_name} 테이블 생성 중...")
 
-        # Members와 Products 테이블 ID 조회
-        members_table_id = None
-        products_table_id = None
-
-        # 다시 스키마 조회 (Products가 방금 생성됐을 수 있음)
-        schema = base.schema()
-        for table in schema.tables:
-            if table.name == config.AIRTABLE_TABLES['members']:
-                members_table_id = table.id
-            elif table.name == products_name:
-                products_table_id = table.id
-
+        # Members와 Products 테이블 ID (Products가 방금 생성됐으면 다시 조회된 스키마 기준)
         results['member_products'] = _create_member_products_table(
-            base, members_table_id, products_table_id
+            base, schema.table_id(config.AIRTABLE_TABLES['members']), schema.table_id(products_name)
         )
+        if results['member_products']:
+            schema.refresh()
     else:
         logger.info(f"{member_products_name} 테이블 이미 존재")
 
+    # 변경 감지용 Sync Hash 필드 확인/생성
+    if config.SYNC_DETECT_CHANGES:
+        results['sync_hash'] = _ensure_sync_hash_fields(base, schema)
+        if results['sync_hash']:
+            schema.refresh()
+
     return results
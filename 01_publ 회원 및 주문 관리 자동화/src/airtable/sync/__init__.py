@@ -5,7 +5,7 @@
 
 from .members import sync_members
 from .orders import sync_orders, update_orders_member_products_link
-from .refunds import sync_refunds
+from .refunds import report_refund_write_error, sync_refunds
 from .products import sync_products
 from .member_products import sync_member_products
 
@@ -13,6 +13,7 @@ __all__ = [
     'sync_members',
     'sync_orders',
     'sync_refunds',
+    'report_refund_write_error',
     'sync_products',
     'sync_member_products',
     'update_orders_member_products_link',
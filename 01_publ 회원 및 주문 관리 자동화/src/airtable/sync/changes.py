@@ -0,0 +1,62 @@
+"""기존 레코드 변경 반영 공통 처리
+
+CSV 필드 해시를 레코드의 Sync Hash와 비교하여 내용이 바뀐 기존 레코드만 업데이트합니다
+(content_hash 모듈 참고). 값이 같은 레코드는 요청을 보내지 않습니다.
+"""
+
+from typing import Any, Callable, Iterable, Mapping
+
+from pyairtable import Table
+
+from ...logger import logger
+
+from ..content_hash import changed_records
+from ..records import TableSnapshot
+
+
+def update_changed(
+    snapshot: TableSnapshot,
+    table: Table,
+    rows: Iterable[Any],
+    to_fields: Callable[[Any], dict[str, Any]],
+    key_field: str,
+    existing: Mapping[str, str],
+    hashes: Mapping[str, str | None]
+) -> int:
+    """CSV 내용이 바뀐 기존 레코드 업데이트
+
+    같은 키가 CSV에 여러 번 나오면 마지막 행 기준으로 비교합니다.
+    행은 한 번만 순회하며, 기존 레코드와 키가 같은 행만 보관합니다.
+
+    Args:
+        snapshot: 실행 단위 스냅샷
+        table: Airtable 테이블 객체
+        rows: CSV 행 (iter_rows, row.get(key_field)로 키 조회)
+        to_fields: CSV 행 -> 레코드 필드 (CSV에서 오는 필드만, 해시 대상)
+        key_field: 고유 키 필드명
+        existing: 고유 키 -> record_id
+        hashes: 고유 키 -> 저장된 Sync Hash
+
+    Returns:
+        업데이트된 레코드 수
+    """
+    latest = {}
+    for row in rows:
+        key = row.get(key_field)
+        if key and key in existing:
+            latest[key] = row
+    records_to_update = changed_records(
+        {key: to_fields(row) for key, row in latest.items()}, existing, hashes
+    )
+
+    unhashed = sum(1 for key in latest if not hashes.get(key))
+    logger.info(f"변경된 기존 레코드: {len(records_to_update)}개 (비교 {len(latest)}개)")
+    if unhashed:
+        logger.info(f"  Sync Hash 없는 레코드: {unhashed}개 (최초 1회 전체 필드 업데이트)")
+
+    if not records_to_update:
+        return 0
+
+    updated = len(snapshot.batch_update(table, records_to_update))
+    logger.info(f"업데이트 완료: {updated}개")
+    return updated
@@ -7,33 +7,45 @@ from pyairtable import Api
 
 from ... import config
 from ...logger import logger
-from ...utils import batch_iterator
 
 from ..client import get_table
-from ..records import get_existing_by_key, get_existing_member_products
+from ..csv_reader import csv_cache, find_csv
+from ..delta import ExportDelta
+from ..records import TableSnapshot, get_existing_by_key, get_existing_member_products
 
-# Airtable 배치 크기 (API 제한)
-AIRTABLE_BATCH_SIZE = 10
 
+def member_products_code(member_code: str, product_name: str) -> str:
+    """MemberProducts 고유 키 (Member Code + Product name)"""
+    return f"{member_code}_{product_name}"
 
-def sync_member_products(api: Api) -> dict[str, int]:
+
+def sync_member_products(
+    api: Api,
+    snapshot: TableSnapshot | None = None,
+    delta: ExportDelta | None = None
+) -> dict[str, int]:
     """회원별 상품 조합을 MemberProducts 테이블에 동기화 (신규만)
 
     구독 상태 및 만료일은 Airtable Formula가 처리.
     이 함수는 신규 MemberProducts 레코드 생성만 담당.
 
+    조합은 Orders CSV에서 수집합니다 (Orders 테이블 전체 조회 없음).
+    Orders보다 먼저 실행하여 신규 주문을 MemberProducts 연결과 함께 생성할 수 있게 합니다.
+
     Args:
         api: Airtable API 클라이언트
+        snapshot: 실행 단위 스냅샷 (없으면 새로 생성)
+        delta: 이번 실행의 CSV 변경분 (있으면 추가/변경된 주문 행의 조합만 수집)
 
     Returns:
         {'new': int} 딕셔너리
     """
+    snapshot = snapshot or TableSnapshot()
     logger.info(f"\n{'='*50}")
     logger.info(f"Airtable 회원별 상품 동기화 (신규만)")
     logger.info(f"{'='*50}")
 
     # 테이블 객체
-    orders_table = get_table(api, config.AIRTABLE_TABLES['orders'])
     members_table = get_table(api, config.AIRTABLE_TABLES['members'])
     products_table = get_table(api, config.AIRTABLE_TABLES['products'])
     member_products_table = get_table(api, config.AIRTABLE_TABLES['member_products'])
@@ -42,41 +54,40 @@ def sync_member_products(api: Api) -> dict[str, int]:
     logger.info("데이터 조회 중...")
 
     # Members: Member Code -> record_id
-    existing_members = get_existing_by_key(members_table, 'Member Code')
+    existing_members = get_existing_by_key(members_table, 'Member Code', snapshot)
 
     # Products: Product Code -> record_id
-    products_data: dict[str, str] = {}
-    for record in products_table.all():
-        product_code = record['fields'].get('Product Code')
-        if product_code:
-            products_data[product_code] = record['id']
+    products_data = get_existing_by_key(products_table, 'Product Code', snapshot)
 
     # MemberProducts: MemberProducts Code -> record_id
-    existing_member_products = get_existing_member_products(member_products_table)
+    existing_member_products = get_existing_member_products(member_products_table, snapshot)
 
     logger.info(f"  Members: {len(existing_members)}개")
     logger.info(f"  Products: {len(products_data)}개")
     logger.info(f"  MemberProducts 기존: {len(existing_member_products)}개")
 
-    # Orders에서 (Member Code, Product name) 조합 수집
-    logger.info("Orders 집계 중...")
-    member_product_combos: set[tuple[str, str]] = set()
-
-    for record in orders_table.all():
-        member_code = record['fields'].get('Member Code')
-        product_name = record['fields'].get('Product name')
-        if member_code and product_name:
-            member_product_combos.add((member_code, product_name))
+    # Orders CSV에서 (Member Code, Product name) 조합 수집
+    logger.info("Orders CSV 집계 중...")
+    # Member Code -> 주문 행 인덱스는 파일별로 한 번만 생성 (변경분이 있으면 변경된 행만)
+    orders_by_member = (delta or csv_cache).groups(
+        find_csv(config.TABLES['orders']['file_pattern']), 'orders', 'Member Code'
+    )
+    member_product_combos = {
+        (member_code, row.product_name)
+        for member_code, rows in orders_by_member.items()
+        for row in rows
+        if row.product_name
+    }
 
     logger.info(f"  회원+상품 조합: {len(member_product_combos)}개")
 
     # 신규 레코드 생성
     new_records = []
     for member_code, product_name in member_product_combos:
-        member_products_code = f"{member_code}_{product_name}"
+        code = member_products_code(member_code, product_name)
 
         # 이미 존재하면 건너뛰기
-        if member_products_code in existing_member_products:
+        if code in existing_member_products:
             continue
 
         member_id = existing_members.get(member_code)
@@ -86,7 +97,7 @@ def sync_member_products(api: Api) -> dict[str, int]:
             continue
 
         record_fields = {
-            'MemberProducts Code': member_products_code,
+            'MemberProducts Code': code,
             'Member': [member_id],
             'Product': [product_id],
             'Welcome Sent': False,
@@ -98,9 +109,7 @@ def sync_member_products(api: Api) -> dict[str, int]:
     # 레코드 삽입
     inserted = 0
     if new_records:
-        for batch in batch_iterator(new_records, AIRTABLE_BATCH_SIZE):
-            member_products_table.batch_create(batch)
-            inserted += len(batch)
+        inserted = len(snapshot.batch_create(member_products_table, new_records))
         logger.info(f"삽입 완료: {inserted}개")
 
     return {'new': inserted}
@@ -3,115 +3,187 @@
 CSV 데이터를 Members 테이블로 동기화합니다.
 """
 
-from pyairtable import Api
+from typing import Any
+
+from pyairtable import Api, Table
 
 from ... import config
 from ...logger import logger
-from ...utils import safe_get, batch_iterator, to_iso_datetime
 
 from ..client import get_table
-from ..csv_reader import read_csv, find_csv
-from ..records import get_existing_by_key
-from ..validators import check_airtable_duplicates, check_csv_duplicates
+from ..content_hash import SYNC_HASH_FIELD, with_hash
+from ..csv_reader import find_csv, iter_rows
+from ..delta import ExportDelta
+from ..indexes import DuplicateGroups, KeyMap, ValueMap, scan_table
+from ..records import TableSnapshot
+from ..validators import check_csv_duplicates, verify_inserts
+from .changes import update_changed
+from .upsert import upsert_enabled, upsert_records
+
+
+def _member_fields(row: Any) -> dict[str, Any]:
+    """CSV 행 -> Members 필드 (CSV에서 오는 필드만)
+
+    Args:
+        row: Members CSV 행 (iter_rows, 출생연도/날짜 변환 완료)
+
+    Returns:
+        레코드 필드 딕셔너리
+    """
+    record_fields = {
+        'Member Code': row.member_code,
+        'Username': row.username,
+        'E-mail': row.email,
+        'Country': row.country,
+        'Name': row.name,
+        'Gender': row.gender,
+        'Birth year': row.birth_year,
+        'Personal email address': row.personal_email,
+        'Mobile number': row.mobile,
+        'Sign-up Date': row.signup_date,  # 원본 텍스트
+    }
+
+    # Sign-up Date (ISO) - dateTime 형식
+    if row.signup_iso:
+        record_fields['Sign-up Date (ISO)'] = row.signup_iso
 
-# Airtable 배치 크기 (API 제한)
-AIRTABLE_BATCH_SIZE = 10
+    return record_fields
 
 
-def sync_members(api: Api) -> int:
+def _verify_created(table: Table, expected_codes: list[str], created: list[dict[str, Any]]) -> None:
+    """삽입 후 검증 (테이블 전체 대신 삽입한 코드만 서버에서 조회)
+
+    Args:
+        table: Members 테이블 객체
+        expected_codes: 생성되어야 하는 Member Code 목록
+        created: 생성 요청이 반환한 레코드 리스트
+    """
+    verification = verify_inserts(table, 'Member Code', expected_codes, created)
+    for code in verification['missing']:
+        logger.warning(f"   - 삽입 실패: {code}")
+    for code, record_ids in verification['duplicates'].items():
+        logger.warning(f"   - 중복 생성: {code} ({len(record_ids)}개 레코드)")
+    for record_id in verification['unconfirmed_ids']:
+        logger.warning(f"   - 서버에서 확인되지 않은 레코드: {record_id}")
+    if verification['missing'] or verification['duplicates'] or verification['unconfirmed_ids']:
+        logger.warning(
+            f"삽입 검증 실패: 누락 {len(verification['missing'])}개, "
+            f"중복 {len(verification['duplicates'])}개, "
+            f"미확인 {len(verification['unconfirmed_ids'])}개"
+        )
+    else:
+        logger.info(f"✓ 삽입 검증 완료: {verification['confirmed']}개")
+
+
+def _hashed_fields(row: Any) -> dict[str, Any]:
+    """CSV 행 -> Members 필드 + Sync Hash (변경 감지가 꺼져 있으면 해시 없음)"""
+    fields = _member_fields(row)
+    return with_hash(fields) if config.SYNC_DETECT_CHANGES else fields
+
+
+def sync_members(
+    api: Api,
+    snapshot: TableSnapshot | None = None,
+    delta: ExportDelta | None = None
+) -> dict[str, int]:
     """회원 데이터를 CSV에서 읽어 Airtable로 동기화
 
     중복 방지 로직 포함:
     - Airtable 기존 중복 검사
     - CSV 내 중복 검사
-    - 삽입 후 카운트 검증
+    - 삽입 후 검증 (삽입한 코드만 서버에서 재조회)
+
+    config.SYNC_DETECT_CHANGES이면 CSV 필드의 해시를 Sync Hash 필드에 함께 저장하고,
+    저장된 해시와 다른 기존 회원(이메일/이름/전화번호 등 변경)만 업데이트합니다.
+
+    config.AIRTABLE_UPSERT['members']이면 기존 회원을 조회하지 않고 Member Code 기준으로
+    업서트합니다. 기존 회원의 CSV 필드도 갱신되며, Is Active는 보내지 않으므로
+    (비활성 처리한 회원 유지) 신규 회원의 Is Active는 필수 필드 검증이 채웁니다.
 
     Args:
         api: Airtable API 클라이언트
+        snapshot: 실행 단위 스냅샷 (없으면 새로 생성)
+        delta: 이번 실행의 CSV 변경분 (있으면 추가/변경된 행만 처리)
 
     Returns:
-        삽입된 레코드 수
+        {'new': 삽입된 수, 'updated': 변경 업데이트 수} (변경 감지를 끄면 {'new'}만,
+        업서트 모드: {'new': 생성된 수, 'updated': 수정된 수})
     """
+    snapshot = snapshot or TableSnapshot()
     table_config = config.TABLES['members']
     file_path = find_csv(table_config['file_pattern'])
     table = get_table(api, config.AIRTABLE_TABLES['members'])
+    read_rows = delta.iter_rows if delta else iter_rows
 
     logger.info(f"\n{'='*50}")
     logger.info(f"Airtable 회원 동기화: {file_path.split('/')[-1]}")
     logger.info(f"{'='*50}")
 
-    csv_data = read_csv(file_path)
-    logger.info(f"CSV 레코드: {len(csv_data)}")
+    if upsert_enabled('members'):
+        records = [_hashed_fields(row) for row in read_rows(file_path, 'members') if row.member_code]
+        logger.info(f"CSV 레코드: {len(records)}")
+        result = upsert_records(snapshot, table, records, 'Member Code')
+        created_ids = set(result['createdRecords'])
+        created = [record for record in result['records'] if record['id'] in created_ids]
+        if created and not snapshot.planning:
+            _verify_created(table, [record['fields']['Member Code'] for record in created], created)
+        return {'new': len(result['createdRecords']), 'updated': len(result['updatedRecords'])}
+
+    # Members 1회 순회로 중복 그룹 + 기존 키 매핑 (+ 저장된 해시) 생성
+    specs = {
+        'duplicates': DuplicateGroups('Member Code'),
+        'existing': KeyMap('Member Code'),
+    }
+    if config.SYNC_DETECT_CHANGES:
+        specs['hashes'] = ValueMap('Member Code', SYNC_HASH_FIELD)
+    indexes = scan_table(table, specs, snapshot)
 
     # [중복 방지] Airtable 기존 중복 검사
-    airtable_duplicates = check_airtable_duplicates(table, 'Member Code')
+    airtable_duplicates = indexes['duplicates']
     if airtable_duplicates:
         logger.warning(f"Airtable 중복 발견: {len(airtable_duplicates)}개")
         for code, record_ids in list(airtable_duplicates.items())[:3]:
             logger.info(f"   - {code}: {len(record_ids)}개 레코드")
 
     # [중복 방지] CSV 내 중복 검사
-    csv_duplicates = check_csv_duplicates(csv_data, 'Member Code')
+    csv_duplicates = check_csv_duplicates(read_rows(file_path, 'members'), 'Member Code')
     if csv_duplicates:
         logger.warning(f"CSV 내 중복 발견: {len(csv_duplicates)}개")
         for code, count in list(csv_duplicates.items())[:3]:
             logger.info(f"   - {code}: {count}회")
 
-    existing = get_existing_by_key(table, 'Member Code')
+    existing = indexes['existing']
     logger.info(f"Airtable 기존 레코드: {len(existing)}")
 
+    total = 0
     new_records = []
-    for row in csv_data:
-        member_code = row.get('Member Code')
-        if not member_code or member_code in existing:
+    for row in read_rows(file_path, 'members'):
+        total += 1
+        if not row.member_code or row.member_code in existing:
             continue
 
-        # Birth year 처리
-        birth_year = row.get('Birth year')
-        birth_year_str = str(birth_year) if birth_year else ''
-
-        # Sign-up Date를 ISO dateTime으로 변환
-        signup_date_str = safe_get(row, 'Sign-up Date')
-        signup_datetime = to_iso_datetime(signup_date_str)
-
-        record_fields = {
-            'Member Code': member_code,
-            'Username': safe_get(row, 'Username'),
-            'E-mail': safe_get(row, 'E-mail'),
-            'Country': safe_get(row, 'Country'),
-            'Name': safe_get(row, 'Name'),
-            'Gender': safe_get(row, 'Gender'),
-            'Birth year': birth_year_str,
-            'Personal email address': safe_get(row, 'Personal email address'),
-            'Mobile number': safe_get(row, 'Mobile number'),
-            'Sign-up Date': signup_date_str,  # 원본 텍스트
-            'Is Active': True,  # 새 회원은 활성 상태로 추가
-        }
-
-        # Sign-up Date (ISO) - dateTime 형식
-        if signup_datetime:
-            record_fields['Sign-up Date (ISO)'] = signup_datetime
-
+        record_fields = _hashed_fields(row)
+        record_fields['Is Active'] = True  # 새 회원은 활성 상태로 추가
         new_records.append(record_fields)
 
+    logger.info(f"CSV 레코드: {total}")
     logger.info(f"새 레코드: {len(new_records)}")
 
-    if not new_records:
-        return 0
-
     inserted = 0
-    for batch in batch_iterator(new_records, AIRTABLE_BATCH_SIZE):
-        table.batch_create(batch)
-        inserted += len(batch)
+    if new_records:
+        created = snapshot.batch_create(table, new_records)
+        inserted = len(created)
 
-    logger.info(f"삽입 완료: {inserted}개")
+        logger.info(f"삽입 완료: {inserted}개")
 
-    # [중복 방지] 삽입 후 카운트 검증
-    final_count = len(get_existing_by_key(table, 'Member Code'))
-    expected_count = len(existing) + inserted
-    if final_count != expected_count:
-        logger.warning(f"카운트 불일치: 예상 {expected_count}개, 실제 {final_count}개")
-    else:
-        logger.info(f"✓ 카운트 검증 완료: {final_count}개")
+        # [중복 방지] 삽입 후 검증 (계획 모드는 아직 생성 전이므로 건너뜀)
+        if not snapshot.planning:
+            _verify_created(table, [fields['Member Code'] for fields in new_records], created)
+
+    if not config.SYNC_DETECT_CHANGES:
+        return {'new': inserted}
 
-    return inserted
+    return {'new': inserted, 'updated': update_changed(
+        snapshot, table, read_rows(file_path, 'members'), _member_fields, 'Member Code',
+        existing, indexes['hashes']
+    )}
@@ -3,113 +3,219 @@
 CSV 데이터를 Orders 테이블로 동기화합니다.
 """
 
-from typing import Any
+from itertools import islice
+from typing import Any, Iterable, Iterator, Mapping
 
-from pyairtable import Api
+from pyairtable import Api, Table
 
 from ... import config
 from ...logger import logger
-from ...utils import parse_price, safe_get, batch_iterator, to_iso_datetime
 
 from ..client import get_table
-from ..csv_reader import read_csv, find_csv
-from ..records import get_existing_by_key, get_existing_orders, get_existing_member_products
+from ..content_hash import SYNC_HASH_FIELD, with_hash
+from ..csv_reader import find_csv, iter_rows
+from ..delta import ExportDelta
+from ..formulas import And, IsEmpty, NotEmpty
+from ..indexes import KeyMap, ValueMap, scan_table
+from ..records import TableSnapshot, find_by_keys, get_existing_by_key
+from .changes import update_changed
+from .member_products import member_products_code
+from .upsert import upsert_enabled, upsert_records
 
-# Airtable 배치 크기 (API 제한)
-AIRTABLE_BATCH_SIZE = 10
 
+def _order_csv_fields(row: Any) -> dict[str, Any]:
+    """CSV 행 -> Orders 필드 (CSV에서 오는 필드만, Linked Record 제외)
 
-def sync_orders(api: Api) -> int:
-    """주문 데이터를 CSV에서 읽어 Airtable로 동기화 (Member Linked Record 포함)
+    Args:
+        row: Orders CSV 행 (iter_rows, 가격/날짜 변환 완료)
+
+    Returns:
+        레코드 필드 딕셔너리
+    """
+    record_fields = {
+        'Order Number': row.order_number,
+        'Product name': row.product_name,
+        'Type': row.type,
+        'Price': row.price,
+        'Name': row.name,
+        'E-mail': row.email,
+        'Member Code': row.member_code,
+        'Payment Type': row.payment_type,
+        'Payment Method': row.payment_method,
+        'Date and Time of Payment': row.payment_date,  # 원본 텍스트
+    }
+
+    # Date and Time of Payment (ISO) - dateTime 형식
+    if row.payment_iso:
+        record_fields['Date and Time of Payment (ISO)'] = row.payment_iso
+
+    return record_fields
+
+
+def _order_fields(
+    row: Any,
+    existing_members: Mapping[str, str],
+    member_products: Mapping[str, str]
+) -> dict[str, Any]:
+    """CSV 행 -> Orders 필드 (Member, MemberProducts Linked Record 포함)
+
+    config.SYNC_DETECT_CHANGES이면 CSV 필드의 Sync Hash도 포함합니다.
+
+    Args:
+        row: Orders CSV 행
+        existing_members: Member Code -> record_id
+        member_products: MemberProducts Code -> record_id
+
+    Returns:
+        레코드 필드 딕셔너리
+    """
+    member_id = existing_members.get(row.member_code)
+    member_products_id = member_products.get(member_products_code(row.member_code, row.product_name))
+
+    record_fields = _order_csv_fields(row)
+    if config.SYNC_DETECT_CHANGES:
+        record_fields = with_hash(record_fields)
+
+    # Member Linked Record 추가
+    if member_id:
+        record_fields['Member'] = [member_id]
+
+    # MemberProducts Linked Record 추가 (MemberProducts 동기화가 먼저 실행된 경우)
+    if member_products_id:
+        record_fields['MemberProducts'] = [member_products_id]
+
+    return record_fields
+
+
+def _find_member_products(
+    member_products_table: Table,
+    rows: Iterable[Any],
+    snapshot: TableSnapshot
+) -> dict[str, str]:
+    """CSV 행의 (Member Code, Product name) 조합에 해당하는 MemberProducts만 조회
+
+    Returns:
+        MemberProducts Code -> record_id
+    """
+    return find_by_keys(
+        member_products_table,
+        'MemberProducts Code',
+        [
+            member_products_code(row.member_code, row.product_name)
+            for row in rows
+            if row.member_code and row.product_name
+        ],
+        snapshot
+    )
+
+
+def sync_orders(
+    api: Api,
+    snapshot: TableSnapshot | None = None,
+    delta: ExportDelta | None = None
+) -> dict[str, int]:
+    """주문 데이터를 CSV에서 읽어 Airtable로 동기화 (Member, MemberProducts Linked Record 포함)
+
+    Products/MemberProducts 동기화 후 실행하면 신규 주문을 MemberProducts 연결과 함께
+    생성하므로 update_orders_member_products_link의 추가 쓰기가 필요 없습니다.
+
+    config.SYNC_DETECT_CHANGES이면 Sync Hash가 다른 기존 주문의 CSV 필드만 업데이트합니다
+    (Linked Record는 해시 대상이 아니며 연결 복구 단계가 처리).
+
+    config.AIRTABLE_UPSERT['orders']이면 기존 주문을 조회하지 않고 Order Number 기준으로
+    업서트합니다 (기존 주문의 CSV 필드도 갱신, MemberProducts 연결은 유지).
+
+    신규 주문은 config.CSV_COLUMNAR_BATCH_ROWS개씩 생성 요청합니다 (전체 이력 CSV도 배치 단위로 처리).
 
     Args:
         api: Airtable API 클라이언트
+        snapshot: 실행 단위 스냅샷 (없으면 새로 생성)
+        delta: 이번 실행의 CSV 변경분 (있으면 추가/변경된 행만 처리)
 
     Returns:
-        삽입된 레코드 수
+        {'new': 삽입된 수, 'updated': 변경 업데이트 수} (변경 감지를 끄면 {'new'}만,
+        업서트 모드: {'new': 생성된 수, 'updated': 수정된 수})
     """
+    snapshot = snapshot or TableSnapshot()
     table_config = config.TABLES['orders']
     file_path = find_csv(table_config['file_pattern'])
     orders_table = get_table(api, config.AIRTABLE_TABLES['orders'])
     members_table = get_table(api, config.AIRTABLE_TABLES['members'])
+    member_products_table = get_table(api, config.AIRTABLE_TABLES['member_products'])
+    read_rows = delta.iter_rows if delta else iter_rows
 
     logger.info(f"\n{'='*50}")
     logger.info(f"Airtable 주문 동기화: {file_path.split('/')[-1]}")
     logger.info(f"{'='*50}")
 
-    csv_data = read_csv(file_path)
-    logger.info(f"CSV 레코드: {len(csv_data)}")
-
-    existing_orders = get_existing_orders(orders_table)
-    existing_members = get_existing_by_key(members_table, 'Member Code')
-
+    existing_members = get_existing_by_key(members_table, 'Member Code', snapshot)
+
+    if upsert_enabled('orders'):
+        rows = [row for row in read_rows(file_path, 'orders') if row.order_number]
+        logger.info(f"CSV 레코드: {len(rows)}")
+        member_products = _find_member_products(member_products_table, rows, snapshot)
+        records = [_order_fields(row, existing_members, member_products) for row in rows]
+        result = upsert_records(snapshot, orders_table, records, 'Order Number')
+        return {'new': len(result['createdRecords']), 'updated': len(result['updatedRecords'])}
+
+    # Orders 1회 순회로 기존 키 매핑 (+ 저장된 해시) 생성
+    specs = {'existing': KeyMap('Order Number')}
+    if config.SYNC_DETECT_CHANGES:
+        specs['hashes'] = ValueMap('Order Number', SYNC_HASH_FIELD)
+    indexes = scan_table(orders_table, specs, snapshot)
+    existing_orders = indexes['existing']
     logger.info(f"Airtable 기존 주문: {len(existing_orders)}")
 
-    new_records: list[dict[str, Any]] = []
-
-    for row in csv_data:
-        order_number = row.get('Order Number')
-        if not order_number:
-            continue
-
-        # 이미 존재하는 주문은 건너뛰기 (신규만 추가)
-        if order_number in existing_orders:
-            continue
-
-        member_code = safe_get(row, 'Member Code')
-        member_id = existing_members.get(member_code)
-
-        # Date and Time of Payment를 ISO dateTime으로 변환
-        payment_date_str = safe_get(row, 'Date and Time of Payment')
-        payment_datetime = to_iso_datetime(payment_date_str)
-
-        record_fields = {
-            'Order Number': order_number,
-            'Product name': safe_get(row, 'Product name'),
-            'Type': safe_get(row, 'Type'),
-            'Price': parse_price(row.get('Price')),
-            'Name': safe_get(row, 'Name'),
-            'E-mail': safe_get(row, 'E-mail'),
-            'Member Code': member_code,
-            'Payment Type': safe_get(row, 'Payment Type'),
-            'Payment Method': safe_get(row, 'Payment Method'),
-            'Date and Time of Payment': payment_date_str,  # 원본 텍스트
-        }
-
-        # Date and Time of Payment (ISO) - dateTime 형식
-        if payment_datetime:
-            record_fields['Date and Time of Payment (ISO)'] = payment_datetime
-
-        # Member Linked Record 추가
-        if member_id:
-            record_fields['Member'] = [member_id]
-
-        new_records.append(record_fields)
-
-    logger.info(f"새 레코드: {len(new_records)}")
-
-    inserted = 0
-    if new_records:
-        for batch in batch_iterator(new_records, AIRTABLE_BATCH_SIZE):
-            orders_table.batch_create(batch)
-            inserted += len(batch)
+    # 이미 존재하는 주문은 건너뛰고, 신규 주문은 batch_rows개씩 Linked Record를 붙여 바로 생성
+    # (전체 이력 CSV도 신규 행을 모두 메모리에 모으지 않음)
+    total = 0
+
+    def new_rows() -> Iterator[Any]:
+        nonlocal total
+        for row in read_rows(file_path, 'orders'):
+            total += 1
+            if row.order_number and row.order_number not in existing_orders:
+                yield row
+
+    new_count = linked = inserted = 0
+    pending = new_rows()
+    while batch := list(islice(pending, config.CSV_COLUMNAR_BATCH_ROWS)):
+        member_products = _find_member_products(member_products_table, batch, snapshot)
+        new_records = [_order_fields(row, existing_members, member_products) for row in batch]
+        new_count += len(new_records)
+        linked += sum(1 for fields in new_records if 'MemberProducts' in fields)
+        inserted += len(snapshot.batch_create(orders_table, new_records))
+
+    logger.info(f"CSV 레코드: {total}")
+    logger.info(f"새 레코드: {new_count}")
+    if new_count:
+        logger.info(f"  MemberProducts 연결 포함: {linked}개")
         logger.info(f"삽입 완료: {inserted}개")
 
-    return inserted
+    if not config.SYNC_DETECT_CHANGES:
+        return {'new': inserted}
+
+    return {'new': inserted, 'updated': update_changed(
+        snapshot, orders_table, read_rows(file_path, 'orders'), _order_csv_fields, 'Order Number',
+        existing_orders, indexes['hashes']
+    )}
 
 
-def update_orders_member_products_link(api: Api) -> int:
+def update_orders_member_products_link(api: Api, snapshot: TableSnapshot | None = None) -> int:
     """Orders 테이블의 MemberProducts Linked Record 업데이트
 
-    MemberProducts 동기화 후 호출하여 Orders에 Linked Record 연결.
+    신규 주문은 sync_orders가 연결과 함께 생성하므로, 이 함수는 연결이 빠진 기존 주문
+    (예: 주문 생성 시 MemberProducts가 없었던 경우)을 복구합니다.
     이미 연결된 Orders는 건너뜀.
 
     Args:
         api: Airtable API 클라이언트
+        snapshot: 실행 단위 스냅샷 (없으면 새로 생성)
 
     Returns:
         업데이트된 레코드 수
     """
+    snapshot = snapshot or TableSnapshot()
     logger.info(f"\n{'='*50}")
     logger.info(f"Orders → MemberProducts 연결 업데이트")
     logger.info(f"{'='*50}")
@@ -117,28 +223,34 @@ def update_orders_member_products_link(api: Api) -> int:
     orders_table = get_table(api, config.AIRTABLE_TABLES['orders'])
     member_products_table = get_table(api, config.AIRTABLE_TABLES['member_products'])
 
-    # MemberProducts: MemberProducts Code -> record_id
-    existing_member_products = get_existing_member_products(member_products_table)
-    logger.info(f"MemberProducts: {len(existing_member_products)}개")
+    # MemberProducts가 연결되지 않은 Orders만 조회
+    unlinked_orders = snapshot.select(
+        orders_table,
+        And(IsEmpty('MemberProducts'), NotEmpty('Member Code'), NotEmpty('Product name')),
+        ['Member Code', 'Product name', 'MemberProducts']
+    )
+    logger.info(f"연결 안 된 Orders: {len(unlinked_orders)}개")
+
+    if not unlinked_orders:
+        return 0
+
+    # MemberProducts: MemberProducts Code -> record_id (필요한 코드만 조회)
+    existing_member_products = find_by_keys(
+        member_products_table,
+        'MemberProducts Code',
+        [
+            member_products_code(record['fields']['Member Code'], record['fields']['Product name'])
+            for record in unlinked_orders
+        ],
+        snapshot
+    )
+    logger.info(f"매칭된 MemberProducts: {len(existing_member_products)}개")
 
-    # Orders 순회하여 연결되지 않은 레코드 찾기
     records_to_update = []
-    orders_all = orders_table.all()
-    logger.info(f"Orders 전체: {len(orders_all)}개")
-
-    for record in orders_all:
-        # 이미 MemberProducts가 연결되어 있으면 건너뛰기
-        if record['fields'].get('MemberProducts'):
-            continue
-
-        member_code = record['fields'].get('Member Code')
-        product_name = record['fields'].get('Product name')
-
-        if not member_code or not product_name:
-            continue
-
-        member_products_code = f"{member_code}_{product_name}"
-        member_products_id = existing_member_products.get(member_products_code)
+    for record in unlinked_orders:
+        member_products_id = existing_member_products.get(
+            member_products_code(record['fields']['Member Code'], record['fields']['Product name'])
+        )
 
         if member_products_id:
             records_to_update.append({
@@ -151,9 +263,7 @@ def update_orders_member_products_link(api: Api) -> int:
     # 배치 업데이트
     updated = 0
     if records_to_update:
-        for batch in batch_iterator(records_to_update, AIRTABLE_BATCH_SIZE):
-            orders_table.batch_update(batch)
-            updated += len(batch)
+        updated = len(snapshot.batch_update(orders_table, records_to_update))
         logger.info(f"연결 완료: {updated}개")
 
     return updated
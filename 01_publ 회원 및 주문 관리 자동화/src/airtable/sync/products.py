@@ -3,44 +3,54 @@
 Orders CSV에서 상품 정보를 추출하여 Products 테이블로 동기화합니다.
 """
 
+from typing import Any
+
 from pyairtable import Api
 
 from ... import config
 from ...logger import logger
-from ...utils import batch_iterator
 
 from ..client import get_table
-from ..csv_reader import read_csv, find_csv
-from ..records import get_existing_by_key
-
-# Airtable 배치 크기 (API 제한)
-AIRTABLE_BATCH_SIZE = 10
+from ..csv_reader import find_csv, iter_rows
+from ..delta import ExportDelta
+from ..records import TableSnapshot, get_existing_by_key
+from .upsert import upsert_enabled, upsert_records
 
 
-def sync_products(api: Api) -> int:
+def sync_products(
+    api: Api,
+    snapshot: TableSnapshot | None = None,
+    delta: ExportDelta | None = None
+) -> dict[str, int]:
     """Orders 데이터에서 상품 정보를 추출하여 Products 테이블에 동기화
 
+    config.AIRTABLE_UPSERT['products']이면 기존 상품을 조회하지 않고 Product Code 기준으로
+    업서트합니다. 수동 입력 필드(Display Name, Subscription Days)는 보내지 않고,
+    Is Subscription은 구독 결제가 있는 상품만 True로 보냅니다 (수동으로 켠 값을 끄지 않음).
+
     Args:
         api: Airtable API 클라이언트
+        snapshot: 실행 단위 스냅샷 (없으면 새로 생성)
+        delta: 이번 실행의 CSV 변경분 (있으면 추가/변경된 주문 행에서만 상품 추출)
 
     Returns:
-        삽입된 레코드 수
+        {'new': 삽입된 수} (업서트 모드: {'new': 생성된 수, 'updated': 수정된 수})
     """
+    snapshot = snapshot or TableSnapshot()
     table_config = config.TABLES['orders']
     file_path = find_csv(table_config['file_pattern'])
     products_table = get_table(api, config.AIRTABLE_TABLES['products'])
+    read_rows = delta.iter_rows if delta else iter_rows
 
     logger.info(f"\n{'='*50}")
     logger.info(f"Airtable 상품 동기화")
     logger.info(f"{'='*50}")
 
-    csv_data = read_csv(file_path)
-
     # 상품별 Payment Type 수집 (구독 여부 판단용)
     product_payment_types: dict[str, set[str]] = {}
-    for row in csv_data:
-        product_name = row.get('Product name', '').strip()
-        payment_type = row.get('Payment Type', '').strip()
+    for row in read_rows(file_path, 'orders'):
+        product_name = row.product_name.strip()
+        payment_type = row.payment_type.strip()
         if product_name:
             if product_name not in product_payment_types:
                 product_payment_types[product_name] = set()
@@ -49,8 +59,18 @@ def sync_products(api: Api) -> int:
 
     logger.info(f"CSV에서 발견된 상품: {len(product_payment_types)}종")
 
+    if upsert_enabled('products'):
+        records = []
+        for product_name, payment_types in product_payment_types.items():
+            record_fields: dict[str, Any] = {'Product Code': product_name}
+            if 'Regular Payment' in payment_types:
+                record_fields['Is Subscription'] = True
+            records.append(record_fields)
+        result = upsert_records(snapshot, products_table, records, 'Product Code')
+        return {'new': len(result['createdRecords']), 'updated': len(result['updatedRecords'])}
+
     # 기존 상품 조회
-    existing_products = get_existing_by_key(products_table, 'Product Code')
+    existing_products = get_existing_by_key(products_table, 'Product Code', snapshot)
     logger.info(f"Airtable 기존 상품: {len(existing_products)}")
 
     # 신규 상품만 추가
@@ -73,12 +93,9 @@ def sync_products(api: Api) -> int:
     logger.info(f"새 상품: {len(new_records)}")
 
     if not new_records:
-        return 0
+        return {'new': 0}
 
-    inserted = 0
-    for batch in batch_iterator(new_records, AIRTABLE_BATCH_SIZE):
-        products_table.batch_create(batch)
-        inserted += len(batch)
+    inserted = len(snapshot.batch_create(products_table, new_records))
 
     logger.info(f"상품 삽입 완료: {inserted}개")
-    return inserted
+    return {'new': inserted}
@@ -4,75 +4,107 @@ CSV 데이터를 Refunds 테이블로 동기화합니다.
 신규 환불 추가 및 미결정 상태 환불의 상태 변경 추적을 포함합니다.
 """
 
-from typing import Any
+from typing import Any, Mapping
 
-from pyairtable import Api
+from pyairtable import Api, Table
 
 from ... import config
 from ...logger import logger
-from ...utils import parse_price, safe_get, batch_iterator, to_iso_datetime
 
 from ..client import get_table
-from ..csv_reader import read_csv, find_csv
-from ..records import get_existing_by_key, get_existing_orders, get_pending_refunds
+from ..csv_reader import csv_cache, find_csv, iter_rows
+from ..delta import ExportDelta
+from ..indexes import FilteredMap, KeyMap, scan_table
+from ..records import PENDING_REFUND, TableSnapshot, get_existing_orders
+from ..writer import BatchWriteError
+from .upsert import upsert_enabled, upsert_records
 
-# Airtable 배치 크기 (API 제한)
-AIRTABLE_BATCH_SIZE = 10
 
+def _is_missing_option(error: Exception) -> bool:
+    """Single Select 옵션 누락 에러인지 확인"""
+    return 'INVALID_MULTIPLE_CHOICE_OPTIONS' in str(error)
 
-def _prepare_new_refunds(
-    csv_data: list[dict[str, Any]],
-    existing_refunds: dict[str, str],
-    existing_orders: dict[str, str]
-) -> list[dict[str, Any]]:
-    """신규 환불 레코드 준비
+
+def report_refund_write_error(error: BatchWriteError) -> None:
+    """실행 끝에 보낸 Refunds 쓰기 실패 안내 (쓰기 대기열 flush 결과)
 
     Args:
-        csv_data: CSV 데이터 리스트
-        existing_refunds: 기존 환불 레코드 (Order Number -> record_id)
+        error: Refunds 테이블의 배치 쓰기 실패
+    """
+    if all(_is_missing_option(e) for _, e in error.failures):
+        _log_missing_options(error.failed_records)
+        logger.info(f"환불 쓰기 실패: {len(error.failed_records)}개 (상태 옵션 누락)")
+    else:
+        logger.error(f"환불 쓰기 실패: {len(error.failed_records)}개 - {error}")
+
+
+def _log_missing_options(failed_records: list[dict[str, Any]]) -> None:
+    """Single Select 옵션 누락으로 실패한 레코드 안내"""
+    # 실패한 레코드들의 상태값 수집
+    statuses = set(r.get('Refund Status', '') for r in failed_records)
+    logger.warning("Airtable 'Refund Status' 필드에 새 옵션 추가 필요!")
+    logger.info(f"   누락된 옵션: {statuses}")
+    logger.info("   해결 방법: Airtable에서 Refunds 테이블의 'Refund Status' 필드에")
+    logger.info(f"   '{', '.join(statuses)}' 옵션을 수동으로 추가하세요.")
+
+
+def _refund_fields(row: Any, existing_orders: Mapping[str, str]) -> dict[str, Any]:
+    """CSV 행 -> Refunds 필드 (Orders Linked Record 포함)
+
+    Args:
+        row: Refunds CSV 행 (iter_rows, 가격/날짜 변환 완료)
         existing_orders: 기존 주문 레코드 (Order Number -> record_id)
 
     Returns:
-        새로 추가할 레코드 리스트
+        레코드 필드 딕셔너리
     """
-    new_records = []
-
-    for row in csv_data:
-        order_number = row.get('Order Number')
-        if not order_number or order_number in existing_refunds:
-            continue
+    order_id = existing_orders.get(row.order_number)
+
+    record_fields = {
+        'Order Number': row.order_number,
+        'Refund Status': row.refund_status,
+        'Refund Request Price': row.refund_price,
+        'Username': row.username,
+        'Member Code': row.member_code,
+        'Refund Request Date': row.refund_date,  # 원본 텍스트
+    }
 
-        order_id = existing_orders.get(order_number)
+    # Refund Request Date (ISO) - dateTime 형식
+    if row.refund_iso:
+        record_fields['Refund Request Date (ISO)'] = row.refund_iso
 
-        # Refund Request Date를 ISO dateTime으로 변환
-        refund_date_str = safe_get(row, 'Refund Request Date')
-        refund_datetime = to_iso_datetime(refund_date_str)
+    # Orders Linked Record 추가
+    if order_id:
+        record_fields['Orders'] = [order_id]
 
-        record_fields = {
-            'Order Number': order_number,
-            'Refund Status': safe_get(row, 'Refund Status'),
-            'Refund Request Price': parse_price(row.get('Refund Request Price')),
-            'Username': safe_get(row, 'Username'),
-            'Member Code': safe_get(row, 'Member Code'),
-            'Refund Request Date': refund_date_str,  # 원본 텍스트
-        }
+    return record_fields
 
-        # Refund Request Date (ISO) - dateTime 형식
-        if refund_datetime:
-            record_fields['Refund Request Date (ISO)'] = refund_datetime
 
-        # Orders Linked Record 추가
-        if order_id:
-            record_fields['Orders'] = [order_id]
+def _prepare_new_refunds(
+    rows: list[Any],
+    existing_refunds: dict[str, str],
+    existing_orders: dict[str, str]
+) -> list[dict[str, Any]]:
+    """신규 환불 레코드 준비
 
-        new_records.append(record_fields)
+    Args:
+        rows: CSV 행 리스트
+        existing_refunds: 기존 환불 레코드 (Order Number -> record_id)
+        existing_orders: 기존 주문 레코드 (Order Number -> record_id)
 
-    return new_records
+    Returns:
+        새로 추가할 레코드 리스트
+    """
+    return [
+        _refund_fields(row, existing_orders)
+        for row in rows
+        if row.order_number and row.order_number not in existing_refunds
+    ]
 
 
 def _find_status_updates(
     pending_refunds: dict[str, dict[str, Any]],
-    csv_by_order: dict[str, dict[str, Any]]
+    csv_by_order: dict[str, Any]
 ) -> list[dict[str, Any]]:
     """상태 변경 대상 찾기
 
@@ -90,7 +122,7 @@ def _find_status_updates(
         if not csv_row:
             continue
 
-        csv_status = csv_row.get('Refund Status')
+        csv_status = csv_row.refund_status
         airtable_status = pending_data['status']
 
         # 상태가 변경되었으면 업데이트 대상에 추가
@@ -103,18 +135,52 @@ def _find_status_updates(
     return updates
 
 
-def sync_refunds(api: Api) -> tuple[int, int]:
+def _upsert_refunds(
+    snapshot: TableSnapshot,
+    refunds_table: Table,
+    rows: list[Any],
+    existing_orders: Mapping[str, str]
+) -> tuple[int, int]:
+    """Order Number 기준 업서트 (기존 환불/미결정 환불 조회 없음)
+
+    Returns:
+        (생성된 수, 수정된 수) 튜플 (수정 수는 CSV와 매칭된 기존 환불 전체)
+    """
+    records = [_refund_fields(row, existing_orders) for row in rows if row.order_number]
+    try:
+        result = upsert_records(snapshot, refunds_table, records, 'Order Number')
+    except BatchWriteError as e:
+        # Single Select 옵션 누락 에러만 처리 (나머지는 그대로 전달)
+        if not all(_is_missing_option(error) for _, error in e.failures):
+            raise
+        _log_missing_options(e.failed_records)
+        logger.info(f"환불 업서트 실패: {len(e.failed_records)}개 (상태 옵션 누락)")
+        return len(e.created_ids), len(e.records) - len(e.created_ids)
+    return len(result['createdRecords']), len(result['updatedRecords'])
+
+
+def sync_refunds(
+    api: Api,
+    snapshot: TableSnapshot | None = None,
+    delta: ExportDelta | None = None
+) -> tuple[int, int]:
     """환불 데이터를 CSV에서 읽어 Airtable로 동기화
 
     - 신규 환불 추가 (Orders Linked Record 포함)
     - 미결정 상태 환불의 상태 변경 추적 및 업데이트
 
+    config.AIRTABLE_UPSERT['refunds']이면 기존 환불을 조회하지 않고 Order Number 기준으로
+    업서트합니다 (상태 변경도 업서트로 반영).
+
     Args:
         api: Airtable API 클라이언트
+        snapshot: 실행 단위 스냅샷 (없으면 새로 생성)
+        delta: 이번 실행의 CSV 변경분 (있으면 추가/변경된 행만 처리, 상태 변경도 변경된 행에 포함)
 
     Returns:
         (삽입된 수, 업데이트된 수) 튜플
     """
+    snapshot = snapshot or TableSnapshot()
     table_config = config.TABLES['refunds']
     file_path = find_csv(table_config['file_pattern'])
     refunds_table = get_table(api, config.AIRTABLE_TABLES['refunds'])
@@ -124,28 +190,32 @@ def sync_refunds(api: Api) -> tuple[int, int]:
     logger.info(f"Airtable 환불 동기화: {file_path.split('/')[-1]}")
     logger.info(f"{'='*50}")
 
-    csv_data = read_csv(file_path)
-    logger.info(f"CSV 레코드: {len(csv_data)}")
+    # 환불 CSV는 작으므로 행 리스트로 보관 (신규 추가 + 상태 변경 대조에 함께 사용)
+    rows = list((delta.iter_rows if delta else iter_rows)(file_path, 'refunds'))
+    logger.info(f"CSV 레코드: {len(rows)}")
 
-    # 기존 환불 조회
-    existing_refunds = get_existing_by_key(refunds_table, 'Order Number')
-    existing_orders = get_existing_orders(orders_table)
+    if upsert_enabled('refunds'):
+        return _upsert_refunds(
+            snapshot, refunds_table, rows, get_existing_orders(orders_table, snapshot)
+        )
 
-    # 미결정 상태 환불만 조회 (상태 변경 추적용)
-    pending_refunds = get_pending_refunds(refunds_table)
+    # Refunds 1회 순회로 기존 환불 + 미결정 상태 환불(상태 변경 추적용) 인덱스 생성
+    indexes = scan_table(refunds_table, {
+        'existing': KeyMap('Order Number'),
+        'pending': FilteredMap(PENDING_REFUND, 'Order Number', {'status': 'Refund Status'}),
+    }, snapshot)
+    existing_refunds = indexes['existing']
+    pending_refunds = indexes['pending']
+    existing_orders = get_existing_orders(orders_table, snapshot)
 
     logger.info(f"Airtable 기존 환불: {len(existing_refunds)}")
     logger.info(f"미결정 상태 환불: {len(pending_refunds)}")
 
-    # CSV를 Order Number로 인덱싱 (빠른 조회용)
-    csv_by_order = {
-        row.get('Order Number'): row
-        for row in csv_data
-        if row.get('Order Number')
-    }
+    # CSV Order Number 인덱스 (파일별로 한 번만 생성, 변경분이 있으면 변경된 행만)
+    csv_by_order = (delta or csv_cache).index(file_path, 'refunds', 'Order Number')
 
     # 1. 신규 환불 준비
-    new_records = _prepare_new_refunds(csv_data, existing_refunds, existing_orders)
+    new_records = _prepare_new_refunds(rows, existing_refunds, existing_orders)
 
     # 2. 상태 변경 대상 찾기
     refunds_to_update = _find_status_updates(pending_refunds, csv_by_order)
@@ -158,23 +228,17 @@ def sync_refunds(api: Api) -> tuple[int, int]:
     failed_records: list[dict[str, Any]] = []
 
     if new_records:
-        for batch in batch_iterator(new_records, AIRTABLE_BATCH_SIZE):
-            try:
-                refunds_table.batch_create(batch)
-                inserted += len(batch)
-            except Exception as e:
-                error_msg = str(e)
-                # Single Select 옵션 누락 에러 처리
-                if 'INVALID_MULTIPLE_CHOICE_OPTIONS' in error_msg:
-                    logger.warning("Airtable 'Refund Status' 필드에 새 옵션 추가 필요!")
-                    # 실패한 레코드들의 상태값 수집
-                    statuses = set(r.get('Refund Status', '') for r in batch)
-                    logger.info(f"   누락된 옵션: {statuses}")
-                    logger.info("   해결 방법: Airtable에서 Refunds 테이블의 'Refund Status' 필드에")
-                    logger.info(f"   '{', '.join(statuses)}' 옵션을 수동으로 추가하세요.")
-                    failed_records.extend(batch)
-                else:
-                    raise
+        try:
+            # 환불 레코드 ID를 쓰는 이후 단계가 없으므로 쓰기 대기열이 있으면 실행 끝까지 미룸
+            # (Orders 연결 복구 등 같은 레코드의 수정이 생성 요청에 합쳐짐)
+            inserted = len(snapshot.batch_create(refunds_table, new_records, defer=True))
+        except BatchWriteError as e:
+            # Single Select 옵션 누락 에러만 처리 (나머지는 그대로 전달)
+            if not all(_is_missing_option(error) for _, error in e.failures):
+                raise
+            inserted = len(e.records)
+            failed_records = e.failed_records
+            _log_missing_options(failed_records)
 
         if inserted > 0:
             logger.info(f"환불 삽입 완료: {inserted}개")
@@ -184,16 +248,13 @@ def sync_refunds(api: Api) -> tuple[int, int]:
     # 환불 상태 업데이트
     updated = 0
     if refunds_to_update:
-        for batch in batch_iterator(refunds_to_update, AIRTABLE_BATCH_SIZE):
-            try:
-                refunds_table.batch_update(batch)
-                updated += len(batch)
-            except Exception as e:
-                error_msg = str(e)
-                if 'INVALID_MULTIPLE_CHOICE_OPTIONS' in error_msg:
-                    logger.warning("환불 상태 업데이트 실패: 상태 옵션 누락")
-                else:
-                    raise
+        try:
+            updated = len(snapshot.batch_update(refunds_table, refunds_to_update))
+        except BatchWriteError as e:
+            if not all(_is_missing_option(error) for _, error in e.failures):
+                raise
+            updated = len(e.records)
+            logger.warning("환불 상태 업데이트 실패: 상태 옵션 누락")
         if updated > 0:
             logger.info(f"환불 상태 업데이트 완료: {updated}개")
 
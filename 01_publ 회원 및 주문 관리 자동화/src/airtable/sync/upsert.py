@@ -0,0 +1,65 @@
+"""업서트(performUpsert) 공통 처리
+
+settings.yaml의 airtable_upsert에서 켠 테이블은 기존 키를 조회하지 않고
+고유 키 필드를 fieldsToMergeOn으로 보내 Airtable이 생성/수정을 결정하게 합니다.
+"""
+
+from typing import Any
+
+from pyairtable import Table
+
+from ... import config
+from ...logger import logger
+
+from ..records import TableSnapshot
+
+
+def upsert_enabled(table_key: str) -> bool:
+    """테이블의 업서트 모드 여부
+
+    Args:
+        table_key: config.AIRTABLE_TABLES 키 (members, orders, ...)
+
+    Returns:
+        settings.yaml의 airtable_upsert 설정값
+    """
+    return bool(config.AIRTABLE_UPSERT.get(table_key, False))
+
+
+def upsert_records(
+    snapshot: TableSnapshot,
+    table: Table,
+    records: list[dict[str, Any]],
+    key_field: str
+) -> dict[str, list]:
+    """고유 키 기준 업서트
+
+    한 요청 안에 같은 키가 둘 이상이면 Airtable이 거부하므로
+    키가 같은 레코드는 마지막 것만 보냅니다 (CSV 뒤쪽 행 우선).
+
+    Args:
+        snapshot: 실행 단위 스냅샷
+        table: Airtable 테이블 객체
+        records: 필드 딕셔너리 리스트 (key_field 필수)
+        key_field: 매칭 필드 (fieldsToMergeOn)
+
+    Returns:
+        {'records', 'createdRecords', 'updatedRecords'} (BatchWriter.upsert 참고)
+
+    Raises:
+        BatchWriteError: 일부 배치 실패
+    """
+    unique = {fields[key_field]: fields for fields in records}
+    if len(unique) < len(records):
+        logger.warning(f"같은 {key_field} 중복 {len(records) - len(unique)}개: 마지막 행만 전송")
+    logger.info(f"업서트 대상: {len(unique)} ({key_field} 기준)")
+
+    if not unique:
+        return {'records': [], 'createdRecords': [], 'updatedRecords': []}
+
+    result = snapshot.batch_upsert(table, list(unique.values()), [key_field])
+    logger.info(
+        f"업서트 완료: 신규 {len(result['createdRecords'])}개, "
+        f"업데이트 {len(result['updatedRecords'])}개"
+    )
+    return result
@@ -4,47 +4,89 @@ Airtable 및 CSV 데이터의 중복 검사 기능을 제공합니다.
 """
 
 from collections import Counter, defaultdict
-from typing import Any
+from typing import Any, Iterable
 
 from pyairtable import Table
 
+from ..utils import batch_iterator
 
-def check_airtable_duplicates(table: Table, key_field: str) -> dict[str, list[str]]:
+from .formulas import In
+from .indexes import DuplicateGroups, scan_table
+from .records import KEYS_PER_FORMULA, TableSnapshot
+
+
+def check_airtable_duplicates(
+    table: Table,
+    key_field: str,
+    snapshot: TableSnapshot | None = None
+) -> dict[str, list[str]]:
     """Airtable 테이블에서 중복 키 검사
 
     Args:
         table: Airtable 테이블 객체
         key_field: 고유 키 필드명
+        snapshot: 실행 단위 스냅샷 (없으면 테이블 직접 조회)
 
     Returns:
         key_value -> [record_id1, record_id2, ...] (2개 이상인 것만)
     """
-    key_records: dict[str, list[str]] = defaultdict(list)
+    return scan_table(table, {'duplicates': DuplicateGroups(key_field)}, snapshot)['duplicates']
+
+
+def verify_inserts(
+    table: Table,
+    key_field: str,
+    expected_keys: list[str],
+    created: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """삽입한 키만 서버에서 다시 조회하여 삽입 결과 검증
 
-    for record in table.all():
-        key_value = record['fields'].get(key_field)
-        if key_value:
-            key_records[key_value].append(record['id'])
+    테이블 전체 대신 삽입한 키 값만 formula로 조회합니다 (레코드 ID + 키 필드).
+    스냅샷/캐시를 거치지 않으므로 batch_create 결과가 아니라 서버 상태를 확인합니다.
 
+    Args:
+        table: Airtable 테이블 객체
+        key_field: 고유 키 필드명
+        expected_keys: 삽입을 요청한 키 값 목록
+        created: batch_create가 반환한 레코드 리스트
+
+    Returns:
+        {
+            'confirmed': 서버에서 확인된 키 수,
+            'missing': 서버에 없는 키 목록 (삽입 실패),
+            'duplicates': 키 -> [record_id, ...] (서버에 2개 이상),
+            'unconfirmed_ids': batch_create가 반환했지만 서버에서 찾지 못한 레코드 ID 목록
+        }
+    """
+    keys = sorted(set(k for k in expected_keys if k))
+    found: dict[str, list[str]] = defaultdict(list)
+    server = TableSnapshot(retain=False)
+    for chunk in batch_iterator(keys, KEYS_PER_FORMULA):
+        for record in server.iter_select(table, In(key_field, chunk), [key_field]):
+            found[record['fields'][key_field]].append(record['id'])
+
+    found_ids = {record_id for ids in found.values() for record_id in ids}
     return {
-        key: ids
-        for key, ids in key_records.items()
-        if len(ids) > 1
+        'confirmed': len(found),
+        'missing': [key for key in keys if key not in found],
+        'duplicates': {key: ids for key, ids in found.items() if len(ids) > 1},
+        'unconfirmed_ids': [record['id'] for record in created if record['id'] not in found_ids],
     }
 
 
-def check_csv_duplicates(csv_data: list[dict[str, Any]], key_field: str) -> dict[str, int]:
+def check_csv_duplicates(csv_data: Iterable[Any], key_field: str) -> dict[str, int]:
     """CSV 데이터에서 중복 키 검사
 
+    행은 한 번만 순회하며 키만 셉니다 (iter_rows 결과를 그대로 넘겨도 행을 보관하지 않음).
+
     Args:
-        csv_data: CSV 레코드 리스트
-        key_field: 고유 키 필드명
+        csv_data: CSV 행 (딕셔너리 또는 iter_rows 행, row.get(key_field)로 키 조회)
+        key_field: 고유 키 필드명 (CSV 헤더)
 
     Returns:
         key_value -> 출현 횟수 (2회 이상인 것만)
     """
-    keys = [row.get(key_field) for row in csv_data if row.get(key_field)]
-    counter = Counter(keys)
+    counter = Counter(key for key in (row.get(key_field) for row in csv_data) if key)
 
     return {
         key: count
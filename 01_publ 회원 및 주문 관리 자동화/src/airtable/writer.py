@@ -0,0 +1,288 @@
+"""Airtable 배치 쓰기
+
+batch_create / batch_update 요청(최대 10개 레코드)을 스레드 풀로 동시에 보내고,
+결과는 입력 순서대로 모아 반환합니다.
+
+- 요청 속도: 테이블의 API 클라이언트가 RateLimitedApi면 그 한도를 공유하고,
+  아니면 BatchWriter의 토큰 버킷(config.AIRTABLE_REQUESTS_PER_SECOND)으로 제한
+- 일부 배치가 실패해도 나머지 배치는 끝까지 보내고, 실패 배치를 모아 BatchWriteError로 보고
+- 레코드 값 오류(422)로 거부된 배치는 반으로 나누어 다시 보내 문제 레코드만 실패로 남김
+  (quarantine(Quarantine)이 있으면 끝까지 거부된 레코드를 오류와 함께 기록)
+- schema(SchemaCache)가 있으면 스키마에 없는 Single Select 값을 담은 배치만 typecast로 보내
+  Airtable이 옵션을 추가하게 함
+- journal(WriteJournal)이 있으면 보내기 전에 배치를 기록하고, 응답마다 확인(ack)을 기록
+
+Example:
+    >>> writer = BatchWriter()
+    >>> created = writer.create(members_table, new_records)     # 10개씩 나누어 동시 전송
+    >>> updated = writer.update(orders_table, records_to_update)
+    >>> result = writer.upsert(members_table, records, ['Member Code'])
+    >>> result['createdRecords'], result['updatedRecords']      # 생성/수정된 레코드 ID
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from pyairtable import Table
+
+from .. import config
+from ..logger import logger
+from ..utils import batch_iterator
+
+from .journal import WriteJournal
+from .quarantine import Quarantine, is_record_error
+from .ratelimit import RateLimitedApi, RateLimiter
+from .schema import SchemaCache
+
+# Airtable 배치 크기 (API 제한: 요청당 최대 10개 레코드)
+AIRTABLE_BATCH_SIZE = 10
+
+
+class BatchWriteError(Exception):
+    """일부 배치 쓰기 실패
+
+    Attributes:
+        records: 성공한 배치의 결과 레코드 (입력 순서)
+        failures: (실패한 배치 레코드 리스트, 예외) 목록 (입력 순서, 값 오류는 레코드 1개씩)
+        created_ids: upsert에서 새로 생성된 레코드 ID (records 중 나머지는 수정)
+    """
+
+    def __init__(
+        self,
+        records: list[dict[str, Any]],
+        failures: list[tuple[list[dict[str, Any]], Exception]],
+        created_ids: set[str] | None = None
+    ) -> None:
+        self.records = records
+        self.failures = failures
+        self.created_ids = created_ids or set()
+        failed = sum(len(batch) for batch, _ in failures)
+        super().__init__(f"{len(failures)}개 배치 실패 ({failed}개 레코드): {failures[0][1]}")
+
+    @property
+    def failed_records(self) -> list[dict[str, Any]]:
+        """실패한 배치의 레코드 전체"""
+        return [record for batch, _ in self.failures for record in batch]
+
+    def succeeded(self, records: list[Any]) -> list[Any]:
+        """입력 레코드 중 성공한 배치에 속한 것 (입력 순서, self.records와 같은 순서)
+
+        Args:
+            records: 쓰기 요청에 넘긴 입력 레코드 리스트 (같은 객체)
+        """
+        failed = {id(record) for record in self.failed_records}
+        return [record for record in records if id(record) not in failed]
+
+
+class BatchWriter:
+    """동시 실행 + 속도 제한 배치 쓰기"""
+
+    def __init__(
+        self,
+        max_workers: int = config.AIRTABLE_WRITE_WORKERS,
+        requests_per_second: float = config.AIRTABLE_REQUESTS_PER_SECOND,
+        batch_size: int = AIRTABLE_BATCH_SIZE,
+        journal: WriteJournal | None = None,
+        quarantine: Quarantine | None = None,
+        schema: SchemaCache | None = None
+    ) -> None:
+        """
+        Args:
+            max_workers: 동시 요청 스레드 수
+            requests_per_second: 속도 제한이 없는 API 클라이언트에 적용할 초당 요청 수
+            batch_size: 요청당 레코드 수 (최대 10)
+            journal: 쓰기 저널 (없으면 기록하지 않음)
+            quarantine: 값 오류로 거부된 레코드 기록 (없으면 기록하지 않음)
+            schema: 스키마 캐시 (있으면 새 Single Select 옵션을 typecast로 추가)
+        """
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.limiter = RateLimiter(requests_per_second)
+        self.journal = journal
+        self.quarantine = quarantine
+        self.schema = schema
+
+    def create(self, table: Table, records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """레코드 생성
+
+        Args:
+            table: Airtable 테이블 객체
+            records: 생성할 필드 딕셔너리 리스트
+
+        Returns:
+            생성된 레코드 리스트 (입력 순서)
+
+        Raises:
+            BatchWriteError: 일부 배치 실패 (성공한 결과 포함)
+        """
+        return self._run(table, table.batch_create, records, 'create')
+
+    def update(self, table: Table, records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """레코드 수정
+
+        Args:
+            table: Airtable 테이블 객체
+            records: 수정할 레코드 리스트 [{id, fields}]
+
+        Returns:
+            수정된 레코드 리스트 (입력 순서)
+
+        Raises:
+            BatchWriteError: 일부 배치 실패 (성공한 결과 포함)
+        """
+        return self._run(table, table.batch_update, records, 'update')
+
+    def upsert(
+        self,
+        table: Table,
+        records: list[dict[str, Any]],
+        key_fields: list[str]
+    ) -> dict[str, list]:
+        """키 필드 기준 생성 또는 수정 (performUpsert)
+
+        Airtable이 key_fields 값이 같은 레코드를 찾아 수정하고, 없으면 생성합니다.
+        같은 요청 안에 키가 같은 레코드가 둘 이상이면 요청이 거부되므로 호출 전에 중복을 제거하세요.
+
+        Args:
+            table: Airtable 테이블 객체
+            records: 필드 딕셔너리 리스트 (key_fields 필드 필수)
+            key_fields: 매칭 필드 목록 (fieldsToMergeOn)
+
+        Returns:
+            {'records': 결과 레코드 (입력 순서), 'createdRecords': 생성된 ID, 'updatedRecords': 수정된 ID}
+
+        Raises:
+            BatchWriteError: 일부 배치 실패 (성공한 결과와 created_ids 포함)
+        """
+        created_ids: set[str] = set()
+        lock = threading.Lock()
+
+        def send(batch: list[dict[str, Any]], **kwargs: Any) -> list[dict[str, Any]]:
+            result = table.batch_upsert([{'fields': fields} for fields in batch], key_fields, **kwargs)
+            with lock:
+                created_ids.update(result['createdRecords'])
+            return result['records']
+
+        try:
+            written = self._run(table, send, records, 'upsert', key_fields)
+        except BatchWriteError as e:
+            raise BatchWriteError(e.records, e.failures, created_ids) from None
+        return {
+            'records': written,
+            'createdRecords': [record['id'] for record in written if record['id'] in created_ids],
+            'updatedRecords': [record['id'] for record in written if record['id'] not in created_ids],
+        }
+
+    def _run(
+        self,
+        table: Table,
+        send: Callable[..., list[dict[str, Any]]],
+        records: list[dict[str, Any]],
+        op: str,
+        key_fields: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        batches = list(batch_iterator(records, self.batch_size))
+        if not batches:
+            return []
+
+        # RateLimitedApi는 요청마다 이미 토큰을 받으므로 중복 제한하지 않음
+        limited = isinstance(getattr(table, 'api', None), RateLimitedApi)
+
+        # 스키마에 없는 Single Select 값을 담은 배치 -> 새 옵션 (typecast로 전송)
+        new_choices = self._new_choices(table, batches, op)
+
+        # 보내기 전에 모든 배치를 저널에 기록 (중단 시 보내지 못한 배치도 재개 대상)
+        seqs: list[int | None] = (
+            self.journal.plan(table.name, op, batches, key_fields) if self.journal
+            else [None] * len(batches)
+        )
+
+        Outcome = tuple[list[dict[str, Any]], list[tuple[list[dict[str, Any]], Exception]]]
+
+        def bisect(batch: list[dict[str, Any]], typecast: bool) -> Outcome:
+            """배치 전송, 값 오류면 반으로 나누어 재전송 (결과는 입력 순서)"""
+            if not limited:
+                self.limiter.acquire()
+            try:
+                return (send(batch, typecast=True) if typecast else send(batch)), []
+            except Exception as e:
+                if len(batch) == 1 or not is_record_error(e):
+                    return [], [(batch, e)]
+            middle = len(batch) // 2
+            left_written, left_failures = bisect(batch[:middle], typecast)
+            right_written, right_failures = bisect(batch[middle:], typecast)
+            return left_written + right_written, left_failures + right_failures
+
+        def write(job: tuple[int, int | None, list[dict[str, Any]]]) -> Outcome:
+            index, seq, batch = job
+            result, batch_failures = bisect(batch, index in new_choices)
+            dead = [(rows, e) for rows, e in batch_failures if is_record_error(e)]
+            if self.quarantine:
+                for rows, e in dead:
+                    self.quarantine.add(table.name, op, rows, e, key_fields)
+            if seq is not None:
+                # 값 오류만 남았으면 다시 보내도 같은 결과이므로 확인 처리 (레코드는 격리 파일에)
+                if len(dead) < len(batch_failures):
+                    self.journal.fail(seq, batch_failures[0][1])
+                else:
+                    self.journal.ack(seq, [record['id'] for record in result])
+            return result, batch_failures
+
+        jobs = list(zip(range(len(batches)), seqs, batches))
+        workers = min(self.max_workers, len(batches))
+        if workers <= 1:
+            outcomes = [write(job) for job in jobs]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                outcomes = list(executor.map(write, jobs))
+
+        written: list[dict[str, Any]] = []
+        failures: list[tuple[list[dict[str, Any]], Exception]] = []
+        for result, batch_failures in outcomes:
+            written.extend(result)
+            failures.extend(batch_failures)
+
+        if self.schema:
+            # 성공한 배치의 새 옵션은 스키마에 반영, 값 오류가 남았으면 스키마를 다시 조회하도록 버림
+            for index, choices in new_choices.items():
+                if not outcomes[index][1]:
+                    self.schema.add_choices(table.name, choices)
+            if any(is_record_error(e) for _, e in failures):
+                self.schema.invalidate()
+
+        if failures:
+            raise BatchWriteError(written, failures)
+        return written
+
+    def _new_choices(
+        self,
+        table: Table,
+        batches: list[list[dict[str, Any]]],
+        op: str
+    ) -> dict[int, dict[str, set[str]]]:
+        """배치별 스키마에 없는 Single Select 옵션 (옵션이 없는 배치는 제외)
+
+        Returns:
+            배치 순번 -> 필드명 -> 새 옵션 집합
+        """
+        if self.schema is None:
+            return {}
+        new_choices = {}
+        try:
+            for index, batch in enumerate(batches):
+                fields = [record['fields'] for record in batch] if op == 'update' else batch
+                choices = self.schema.missing_choices(table.name, fields)
+                if choices:
+                    new_choices[index] = choices
+        except Exception as e:
+            logger.warning(f"  스키마 조회 실패 (옵션 확인 없이 전송): {e}")
+            return {}
+        if new_choices:
+            added: dict[str, set[str]] = {}
+            for choices in new_choices.values():
+                for name, values in choices.items():
+                    added.setdefault(name, set()).update(values)
+            for name, values in added.items():
+                logger.info(f"  {table.name}.{name} 새 옵션 추가 (typecast): {', '.join(sorted(values))}")
+        return new_choices
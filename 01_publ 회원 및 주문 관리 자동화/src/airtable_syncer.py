@@ -3,22 +3,48 @@
 CSV 데이터를 Airtable로 직접 동기화.
 - Members/Orders/Refunds 테이블 지원
 - Linked Record 자동 연결
+- 계획/적용 분리: plan_sync()가 변경 목록을 파일로 저장하고 apply_sync_plan()이 적용
+- 변경분 동기화: 마지막으로 동기화된 내보내기와 비교하여 추가/변경된 CSV 행만 처리
 """
 
-from typing import Any
+import time
+from pathlib import Path
+from typing import Any, Callable
 
+from pyairtable import Api
+
+from . import config
 from .logger import logger
+from .airtable.writer import BatchWriter
 
 # airtable 패키지에서 공통 기능 import
 from .airtable import (
     get_api as get_airtable_api,
+    get_table,
+    find_csv,
+    csv_cache,
+    AirtableMirror,
+    ExportDelta,
+    TableSnapshot,
+    Quarantine,
+    SchemaCache,
+    WriteJournal,
+    load_delta,
+    mark_synced,
     # Sync functions
     sync_members as sync_members_to_airtable,
     sync_orders as sync_orders_to_airtable,
     sync_refunds as sync_refunds_to_airtable,
+    report_refund_write_error,
     sync_products as sync_products_to_airtable,
     sync_member_products as sync_member_products_to_airtable,
     update_orders_member_products_link,
+    # Plan
+    apply_plan,
+    build_plan,
+    load_plan,
+    log_plan,
+    save_plan,
     # Schema, History, Maintenance
     ensure_tables_exist,
     record_sync_history,
@@ -29,17 +55,244 @@ from .airtable import (
 )
 
 
+def prefetch_tables(api: Api, snapshot: TableSnapshot) -> dict[str, float]:
+    """동기화 단계가 읽는 테이블을 동시에 조회하여 스냅샷에 적재
+
+    Args:
+        api: Airtable API 클라이언트
+        snapshot: 실행 단위 스냅샷
+
+    Returns:
+        테이블명 -> 소요 시간 (초)
+    """
+    table_keys = ['members', 'orders', 'products', 'member_products', 'refunds']
+    tables = [get_table(api, config.AIRTABLE_TABLES[key]) for key in table_keys]
+
+    logger.info(f"\n{'='*50}")
+    logger.info(f"테이블 사전 조회 ({len(tables)}개 동시, 최대 {config.AIRTABLE_PREFETCH_WORKERS}개 스레드)")
+    logger.info(f"{'='*50}")
+
+    started = time.perf_counter()
+    durations = snapshot.prefetch(tables, config.AIRTABLE_PREFETCH_WORKERS)
+    for table in tables:
+        if table.name in durations:
+            logger.info(f"  - {table.name}: {snapshot.loaded_count(table)}개 ({durations[table.name]:.1f}초)")
+    logger.info(f"사전 조회 완료: {time.perf_counter() - started:.1f}초")
+    return durations
+
+
+def flush_writes(snapshot: TableSnapshot, results: dict[str, dict[str, Any]]) -> dict[str, dict[str, int]]:
+    """단계별로 모아 둔 쓰기를 한 번에 전송
+
+    Refunds 생성은 실행 끝까지 미뤄지므로 results['refunds']['new']를 실제 생성 수로 고칩니다.
+
+    Args:
+        snapshot: 실행 단위 스냅샷 (쓰기 대기열 포함)
+        results: 동기화 결과 딕셔너리
+
+    Returns:
+        테이블명 -> {'created', 'updated', 'update_ops', 'requests', 'failed'}
+    """
+    if snapshot.queue is None or not len(snapshot.queue):
+        return {}
+
+    logger.info(f"\n{'='*50}")
+    logger.info(f"쓰기 반영 (대기 레코드 {len(snapshot.queue)}개)")
+    logger.info(f"{'='*50}")
+
+    flushed = snapshot.flush()
+    summary: dict[str, dict[str, int]] = {}
+    for table_name, outcome in flushed.items():
+        failed = sum(len(e.failed_records) for e in outcome['errors'])
+        summary[table_name] = {
+            'created': len(outcome['created']),
+            'updated': outcome['updated'],
+            'update_ops': outcome['update_ops'],
+            'requests': outcome['requests'],
+            'failed': failed,
+        }
+        logger.info(
+            f"  - {table_name}: 생성 {len(outcome['created'])}개, 수정 {outcome['updated']}개 "
+            f"(수정 요청 {outcome['update_ops']}건 병합, 배치 {outcome['requests']}회)"
+        )
+        for error in outcome['errors']:
+            if table_name == config.AIRTABLE_TABLES['refunds']:
+                report_refund_write_error(error)
+            else:
+                logger.error(f"  {table_name} 쓰기 실패: {len(error.failed_records)}개 - {error}")
+
+    refunds = flushed.get(config.AIRTABLE_TABLES['refunds'])
+    if refunds and refunds['create_ops'] and isinstance(results.get('refunds'), dict):
+        results['refunds']['new'] = len(refunds['created'])
+    return summary
+
+
+def log_api_stats(api: Api) -> dict[str, Any]:
+    """이번 실행의 API 요청 통계 로그 (요청 한도에 얼마나 가까웠는지)
+
+    Args:
+        api: Airtable API 클라이언트
+
+    Returns:
+        ThrottledApi.stats() 결과 (통계가 없는 클라이언트면 빈 딕셔너리)
+    """
+    if not hasattr(api, 'stats'):
+        return {}
+    stats = api.stats()
+
+    logger.info(f"\n{'='*50}")
+    logger.info("API 요청 통계")
+    logger.info(f"{'='*50}")
+    logger.info(f"  - 요청: {stats['requests']}회 (재시도 {stats['retries']}회, 최종 실패 {stats['failed']}회)")
+    logger.info(f"  - 429: {stats['throttled']}회, 5xx: {stats['server_errors']}회")
+    logger.info(
+        f"  - 속도: 최대 {stats['max_rate']:.1f}/초, 최저 {stats['lowest_rate']:.1f}/초, "
+        f"현재 {stats['rate']:.1f}/초"
+    )
+    logger.info(f"  - 한도 사용률: {stats['utilization']:.0%} ({stats['elapsed']:.1f}초 동안)")
+    logger.info(
+        f"  - 지연: 평균 {stats['latency_avg'] * 1000:.0f}ms, 최대 {stats['latency_max'] * 1000:.0f}ms, "
+        f"토큰 대기 {stats['waited']:.1f}초, 백오프 {stats['backoff']:.1f}초"
+    )
+    if stats['throttled']:
+        logger.warning(f"429 응답 {stats['throttled']}회: requests_per_second 또는 동시 스레드 수를 낮추는 것을 고려하세요")
+    return stats
+
+
+def run_sync_stages(
+    api: Api,
+    snapshot: TableSnapshot,
+    results: dict[str, dict[str, Any]],
+    on_stage: Callable[[str], None] | None = None,
+    delta: ExportDelta | None = None
+) -> None:
+    """동기화 단계 실행 (Members -> Products -> MemberProducts -> Orders -> 연결 복구 -> Refunds -> 검증)
+
+    sync_all_to_airtable(바로 쓰기)과 plan_sync(계획만 기록)가 같은 단계를 공유합니다.
+    Members/Orders 단계의 오류는 호출자에게 전달하고, 나머지 단계의 오류는 results에 기록합니다.
+    delta가 있으면 CSV 단계는 추가/변경된 행만 처리하고, 변경분이 없는 CSV의 단계
+    (Members / Products·MemberProducts·Orders / Refunds)는 건너뜁니다 (결과에 'unchanged': True).
+    연결 복구와 필수 필드 검증은 Airtable 기준이므로 항상 실행합니다.
+
+    Args:
+        api: Airtable API 클라이언트
+        snapshot: 실행 단위 스냅샷
+        results: 단계별 결과를 채울 딕셔너리
+        on_stage: 단계가 끝날 때마다 단계 이름으로 호출 (계획 모드의 단계별 변경 수 집계용)
+        delta: 이번 실행의 CSV 변경분 (없으면 CSV 전체 처리)
+    """
+    def mark(stage: str) -> None:
+        if on_stage:
+            on_stage(stage)
+
+    def unchanged(table_key: str) -> bool:
+        if delta and delta.unchanged(table_key):
+            logger.info(f"{table_key} CSV 변경 없음: 동기화 단계 건너뜀")
+            return True
+        return False
+
+    # Members 동기화
+    if unchanged('members'):
+        results['members'] = {'new': 0, 'updated': 0, 'unchanged': True}
+    else:
+        results['members'] = sync_members_to_airtable(api, snapshot, delta)
+    mark('members')
+
+    orders_unchanged = unchanged('orders')
+
+    # Products 동기화 (Orders CSV에서 상품 추출)
+    try:
+        if orders_unchanged:
+            results['products'] = {'new': 0, 'unchanged': True}
+        else:
+            results['products'] = sync_products_to_airtable(api, snapshot, delta)
+    except Exception as e:
+        logger.warning(f"Products 동기화 건너뜀: {e}")
+        results['products'] = {'new': 0, 'error': str(e)}
+    mark('products')
+
+    # MemberProducts 동기화 (Orders CSV의 회원+상품 조합, 신규만)
+    try:
+        if orders_unchanged:
+            results['member_products'] = {'new': 0, 'unchanged': True}
+        else:
+            results['member_products'] = sync_member_products_to_airtable(api, snapshot, delta)
+    except Exception as e:
+        logger.warning(f"MemberProducts 동기화 건너뜀: {e}")
+        results['member_products'] = {'new': 0, 'error': str(e)}
+    mark('member_products')
+
+    # Orders 동기화 (신규 추가, Member + MemberProducts 연결 포함)
+    if orders_unchanged:
+        results['orders'] = {'new': 0, 'updated': 0, 'unchanged': True}
+    else:
+        results['orders'] = sync_orders_to_airtable(api, snapshot, delta)
+    mark('orders')
+
+    # Orders → MemberProducts 연결 누락 복구 (기존 주문)
+    try:
+        orders_linked = update_orders_member_products_link(api, snapshot)
+        results['orders']['member_products_linked'] = orders_linked
+    except Exception as e:
+        logger.warning(f"Orders-MemberProducts 연결 건너뜀: {e}")
+        results['orders']['member_products_linked'] = 0
+    mark('orders_links')
+
+    # Refunds 동기화 (상태 변경 업데이트 포함)
+    try:
+        if unchanged('refunds'):
+            results['refunds'] = {'new': 0, 'updated': 0, 'unchanged': True}
+        else:
+            new_count, update_count = sync_refunds_to_airtable(api, snapshot, delta)
+            results['refunds'] = {'new': new_count, 'updated': update_count}
+    except Exception as e:
+        logger.error(f"Refunds 동기화 오류: {e}")
+        results['refunds'] = {'new': 0, 'updated': 0, 'error': str(e)}
+    mark('refunds')
+
+    # Refunds → Orders Linked Record 복구 (빈 연결 자동 채우기)
+    try:
+        refunds_linked = backfill_refunds_orders_link(api, snapshot=snapshot)
+        results['refunds']['orders_linked'] = refunds_linked
+    except Exception as e:
+        logger.warning(f"Refunds-Orders 연결 복구 건너뜀: {e}")
+        results['refunds']['orders_linked'] = 0
+    mark('refunds_links')
+
+    # 필수 필드 검증 및 자동 복구
+    try:
+        validation_results = validate_required_fields(api, auto_fix=True, snapshot=snapshot)
+        results['validation'] = validation_results
+    except Exception as e:
+        logger.warning(f"필수 필드 검증 건너뜀: {e}")
+        results['validation'] = {'error': str(e)}
+    mark('validation')
+
+
 def sync_all_to_airtable() -> dict[str, dict[str, Any]]:
     """CSV 데이터를 Airtable로 전체 동기화
 
     동기화 순서:
     1. Members - 회원 데이터
-    2. Orders - 주문 데이터 (신규 추가, Member 연결)
-    3. Products - 상품 마스터 (Orders에서 추출)
-    4. MemberProducts - 회원별 상품 (신규만)
-    5. Orders - MemberProducts 연결 업데이트
+    2. Products - 상품 마스터 (Orders CSV에서 추출)
+    3. MemberProducts - 회원별 상품 (Orders CSV의 조합, 신규만)
+    4. Orders - 주문 데이터 (신규 추가, Member + MemberProducts 연결)
+    5. Orders - MemberProducts 연결 누락 복구 (기존 주문)
     6. Refunds - 환불 데이터
 
+    모든 단계는 하나의 TableSnapshot을 공유하여 각 테이블을 한 번만 조회합니다.
+    수정(과 Refunds 생성)은 쓰기 대기열에 레코드별로 병합했다가 마지막에 한 번에 보냅니다.
+    config.AIRTABLE_UPSERT에서 켠 테이블은 신규/수정 수를 함께 반환합니다 ({'new', 'updated'}).
+    config.AIRTABLE_PREFETCH_ENABLED이면 단계 시작 전에 모든 테이블을 동시에 조회합니다.
+    config.AIRTABLE_JOURNAL_ENABLED이면 배치 쓰기를 저널에 기록하여, 중단 시
+    `--resume`으로 미확인 배치만 재전송할 수 있습니다 (정상 종료 시 저널 삭제).
+    값 오류로 거부된 배치는 나누어 다시 보내고, 끝까지 거부된 레코드는
+    config.AIRTABLE_QUARANTINE_ENABLED이면 격리 파일에 기록합니다 (`--retry-quarantine`).
+    스키마는 SchemaCache에 저장해 두고, config.AIRTABLE_ADD_SELECT_OPTIONS이면 새 Single Select 값
+    (예: 새 Refund Status)을 담은 배치를 typecast로 보내 옵션을 자동으로 추가합니다.
+    config.CSV_DELTA_ENABLED이면 새 CSV를 마지막으로 깨끗하게 동기화된 내보내기(archive)와 비교하여
+    추가/변경된 행만 처리하고, 깨끗하게 끝난 실행의 CSV를 다음 비교 기준으로 기록합니다.
+
     Returns:
         각 테이블별 동기화 결과 딕셔너리
     """
@@ -48,69 +301,165 @@ def sync_all_to_airtable() -> dict[str, dict[str, Any]]:
     logger.info("=" * 60)
 
     api = get_airtable_api()
+    journal = WriteJournal.begin(config.JOURNAL_FILE) if config.AIRTABLE_JOURNAL_ENABLED else None
+    quarantine = Quarantine.begin(config.QUARANTINE_FILE) if config.AIRTABLE_QUARANTINE_ENABLED else None
+    schema = SchemaCache(api)
+    snapshot = TableSnapshot.for_sync(journal, quarantine, schema if config.AIRTABLE_ADD_SELECT_OPTIONS else None)
     results: dict[str, dict[str, Any]] = {}
+    delta = None
 
     try:
-        # 테이블 존재 확인 및 생성
-        ensure_tables_exist(api)
+        # 이전 내보내기와 비교한 CSV 변경분 (전체 동기화할 차례면 None)
+        if config.CSV_DELTA_ENABLED:
+            delta = load_delta()
+            if delta:
+                results['delta'] = delta.summary()
 
-        # Members 동기화
-        results['members'] = {'new': sync_members_to_airtable(api)}
+        # 테이블 존재 확인 및 생성 (저장된 스키마가 유효하면 조회 없음)
+        ensure_tables_exist(api, schema)
 
-        # Orders 동기화 (신규 추가, Member 연결)
-        results['orders'] = {'new': sync_orders_to_airtable(api)}
+        # 모든 테이블 동시 사전 조회 (읽기 단계 지연을 가장 느린 테이블 수준으로)
+        if config.AIRTABLE_PREFETCH_ENABLED:
+            prefetch_tables(api, snapshot)
 
-        # Products 동기화 (Orders CSV에서 상품 추출)
-        try:
-            results['products'] = {'new': sync_products_to_airtable(api)}
-        except Exception as e:
-            logger.warning(f"Products 동기화 건너뜀: {e}")
-            results['products'] = {'new': 0, 'error': str(e)}
+        run_sync_stages(api, snapshot, results, delta=delta)
 
-        # MemberProducts 동기화 (신규만)
-        try:
-            member_products_result = sync_member_products_to_airtable(api)
-            results['member_products'] = member_products_result
-        except Exception as e:
-            logger.warning(f"MemberProducts 동기화 건너뜀: {e}")
-            results['member_products'] = {'new': 0, 'error': str(e)}
+    except Exception as e:
+        logger.error(f"오류 (Airtable 동기화): {e}")
+        results['error'] = str(e)
 
-        # Orders → MemberProducts 연결 업데이트
-        try:
-            orders_linked = update_orders_member_products_link(api)
-            results['orders']['member_products_linked'] = orders_linked
-        except Exception as e:
-            logger.warning(f"Orders-MemberProducts 연결 건너뜀: {e}")
-            results['orders']['member_products_linked'] = 0
+    # 단계별 수정을 레코드별로 병합하여 한 번에 전송 (중간 단계가 실패해도 앞 단계 결과는 반영)
+    try:
+        results['writes'] = flush_writes(snapshot, results)
+    except Exception as e:
+        logger.error(f"쓰기 반영 오류: {e}")
+        results['error'] = str(e)
 
-        # Refunds 동기화 (상태 변경 업데이트 포함)
-        try:
-            new_count, update_count = sync_refunds_to_airtable(api)
-            results['refunds'] = {'new': new_count, 'updated': update_count}
-        except Exception as e:
-            logger.error(f"Refunds 동기화 오류: {e}")
-            results['refunds'] = {'new': 0, 'updated': 0, 'error': str(e)}
+    # 모든 배치가 확인되었으면 저널 삭제 (실패 배치가 있으면 --resume용으로 유지)
+    if journal:
+        results['journal'] = {'pending': journal.close()}
+
+    # 값 오류로 거부된 레코드가 없으면 격리 파일 삭제
+    if quarantine:
+        results['quarantine'] = {'records': quarantine.close()}
 
-        # Refunds → Orders Linked Record 복구 (빈 연결 자동 채우기)
+    # 깨끗하게 끝났으면 이번 CSV를 다음 실행의 비교 기준으로 기록
+    if config.CSV_DELTA_ENABLED:
         try:
-            refunds_linked = backfill_refunds_orders_link(api)
-            results['refunds']['orders_linked'] = refunds_linked
+            mark_synced(results, delta)
         except Exception as e:
-            logger.warning(f"Refunds-Orders 연결 복구 건너뜀: {e}")
-            results['refunds']['orders_linked'] = 0
+            logger.warning(f"CSV 비교 기준 기록 건너뜀: {e}")
+
+    # 실행 동안 공유한 파싱된 CSV 반환 (다음 실행은 새 내보내기를 읽음)
+    csv_cache.clear()
+
+    results['api'] = log_api_stats(api)
+    return results
+
+
+def _plan_snapshot(api: Api) -> tuple[TableSnapshot, str]:
+    """계획용 스냅샷 (로컬 미러가 있으면 API 호출 없이 미러에서 적재)
+
+    Returns:
+        (스냅샷, 'mirror' | 'api')
+    """
+    snapshot = TableSnapshot.for_plan()
+    if config.AIRTABLE_MIRROR_ENABLED and config.MIRROR_FILE.exists():
+        with AirtableMirror(config.MIRROR_FILE) as mirror:
+            if all(mirror.last_refreshed(key) for key in ['members', 'orders', 'refunds', 'products', 'member_products']):
+                mirror.snapshot(snapshot=snapshot)
+                return snapshot, 'mirror'
+    if config.AIRTABLE_PREFETCH_ENABLED:
+        prefetch_tables(api, snapshot)
+    return snapshot, 'api'
+
+
+def plan_sync(path: Path = config.PLAN_FILE) -> dict[str, Any]:
+    """동기화 계획 계산 후 파일로 저장 (Airtable에 쓰지 않음)
+
+    sync_all_to_airtable과 같은 단계를 TableSnapshot.for_plan()으로 실행하여
+    생성/수정/연결 복구/검증 복구를 레코드별로 병합한 변경 목록을 만듭니다.
+    로컬 미러가 있으면 API 호출 없이 계산합니다 (없으면 증분 조회 캐시로 스냅샷 적재).
+    테이블/필드 생성(ensure_tables_exist)은 하지 않습니다.
+
+    Args:
+        path: 계획 파일 경로
 
-        # 필수 필드 검증 및 자동 복구
+    Returns:
+        계획 딕셔너리 (plan 모듈 참고)
+    """
+    logger.info("\n" + "=" * 60)
+    logger.info("AIRTABLE 동기화 계획")
+    logger.info("=" * 60)
+
+    started = time.perf_counter()
+    api = get_airtable_api()
+    snapshot, source = _plan_snapshot(api)
+    results: dict[str, dict[str, Any]] = {}
+
+    # 단계별 변경 수 = 단계 전후 대기열 수 차이
+    stages: dict[str, dict[str, dict[str, int]]] = {}
+    previous: dict[str, dict[str, int]] = {}
+
+    def on_stage(stage: str) -> None:
+        nonlocal previous
+        current = snapshot.queue.counts()
+        changed = {}
+        for table_name, counts in current.items():
+            before = previous.get(table_name, {'creates': 0, 'update_ops': 0})
+            created = counts['creates'] - before['creates']
+            updated = counts['update_ops'] - before['update_ops']
+            if created or updated:
+                changed[table_name] = {'create': created, 'update': updated}
+        if changed:
+            stages[stage] = changed
+        previous = current
+
+    run_sync_stages(api, snapshot, results, on_stage)
+
+    errors = {stage: result['error'] for stage, result in results.items() if 'error' in result}
+    csv_files = {}
+    for table_key, table_config in config.TABLES.items():
         try:
-            validation_results = validate_required_fields(api, auto_fix=True)
-            results['validation'] = validation_results
-        except Exception as e:
-            logger.warning(f"필수 필드 검증 건너뜀: {e}")
-            results['validation'] = {'error': str(e)}
+            csv_files[table_key] = Path(find_csv(table_config['file_pattern'])).name
+        except FileNotFoundError:
+            csv_files[table_key] = None
 
-    except Exception as e:
-        logger.error(f"오류 (Airtable 동기화): {e}")
-        results['error'] = str(e)
+    plan = build_plan(snapshot.queue.changes(), stages, {'snapshot': source, 'csv': csv_files}, errors)
+    save_plan(plan, path)
+    csv_cache.clear()
+
+    logger.info(f"\n{'='*50}")
+    logger.info(f"계획 저장: {path} ({time.perf_counter() - started:.2f}초)")
+    logger.info(f"{'='*50}")
+    log_plan(plan)
+    return plan
+
+
+def apply_sync_plan(path: Path = config.PLAN_FILE) -> dict[str, dict[str, int]]:
+    """저장된 계획 적용 (CSV/스냅샷 재계산 없음)
 
+    실패 후 같은 계획을 다시 적용하면 이미 생성된 레코드는 고유 키로 확인하여 건너뜁니다.
+
+    Args:
+        path: 계획 파일 경로
+
+    Returns:
+        테이블명 -> {'created', 'existing', 'updated', 'skipped', 'failed'}
+    """
+    logger.info("\n" + "=" * 60)
+    logger.info(f"AIRTABLE 계획 적용: {path}")
+    logger.info("=" * 60)
+
+    plan = load_plan(path)
+    log_plan(plan)
+
+    api = get_airtable_api()
+    schema = SchemaCache(api)
+    ensure_tables_exist(api, schema)
+    writer = BatchWriter(schema=schema if config.AIRTABLE_ADD_SELECT_OPTIONS else None)
+    results = apply_plan(api, plan, writer)
+    log_api_stats(api)
     return results
 
 
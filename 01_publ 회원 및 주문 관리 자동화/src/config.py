@@ -62,6 +62,13 @@ PUBL_CHANNEL_ID: str = os.getenv('PUBL_CHANNEL_ID', 'L2NoYW5uZWxzLzE3Njkx')
 DOWNLOAD_DIR: Path = BASE_DIR / 'downloads'
 ARCHIVE_DIR: Path = BASE_DIR / 'archive'
 SESSION_FILE: Path = BASE_DIR / '.session.json'
+CACHE_DIR: Path = BASE_DIR / '.airtable_cache'
+MIRROR_FILE: Path = BASE_DIR / 'airtable_mirror.sqlite3'
+JOURNAL_FILE: Path = BASE_DIR / '.airtable_journal.jsonl'
+QUARANTINE_FILE: Path = BASE_DIR / '.airtable_quarantine.jsonl'
+SCHEMA_FILE: Path = BASE_DIR / '.airtable_schema.json'
+PLAN_FILE: Path = BASE_DIR / 'sync_plan.json'
+DELTA_STATE_FILE: Path = BASE_DIR / '.csv_delta_state.json'
 
 # 브라우저 설정 (settings.yaml에서 로드, 기본값 제공)
 HEADLESS: bool = _settings.get('browser', {}).get('headless', True)
@@ -96,6 +103,61 @@ PROCESSING_ORDER: list[str] = ['members', 'orders', 'refunds']
 # 동기화 설정 (settings.yaml에서 로드, 기본값 제공)
 BATCH_SIZE: int = _settings.get('sync', {}).get('batch_size', 100)
 TIMEZONE: str = _settings.get('sync', {}).get('timezone', '+09:00')
+SYNC_DETECT_CHANGES: bool = _settings.get('sync', {}).get('detect_changes', True)
+
+# CSV 변경분 동기화 설정 (settings.yaml에서 로드, 기본값 제공)
+CSV_DELTA_ENABLED: bool = _settings.get('csv_delta', {}).get('enabled', True)
+CSV_DELTA_FULL_SYNC_DAYS: float = _settings.get('csv_delta', {}).get('full_sync_days', 7)
+
+# 전체 이력 주문 CSV 열 단위 읽기 설정 (settings.yaml에서 로드, 기본값 제공)
+CSV_COLUMNAR_ENABLED: bool = _settings.get('csv_columnar', {}).get('enabled', True)
+CSV_COLUMNAR_PATTERN: str = _settings.get('csv_columnar', {}).get('file_pattern', '*_orders_all.csv')
+CSV_COLUMNAR_BATCH_ROWS: int = _settings.get('csv_columnar', {}).get('batch_rows', 10000)
+
+# 파싱된 CSV 캐시 설정 (settings.yaml에서 로드, 기본값 제공)
+CSV_CACHE_ENABLED: bool = _settings.get('csv_cache', {}).get('enabled', True)
+CSV_CACHE_MAX_BYTES: int = int(_settings.get('csv_cache', {}).get('max_mb', 100) * 1024 * 1024)
+
+# Airtable API 호출 설정 (settings.yaml에서 로드, 기본값 제공)
+AIRTABLE_REQUESTS_PER_SECOND: float = _settings.get('airtable_api', {}).get('requests_per_second', 5)
+AIRTABLE_PREFETCH_ENABLED: bool = _settings.get('airtable_api', {}).get('prefetch', True)
+AIRTABLE_PREFETCH_WORKERS: int = _settings.get('airtable_api', {}).get('prefetch_workers', 5)
+AIRTABLE_WRITE_WORKERS: int = _settings.get('airtable_api', {}).get('write_workers', 5)
+AIRTABLE_MIN_REQUESTS_PER_SECOND: float = _settings.get('airtable_api', {}).get('min_requests_per_second', 1)
+AIRTABLE_RAMP_STEP: float = _settings.get('airtable_api', {}).get('ramp_step', 0.05)
+AIRTABLE_MAX_RETRIES: int = _settings.get('airtable_api', {}).get('max_retries', 5)
+AIRTABLE_BACKOFF_SECONDS: float = _settings.get('airtable_api', {}).get('backoff_seconds', 1)
+AIRTABLE_BACKOFF_MAX_SECONDS: float = _settings.get('airtable_api', {}).get('backoff_max_seconds', 30)
+
+# Airtable 업서트 모드 (settings.yaml에서 로드, 기본값 제공)
+_default_upsert: dict[str, bool] = {
+    'members': False,
+    'orders': False,
+    'refunds': False,
+    'products': False,
+}
+AIRTABLE_UPSERT: dict[str, bool] = {
+    **_default_upsert,
+    **_settings.get('airtable_upsert', {})
+}
+
+# Airtable 증분 조회 캐시 설정 (settings.yaml에서 로드, 기본값 제공)
+AIRTABLE_CACHE_ENABLED: bool = _settings.get('airtable_cache', {}).get('enabled', True)
+AIRTABLE_CACHE_RECONCILE_HOURS: float = _settings.get('airtable_cache', {}).get('reconcile_hours', 24)
+
+# Airtable 로컬 SQLite 미러 설정 (settings.yaml에서 로드, 기본값 제공)
+AIRTABLE_MIRROR_ENABLED: bool = _settings.get('airtable_mirror', {}).get('enabled', True)
+AIRTABLE_MIRROR_RECONCILE_HOURS: float = _settings.get('airtable_mirror', {}).get('reconcile_hours', 24)
+
+# Airtable 쓰기 저널 설정 (settings.yaml에서 로드, 기본값 제공)
+AIRTABLE_JOURNAL_ENABLED: bool = _settings.get('airtable_journal', {}).get('enabled', True)
+
+# Airtable 격리 파일 설정 (settings.yaml에서 로드, 기본값 제공)
+AIRTABLE_QUARANTINE_ENABLED: bool = _settings.get('airtable_quarantine', {}).get('enabled', True)
+
+# Airtable 스키마 캐시 설정 (settings.yaml에서 로드, 기본값 제공)
+AIRTABLE_SCHEMA_CACHE_HOURS: float = _settings.get('airtable_schema', {}).get('cache_hours', 24)
+AIRTABLE_ADD_SELECT_OPTIONS: bool = _settings.get('airtable_schema', {}).get('add_select_options', True)
 
 # Airtable 테이블 설정 (settings.yaml에서 로드, 기본값 제공)
 _default_tables: dict[str, str] = {
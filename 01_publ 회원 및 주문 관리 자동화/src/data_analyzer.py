@@ -4,66 +4,77 @@ Airtable과 publ CSV 간의 데이터 불일치를 분석하고 리포트 생성
 """
 
 import argparse
-import csv
 import glob
 import re
 from collections import defaultdict
 from pathlib import Path
-from typing import Any
+from typing import Any, Mapping
 
 from pyairtable import Api
 
 from . import config
+from .airtable.compact import CompactTable
+from .airtable.csv_reader import csv_cache
+from .airtable.mirror import AirtableMirror
+from .airtable.records import iter_records
 from .logger import logger
 
 
+# 분석/리포트에 쓰는 Members 필드 (이 필드만 조회하고 보관)
+ANALYSIS_FIELDS = ['Member Code', 'Name', 'E-mail', 'Sign-up Date']
+
+
 def get_airtable_api() -> Api:
     """Airtable API 클라이언트 생성"""
     return Api(config.AIRTABLE_API_KEY)
 
 
-def load_airtable_members(api: Api) -> dict[str, dict[str, Any]]:
-    """Airtable에서 모든 Members 레코드 조회
+def load_airtable_members(api: Api) -> Mapping[str, dict[str, Any]]:
+    """Airtable에서 모든 Members 레코드 조회 (ANALYSIS_FIELDS만)
 
     Args:
         api: Airtable API 클라이언트
 
     Returns:
-        member_code -> {id, fields} 매핑 딕셔너리
+        member_code -> {id, fields} 매핑 (CompactTable 기반, 조회 시 레코드 생성)
     """
     table = api.table(config.AIRTABLE_BASE_ID, config.AIRTABLE_TABLES['members'])
+    members = CompactTable(iter_records(table, fields=ANALYSIS_FIELDS))
+    return members.by_key('Member Code')
 
-    result: dict[str, dict[str, Any]] = {}
-    for record in table.all():
-        member_code = record['fields'].get('Member Code')
-        if member_code:
-            result[member_code] = {
-                'id': record['id'],
-                'fields': record['fields']
-            }
 
-    return result
+def load_mirror_members(mirror: AirtableMirror) -> Mapping[str, dict[str, Any]]:
+    """로컬 미러에서 모든 Members 레코드 조회 (API 호출 없음, ANALYSIS_FIELDS만)
+
+    Args:
+        mirror: 로컬 SQLite 미러
+
+    Returns:
+        member_code -> {id, fields} 매핑 (CompactTable 기반, 조회 시 레코드 생성)
+    """
+    members = CompactTable(
+        {
+            'id': record['id'],
+            'createdTime': record['createdTime'],
+            'fields': {k: v for k, v in record['fields'].items() if k in ANALYSIS_FIELDS},
+        }
+        for record in mirror.records('members')
+    )
+    return members.by_key('Member Code')
 
 
-def load_csv_members(csv_path: str) -> dict[str, dict[str, Any]]:
+def load_csv_members(csv_path: str) -> Mapping[str, Any]:
     """CSV 파일에서 회원 데이터 로드
 
+    같은 프로세스에서 동기화가 이미 읽은 파일이면 파싱된 캐시(csv_cache)의 인덱스를 그대로 사용합니다.
+
     Args:
         csv_path: CSV 파일 경로
 
     Returns:
-        member_code -> {row_data} 매핑 딕셔너리
+        member_code -> 행 매핑 (행은 .get('Name') 등 CSV 헤더로 조회)
     """
-    result: dict[str, dict[str, Any]] = {}
-
-    with open(csv_path, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            member_code = row.get('Member Code')
-            if member_code:
-                result[member_code] = dict(row)
-
-    return result
+    return csv_cache.index(csv_path, 'members', 'Member Code')
 
 
 def find_latest_csv(pattern: str = '*_members.csv') -> str | None:
@@ -93,12 +104,12 @@ def find_latest_csv(pattern: str = '*_members.csv') -> str | None:
 
 
 def find_airtable_duplicates(
-    airtable_members: dict[str, dict[str, Any]]
+    airtable_members: Mapping[str, dict[str, Any]]
 ) -> dict[str, list[str]]:
     """Airtable에서 중복 Member Code 찾기
 
     Note: load_airtable_members는 이미 중복을 덮어쓰므로,
-    이 함수는 table.all()을 직접 호출하여 중복 검사
+    이 함수는 Member Code만 다시 스트리밍 조회하여 중복 검사
 
     Args:
         airtable_members: 사용하지 않음 (API 재호출 필요)
@@ -111,7 +122,7 @@ def find_airtable_duplicates(
 
     member_code_records: dict[str, list[str]] = defaultdict(list)
 
-    for record in table.all():
+    for record in iter_records(table, fields=['Member Code']):
         member_code = record['fields'].get('Member Code')
         if member_code:
             member_code_records[member_code].append(record['id'])
@@ -125,8 +136,8 @@ def find_airtable_duplicates(
 
 
 def find_discrepancies(
-    airtable_members: dict[str, dict[str, Any]],
-    csv_members: dict[str, dict[str, Any]]
+    airtable_members: Mapping[str, dict[str, Any]],
+    csv_members: Mapping[str, Any]
 ) -> dict[str, list]:
     """Airtable과 CSV 간 불일치 레코드 찾기
 
@@ -154,7 +165,7 @@ def find_discrepancies(
 
 def identify_test_records(
     member_codes: list[str],
-    airtable_members: dict[str, dict[str, Any]]
+    airtable_members: Mapping[str, dict[str, Any]]
 ) -> dict[str, list[str]]:
     """테스트 레코드와 정상 레코드 분류
 
@@ -208,8 +219,8 @@ def identify_test_records(
 
 
 def print_analysis_report(
-    airtable_members: dict[str, dict[str, Any]],
-    csv_members: dict[str, dict[str, Any]],
+    airtable_members: Mapping[str, dict[str, Any]],
+    csv_members: Mapping[str, Any],
     duplicates: dict[str, list[str]],
     discrepancies: dict[str, list],
     record_classification: dict[str, list[str]],
@@ -330,11 +341,12 @@ def print_analysis_report(
     logger.info("\n" + "=" * 60)
 
 
-def run_analysis(csv_path: str | None = None) -> dict[str, Any]:
+def run_analysis(csv_path: str | None = None, use_mirror: bool = False) -> dict[str, Any]:
     """전체 분석 실행
 
     Args:
         csv_path: CSV 파일 경로 (None이면 최신 파일 자동 검색)
+        use_mirror: True면 Airtable API 대신 로컬 SQLite 미러 사용
 
     Returns:
         분석 결과 딕셔너리
@@ -350,14 +362,23 @@ def run_analysis(csv_path: str | None = None) -> dict[str, Any]:
 
     logger.info(f"분석 CSV: {csv_path}")
 
-    # API 연결
-    logger.info("Airtable 연결 중...")
-    api = get_airtable_api()
+    if use_mirror:
+        # 로컬 미러에서 로드 (중복 검사도 SQL로 처리)
+        logger.info(f"로컬 미러 로드 중... ({config.MIRROR_FILE.name})")
+        with AirtableMirror(config.MIRROR_FILE) as mirror:
+            airtable_members = load_mirror_members(mirror)
+            mirror_duplicates = mirror.duplicates('members')
+            refreshed = mirror.last_refreshed('members')
+        logger.info(f"  - Airtable (미러, 갱신 기준 {refreshed or '없음'}): {len(airtable_members)}개")
+    else:
+        # API 연결
+        logger.info("Airtable 연결 중...")
+        api = get_airtable_api()
 
-    # 데이터 로드
-    logger.info("Airtable 데이터 로드 중...")
-    airtable_members = load_airtable_members(api)
-    logger.info(f"  - Airtable: {len(airtable_members)}개")
+        # 데이터 로드
+        logger.info("Airtable 데이터 로드 중...")
+        airtable_members = load_airtable_members(api)
+        logger.info(f"  - Airtable: {len(airtable_members)}개")
 
     logger.info("CSV 데이터 로드 중...")
     csv_members = load_csv_members(csv_path)
@@ -365,7 +386,10 @@ def run_analysis(csv_path: str | None = None) -> dict[str, Any]:
 
     # 중복 검사
     logger.info("중복 검사 중...")
-    duplicates = find_airtable_duplicates(airtable_members)
+    if use_mirror:
+        duplicates = mirror_duplicates
+    else:
+        duplicates = find_airtable_duplicates(airtable_members)
 
     # 불일치 검사
     logger.info("불일치 검사 중...")
@@ -405,9 +429,14 @@ def main():
         type=str,
         help='분석할 members CSV 파일 경로 (없으면 최신 파일 자동 검색)'
     )
+    parser.add_argument(
+        '--mirror',
+        action='store_true',
+        help='Airtable API 대신 로컬 SQLite 미러 사용 (오프라인 분석)'
+    )
 
     args = parser.parse_args()
-    run_analysis(csv_path=args.csv)
+    run_analysis(csv_path=args.csv, use_mirror=args.mirror)
 
 
 if __name__ == '__main__':
@@ -5,9 +5,18 @@
 2. 다운로드한 CSV 데이터를 Airtable에 동기화
 3. 처리 완료된 CSV 파일 아카이브
 4. 동기화 히스토리 기록 (SyncHistory 테이블)
+5. 로컬 SQLite 미러 갱신 (settings.yaml의 airtable_mirror)
 
 초기화 모드:
 --init-orders 옵션으로 주문 전체 페이지 다운로드
+
+재개 모드:
+--resume 옵션으로 중단된 동기화의 미확인 쓰기 배치만 재전송 (다운로드/전체 조회 없음)
+--retry-quarantine 옵션으로 값 오류로 격리된 레코드만 재전송 (Airtable 옵션 추가 등을 고친 뒤)
+
+계획/적용 모드:
+--plan [경로] 옵션으로 다운로드된 CSV와 로컬 미러로 변경 목록만 계산하여 저장 (Airtable에 쓰지 않음)
+--apply [경로] 옵션으로 저장된 계획을 Airtable에 적용 (CSV 재계산 없음)
 """
 
 import shutil
@@ -18,7 +27,8 @@ from typing import Any
 
 from . import config
 from .downloader import download_all, download_orders_all_pages, get_timestamp, login
-from .airtable_syncer import sync_all_to_airtable, record_sync_history
+from .airtable import get_api, refresh_mirror, resume_writes, retry_quarantined
+from .airtable_syncer import apply_sync_plan, plan_sync, sync_all_to_airtable, record_sync_history
 from .logger import logger
 
 
@@ -87,6 +97,8 @@ def print_summary(
             if isinstance(result, dict):
                 if 'error' in result:
                     logger.error(f"  {data_type.upper()}: 오류 - {result['error']}")
+                elif result.get('unchanged'):
+                    logger.info(f"  {data_type.upper()}: CSV 변경 없음 (건너뜀)")
                 elif 'updated' in result:
                     logger.info(f"  {data_type.upper()}: {result['new']}개 신규, {result['updated']}개 업데이트")
                 else:
@@ -198,6 +210,18 @@ def main() -> None:
         downloaded_files=downloaded_files_str
     )
 
+    # 5. 로컬 미러 갱신 (SyncHistory 포함, 실패해도 동기화 결과에는 영향 없음)
+    if config.AIRTABLE_MIRROR_ENABLED:
+        logger.info("")
+        logger.info("#" * 60)
+        logger.info("# STEP 5: 로컬 미러 갱신")
+        logger.info("#" * 60)
+
+        try:
+            refresh_mirror()
+        except Exception as e:
+            logger.warning(f"로컬 미러 갱신 건너뜀: {e}")
+
 
 def run_init_orders() -> None:
     """주문 전체 페이지 다운로드 (초기화용)"""
@@ -238,14 +262,98 @@ def run_init_orders() -> None:
         logger.error(f"오류: {e}")
 
 
+def run_resume() -> None:
+    """중단된 동기화의 미확인 쓰기 배치 재전송 (쓰기 저널 기준)"""
+    logger.info("")
+    logger.info("=" * 60)
+    logger.info("중단된 동기화 재개")
+    logger.info("=" * 60)
+
+    # 환경변수 검증
+    try:
+        config.validate_config()
+    except ValueError as e:
+        logger.error(f"설정 오류:\n{e}")
+        logger.error(".env 파일을 확인해주세요.")
+        return
+
+    try:
+        resume_writes(get_api())
+    except Exception as e:
+        logger.error(f"재개 오류: {e}")
+
+
+def run_retry_quarantine() -> None:
+    """값 오류로 격리된 레코드 재전송"""
+    try:
+        config.validate_config()
+    except ValueError as e:
+        logger.error(f"설정 오류:\n{e}")
+        logger.error(".env 파일을 확인해주세요.")
+        return
+
+    try:
+        retry_quarantined(get_api())
+    except Exception as e:
+        logger.error(f"재전송 오류: {e}")
+
+
+def run_plan(path: Path) -> None:
+    """동기화 계획 계산 후 저장 (Airtable에 쓰지 않음)"""
+    try:
+        config.validate_config()
+    except ValueError as e:
+        logger.error(f"설정 오류:\n{e}")
+        logger.error(".env 파일을 확인해주세요.")
+        return
+
+    try:
+        plan_sync(path)
+    except Exception as e:
+        logger.error(f"계획 오류: {e}")
+
+
+def run_apply(path: Path) -> None:
+    """저장된 동기화 계획 적용"""
+    try:
+        config.validate_config()
+    except ValueError as e:
+        logger.error(f"설정 오류:\n{e}")
+        logger.error(".env 파일을 확인해주세요.")
+        return
+
+    if not path.exists():
+        logger.error(f"계획 파일이 없습니다: {path}")
+        return
+
+    try:
+        apply_sync_plan(path)
+    except Exception as e:
+        logger.error(f"적용 오류: {e}")
+
+
 if __name__ == '__main__':
     if len(sys.argv) > 1:
         if sys.argv[1] == '--init-orders':
             run_init_orders()
+        elif sys.argv[1] == '--resume':
+            run_resume()
+        elif sys.argv[1] == '--retry-quarantine':
+            run_retry_quarantine()
+        elif sys.argv[1] in ('--plan', '--apply'):
+            plan_path = Path(sys.argv[2]) if len(sys.argv) > 2 else config.PLAN_FILE
+            if sys.argv[1] == '--plan':
+                run_plan(plan_path)
+            else:
+                run_apply(plan_path)
         else:
             logger.warning(f"알 수 없는 옵션: {sys.argv[1]}")
             logger.info("사용법:")
             logger.info("  python -m src.main              # 일반 동기화")
             logger.info("  python -m src.main --init-orders # 주문 전체 페이지 다운로드")
+            logger.info("  python -m src.main --resume      # 중단된 쓰기 배치만 재전송")
+            logger.info("  python -m src.main --retry-quarantine # 격리된 레코드만 재전송")
+            logger.info("  python -m src.main --plan [경로]  # 변경 목록만 계산하여 저장")
+            logger.info("  python -m src.main --apply [경로] # 저장된 계획 적용")
     else:
         main()
@@ -1,10 +1,22 @@
 """공통 유틸리티 모듈
 
 Airtable 동기화에서 공통으로 사용하는 함수들을 모아둔 모듈.
+- 셀 단위 변환: parse_price, to_iso_datetime
+- 열 단위 변환: normalize_prices, normalize_datetimes (반복 값은 메모에서 조회)
 """
 
 from datetime import datetime, timedelta
-from typing import Any, Callable, Iterator
+from typing import Any, Callable, Iterable, Iterator
+
+from . import config
+
+# 변환 메모 최대 항목 수 (가득 차면 비우고 다시 채움)
+MEMO_MAX_SIZE = 65536
+
+_MISSING = object()
+
+# 월별 최대 일수 (2월 29일은 윤년 확인이 필요하므로 strptime 경로)
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
 
 
 def batch_process(
@@ -92,11 +104,43 @@ def safe_get(data: dict[str, Any], key: str, default: Any = '') -> Any:
     return value if value is not None else default
 
 
-def to_iso_datetime(date_str: str | None) -> str | None:
-    """날짜 문자열을 ISO 8601 형식으로 변환 (KST 타임존)
+def _fixed_width_iso(text: str, tz: str) -> str | None:
+    """publ 고정폭 형식(YYYY-MM-DD HH:MM[:SS])을 슬라이싱으로 ISO 변환
+
+    형식이 다르거나 범위 확인이 필요한 값(2월 29일 이후 등)은 None -> strptime 경로에서 처리합니다.
+    """
+    length = len(text)
+    if length == 19:
+        if text[16] != ':':
+            return None
+        seconds = text[17:19]
+    elif length == 16:
+        seconds = '00'
+    else:
+        return None
+    if text[4] != '-' or text[7] != '-' or text[10] != ' ' or text[13] != ':':
+        return None
+    digits = text[0:4] + text[5:7] + text[8:10] + text[11:13] + text[14:16] + seconds
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+
+    month = int(text[5:7])
+    if not (
+        text[0:4] != '0000' and 1 <= month <= 12 and 1 <= int(text[8:10]) <= _DAYS_IN_MONTH[month]
+        and int(text[11:13]) < 24 and int(text[14:16]) < 60 and int(seconds) < 60
+    ):
+        return None
+    return f"{text[0:10]}T{text[11:16]}:{seconds}{tz}"
+
+
+def to_iso_datetime(date_str: str | None, tz: str | None = None) -> str | None:
+    """날짜 문자열을 ISO 8601 형식으로 변환
+
+    publ 고정폭 형식은 슬라이싱으로, 그 밖의 값은 strptime으로 변환합니다.
 
     Args:
         date_str: 날짜 문자열 (YYYY-MM-DD HH:MM:SS 또는 YYYY-MM-DD HH:MM 형식)
+        tz: UTC 오프셋 (없으면 config.TIMEZONE, settings.yaml의 sync.timezone)
 
     Returns:
         ISO 8601 형식 문자열 (예: 2024-12-27T15:30:45+09:00) 또는 None
@@ -112,9 +156,11 @@ def to_iso_datetime(date_str: str | None) -> str | None:
     if not date_str or not date_str.strip():
         return None
 
-    from datetime import datetime
-
+    tz = tz or config.TIMEZONE
     date_str = date_str.strip()
+    iso = _fixed_width_iso(date_str, tz)
+    if iso:
+        return iso
 
     # 여러 형식 시도
     formats = [
@@ -125,13 +171,91 @@ def to_iso_datetime(date_str: str | None) -> str | None:
     for fmt in formats:
         try:
             dt = datetime.strptime(date_str, fmt)
-            return dt.strftime('%Y-%m-%dT%H:%M:%S') + '+09:00'
+            return dt.strftime('%Y-%m-%dT%H:%M:%S') + tz
         except ValueError:
             continue
 
     return None
 
 
+class BoundedMemo:
+    """크기가 제한된 변환 결과 메모
+
+    같은 값이 반복되는 열(가격, 결제 시각 등)은 고유값마다 한 번만 변환합니다.
+    max_size개가 차면 메모를 비우고 다시 채웁니다 (고유값이 대부분인 열에서도 항목당 비용이 일정).
+    """
+
+    def __init__(self, convert: Callable[[Any], Any], max_size: int = MEMO_MAX_SIZE) -> None:
+        """
+        Args:
+            convert: 값 1개를 변환하는 함수
+            max_size: 보관할 최대 항목 수
+        """
+        self.convert = convert
+        self.max_size = max_size
+        self._values: dict[Any, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def map(self, values: Iterable[Any]) -> list[Any]:
+        """값 목록 변환 (메모에 있으면 조회, 없으면 변환 후 저장)"""
+        memo = self._values
+        convert = self.convert
+        result = []
+        append = result.append
+        for value in values:
+            converted = memo.get(value, _MISSING)
+            if converted is _MISSING:
+                converted = convert(value)
+                if len(memo) >= self.max_size:
+                    memo.clear()
+                memo[value] = converted
+            append(converted)
+        return result
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+_price_memo = BoundedMemo(parse_price)
+_datetime_memos: dict[str, BoundedMemo] = {}
+
+
+def normalize_prices(values: Iterable[str | int | float | None]) -> list[int]:
+    """가격 열을 한 번에 정수로 변환 (parse_price와 같은 결과)
+
+    Args:
+        values: 가격 값 목록 (CSV 열 등)
+
+    Returns:
+        정수 가격 리스트 (입력 순서)
+
+    Raises:
+        ValueError: 숫자로 읽을 수 없는 가격 (parse_price와 같음)
+    """
+    return _price_memo.map(values)
+
+
+def normalize_datetimes(values: Iterable[str | None], tz: str | None = None) -> list[str | None]:
+    """날짜 열을 한 번에 ISO 8601로 변환 (to_iso_datetime과 같은 결과)
+
+    타임존별 메모를 사용하므로 같은 시각이 반복되는 열은 고유값마다 한 번만 변환합니다.
+
+    Args:
+        values: 날짜 문자열 목록 (CSV 열 등)
+        tz: UTC 오프셋 (없으면 config.TIMEZONE)
+
+    Returns:
+        ISO 8601 문자열 또는 None 리스트 (입력 순서)
+    """
+    tz = tz or config.TIMEZONE
+    memo = _datetime_memos.get(tz)
+    if memo is None:
+        memo = _datetime_memos[tz] = BoundedMemo(lambda value: to_iso_datetime(value, tz))
+    return memo.map(values)
+
+
 def parse_iso_datetime(iso_str: str | None) -> datetime | None:
     """ISO 8601 형식 문자열을 datetime 객체로 변환
 
@@ -145,13 +269,12 @@ def parse_iso_datetime(iso_str: str | None) -> datetime | None:
         return None
 
     try:
-        # +09:00 형식의 타임존 제거하고 파싱
-        if '+' in iso_str:
-            iso_str = iso_str.split('+')[0]
-        elif iso_str.endswith('Z'):
-            iso_str = iso_str[:-1]
+        # Z는 Python 3.11 미만의 fromisoformat이 읽지 못하므로 +00:00으로 바꾼 뒤 파싱
+        if iso_str.endswith('Z'):
+            iso_str = iso_str[:-1] + '+00:00'
 
-        return datetime.fromisoformat(iso_str)
+        # +09:00/-05:00 형식의 타임존 제거 (로컬 시각 그대로)
+        return datetime.fromisoformat(iso_str).replace(tzinfo=None)
     except ValueError:
         return None
 
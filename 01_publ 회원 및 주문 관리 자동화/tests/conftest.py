@@ -1,16 +1,46 @@
 """공통 테스트 fixtures"""
 
 import pytest
+import requests
 from unittest.mock import MagicMock
 
 
 @pytest.fixture
 def mock_table():
-    """Mock Airtable Table object"""
+    """Mock Airtable Table object
+
+    iterate()는 all()에 설정한 결과를 100개 단위 페이지로 나누어 반환합니다.
+    (all.return_value / all.side_effect만 설정하면 두 방식 모두 같은 데이터를 봄)
+    """
     table = MagicMock()
+
+    def iterate(*args, **kwargs):
+        records = table.all(*args, **kwargs)
+        for i in range(0, len(records), 100):
+            yield records[i:i + 100]
+
+    table.iterate.side_effect = iterate
     return table
 
 
+def echo_create(key_field='n', prefix='rec'):
+    """batch_create 응답 흉내 (레코드 ID = prefix + 키 필드 값, typecast 등 인자는 무시)
+
+    Example:
+        >>> mock_table.batch_create.side_effect = echo_create('Member Code')
+    """
+    def create(records, **kwargs):
+        return [{'id': f"{prefix}{fields[key_field]}", 'fields': fields} for fields in records]
+    return create
+
+
+def record_error(message='INVALID_MULTIPLE_CHOICE_OPTIONS'):
+    """레코드 값 오류(422) 응답 흉내"""
+    response = requests.Response()
+    response.status_code = 422
+    return requests.HTTPError(f"422 Client Error: {message}", response=response)
+
+
 @pytest.fixture
 def sample_csv_data():
     """샘플 CSV 데이터 (중복 포함)"""
@@ -0,0 +1,72 @@
+"""columnar 모듈 테스트"""
+
+import pytest
+
+from src import config
+from src.airtable import columnar
+from src.airtable.csv_reader import iter_rows
+
+ORDERS_CSV = (
+    "Order Number,Product name,Price,Date and Time of Payment,E-mail,Extra\n"
+    "O1,P1,\"1,000원\",2024-12-27 15:30:45,a@example.com,x\n"
+    "\n"
+    "O2,P2,,2024-12-27 15:30,,\n"
+    "O3,\"P, 3\", 500 ,2024-02-30 10:00:00,,\n"
+    "O4,P1,+700,2024-1-5 3:04:05,,\n"
+    "O5,P1,0, 2024-12-27 15:30:45 ,,\n"
+    "O6,P1,12,not a date,,\n"
+)
+
+
+@pytest.fixture
+def orders_file(tmp_path, monkeypatch):
+    """행 단위 결과와 비교할 주문 CSV (파일명이 전체 이력 패턴과 다르므로 iter_rows는 행 단위)"""
+    monkeypatch.setattr(config, 'CSV_COLUMNAR_ENABLED', True)
+    path = tmp_path / "orders.csv"
+    path.write_bytes(b'\xef\xbb\xbf' + ORDERS_CSV.encode('utf-8'))
+    return path
+
+
+@pytest.mark.parametrize('backend', [
+    'python',
+    pytest.param('arrow', marks=pytest.mark.skipif(columnar.pa is None, reason='pyarrow 없음')),
+])
+def test_same_rows_as_iter_rows(orders_file, backend):
+    """열 단위 변환 결과가 행 단위와 같음 (배치 경계, 빈 줄, 없는 날짜 포함)"""
+    expected = list(iter_rows(str(orders_file), 'orders'))
+
+    rows = list(columnar.iter_rows_columnar(str(orders_file), 'orders', batch_rows=2, backend=backend))
+
+    assert rows == expected
+    assert rows[0].price == 1000
+    assert rows[2].payment_iso is None  # 2월 30일
+
+
+def test_column_batches(orders_file):
+    """배치마다 스키마 열 순서의 열 리스트"""
+    batches = list(columnar.iter_column_batches(str(orders_file), 'orders', batch_rows=4, backend='python'))
+
+    assert [len(columns[0]) for columns in batches] == [4, 2]
+    assert batches[0][0] == ['O1', 'O2', 'O3', 'O4']
+
+
+def test_full_history_file_read_by_columns(tmp_path, monkeypatch):
+    """전체 이력 파일은 iter_rows가 열 단위 리더로 읽음"""
+    monkeypatch.setattr(config, 'CSV_COLUMNAR_ENABLED', True)
+    calls = []
+    monkeypatch.setattr(
+        columnar, 'iter_rows_columnar', lambda path, table_key: calls.append(path) or iter([])
+    )
+    path = tmp_path / "260101_090000_orders_all.csv"
+    path.write_text("Order Number\nO1\n", encoding='utf-8')
+
+    assert list(iter_rows(str(path), 'orders')) == []
+    assert calls == [str(path)]
+
+
+def test_arrow_backend_requires_pyarrow(orders_file, monkeypatch):
+    """pyarrow 없이 arrow 백엔드를 요청하면 ValueError"""
+    monkeypatch.setattr(columnar, 'pa', None)
+
+    with pytest.raises(ValueError):
+        list(columnar.iter_column_batches(str(orders_file), 'orders', backend='arrow'))
@@ -0,0 +1,128 @@
+"""compact 모듈 테스트"""
+
+from src.airtable.compact import CompactTable, KeyIndex
+from src.airtable.records import TableSnapshot, get_existing_by_key
+
+
+class TestCompactTable:
+    """CompactTable 클래스 테스트"""
+
+    def test_round_trip(self, sample_refund_records):
+        """보관 후 조회하면 같은 레코드"""
+        table = CompactTable(sample_refund_records)
+
+        assert len(table) == len(sample_refund_records)
+        assert [record['id'] for record in table] == [record['id'] for record in sample_refund_records]
+        for original in sample_refund_records:
+            assert table.get(original['id'])['fields'] == original['fields']
+
+    def test_missing_fields_are_omitted(self):
+        """레코드에 없던 필드는 조회 결과에도 없음 (None과 구분)"""
+        table = CompactTable([
+            {'id': 'rec1', 'fields': {'Member Code': 'M001', 'Name': None}},
+            {'id': 'rec2', 'fields': {'Member Code': 'M002', 'E-mail': 'a@b.com'}},
+        ])
+
+        assert table.get('rec1')['fields'] == {'Member Code': 'M001', 'Name': None}
+        assert table.get('rec2')['fields'] == {'Member Code': 'M002', 'E-mail': 'a@b.com'}
+
+    def test_put_replaces_existing_record(self):
+        """같은 ID는 자리를 유지하며 값 교체"""
+        table = CompactTable([
+            {'id': 'rec1', 'fields': {'Member Code': 'M001', 'Name': 'A'}},
+            {'id': 'rec2', 'fields': {'Member Code': 'M002'}},
+        ])
+
+        table.put({'id': 'rec1', 'fields': {'Member Code': 'M001'}})
+
+        assert len(table) == 2
+        assert table.get('rec1')['fields'] == {'Member Code': 'M001'}
+        assert [record['id'] for record in table] == ['rec1', 'rec2']
+
+    def test_patch_keeps_other_fields(self):
+        """patch는 주어진 필드만 교체"""
+        table = CompactTable([{'id': 'rec1', 'fields': {'Member Code': 'M001', 'Name': 'A'}}])
+
+        table.patch('rec1', {'Name': 'B', 'Is Active': True})
+        table.patch('rec9', {'Name': 'X'})
+
+        assert table.get('rec1')['fields'] == {'Member Code': 'M001', 'Name': 'B', 'Is Active': True}
+        assert len(table) == 1
+
+    def test_rekey(self):
+        """레코드 ID만 바꾸고 자리와 필드 유지"""
+        table = CompactTable([{'id': 'pending:1', 'fields': {'Member Code': 'M001'}}])
+
+        table.rekey('pending:1', 'rec1')
+
+        assert 'pending:1' not in table
+        assert table.get('rec1')['fields'] == {'Member Code': 'M001'}
+
+    def test_linked_records_returned_as_lists(self):
+        """Linked Record는 튜플로 보관하고 리스트로 반환"""
+        table = CompactTable([{'id': 'ord1', 'fields': {'Member': ['recM1']}}])
+
+        assert table.get('ord1')['fields']['Member'] == ['recM1']
+
+    def test_key_index_is_bidirectional(self, sample_airtable_records):
+        """키 -> ID (중복은 마지막), ID -> 키"""
+        index = CompactTable(sample_airtable_records).key_index('Member Code')
+
+        assert dict(index) == {'M001': 'rec3', 'M002': 'rec2'}
+        assert index.key_of('rec1') == 'M001'
+        assert index.key_of('rec2') == 'M002'
+
+    def test_by_key_view(self, sample_airtable_records_no_duplicates):
+        """키 -> 레코드 뷰"""
+        members = CompactTable(sample_airtable_records_no_duplicates).by_key('Member Code')
+
+        assert set(members) == {'M001', 'M002'}
+        assert members['M002']['id'] == 'rec2'
+        assert members.get('M999') is None
+
+
+class TestKeyIndex:
+    """KeyIndex 클래스 테스트"""
+
+    def test_skips_empty_keys(self):
+        """빈 키는 무시"""
+        index = KeyIndex()
+        index.add('rec1', '')
+        index.add('rec2', None)
+        index.add('rec3', 'M003')
+
+        assert dict(index) == {'M003': 'rec3'}
+        assert index.key_of('rec1') is None
+
+    def test_equals_plain_dict(self):
+        """일반 딕셔너리와 비교 가능"""
+        index = KeyIndex()
+        index.add('rec1', 'M001')
+
+        assert index == {'M001': 'rec1'}
+
+
+class TestSnapshotKeyIndex:
+    """TableSnapshot.key_index 메서드 테스트"""
+
+    def test_loaded_table_builds_index_from_columns(self, mock_table, sample_airtable_records_no_duplicates):
+        """적재된 테이블에서 API 호출 없이 인덱스 생성"""
+        mock_table.all.return_value = sample_airtable_records_no_duplicates
+        snapshot = TableSnapshot()
+        snapshot.records(mock_table, ['Member Code'])
+
+        index = get_existing_by_key(mock_table, 'Member Code', snapshot)
+
+        assert index == {'M001': 'rec1', 'M002': 'rec2'}
+        assert index.key_of('rec2') == 'M002'
+        assert mock_table.iterate.call_count == 1
+
+    def test_streaming_snapshot_does_not_retain(self, mock_table, sample_airtable_records_no_duplicates):
+        """retain=False면 적재 없이 스트리밍으로 인덱스 생성"""
+        mock_table.all.return_value = sample_airtable_records_no_duplicates
+        snapshot = TableSnapshot(retain=False)
+
+        index = snapshot.key_index(mock_table, 'Member Code')
+
+        assert index == {'M001': 'rec1', 'M002': 'rec2'}
+        assert not snapshot.is_loaded(mock_table)
@@ -0,0 +1,49 @@
+"""content_hash 모듈 테스트"""
+
+from src.airtable.content_hash import SYNC_HASH_FIELD, changed_records, content_hash, with_hash
+
+
+class TestContentHash:
+    """content_hash 함수 테스트"""
+
+    def test_independent_of_field_order(self):
+        """필드 순서가 달라도 같은 해시"""
+        assert content_hash({'Name': 'A', 'E-mail': 'a@x.com'}) == content_hash({'E-mail': 'a@x.com', 'Name': 'A'})
+
+    def test_detects_value_change(self):
+        """값이 바뀌면 다른 해시"""
+        assert content_hash({'Name': 'A'}) != content_hash({'Name': 'B'})
+
+    def test_empty_values_same_as_missing(self):
+        """빈 값은 필드가 없는 것과 같은 해시"""
+        assert content_hash({'Name': 'A', 'Gender': ''}) == content_hash({'Name': 'A', 'Gender': None})
+        assert content_hash({'Name': 'A', 'Gender': ''}) == content_hash({'Name': 'A'})
+
+    def test_ignores_stored_hash(self):
+        """Sync Hash 필드 자체는 해시에 포함하지 않음"""
+        fields = with_hash({'Name': 'A'})
+        assert content_hash(fields) == fields[SYNC_HASH_FIELD]
+
+
+class TestChangedRecords:
+    """changed_records 함수 테스트"""
+
+    def test_returns_only_changed_existing_records(self):
+        """해시가 다르거나 없는 기존 레코드만 반환 (신규 키 제외)"""
+        latest = {
+            'M1': {'Member Code': 'M1', 'Name': 'A'},
+            'M2': {'Member Code': 'M2', 'Name': 'B2'},
+            'M3': {'Member Code': 'M3', 'Name': 'C'},
+            'M4': {'Member Code': 'M4', 'Name': 'D'},
+        }
+        existing = {'M1': 'rec1', 'M2': 'rec2', 'M3': 'rec3'}
+        hashes = {
+            'M1': content_hash(latest['M1']),
+            'M2': content_hash({'Member Code': 'M2', 'Name': 'B'}),
+            'M3': None,
+        }
+
+        records = changed_records(latest, existing, hashes)
+
+        assert [record['id'] for record in records] == ['rec2', 'rec3']
+        assert records[0]['fields'] == with_hash(latest['M2'])
@@ -3,7 +3,7 @@
 import pytest
 from pathlib import Path
 
-from src.airtable.csv_reader import read_csv, find_csv
+from src.airtable.csv_reader import ROW_SCHEMAS, ParsedCsvCache, find_csv, iter_rows, read_csv
 
 
 class TestReadCsv:
@@ -94,3 +94,100 @@ class TestFindCsv:
 
         assert "orders.csv" in result
         assert "members.csv" not in result
+
+
+class TestIterRows:
+    """iter_rows 함수 / 행 스키마 테스트"""
+
+    def test_orders_typed_at_parse_time(self, tmp_path):
+        """가격/날짜는 읽을 때 변환, 원본 날짜 텍스트도 유지"""
+        csv_content = (
+            "Order Number,Price,Date and Time of Payment,Extra\n"
+            "O1,\"1,000원\",2024-12-27 15:30,x\n"
+            "\n"
+            "O2,,,y\n"
+        )
+        csv_file = tmp_path / "orders.csv"
+        csv_file.write_bytes(b'\xef\xbb\xbf' + csv_content.encode('utf-8'))
+
+        rows = list(iter_rows(str(csv_file), 'orders'))
+
+        assert len(rows) == 2
+        assert rows[0].order_number == 'O1'
+        assert rows[0].price == 1000
+        assert rows[0].payment_date == '2024-12-27 15:30'
+        assert rows[0].payment_iso == '2024-12-27T15:30:00+09:00'
+        assert rows[1].price == 0
+        assert rows[1].payment_iso is None
+        assert rows[1].member_code == ''  # CSV에 없는 열은 빈 문자열
+
+    def test_rows_are_streamed(self, tmp_path):
+        """파일 전체를 읽기 전에 첫 행을 반환"""
+        csv_file = tmp_path / "members.csv"
+        csv_file.write_text("Member Code,Birth year\nM001,1990.0\nM002,\n", encoding='utf-8')
+
+        rows = iter_rows(str(csv_file), 'members')
+        first = next(rows)
+
+        assert first.member_code == 'M001'
+        assert first.birth_year == '1990'
+        assert next(rows).birth_year == ''
+
+    def test_get_by_header(self):
+        """CSV 헤더 이름으로 값 조회 (딕셔너리 행과 같은 방식), 속성 외 저장 없음"""
+        row = ROW_SCHEMAS['refunds'].from_mapping({'Order Number': 'O1', 'Refund Request Price': '500'})
+
+        assert row.get('Order Number') == 'O1'
+        assert row.get('Refund Request Price') == 500
+        assert row.get('Unknown', 'default') == 'default'
+        assert not hasattr(row, '__dict__')
+
+
+ORDERS_CONTENT = (
+    "Order Number,Member Code,Price\n"
+    "O1,M001,\"1,000\"\n"
+    "O2,M002,2000\n"
+    "O3,M001,500\n"
+)
+
+
+class TestParsedCsvCache:
+    """ParsedCsvCache 클래스 테스트"""
+
+    def test_file_parsed_once(self, tmp_path):
+        """행/인덱스/그룹을 여러 번 요청해도 파일은 한 번만 읽음"""
+        csv_file = tmp_path / "orders.csv"
+        csv_file.write_text(ORDERS_CONTENT, encoding='utf-8')
+        cache = ParsedCsvCache()
+
+        assert len(list(cache.iter_rows(str(csv_file), 'orders'))) == 3
+        index = cache.index(str(csv_file), 'orders', 'Order Number')
+        groups = cache.groups(str(csv_file), 'orders', 'Member Code')
+
+        assert cache.reads == 1
+        assert index['O1'].price == 1000
+        assert [row.order_number for row in groups['M001']] == ['O1', 'O3']
+        assert cache.index(str(csv_file), 'orders', 'Order Number') is index
+
+    def test_changed_file_reparsed(self, tmp_path):
+        """파일 크기/수정 시각이 바뀌면 다시 읽고 인덱스도 새로 생성"""
+        csv_file = tmp_path / "orders.csv"
+        csv_file.write_text(ORDERS_CONTENT, encoding='utf-8')
+        cache = ParsedCsvCache()
+        cache.index(str(csv_file), 'orders', 'Order Number')
+
+        csv_file.write_text(ORDERS_CONTENT + "O4,M003,700\n", encoding='utf-8')
+        index = cache.index(str(csv_file), 'orders', 'Order Number')
+
+        assert cache.reads == 2
+        assert sorted(index) == ['O1', 'O2', 'O3', 'O4']
+
+    def test_large_file_streamed(self, tmp_path):
+        """max_bytes보다 큰 파일은 보관하지 않고 매번 스트리밍"""
+        csv_file = tmp_path / "orders.csv"
+        csv_file.write_text(ORDERS_CONTENT, encoding='utf-8')
+        cache = ParsedCsvCache(max_bytes=10)
+
+        assert cache.rows(str(csv_file), 'orders') is None
+        assert [row.order_number for row in cache.iter_rows(str(csv_file), 'orders')] == ['O1', 'O2', 'O3']
+        assert cache.reads == 0
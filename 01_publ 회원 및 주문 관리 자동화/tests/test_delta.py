@@ -0,0 +1,141 @@
+"""delta 모듈 테스트"""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src import config
+from src.airtable.delta import ExportDelta, compute_delta, load_delta, mark_synced
+from src.airtable.sync.members import sync_members
+
+MEMBERS_HEADER = "Member Code,Name,E-mail\n"
+
+
+def _write(path, body):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(MEMBERS_HEADER + body, encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def exports(tmp_path, monkeypatch):
+    """archive/20261016/ 의 이전 내보내기 + downloads/ 의 새 내보내기"""
+    monkeypatch.setattr(config, 'ARCHIVE_DIR', tmp_path / 'archive')
+    monkeypatch.setattr(config, 'DOWNLOAD_DIR', tmp_path / 'downloads')
+    monkeypatch.setattr(config, 'TABLES', {'members': config.TABLES['members']})
+    previous = _write(
+        tmp_path / 'archive' / '20261016' / '261016_090000_members.csv',
+        "M001,Kim,kim@a.com\nM002,Lee,lee@a.com\nM003,Park,park@a.com\n",
+    )
+    current = _write(
+        tmp_path / 'downloads' / '261017_090000_members.csv',
+        "M001,Kim,kim@a.com\nM002,Lee,new@a.com\nM004,Choi,choi@a.com\n,Blank,\n",
+    )
+    return previous, current
+
+
+def _state(path, full_synced_at=None, files=None):
+    full_synced_at = full_synced_at or datetime.now().astimezone()
+    path.write_text(json.dumps({
+        'files': files or {'members': '261016_090000_members.csv'},
+        'full_synced_at': full_synced_at.isoformat(timespec='seconds'),
+    }), encoding='utf-8')
+    return path
+
+
+class TestComputeDelta:
+    """compute_delta 함수 테스트"""
+
+    def test_added_changed_removed(self, exports):
+        """추가/변경된 행만 새 CSV 순서로 반환, 삭제된 키는 보고만"""
+        delta = compute_delta(*exports, 'members')
+
+        assert [row.member_code for row in delta.rows] == ['M002', 'M004']
+        assert delta.rows[0].email == 'new@a.com'
+        assert (delta.added, delta.changed, delta.unchanged) == (1, 1, 1)
+        assert delta.removed == ['M003']
+
+    def test_identical_exports(self, exports):
+        """같은 내용이면 변경분 없음 -> 단계 건너뜀 대상"""
+        previous, _ = exports
+        delta = compute_delta(previous, previous, 'members')
+
+        assert delta.rows == []
+        assert ExportDelta({'members': delta}).unchanged('members')
+
+
+class TestLoadDelta:
+    """load_delta 함수 테스트"""
+
+    def test_uses_archived_baseline(self, exports, tmp_path):
+        """상태 파일의 파일명으로 archive에서 기준 내보내기를 찾음"""
+        _, current = exports
+        delta = load_delta(_state(tmp_path / 'state.json'), full_sync_days=7)
+
+        assert delta.summary() == {'members': {'added': 1, 'changed': 1, 'removed': 1, 'unchanged': 1}}
+        assert [row.member_code for row in delta.iter_rows(str(current), 'members')] == ['M002', 'M004']
+
+    def test_full_sync_when_due(self, exports, tmp_path):
+        """기록이 없거나 전체 동기화 주기가 지나면 None (CSV 전체)"""
+        old = datetime.now().astimezone() - timedelta(days=8)
+
+        assert load_delta(tmp_path / 'missing.json', full_sync_days=7) is None
+        assert load_delta(_state(tmp_path / 'state.json', old), full_sync_days=7) is None
+
+    def test_missing_baseline_reads_full_csv(self, exports, tmp_path):
+        """archive에 기준 파일이 없는 테이블은 CSV 전체"""
+        _, current = exports
+        state = _state(tmp_path / 'state.json', files={'members': '261001_090000_members.csv'})
+
+        delta = load_delta(state, full_sync_days=7)
+
+        assert delta.tables == {}
+        assert len(list(delta.iter_rows(str(current), 'members'))) == 4
+
+
+class TestMarkSynced:
+    """mark_synced 함수 테스트"""
+
+    def test_clean_run_recorded(self, exports, tmp_path):
+        """깨끗한 전체 동기화는 새 CSV 파일명과 전체 동기화 시각을 기록"""
+        path = tmp_path / 'state.json'
+
+        assert mark_synced({'members': {'new': 1}, 'writes': {'Members': {'failed': 0}}}, None, path)
+
+        state = json.loads(path.read_text(encoding='utf-8'))
+        assert state['files'] == {'members': '261017_090000_members.csv'}
+        assert 'full_synced_at' in state
+
+    def test_failed_run_keeps_baseline(self, exports, tmp_path):
+        """쓰기 실패/격리 레코드가 있으면 이전 기준 유지"""
+        path = _state(tmp_path / 'state.json')
+        before = path.read_text(encoding='utf-8')
+
+        assert not mark_synced({'writes': {'Members': {'failed': 2}}}, None, path)
+        assert not mark_synced({'quarantine': {'records': 1}}, None, path)
+        assert path.read_text(encoding='utf-8') == before
+
+
+def test_sync_members_reads_delta_rows(exports, tmp_path, mock_table):
+    """변경분이 있으면 회원 동기화는 추가/변경된 행만 처리"""
+    mock_table.name = config.AIRTABLE_TABLES['members']
+    mock_table.all.return_value = [{'id': 'recM2', 'fields': {'Member Code': 'M002'}}]
+    mock_table.batch_create.side_effect = lambda records: [
+        {'id': f"rec{fields['Member Code']}", 'fields': fields} for fields in records
+    ]
+    mock_table.batch_update.side_effect = lambda records: records
+    api = MagicMock()
+    api.table.return_value = mock_table
+    delta = load_delta(_state(tmp_path / 'state.json'), full_sync_days=7)
+
+    with patch.dict('src.config.AIRTABLE_UPSERT', {'members': False}), \
+         patch('src.airtable.sync.members.verify_inserts', return_value={
+             'missing': [], 'duplicates': {}, 'unconfirmed_ids': [], 'confirmed': 1}), \
+         patch.object(config, 'SYNC_DETECT_CHANGES', True):
+        result = sync_members(api, delta=delta)
+
+    created = mock_table.batch_create.call_args.args[0]
+    assert [fields['Member Code'] for fields in created] == ['M004']
+    assert result == {'new': 1, 'updated': 1}
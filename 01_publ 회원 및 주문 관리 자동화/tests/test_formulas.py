@@ -0,0 +1,96 @@
+"""formulas 모듈 테스트"""
+
+import pytest
+
+from src.airtable.formulas import (
+    And,
+    Contains,
+    Equals,
+    In,
+    IsEmpty,
+    Not,
+    NotEmpty,
+    NotIn,
+    Or,
+    field_ref,
+    quote,
+)
+
+
+class TestQuoting:
+    """필드 참조/리터럴 이스케이프 테스트"""
+
+    def test_field_ref(self):
+        """필드명을 중괄호로 감쌈"""
+        assert field_ref('Member Code') == '{Member Code}'
+
+    def test_quote_escapes_single_quote(self):
+        """작은따옴표 이스케이프"""
+        assert quote("O'Brien") == "'O\\'Brien'"
+
+    def test_quote_numbers_and_bools(self):
+        """숫자/불리언 리터럴"""
+        assert quote(10) == '10'
+        assert quote(True) == 'TRUE()'
+
+
+class TestToFormula:
+    """formula 문자열 생성 테스트"""
+
+    def test_is_empty(self):
+        """빈 값 조건"""
+        assert IsEmpty('Orders').to_formula() == 'NOT({Orders})'
+
+    def test_not_in(self):
+        """목록 제외 조건"""
+        where = NotIn('Refund Status', ['Refunded', 'Rejected'])
+
+        assert where.to_formula() == (
+            "NOT(OR({Refund Status}='Refunded', {Refund Status}='Rejected'))"
+        )
+
+    def test_and_combines(self):
+        """AND 조합"""
+        where = And(IsEmpty('Orders'), NotEmpty('Order Number'))
+
+        assert where.to_formula() == 'AND(NOT({Orders}), NOT(NOT({Order Number})))'
+
+    def test_empty_or_is_false(self):
+        """빈 OR은 FALSE()"""
+        assert In('Order Number', []).to_formula() == 'FALSE()'
+
+    def test_contains(self):
+        """문자열 포함 조건"""
+        assert Contains('Code', '_').to_formula() == "FIND('_', {Code})>0"
+
+
+class TestMatches:
+    """Python 평가 테스트"""
+
+    @pytest.mark.parametrize('value', [None, '', False, []])
+    def test_is_empty_matches_blank_values(self, value):
+        """빈 값 판정"""
+        assert IsEmpty('Field').matches({'Field': value})
+
+    def test_is_empty_rejects_values(self):
+        """값이 있으면 비어있지 않음"""
+        assert not IsEmpty('Orders').matches({'Orders': ['rec1']})
+        assert not IsEmpty('Is Active').matches({'Is Active': True})
+
+    def test_missing_field_is_empty(self):
+        """필드 자체가 없으면 빈 값"""
+        assert IsEmpty('Orders').matches({})
+
+    def test_not_in_includes_blank(self):
+        """빈 상태는 NotIn에 포함"""
+        where = NotIn('Refund Status', ['Refunded', 'Rejected'])
+
+        assert where.matches({'Refund Status': 'Pending'})
+        assert where.matches({})
+        assert not where.matches({'Refund Status': 'Refunded'})
+
+    def test_combined_fields(self):
+        """조합 조건의 필드 집합"""
+        where = And(IsEmpty('Orders'), Or(Equals('A', 1), Not(Contains('B', 'x'))))
+
+        assert where.fields == {'Orders', 'A', 'B'}
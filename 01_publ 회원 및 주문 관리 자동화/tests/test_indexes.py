@@ -0,0 +1,89 @@
+"""indexes 모듈 테스트"""
+
+from src.airtable.formulas import NotIn
+from src.airtable.indexes import (
+    DuplicateGroups,
+    FilteredMap,
+    KeyMap,
+    build_indexes,
+    scan_table,
+)
+from src.airtable.records import FINAL_REFUND_STATUSES, PENDING_REFUND, TableSnapshot
+
+
+class TestBuildIndexes:
+    """build_indexes 함수 테스트"""
+
+    def test_key_map_and_duplicates(self, sample_airtable_records):
+        """키 매핑과 중복 그룹을 함께 생성"""
+        result = build_indexes(sample_airtable_records, {
+            'existing': KeyMap('Member Code'),
+            'duplicates': DuplicateGroups('Member Code'),
+        })
+
+        assert result['existing'] == {'M001': 'rec3', 'M002': 'rec2'}
+        assert result['duplicates'] == {'M001': ['rec1', 'rec3']}
+
+    def test_key_map_reverse_lookup(self, sample_airtable_records_no_duplicates):
+        """KeyMap 결과로 레코드 ID -> 키 조회"""
+        result = build_indexes(sample_airtable_records_no_duplicates, {
+            'existing': KeyMap('Member Code'),
+        })
+
+        assert result['existing'].key_of('rec1') == 'M001'
+        assert result['existing'].key_of('missing') is None
+
+    def test_filtered_map(self, sample_refund_records):
+        """조건에 맞는 레코드만 값과 함께 수집"""
+        result = build_indexes(sample_refund_records, {
+            'pending': FilteredMap(PENDING_REFUND, 'Order Number', {'status': 'Refund Status'}),
+        })
+
+        assert result['pending'] == {
+            'ORD001': {'id': 'ref1', 'status': 'Pending'},
+            'ORD003': {'id': 'ref3', 'status': 'Processing'},
+        }
+
+    def test_iterates_records_once(self, sample_airtable_records):
+        """레코드 이터러블을 한 번만 순회"""
+        consumed = iter(sample_airtable_records)
+
+        result = build_indexes(consumed, {
+            'existing': KeyMap('Member Code'),
+            'duplicates': DuplicateGroups('Member Code'),
+        })
+
+        assert len(result['existing']) == 2
+        assert list(consumed) == []
+
+
+class TestScanTable:
+    """scan_table 함수 테스트"""
+
+    def test_single_fetch_with_field_union(self, mock_table, sample_refund_records):
+        """필드 합집합으로 한 번만 조회"""
+        mock_table.all.return_value = sample_refund_records
+
+        result = scan_table(mock_table, {
+            'existing': KeyMap('Order Number'),
+            'pending': FilteredMap(
+                NotIn('Refund Status', FINAL_REFUND_STATUSES), 'Order Number', {'status': 'Refund Status'}
+            ),
+        })
+
+        mock_table.all.assert_called_once_with(fields=['Order Number', 'Refund Status'])
+        assert len(result['existing']) == 4
+        assert set(result['pending']) == {'ORD001', 'ORD003'}
+
+    def test_uses_loaded_snapshot(self, mock_table, sample_airtable_records_no_duplicates):
+        """적재된 스냅샷에서는 API 호출 없음"""
+        mock_table.all.return_value = sample_airtable_records_no_duplicates
+        snapshot = TableSnapshot()
+        snapshot.records(mock_table, ['Member Code'])
+
+        scan_table(mock_table, {
+            'existing': KeyMap('Member Code'),
+            'duplicates': DuplicateGroups('Member Code'),
+        }, snapshot)
+
+        assert mock_table.all.call_count == 1
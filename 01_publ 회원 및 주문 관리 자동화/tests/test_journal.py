@@ -0,0 +1,215 @@
+"""journal / resume 모듈 테스트"""
+
+import json
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src import config
+from src.airtable.journal import WriteJournal
+from src.airtable.quarantine import Quarantine
+from src.airtable.resume import resume_writes, retry_quarantined
+from src.airtable.schema import SchemaCache
+from src.airtable.writer import BatchWriteError, BatchWriter
+
+from .conftest import echo_create, record_error
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return tmp_path / 'journal.jsonl'
+
+
+@pytest.fixture
+def members_table(mock_table):
+    mock_table.name = config.AIRTABLE_TABLES['members']
+    return mock_table
+
+
+def _writer(journal=None, quarantine=None, schema=None):
+    writer = BatchWriter(max_workers=1, journal=journal, quarantine=quarantine, schema=schema)
+    writer.limiter = MagicMock()
+    return writer
+
+class TestWriteJournal:
+    """WriteJournal 클래스 테스트"""
+
+    def test_acked_batches_not_pending(self, members_table, journal_path):
+        """응답을 받은 배치는 미확인 목록에 없고, 종료 시 저널 삭제"""
+        members_table.batch_create.side_effect = echo_create('Member Code')
+        journal = WriteJournal(journal_path)
+
+        _writer(journal).create(members_table, [{'Member Code': f"M{i}"} for i in range(25)])
+
+        assert journal.pending() == []
+        assert journal.close() == 0
+        assert not journal_path.exists()
+
+    def test_failed_and_unsent_batches_pending(self, members_table, journal_path):
+        """실패한 배치는 고유 키와 함께 미확인으로 남음"""
+        def fail_second(records):
+            if records[0]['Member Code'] == 'M10':
+                raise Exception('503')
+            return echo_create('Member Code')(records)
+
+        members_table.batch_create.side_effect = fail_second
+        journal = WriteJournal(journal_path)
+
+        with pytest.raises(BatchWriteError):
+            _writer(journal).create(members_table, [{'Member Code': f"M{i}"} for i in range(25)])
+
+        pending = WriteJournal(journal_path).pending()
+        assert len(pending) == 1
+        assert pending[0]['op'] == 'create'
+        assert pending[0]['key_field'] == 'Member Code'
+        assert [fields['Member Code'] for fields in pending[0]['records']] == [f"M{i}" for i in range(10, 20)]
+        assert journal.close() == 1
+        assert journal_path.exists()
+
+    def test_truncated_last_line_ignored(self, members_table, journal_path):
+        """중단으로 잘린 마지막 줄은 무시"""
+        journal = WriteJournal(journal_path)
+        journal.plan(members_table.name, 'update', [[{'id': 'rec1', 'fields': {}}]])
+        with open(journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"event": "ack", "se')
+
+        reopened = WriteJournal(journal_path)
+
+        assert [entry['seq'] for entry in reopened.pending()] == [1]
+        assert reopened.plan(members_table.name, 'update', [[]]) == [2]
+
+    def test_begin_discards_previous_journal(self, members_table, journal_path):
+        """새 실행은 이전 저널을 버리고 시작"""
+        WriteJournal(journal_path).plan(members_table.name, 'update', [[{'id': 'rec1', 'fields': {}}]])
+
+        journal = WriteJournal.begin(journal_path)
+
+        assert journal.pending() == []
+
+
+class TestResumeWrites:
+    """resume_writes 함수 테스트"""
+
+    def test_replays_only_unacked_batches_matched_by_key(self, members_table, journal_path):
+        """이미 생성된 키는 건너뛰고 없는 레코드만 생성, 테이블 전체 조회 없음"""
+        journal = WriteJournal(journal_path)
+        seqs = journal.plan(members_table.name, 'create', [
+            [{'Member Code': 'M1'}, {'Member Code': 'M2'}],
+            [{'Member Code': 'M3'}],
+        ])
+        journal.ack(seqs[1], ['recM3'])
+
+        # M1은 응답을 받기 전에 생성됨 (formula 조회 결과)
+        members_table.all.return_value = [{'id': 'recM1', 'fields': {'Member Code': 'M1'}}]
+        members_table.batch_create.side_effect = echo_create('Member Code')
+        api = MagicMock()
+        api.table.return_value = members_table
+
+        with patch('src.airtable.resume.BatchWriter', return_value=_writer()):
+            result = resume_writes(api, journal_path)
+
+        assert result == {'batches': 1, 'replayed': 1, 'sent': 1, 'skipped': 1, 'failed': 0}
+        members_table.batch_create.assert_called_once_with([{'Member Code': 'M2'}])
+        assert 'formula' in members_table.all.call_args.kwargs
+        assert not journal_path.exists()
+
+    def test_failed_replay_stays_pending(self, members_table, journal_path):
+        """재전송이 실패한 배치는 저널에 남음"""
+        WriteJournal(journal_path).plan(members_table.name, 'update', [[{'id': 'rec1', 'fields': {'Name': 'A'}}]])
+        members_table.batch_update.side_effect = Exception('422')
+        api = MagicMock()
+        api.table.return_value = members_table
+
+        with patch('src.airtable.resume.BatchWriter', return_value=_writer()):
+            result = resume_writes(api, journal_path)
+
+        assert result['failed'] == 1
+        assert len(WriteJournal(journal_path).pending()) == 1
+
+    def test_record_errors_acked_and_quarantined(self, members_table, journal_path, tmp_path):
+        """값 오류만 남은 배치는 확인 처리하고 문제 레코드는 격리 (재개 대상 아님)"""
+        def reject_m3(records):
+            if any(fields['Member Code'] == 'M3' for fields in records):
+                raise record_error()
+            return echo_create('Member Code')(records)
+
+        members_table.batch_create.side_effect = reject_m3
+        journal = WriteJournal(journal_path)
+        quarantine = Quarantine(tmp_path / 'quarantine.jsonl')
+        writer = _writer(journal, quarantine)
+
+        with pytest.raises(BatchWriteError):
+            writer.create(members_table, [{'Member Code': f"M{i}"} for i in range(5)])
+
+        assert journal.pending() == []
+        assert [entry['records'] for entry in quarantine.entries()] == [[{'Member Code': 'M3'}]]
+
+
+class TestRetryQuarantined:
+    """retry_quarantined 함수 테스트"""
+
+    def test_retries_only_quarantined_records(self, members_table, tmp_path):
+        """격리 레코드를 묶어 재전송하고, 이미 생성된 키는 건너뜀"""
+        path = tmp_path / 'quarantine.jsonl'
+        quarantine = Quarantine(path)
+        for code in ['M1', 'M2']:
+            quarantine.add(members_table.name, 'create', [{'Member Code': code}], record_error())
+
+        members_table.all.return_value = [{'id': 'recM1', 'fields': {'Member Code': 'M1'}}]
+        members_table.batch_create.side_effect = echo_create('Member Code')
+        api = MagicMock()
+        api.table.return_value = members_table
+
+        with patch('src.airtable.resume.BatchWriter', side_effect=lambda **kwargs: _writer(**kwargs)):
+            result = retry_quarantined(api, path)
+
+        assert result == {'records': 2, 'sent': 1, 'skipped': 1, 'failed': 0}
+        members_table.batch_create.assert_called_once_with([{'Member Code': 'M2'}])
+        assert not path.exists()
+
+    def test_rejected_again_stays_quarantined(self, members_table, tmp_path):
+        """다시 거부된 레코드는 격리 파일에 남음"""
+        path = tmp_path / 'quarantine.jsonl'
+        Quarantine(path).add(members_table.name, 'update', [{'id': 'rec1', 'fields': {'Name': 'A'}}], 'boom')
+        members_table.batch_update.side_effect = record_error()
+        api = MagicMock()
+        api.table.return_value = members_table
+
+        with patch('src.airtable.resume.BatchWriter', side_effect=lambda **kwargs: _writer(**kwargs)):
+            result = retry_quarantined(api, path)
+
+        assert result['failed'] == 1
+        entries = Quarantine(path).entries()
+        assert [entry['records'] for entry in entries] == [[{'id': 'rec1', 'fields': {'Name': 'A'}}]]
+        assert '422' in entries[0]['error']
+
+    def test_new_select_option_retried_with_typecast(self, members_table, tmp_path):
+        """옵션 추가 전 스키마에 없는 값으로 거부된 레코드는 typecast로 재전송하고 스키마에 반영"""
+        schema_path = tmp_path / 'schema.json'
+        schema_path.write_text(json.dumps({
+            'base_id': config.AIRTABLE_BASE_ID,
+            'fetched_at': datetime.now().isoformat(timespec='seconds'),
+            'tables': {members_table.name: {'id': 'tblMembers', 'fields': {
+                'Member Code': {'id': 'fldCode', 'type': 'singleLineText', 'choices': None},
+                'Country': {'id': 'fldCountry', 'type': 'singleSelect', 'choices': ['KR']},
+            }}},
+        }), encoding='utf-8')
+        path = tmp_path / 'quarantine.jsonl'
+        Quarantine(path).add(
+            members_table.name, 'create', [{'Member Code': 'M1', 'Country': 'JP'}], record_error()
+        )
+        members_table.all.return_value = []
+        members_table.batch_create.side_effect = echo_create('Member Code')
+        api = MagicMock()
+        api.table.return_value = members_table
+
+        with patch.object(config, 'AIRTABLE_ADD_SELECT_OPTIONS', True), \
+             patch('src.airtable.resume.SchemaCache', side_effect=lambda api: SchemaCache(api, schema_path)), \
+             patch('src.airtable.resume.BatchWriter', side_effect=lambda **kwargs: _writer(**kwargs)):
+            result = retry_quarantined(api, path)
+
+        assert result == {'records': 1, 'sent': 1, 'skipped': 0, 'failed': 0}
+        assert members_table.batch_create.call_args.kwargs == {'typecast': True}
+        assert SchemaCache(api, schema_path).missing_choices(members_table.name, [{'Country': 'JP'}]) == {}
+        api.base.return_value.schema.assert_not_called()
@@ -0,0 +1,25 @@
+"""maintenance 모듈 테스트"""
+
+from unittest.mock import MagicMock
+
+from src.airtable.maintenance import validate_required_fields
+
+
+class TestValidateRequiredFields:
+    """validate_required_fields 함수 테스트"""
+
+    def test_reports_candidates_without_full_scan(self, mock_table):
+        """서버 필터 결과 수를 candidates로 반환 (전체 테이블 조회 없음)"""
+        mock_table.all.return_value = [
+            {'id': 'rec1', 'fields': {'Member Code': 'M001'}},
+        ]
+        mock_table.batch_update.side_effect = lambda records: records
+        api = MagicMock()
+        api.table.return_value = mock_table
+
+        results = validate_required_fields(api, auto_fix=True)
+
+        assert results['members']['candidates'] == 1
+        assert results['members']['missing'] == {'Is Active': 1}
+        assert results['members']['fixed'] == {'Is Active': 1}
+        assert 'formula' in mock_table.all.call_args.kwargs
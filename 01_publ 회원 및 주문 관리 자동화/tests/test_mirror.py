@@ -0,0 +1,155 @@
+"""mirror 모듈 테스트"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.airtable.mirror import AirtableMirror
+
+
+@pytest.fixture
+def mirror():
+    """메모리 SQLite 미러"""
+    with AirtableMirror(':memory:') as m:
+        yield m
+
+
+@pytest.fixture
+def mock_api(mock_table):
+    """get_table()이 mock_table을 반환하는 API"""
+    api = MagicMock()
+    api.table.return_value = mock_table
+    return api
+
+
+@pytest.fixture
+def sample_orders():
+    return [
+        {'id': 'ord1', 'createdTime': '2026-01-01T00:00:00.000Z',
+         'fields': {'Order Number': 'ORD001', 'Member Code': 'M001', 'Member': ['recM1']}},
+        {'id': 'ord2', 'createdTime': '2026-01-01T00:00:00.000Z',
+         'fields': {'Order Number': 'ORD002', 'Member Code': 'M001', 'Member': ['recM1']}},
+        {'id': 'ord3', 'createdTime': '2026-01-01T00:00:00.000Z',
+         'fields': {'Order Number': 'ORD003', 'Member Code': 'M002', 'Member': ['recM2']}},
+    ]
+
+
+class TestAirtableMirror:
+    """AirtableMirror 테스트"""
+
+    def test_first_refresh_is_full(self, mirror, mock_api, mock_table, sample_airtable_records):
+        """첫 갱신은 전체 조회"""
+        mock_table.all.return_value = sample_airtable_records
+
+        count = mirror.refresh_table(mock_api, 'members')
+
+        assert count == 3
+        assert mirror.count('members') == 3
+        mock_table.all.assert_called_once_with()
+
+    def test_second_refresh_is_incremental(self, mirror, mock_api, mock_table, sample_airtable_records_no_duplicates):
+        """두 번째 갱신은 수정된 레코드만 조회하여 병합"""
+        mock_table.all.return_value = sample_airtable_records_no_duplicates
+        mirror.refresh_table(mock_api, 'members')
+
+        mock_table.all.reset_mock()
+        mock_table.all.return_value = [
+            {'id': 'rec2', 'fields': {'Member Code': 'M002', 'Name': 'Changed'}},
+            {'id': 'rec9', 'fields': {'Member Code': 'M009'}},
+        ]
+        mirror.refresh_table(mock_api, 'members')
+
+        assert 'LAST_MODIFIED_TIME()' in mock_table.all.call_args.kwargs['formula']
+        assert mirror.count('members') == 3
+        assert mirror.get_by_key('members', 'M002')['fields']['Name'] == 'Changed'
+
+    def test_reconcile_removes_deleted_records(self, mock_api, mock_table, sample_airtable_records_no_duplicates):
+        """reconcile 주기가 지나면 전체 조회로 교체하여 삭제된 레코드 제거"""
+        with AirtableMirror(':memory:', reconcile_hours=0) as mirror:
+            mock_table.all.return_value = sample_airtable_records_no_duplicates
+            mirror.refresh_table(mock_api, 'members')
+
+            mock_table.all.return_value = [{'id': 'rec1', 'fields': {'Member Code': 'M001'}}]
+            mirror.refresh_table(mock_api, 'members')
+
+            assert 'formula' not in mock_table.all.call_args.kwargs
+            assert mirror.key_map('members') == {'M001': 'rec1'}
+
+    def test_reconcile_refreshes_computed_fields(self, mock_api, mock_table):
+        """증분 조회에 나타나지 않는 계산 필드 변경도 reconcile 시 반영"""
+        with AirtableMirror(':memory:', reconcile_hours=0) as mirror:
+            mock_table.all.return_value = [
+                {'id': 'mp1', 'fields': {'MemberProducts Code': 'M001_P1', 'Subscription Status': 'Active'}},
+            ]
+            mirror.refresh_table(mock_api, 'member_products')
+
+            mock_table.all.return_value = [
+                {'id': 'mp1', 'fields': {'MemberProducts Code': 'M001_P1', 'Subscription Status': 'Expired'}},
+            ]
+            mirror.refresh_table(mock_api, 'member_products')
+
+            record = mirror.get_by_key('member_products', 'M001_P1')
+            assert record['fields']['Subscription Status'] == 'Expired'
+
+    def test_failed_reconcile_keeps_previous_rows(self, mock_api, mock_table, sample_airtable_records_no_duplicates):
+        """전체 교체 중 실패하면 이전 데이터 유지"""
+        with AirtableMirror(':memory:', reconcile_hours=0) as mirror:
+            mock_table.all.return_value = sample_airtable_records_no_duplicates
+            mirror.refresh_table(mock_api, 'members')
+
+            mock_table.all.side_effect = Exception('429')
+            results = mirror.refresh(mock_api, ['members'])
+
+            assert results['members'] == -1
+            assert mirror.count('members') == 2
+
+    def test_refresh_continues_after_table_error(self, mirror, mock_api, mock_table):
+        """한 테이블 실패 시 -1 기록 후 나머지 테이블 계속"""
+        mock_table.all.side_effect = [Exception('429'), [], [], [], [], []]
+
+        results = mirror.refresh(mock_api)
+
+        assert results['members'] == -1
+        assert results['orders'] == 0
+
+    def test_duplicates(self, mirror, sample_airtable_records):
+        """고유 키 중복 레코드 반환"""
+        mirror.upsert('members', sample_airtable_records)
+
+        assert mirror.duplicates('members') == {'M001': ['rec1', 'rec3']}
+
+    def test_find_by_indexed_field(self, mirror, sample_orders):
+        """INDEXED_FIELDS 필드로 조회"""
+        mirror.upsert('orders', sample_orders)
+
+        result = mirror.find('orders', 'Member Code', 'M001')
+
+        assert sorted(r['id'] for r in result) == ['ord1', 'ord2']
+
+    def test_linked_from(self, mirror, sample_orders):
+        """Linked Record로 역참조 조회"""
+        mirror.upsert('orders', sample_orders)
+
+        result = mirror.linked_from('orders', 'Member', 'recM2')
+
+        assert [r['fields']['Order Number'] for r in result] == ['ORD003']
+
+    def test_upsert_replaces_links(self, mirror, sample_orders):
+        """레코드 교체 시 이전 Linked Record 인덱스 제거"""
+        mirror.upsert('orders', sample_orders)
+        mirror.upsert('orders', [
+            {'id': 'ord3', 'fields': {'Order Number': 'ORD003', 'Member': ['recM1']}}
+        ])
+
+        assert mirror.linked_from('orders', 'Member', 'recM2') == []
+        assert len(mirror.linked_from('orders', 'Member', 'recM1')) == 3
+
+    def test_snapshot_reads_locally(self, mirror, mock_table, sample_airtable_records_no_duplicates):
+        """미러 스냅샷은 API 조회 없이 레코드 반환"""
+        mirror.upsert('members', sample_airtable_records_no_duplicates)
+        mock_table.name = 'Members'
+
+        snapshot = mirror.snapshot(['members'])
+        records = snapshot.records(mock_table, ['Member Code', 'Name'])
+
+        assert len(records) == 2
+        mock_table.all.assert_not_called()
@@ -0,0 +1,148 @@
+"""mutations 모듈 테스트"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.airtable.mutations import MutationQueue, is_pending_id
+from src.airtable.records import TableSnapshot
+from src.airtable.writer import BatchWriter
+
+from .conftest import echo_create
+
+
+@pytest.fixture
+def writer():
+    """속도 제한 대기 없는 BatchWriter"""
+    batch_writer = BatchWriter(max_workers=1)
+    batch_writer.limiter = MagicMock()
+    return batch_writer
+
+
+class TestMutationQueue:
+    """MutationQueue 클래스 테스트"""
+
+    def test_merges_updates_per_record(self, mock_table, writer):
+        """같은 레코드의 수정은 필드를 병합하여 1건으로 전송"""
+        mock_table.batch_update.side_effect = lambda records: records
+        queue = MutationQueue()
+
+        queue.update(mock_table, [{'id': 'rec1', 'fields': {'Refund Status': 'Refunded'}}])
+        queue.update(mock_table, [{'id': 'rec1', 'fields': {'Orders': ['recO1']}}])
+        queue.update(mock_table, [{'id': 'rec2', 'fields': {'Orders': ['recO2']}}])
+        results = queue.flush(writer)
+
+        sent = mock_table.batch_update.call_args.args[0]
+        assert sent == [
+            {'id': 'rec1', 'fields': {'Refund Status': 'Refunded', 'Orders': ['recO1']}},
+            {'id': 'rec2', 'fields': {'Orders': ['recO2']}},
+        ]
+        outcome = results[mock_table.name]
+        assert outcome['updated'] == 2
+        assert outcome['update_ops'] == 3
+        assert outcome['requests'] == 1
+
+    def test_updates_fold_into_pending_creates(self, mock_table, writer):
+        """임시 ID에 대한 수정은 생성 요청에 합쳐짐 (별도 수정 요청 없음)"""
+        mock_table.batch_create.side_effect = echo_create(prefix='recNew')
+        queue = MutationQueue()
+
+        pending = queue.create(mock_table, [{'n': 1, 'Order Number': 'O1'}])
+        assert is_pending_id(pending[0]['id'])
+        queue.update(mock_table, [{'id': pending[0]['id'], 'fields': {'Orders': ['recO1']}}])
+        results = queue.flush(writer)
+
+        assert mock_table.batch_create.call_args.args[0] == [
+            {'n': 1, 'Order Number': 'O1', 'Orders': ['recO1']}
+        ]
+        mock_table.batch_update.assert_not_called()
+        assert results[mock_table.name]['pending_ids'] == [pending[0]['id']]
+
+    def test_flush_sends_full_batches(self, mock_table, writer):
+        """여러 단계의 수정을 모아 10개씩 꽉 채워 전송"""
+        mock_table.batch_update.side_effect = lambda records: records
+        queue = MutationQueue()
+
+        # 3개 단계가 7개씩 수정 요청 (단계별로 보내면 배치 3회, 각 7개)
+        for stage in range(3):
+            queue.update(mock_table, [
+                {'id': f"rec{stage}_{i}", 'fields': {'Is Active': True}} for i in range(7)
+            ])
+        results = queue.flush(writer)
+
+        sizes = [len(call.args[0]) for call in mock_table.batch_update.call_args_list]
+        assert sizes == [10, 10, 1]
+        assert results[mock_table.name]['requests'] == 3
+
+    def test_rejects_links_to_pending_records(self, mock_table):
+        """아직 생성되지 않은 레코드를 Linked Record로 참조하면 오류"""
+        queue = MutationQueue()
+        pending = queue.create(mock_table, [{'n': 1}])
+
+        with pytest.raises(ValueError):
+            queue.update(mock_table, [{'id': 'rec1', 'fields': {'Refunds': [pending[0]['id']]}}])
+
+    def test_partial_create_failure_keeps_successful_ids(self, mock_table):
+        """생성 일부 실패 시 성공한 임시 ID만 결과에 남고 수정은 계속 전송"""
+        writer = BatchWriter(max_workers=1, batch_size=2)
+        writer.limiter = MagicMock()
+
+        def fail_second(records):
+            if records[0]['n'] == 2:
+                raise Exception('422 INVALID_MULTIPLE_CHOICE_OPTIONS')
+            return echo_create(prefix='recNew')(records)
+
+        mock_table.batch_create.side_effect = fail_second
+        mock_table.batch_update.side_effect = lambda records: records
+        queue = MutationQueue()
+        pending = queue.create(mock_table, [{'n': i} for i in range(4)])
+        queue.update(mock_table, [{'id': 'rec1', 'fields': {'Orders': ['recO1']}}])
+
+        outcome = queue.flush(writer)[mock_table.name]
+
+        assert outcome['pending_ids'] == [pending[0]['id'], pending[1]['id']]
+        assert [record['id'] for record in outcome['created']] == ['recNew0', 'recNew1']
+        assert outcome['updated'] == 1
+        assert len(outcome['errors']) == 1
+        assert len(queue) == 0
+
+
+class TestSnapshotQueue:
+    """TableSnapshot 쓰기 대기열 연동 테스트"""
+
+    def test_queued_update_patches_snapshot(self, mock_table, writer):
+        """대기 중인 수정은 다른 필드를 유지하며 스냅샷에 바로 반영"""
+        mock_table.all.return_value = [
+            {'id': 'rec1', 'fields': {'Order Number': 'O1', 'Refund Status': 'Requested'}},
+        ]
+        snapshot = TableSnapshot(writer=writer, queue=MutationQueue())
+        snapshot.records(mock_table, ['Order Number', 'Refund Status'])
+
+        snapshot.batch_update(mock_table, [{'id': 'rec1', 'fields': {'Refund Status': 'Refunded'}}])
+
+        record = snapshot.records(mock_table, ['Order Number'])[0]
+        assert record['fields'] == {'Order Number': 'O1', 'Refund Status': 'Refunded'}
+        mock_table.batch_update.assert_not_called()
+
+    def test_flush_replaces_pending_ids(self, mock_table, writer):
+        """flush 후 스냅샷의 임시 ID는 실제 ID로 교체"""
+        mock_table.all.return_value = []
+        mock_table.batch_create.side_effect = echo_create(prefix='recNew')
+        snapshot = TableSnapshot(writer=writer, queue=MutationQueue())
+        snapshot.records(mock_table, ['n'])
+
+        pending = snapshot.batch_create(mock_table, [{'n': 7}], defer=True)
+        assert snapshot.key_index(mock_table, 'n') == {7: pending[0]['id']}
+
+        snapshot.flush()
+
+        assert snapshot.key_index(mock_table, 'n') == {7: 'recNew7'}
+
+    def test_without_defer_creates_immediately(self, mock_table, writer):
+        """defer=False 생성은 대기열이 있어도 바로 전송 (ID가 필요한 단계용)"""
+        mock_table.batch_create.side_effect = echo_create(prefix='recNew')
+        snapshot = TableSnapshot(writer=writer, queue=MutationQueue())
+
+        created = snapshot.batch_create(mock_table, [{'n': 1}])
+
+        assert created[0]['id'] == 'recNew1'
@@ -0,0 +1,187 @@
+"""plan 모듈 / 계획 모드 스냅샷 테스트"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src import config
+from src.airtable.mutations import is_pending_id
+from src.airtable.plan import PLAN_VERSION, apply_plan, build_plan, load_plan, save_plan
+from src.airtable.records import TableSnapshot
+from src.airtable.writer import BatchWriter
+
+from .conftest import echo_create
+
+MEMBERS = config.AIRTABLE_TABLES['members']
+ORDERS = config.AIRTABLE_TABLES['orders']
+
+
+def _table(name, records=None):
+    table = MagicMock()
+    table.name = name
+    table.all.return_value = records or []
+    table.iterate.side_effect = lambda *args, **kwargs: iter([table.all(*args, **kwargs)])
+    table.batch_update.side_effect = lambda records: records
+    return table
+
+
+def _api(*tables):
+    by_name = {table.name: table for table in tables}
+    api = MagicMock()
+    api.table.side_effect = lambda base_id, name: by_name[name]
+    return api
+
+
+def _writer():
+    writer = BatchWriter(max_workers=1)
+    writer.limiter = MagicMock()
+    return writer
+
+
+def _plan(tables):
+    return build_plan(tables, {}, {'snapshot': 'mirror', 'csv': {}})
+
+
+def _member_order_plan():
+    snapshot = TableSnapshot.for_plan()
+    members, orders = _table(MEMBERS), _table(ORDERS)
+    snapshot.seed(MEMBERS, [{'id': 'recOld', 'fields': {'Member Code': 'M0'}}])
+    snapshot.seed(ORDERS, [])
+
+    created = snapshot.batch_create(members, [{'Member Code': 'M1'}])
+    snapshot.batch_create(orders, [
+        {'Order Number': 'O1', 'Member': [created[0]['id']]},
+        {'Order Number': 'O2', 'Member': ['recOld']},
+    ])
+    return _plan(snapshot.queue.changes())
+
+
+class TestPlanningSnapshot:
+    """TableSnapshot.for_plan() 테스트"""
+
+    def test_creates_deferred_with_pending_links(self):
+        """계획 모드는 생성을 API로 보내지 않고 임시 ID 링크를 허용"""
+        snapshot = TableSnapshot.for_plan()
+        members, orders = _table(MEMBERS), _table(ORDERS)
+        snapshot.seed(MEMBERS, [])
+        snapshot.seed(ORDERS, [])
+
+        created = snapshot.batch_create(members, [{'Member Code': 'M1'}])
+        snapshot.batch_create(orders, [{'Order Number': 'O1', 'Member': [created[0]['id']]}])
+
+        assert is_pending_id(created[0]['id'])
+        members.batch_create.assert_not_called()
+        orders.batch_create.assert_not_called()
+        assert snapshot.queue.counts()[ORDERS]['creates'] == 1
+        with pytest.raises(ValueError):
+            snapshot.flush()
+
+    def test_upsert_split_by_snapshot_keys(self):
+        """업서트는 스냅샷 키로 생성(임시 ID)/수정으로 나뉨"""
+        snapshot = TableSnapshot.for_plan()
+        members = _table(MEMBERS)
+        snapshot.seed(MEMBERS, [{'id': 'rec1', 'fields': {'Member Code': 'M1'}}])
+
+        result = snapshot.batch_upsert(
+            members,
+            [{'Member Code': 'M1', 'Name': 'A'}, {'Member Code': 'M2', 'Name': 'B'}],
+            ['Member Code']
+        )
+
+        assert result['records'][0]['id'] == 'rec1'
+        assert is_pending_id(result['records'][1]['id'])
+        assert result['updatedRecords'] == ['rec1']
+        assert result['createdRecords'] == [result['records'][1]['id']]
+        members.batch_upsert.assert_not_called()
+        changes = snapshot.queue.changes()[0]
+        assert [record['fields']['Member Code'] for record in changes['creates']] == ['M2']
+        assert changes['updates'] == [{'id': 'rec1', 'fields': {'Member Code': 'M1', 'Name': 'A'}}]
+
+
+class TestApplyPlan:
+    """apply_plan 함수 테스트"""
+
+    def test_resolves_pending_links(self):
+        """생성된 회원의 실제 ID로 주문의 Linked Record를 바꿔 생성"""
+        members, orders = _table(MEMBERS), _table(ORDERS)
+        members.batch_create.side_effect = echo_create('Member Code')
+        orders.batch_create.side_effect = echo_create('Order Number')
+
+        result = apply_plan(_api(members, orders), _member_order_plan(), _writer())
+
+        members.batch_create.assert_called_once_with([{'Member Code': 'M1'}])
+        orders.batch_create.assert_called_once_with([
+            {'Order Number': 'O1', 'Member': ['recM1']},
+            {'Order Number': 'O2', 'Member': ['recOld']},
+        ])
+        assert result[MEMBERS]['created'] == 1
+        assert result[ORDERS]['created'] == 2
+
+    def test_reapply_skips_existing_keys(self):
+        """다시 적용하면 이미 생성된 키는 만들지 않고 그 ID로 링크"""
+        members = _table(MEMBERS, [{'id': 'recM1', 'fields': {'Member Code': 'M1'}}])
+        orders = _table(ORDERS, [{'id': 'recO1', 'fields': {'Order Number': 'O1'}}])
+        orders.batch_create.side_effect = echo_create('Order Number')
+
+        result = apply_plan(_api(members, orders), _member_order_plan(), _writer())
+
+        members.batch_create.assert_not_called()
+        orders.batch_create.assert_called_once_with([{'Order Number': 'O2', 'Member': ['recOld']}])
+        assert result[MEMBERS] == {'created': 0, 'existing': 1, 'updated': 0, 'skipped': 0, 'failed': 0}
+        assert result[ORDERS]['existing'] == 1
+
+    def test_skips_links_to_failed_creates(self):
+        """생성에 실패한 레코드를 참조하는 변경은 건너뜀"""
+        members, orders = _table(MEMBERS), _table(ORDERS)
+        members.batch_create.side_effect = Exception('422')
+        orders.batch_create.side_effect = echo_create('Order Number')
+
+        result = apply_plan(_api(members, orders), _member_order_plan(), _writer())
+
+        orders.batch_create.assert_called_once_with([{'Order Number': 'O2', 'Member': ['recOld']}])
+        assert result[MEMBERS]['failed'] == 1
+        assert result[ORDERS]['skipped'] == 1
+
+    def test_updates_applied_after_creates(self):
+        """임시 ID를 참조하는 수정은 생성 후 실제 ID로 전송"""
+        members, orders = _table(MEMBERS), _table(ORDERS)
+        members.batch_create.side_effect = echo_create('Member Code')
+        plan = _plan([
+            {'table': MEMBERS, 'creates': [{'id': 'pending:Members:1', 'fields': {'Member Code': 'M1'}}], 'updates': []},
+            {'table': ORDERS, 'creates': [], 'updates': [{'id': 'recO1', 'fields': {'Member': ['pending:Members:1']}}]},
+        ])
+
+        result = apply_plan(_api(members, orders), plan, _writer())
+
+        orders.batch_update.assert_called_once_with([{'id': 'recO1', 'fields': {'Member': ['recM1']}}])
+        assert result[ORDERS]['updated'] == 1
+
+
+class TestPlanFile:
+    """save_plan / load_plan 함수 테스트"""
+
+    def test_round_trip(self, tmp_path):
+        """저장한 계획을 그대로 읽음 (빈 테이블은 제외)"""
+        plan = build_plan(
+            [
+                {'table': MEMBERS, 'creates': [{'id': 'pending:Members:1', 'fields': {'Member Code': 'M1'}}], 'updates': []},
+                {'table': ORDERS, 'creates': [], 'updates': []},
+            ],
+            {'members': {MEMBERS: {'create': 1, 'update': 0}}},
+            {'snapshot': 'api', 'csv': {'members': 'members.csv'}},
+            {'products': 'boom'},
+        )
+        path = tmp_path / 'plan.json'
+
+        save_plan(plan, path)
+
+        assert load_plan(path) == plan
+        assert [entry['table'] for entry in plan['tables']] == [MEMBERS]
+
+    def test_version_mismatch(self, tmp_path):
+        """지원하지 않는 버전은 ValueError"""
+        path = tmp_path / 'plan.json'
+        save_plan({'version': PLAN_VERSION + 1}, path)
+
+        with pytest.raises(ValueError):
+            load_plan(path)
@@ -0,0 +1,269 @@
+"""ratelimit 모듈 테스트"""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from src.airtable.ratelimit import AdaptiveRateLimiter, RateLimitedApi, RateLimiter, ThrottledApi
+
+
+class FakeClock:
+    """sleep 호출만큼 시간이 흐르는 시계"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class TestRateLimiter:
+    """RateLimiter 클래스 테스트"""
+
+    def test_burst_without_waiting(self):
+        """버킷 용량까지는 대기 없이 통과"""
+        clock = FakeClock()
+        limiter = RateLimiter(5, clock=clock, sleep=clock.sleep)
+
+        waits = [limiter.acquire() for _ in range(5)]
+
+        assert waits == [0.0] * 5
+        assert clock.now == 0.0
+
+    def test_waits_when_empty(self):
+        """버킷이 비면 초당 rate개로 제한"""
+        clock = FakeClock()
+        limiter = RateLimiter(5, clock=clock, sleep=clock.sleep)
+
+        for _ in range(15):
+            limiter.acquire()
+
+        # 처음 5개는 즉시, 나머지 10개는 0.2초 간격
+        assert abs(clock.now - 2.0) < 1e-9
+
+    def test_thread_safe(self):
+        """여러 스레드가 동시에 요청해도 토큰 수를 넘지 않음"""
+        limiter = RateLimiter(1000, burst=50)
+        results: list[float] = []
+
+        def worker() -> None:
+            for _ in range(10):
+                results.append(limiter.acquire())
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(results) == 50
+        assert all(wait == 0.0 for wait in results)
+
+
+class TestRateLimitedApi:
+    """RateLimitedApi 클래스 테스트"""
+
+    def _api(self) -> RateLimitedApi:
+        api = RateLimitedApi('key')
+        api.limiter = MagicMock()
+        api.session.request = MagicMock()
+        api._process_response = MagicMock(return_value={})
+        return api
+
+    def test_one_token_per_request(self):
+        """요청마다 토큰 1개"""
+        api = self._api()
+
+        api.request('GET', 'https://api.airtable.com/v0/app/tbl')
+        api.request('GET', 'https://api.airtable.com/v0/app/tbl')
+
+        assert api.limiter.acquire.call_count == 2
+
+    def test_post_fallback_uses_single_token(self):
+        """긴 URL의 GET -> POST 폴백도 토큰 1개"""
+        api = self._api()
+
+        api.request(
+            'GET',
+            'https://api.airtable.com/v0/app/tbl',
+            fallback=('POST', 'https://api.airtable.com/v0/app/tbl/listRecords'),
+            options={'formula': 'x' * 20000},
+        )
+
+        assert api.session.request.call_args.kwargs['method'] == 'POST'
+        assert api.limiter.acquire.call_count == 1
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} Error", response=response)
+
+
+class TestAdaptiveRateLimiter:
+    """AdaptiveRateLimiter 클래스 테스트"""
+
+    def test_throttled_halves_rate_once_per_second(self):
+        """429/5xx마다 절반 (1초 안의 연속 실패는 한 번만)"""
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(8, min_rate=1, clock=clock, sleep=clock.sleep)
+
+        limiter.on_throttled()
+        limiter.on_throttled()
+        assert limiter.rate == 4
+
+        clock.now += 1.0
+        limiter.on_throttled()
+        assert limiter.rate == 2
+        assert limiter.lowest_rate == 2
+
+    def test_rate_floor(self):
+        """최저 속도 아래로 내려가지 않음"""
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(5, min_rate=2, clock=clock, sleep=clock.sleep)
+
+        for _ in range(5):
+            limiter.on_throttled()
+            clock.now += 1.0
+
+        assert limiter.rate == 2
+
+    def test_throttled_drains_burst(self):
+        """감속 직후에는 쌓인 토큰 없이 새 속도로 대기"""
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(4, clock=clock, sleep=clock.sleep)
+
+        limiter.on_throttled()
+
+        assert limiter.acquire() == 0.5
+
+    def test_ramps_back_to_max(self):
+        """성공 응답마다 ramp_step씩 최대 속도까지 회복"""
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(5, ramp_step=0.5, clock=clock, sleep=clock.sleep)
+        limiter.on_throttled()
+
+        for _ in range(3):
+            limiter.on_success(0.1)
+        assert limiter.rate == 4.0
+
+        for _ in range(10):
+            limiter.on_success(0.1)
+        assert limiter.rate == 5
+
+    def test_no_ramp_while_latency_high(self):
+        """지연 시간이 평소보다 크게 늘어난 동안은 회복하지 않음"""
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(5, ramp_step=0.5, clock=clock, sleep=clock.sleep)
+        limiter.on_success(0.1)
+        limiter.on_throttled()
+
+        for _ in range(5):
+            limiter.on_success(2.0)
+
+        assert limiter.rate == 2.5
+
+
+class TestThrottledApi:
+    """ThrottledApi 클래스 테스트"""
+
+    URL = 'https://api.airtable.com/v0/app/tbl'
+
+    def _api(self, outcomes: list) -> ThrottledApi:
+        api = ThrottledApi('key', max_retries=3)
+        api.limiter = MagicMock(wraps=api.limiter)
+        api.limiter.acquire.return_value = 0.0
+        api.session.request = MagicMock()
+        api._process_response = MagicMock(side_effect=outcomes)
+        api._sleep = MagicMock()
+        return api
+
+    def test_pyairtable_retry_disabled(self):
+        """urllib3 재시도 대신 토큰을 받는 재시도 사용"""
+        api = ThrottledApi('key')
+
+        assert api.session.get_adapter(self.URL).max_retries.total == 0
+
+    def test_retries_429_with_token_per_attempt(self):
+        """429는 백오프 후 재시도, 재시도도 토큰 1개"""
+        api = self._api([_http_error(429), _http_error(429), {'records': []}])
+
+        assert api.request('GET', self.URL) == {'records': []}
+
+        assert api.limiter.acquire.call_count == 3
+        assert api.limiter.on_throttled.call_count == 2
+        assert api._sleep.call_count == 2
+        stats = api.stats()
+        assert stats['requests'] == 3
+        assert stats['throttled'] == 2
+        assert stats['retries'] == 2
+        assert stats['failed'] == 0
+
+    def test_backoff_grows_with_jitter(self):
+        """재시도 대기: 상한 base * 2^n의 절반 ~ 전체"""
+        api = self._api([_http_error(429)] * 3 + [{}])
+
+        api.request('GET', self.URL)
+
+        delays = [call.args[0] for call in api._sleep.call_args_list]
+        for attempt, delay in enumerate(delays):
+            cap = 2 ** attempt
+            assert cap / 2 <= delay <= cap
+
+    def test_gives_up_after_max_retries(self):
+        """최대 재시도 후 마지막 오류 전달"""
+        api = self._api([_http_error(429)] * 4)
+
+        with pytest.raises(requests.HTTPError):
+            api.request('GET', self.URL)
+
+        assert api.limiter.acquire.call_count == 4
+        assert api.stats()['failed'] == 1
+
+    def test_server_error_retried_for_idempotent_requests(self):
+        """5xx는 중복 쓰기가 없는 요청만 재시도"""
+        api = self._api([_http_error(503), {'records': []}])
+        assert api.request('PATCH', self.URL) == {'records': []}
+        assert api.stats()['server_errors'] == 1
+
+        api = self._api([_http_error(503), {'records': []}])
+        with pytest.raises(requests.HTTPError):
+            api.request('POST', self.URL, json={'records': []})
+        assert api.limiter.acquire.call_count == 1
+
+    def test_client_error_not_retried(self):
+        """422 같은 요청 오류는 바로 전달"""
+        api = self._api([_http_error(422)])
+
+        with pytest.raises(requests.HTTPError):
+            api.request('PATCH', self.URL)
+
+        assert api._sleep.call_count == 0
+
+    def test_post_fallback_uses_single_retry_loop(self):
+        """긴 URL의 GET -> POST 폴백도 토큰 1개"""
+        api = self._api([{'records': []}])
+
+        api.request(
+            'GET',
+            self.URL,
+            fallback=('POST', f"{self.URL}/listRecords"),
+            options={'formula': 'x' * 20000},
+        )
+
+        assert api.session.request.call_args.kwargs['method'] == 'POST'
+        assert api.limiter.acquire.call_count == 1
+
+    def test_success_feeds_latency(self):
+        """성공 응답 지연 시간을 속도 조절에 반영"""
+        api = self._api([{}])
+
+        api.request('GET', self.URL)
+
+        api.limiter.on_success.assert_called_once()
+        assert api.stats()['requests'] == 1
@@ -1,13 +1,20 @@
 """records 모듈 테스트"""
 
+import threading
+
 import pytest
 from unittest.mock import MagicMock
 
+from src.airtable.formulas import IsEmpty
 from src.airtable.records import (
+    RecordCache,
+    TableSnapshot,
+    find_by_keys,
     get_existing_by_key,
     get_existing_orders,
     get_existing_member_products,
     get_pending_refunds,
+    iter_records,
 )
 
 
@@ -130,3 +137,340 @@ class TestGetPendingRefunds:
         result = get_pending_refunds(mock_table)
 
         assert result == {}
+
+
+class TestTableSnapshot:
+    """TableSnapshot 클래스 테스트"""
+
+    def test_fetches_table_once(self, mock_table, sample_airtable_records_no_duplicates):
+        """같은 테이블은 한 번만 조회"""
+        mock_table.all.return_value = sample_airtable_records_no_duplicates
+        snapshot = TableSnapshot()
+
+        get_existing_by_key(mock_table, 'Member Code', snapshot)
+        get_existing_by_key(mock_table, 'Member Code', snapshot)
+        snapshot.records(mock_table, ['Member Code'])
+
+        assert mock_table.all.call_count == 1
+
+    def test_requests_only_needed_fields(self, mock_table):
+        """필요한 필드만 요청"""
+        mock_table.all.return_value = []
+
+        get_existing_by_key(mock_table, 'Member Code')
+
+        mock_table.all.assert_called_once_with(fields=['Member Code'])
+
+    def test_refetches_union_for_new_fields(self, mock_table):
+        """적재되지 않은 필드 요청 시 합집합으로 재조회"""
+        mock_table.all.return_value = []
+        snapshot = TableSnapshot()
+
+        snapshot.records(mock_table, ['Member Code'])
+        snapshot.records(mock_table, ['Is Active'])
+        snapshot.records(mock_table, ['Member Code', 'Is Active'])
+
+        assert mock_table.all.call_count == 2
+        mock_table.all.assert_called_with(fields=['Is Active', 'Member Code'])
+
+    def test_field_hints_included_in_first_fetch(self, mock_table):
+        """필드 힌트는 첫 조회에 포함"""
+        mock_table.all.return_value = []
+        mock_table.name = 'Members'
+        snapshot = TableSnapshot({'Members': ['Is Active']})
+
+        snapshot.records(mock_table, ['Member Code'])
+        snapshot.records(mock_table, ['Is Active'])
+
+        mock_table.all.assert_called_once_with(fields=['Is Active', 'Member Code'])
+
+    def test_batch_create_updates_snapshot(self, mock_table, sample_airtable_records_no_duplicates):
+        """생성된 레코드가 재조회 없이 반영됨"""
+        mock_table.all.return_value = sample_airtable_records_no_duplicates
+        mock_table.batch_create.return_value = [
+            {'id': 'rec3', 'fields': {'Member Code': 'M003'}},
+        ]
+        snapshot = TableSnapshot()
+        snapshot.records(mock_table)
+
+        snapshot.batch_create(mock_table, [{'Member Code': 'M003'}])
+        result = get_existing_by_key(mock_table, 'Member Code', snapshot)
+
+        assert result['M003'] == 'rec3'
+        assert mock_table.all.call_count == 1
+
+    def test_batch_update_replaces_record(self, mock_table, sample_refund_records):
+        """수정된 레코드가 스냅샷에 반영됨"""
+        mock_table.all.return_value = sample_refund_records
+        mock_table.batch_update.return_value = [
+            {'id': 'ref1', 'fields': {'Order Number': 'ORD001', 'Refund Status': 'Refunded'}},
+        ]
+        snapshot = TableSnapshot()
+        snapshot.records(mock_table, ['Order Number', 'Refund Status'])
+        assert 'ORD001' in get_pending_refunds(mock_table, snapshot)
+
+        snapshot.batch_update(mock_table, [{'id': 'ref1', 'fields': {'Refund Status': 'Refunded'}}])
+
+        assert 'ORD001' not in get_pending_refunds(mock_table, snapshot)
+
+    def test_apply_ignores_unloaded_table(self, mock_table):
+        """적재 전 테이블의 쓰기 결과는 무시"""
+        snapshot = TableSnapshot()
+
+        snapshot.apply(mock_table, [{'id': 'rec1', 'fields': {}}])
+
+        assert not snapshot.is_loaded(mock_table)
+
+    def test_refresh_refetches(self, mock_table, sample_airtable_records_no_duplicates):
+        """refresh는 서버에서 다시 조회"""
+        mock_table.all.return_value = sample_airtable_records_no_duplicates
+        snapshot = TableSnapshot()
+        snapshot.records(mock_table)
+
+        snapshot.refresh(mock_table)
+
+        assert mock_table.all.call_count == 2
+
+    def test_select_filters_loaded_table_in_memory(self, mock_table):
+        """적재된 테이블은 메모리에서 필터링"""
+        mock_table.all.return_value = [
+            {'id': 'ref1', 'fields': {'Order Number': 'ORD001', 'Orders': ['rec1']}},
+            {'id': 'ref2', 'fields': {'Order Number': 'ORD002'}},
+        ]
+        snapshot = TableSnapshot()
+        snapshot.records(mock_table, ['Order Number', 'Orders'])
+
+        result = snapshot.select(mock_table, IsEmpty('Orders'), ['Order Number'])
+
+        assert [r['id'] for r in result] == ['ref2']
+        assert mock_table.all.call_count == 1
+
+    def test_select_pushes_formula_to_server(self, mock_table):
+        """적재 전 테이블은 filterByFormula로 조회"""
+        mock_table.all.return_value = [{'id': 'ref2', 'fields': {'Order Number': 'ORD002'}}]
+        snapshot = TableSnapshot()
+
+        result = snapshot.select(mock_table, IsEmpty('Orders'), ['Order Number'])
+
+        assert [r['id'] for r in result] == ['ref2']
+        mock_table.all.assert_called_once_with(
+            formula='NOT({Orders})', fields=['Order Number', 'Orders']
+        )
+        assert not snapshot.is_loaded(mock_table)
+
+    def test_streaming_snapshot_does_not_retain(self, mock_table, sample_airtable_records_no_duplicates):
+        """retain=False 스냅샷은 적재하지 않고 매번 스트리밍"""
+        mock_table.all.return_value = sample_airtable_records_no_duplicates
+        snapshot = TableSnapshot(retain=False)
+
+        snapshot.records(mock_table, ['Member Code'])
+        snapshot.records(mock_table, ['Member Code'])
+
+        assert not snapshot.is_loaded(mock_table)
+        assert mock_table.iterate.call_count == 2
+
+    def test_iter_records_does_not_copy_loaded_table(self, mock_table, sample_airtable_records_no_duplicates):
+        """적재된 테이블은 복사 없이 순회 (순회 중 수정 결과가 바로 보임)"""
+        mock_table.all.return_value = sample_airtable_records_no_duplicates
+        snapshot = TableSnapshot()
+        snapshot.records(mock_table, ['Member Code'])
+
+        records = snapshot.iter_records(mock_table, ['Member Code'])
+        next(records)
+        snapshot.apply(mock_table, [{'id': 'rec2', 'fields': {'Member Code': 'M002-updated'}}])
+
+        assert next(records)['fields']['Member Code'] == 'M002-updated'
+
+
+    def test_prefetch_loads_tables_concurrently(self, sample_airtable_records_no_duplicates):
+        """모든 테이블 조회가 동시에 진행되고, 이후 추가 조회 없이 사용"""
+        # 3개 조회가 모두 시작되어야 통과하는 barrier (순차 실행이면 timeout으로 실패)
+        barrier = threading.Barrier(3, timeout=5)
+        tables = []
+        for name in ['Members', 'Orders', 'Refunds']:
+            table = MagicMock()
+            table.name = name
+            table.all.return_value = sample_airtable_records_no_duplicates
+
+            def iterate(t=table, **kwargs):
+                barrier.wait()
+                yield t.all(**kwargs)
+
+            table.iterate.side_effect = iterate
+            tables.append(table)
+        snapshot = TableSnapshot({'Members': ['Member Code']})
+
+        durations = snapshot.prefetch(tables, max_workers=3)
+
+        assert set(durations) == {'Members', 'Orders', 'Refunds'}
+        tables[0].all.assert_called_once_with(fields=['Member Code'])
+        tables[1].all.assert_called_once_with()
+        snapshot.records(tables[0], ['Member Code'])
+        assert tables[0].all.call_count == 1
+
+    def test_prefetch_skips_failed_table(self, mock_table):
+        """실패한 테이블은 적재하지 않음"""
+        mock_table.name = 'Members'
+        mock_table.all.side_effect = Exception('429')
+        snapshot = TableSnapshot()
+
+        durations = snapshot.prefetch([mock_table])
+
+        assert durations == {}
+        assert not snapshot.is_loaded(mock_table)
+
+
+class TestIterRecords:
+    """페이지 스트리밍 테스트"""
+
+    def test_get_existing_by_key_consumes_pages(self):
+        """단독 실행 시 table.all() 없이 페이지를 순서대로 소비"""
+        def pages(**kwargs):
+            yield [{'id': 'rec1', 'fields': {'Member Code': 'M001'}}]
+            yield [{'id': 'rec2', 'fields': {'Member Code': 'M002'}}]
+
+        table = MagicMock()
+        table.iterate.side_effect = pages
+
+        result = get_existing_by_key(table, 'Member Code')
+
+        assert result == {'M001': 'rec1', 'M002': 'rec2'}
+        table.all.assert_not_called()
+        table.iterate.assert_called_once_with(fields=['Member Code'])
+
+    def test_iter_records_is_lazy(self):
+        """소비하기 전에는 페이지를 요청하지 않음"""
+        table = MagicMock()
+        table.iterate.return_value = iter([[{'id': 'rec1', 'fields': {}}]])
+
+        records = iter_records(table, fields=['Member Code'])
+
+        table.iterate.assert_not_called()
+        assert [r['id'] for r in records] == ['rec1']
+
+
+class TestFindByKeys:
+    """find_by_keys 함수 테스트"""
+
+    def test_queries_only_given_keys(self, mock_table):
+        """주어진 키만 formula로 조회"""
+        mock_table.all.return_value = [{'id': 'rec1', 'fields': {'Order Number': 'ORD001'}}]
+
+        result = find_by_keys(mock_table, 'Order Number', ['ORD001', 'ORD001', ''])
+
+        assert result == {'ORD001': 'rec1'}
+        mock_table.all.assert_called_once_with(
+            formula="OR({Order Number}='ORD001')", fields=['Order Number']
+        )
+
+    def test_uses_loaded_snapshot(self, mock_table, sample_airtable_records_no_duplicates):
+        """적재된 스냅샷에서 조회"""
+        mock_table.all.return_value = sample_airtable_records_no_duplicates
+        snapshot = TableSnapshot()
+        snapshot.records(mock_table, ['Member Code'])
+
+        result = find_by_keys(mock_table, 'Member Code', ['M002', 'M404'], snapshot)
+
+        assert result == {'M002': 'rec2'}
+        assert mock_table.all.call_count == 1
+
+
+class TestRecordCache:
+    """RecordCache 클래스 테스트 (증분 조회)"""
+
+    def test_first_fetch_is_full(self, tmp_path, mock_table, sample_airtable_records_no_duplicates):
+        """캐시가 없으면 전체 조회"""
+        mock_table.name = 'Members'
+        mock_table.all.return_value = sample_airtable_records_no_duplicates
+        cache = RecordCache(tmp_path)
+
+        records = cache.fetch(mock_table, ['Member Code'])
+
+        assert set(records) == {'rec1', 'rec2'}
+        mock_table.all.assert_called_once_with(fields=['Member Code'])
+        assert (tmp_path / 'Members.json').exists()
+
+    def test_second_fetch_is_incremental(self, tmp_path, mock_table, sample_airtable_records_no_duplicates):
+        """두 번째 조회는 워터마크 이후 변경분만 요청하고 병합"""
+        mock_table.name = 'Members'
+        mock_table.all.return_value = sample_airtable_records_no_duplicates
+        cache = RecordCache(tmp_path)
+        cache.fetch(mock_table, ['Member Code'])
+
+        mock_table.all.reset_mock()
+        mock_table.all.return_value = [
+            {'id': 'rec2', 'fields': {'Member Code': 'M002-changed'}},
+            {'id': 'rec3', 'fields': {'Member Code': 'M003'}},
+        ]
+        records = cache.fetch(mock_table, ['Member Code'])
+
+        assert records['rec1']['fields']['Member Code'] == 'M001'
+        assert records['rec2']['fields']['Member Code'] == 'M002-changed'
+        assert 'rec3' in records
+        kwargs = mock_table.all.call_args.kwargs
+        assert kwargs['formula'].startswith('IS_AFTER(LAST_MODIFIED_TIME()')
+        assert kwargs['fields'] == ['Member Code']
+
+    def test_uncovered_fields_trigger_full_fetch(self, tmp_path, mock_table):
+        """캐시에 없는 필드를 요청하면 전체 조회"""
+        mock_table.name = 'Members'
+        mock_table.all.return_value = []
+        cache = RecordCache(tmp_path)
+        cache.fetch(mock_table, ['Member Code'])
+
+        cache.fetch(mock_table, ['Member Code', 'Is Active'])
+
+        mock_table.all.assert_called_with(fields=['Is Active', 'Member Code'])
+
+    def test_subset_request_keeps_other_cached_fields(self, tmp_path, mock_table):
+        """일부 필드만 요청해도 증분 조회는 캐시 필드 전체로 받아 병합"""
+        mock_table.name = 'Members'
+        mock_table.all.return_value = [{'id': 'rec1', 'fields': {'A': 1, 'B': 2}}]
+        cache = RecordCache(tmp_path)
+        cache.fetch(mock_table, ['A', 'B'])
+
+        mock_table.all.return_value = [{'id': 'rec1', 'fields': {'A': 9, 'B': 2}}]
+        records = cache.fetch(mock_table, ['A'])
+
+        assert mock_table.all.call_args.kwargs['fields'] == ['A', 'B']
+        assert records['rec1']['fields'] == {'A': 9, 'B': 2}
+
+    def test_refresh_from_server_bypasses_cache(self, tmp_path, mock_table, sample_airtable_records_no_duplicates):
+        """from_server=True면 증분 조회 대신 전체 재조회"""
+        mock_table.name = 'Members'
+        mock_table.all.return_value = sample_airtable_records_no_duplicates
+        snapshot = TableSnapshot(cache=RecordCache(tmp_path))
+        snapshot.records(mock_table, ['Member Code'])
+
+        mock_table.all.return_value = sample_airtable_records_no_duplicates[:1]
+        records = snapshot.refresh(mock_table, from_server=True)
+
+        assert 'formula' not in mock_table.all.call_args.kwargs
+        assert [r['id'] for r in records] == ['rec1']
+
+    def test_reconcile_removes_deleted_records(self, tmp_path, mock_table, sample_airtable_records_no_duplicates):
+        """전체 조회 주기가 지나면 캐시를 교체하여 서버에 없는 레코드 제거"""
+        mock_table.name = 'Members'
+        mock_table.all.return_value = sample_airtable_records_no_duplicates
+        cache = RecordCache(tmp_path, reconcile_hours=0)
+        cache.fetch(mock_table, ['Member Code'])
+
+        mock_table.all.return_value = [{'id': 'rec1', 'fields': {'Member Code': 'M001'}}]
+        records = cache.fetch(mock_table, ['Member Code'])
+
+        assert 'formula' not in mock_table.all.call_args.kwargs
+        assert set(records) == {'rec1'}
+
+    def test_snapshot_uses_cache(self, tmp_path, mock_table, sample_airtable_records_no_duplicates):
+        """스냅샷은 캐시를 통해 적재"""
+        mock_table.name = 'Members'
+        mock_table.all.return_value = sample_airtable_records_no_duplicates
+        RecordCache(tmp_path).fetch(mock_table, ['Member Code'])
+        mock_table.all.reset_mock()
+        mock_table.all.return_value = []
+
+        snapshot = TableSnapshot(cache=RecordCache(tmp_path))
+        result = get_existing_by_key(mock_table, 'Member Code', snapshot)
+
+        assert result == {'M001': 'rec1', 'M002': 'rec2'}
+        assert 'formula' in mock_table.all.call_args.kwargs
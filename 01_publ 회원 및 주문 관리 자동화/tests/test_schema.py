@@ -0,0 +1,119 @@
+"""schema 모듈 테스트"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src import config
+from src.airtable.schema import SchemaCache, ensure_tables_exist
+from src.airtable.writer import BatchWriter
+
+from .conftest import echo_create
+
+REFUNDS = config.AIRTABLE_TABLES['refunds']
+
+
+def _field(name, field_type='singleLineText', choices=None):
+    options = SimpleNamespace(choices=[SimpleNamespace(name=c) for c in choices or []])
+    return SimpleNamespace(id=f"fld{name}", name=name, type=field_type, options=options)
+
+
+def _base_schema(*tables):
+    return SimpleNamespace(tables=[
+        SimpleNamespace(id=f"tbl{name}", name=name, fields=fields) for name, fields in tables
+    ])
+
+
+@pytest.fixture
+def api():
+    """Refunds 테이블(Refund Status 옵션 2개)만 있는 Base"""
+    api = MagicMock()
+    api.base.return_value.schema.return_value = _base_schema(
+        (REFUNDS, [_field('Order Number'), _field('Refund Status', 'singleSelect', ['Pending', 'Refunded'])]),
+    )
+    return api
+
+
+class TestSchemaCache:
+    """SchemaCache 클래스 테스트"""
+
+    def test_saved_schema_reused(self, api, tmp_path):
+        """저장된 스키마가 유효하면 API를 다시 호출하지 않음"""
+        path = tmp_path / 'schema.json'
+        SchemaCache(api, path).tables()
+
+        tables = SchemaCache(api, path).tables()
+
+        assert api.base.return_value.schema.call_count == 1
+        assert tables[REFUNDS]['fields']['Refund Status']['choices'] == ['Pending', 'Refunded']
+
+    def test_expired_schema_refetched(self, api, tmp_path):
+        """보관 시간이 지난 스키마는 다시 조회"""
+        path = tmp_path / 'schema.json'
+        SchemaCache(api, path).tables()
+
+        SchemaCache(api, path, max_age_hours=0).tables()
+
+        assert api.base.return_value.schema.call_count == 2
+
+    def test_missing_choices(self, api, tmp_path):
+        """스키마에 없는 Single Select 값만 반환 (빈 값 제외)"""
+        schema = SchemaCache(api, tmp_path / 'schema.json')
+
+        missing = schema.missing_choices(REFUNDS, [
+            {'Refund Status': 'Pending'},
+            {'Refund Status': 'Partial'},
+            {'Refund Status': ''},
+            {'Order Number': 'O1'},
+        ])
+
+        assert missing == {'Refund Status': {'Partial'}}
+
+    def test_add_choices_persisted(self, api, tmp_path):
+        """추가된 옵션은 저장된 스키마에 반영"""
+        path = tmp_path / 'schema.json'
+        SchemaCache(api, path).add_choices(REFUNDS, {'Refund Status': {'Partial'}})
+
+        assert SchemaCache(api, path).missing_choices(REFUNDS, [{'Refund Status': 'Partial'}]) == {}
+
+
+class TestEnsureTablesExist:
+    """ensure_tables_exist 함수 테스트"""
+
+    def test_uses_cached_schema(self, api, tmp_path, monkeypatch):
+        """테이블이 모두 있으면 저장된 스키마만 사용 (조회 없음)"""
+        monkeypatch.setattr(config, 'SYNC_DETECT_CHANGES', False)
+        api.base.return_value.schema.return_value = _base_schema(
+            (config.AIRTABLE_TABLES['products'], []),
+            (config.AIRTABLE_TABLES['member_products'], []),
+        )
+        path = tmp_path / 'schema.json'
+        SchemaCache(api, path).tables()
+
+        result = ensure_tables_exist(api, SchemaCache(api, path))
+
+        assert result == {'products': False, 'member_products': False, 'sync_hash': False}
+        assert api.base.return_value.schema.call_count == 1
+        api.base.return_value.create_table.assert_not_called()
+
+
+class TestSelectOptions:
+    """BatchWriter 새 옵션 처리 테스트"""
+
+    def test_typecast_only_batches_with_new_options(self, api, mock_table, tmp_path):
+        """새 옵션을 담은 배치만 typecast로 보내고 스키마에 반영"""
+        mock_table.name = REFUNDS
+        mock_table.batch_create.side_effect = echo_create('Order Number')
+        schema = SchemaCache(api, tmp_path / 'schema.json')
+        writer = BatchWriter(max_workers=1, schema=schema)
+        writer.limiter = MagicMock()
+        records = [{'Order Number': f"O{i}", 'Refund Status': 'Pending'} for i in range(15)]
+        records[12]['Refund Status'] = 'Partial'
+
+        writer.create(mock_table, records)
+
+        calls = mock_table.batch_create.call_args_list
+        assert calls[0].kwargs == {}
+        assert calls[1].kwargs == {'typecast': True}
+        assert schema.missing_choices(REFUNDS, [{'Refund Status': 'Partial'}]) == {}
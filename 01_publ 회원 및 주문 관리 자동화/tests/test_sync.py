@@ -0,0 +1,174 @@
+"""sync 패키지 테스트 (MemberProducts -> Orders 순서)"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src import config
+from src.airtable.content_hash import SYNC_HASH_FIELD, content_hash
+from src.airtable.csv_reader import ROW_SCHEMAS, ParsedCsvCache
+from src.airtable.records import TableSnapshot
+from src.airtable.sync.member_products import sync_member_products
+from src.airtable.sync.members import _member_fields, sync_members
+from src.airtable.sync.orders import _order_csv_fields, sync_orders
+
+
+def _rows(table_key: str, data: list[dict]) -> list:
+    """CSV 헤더 딕셔너리 -> iter_rows 행"""
+    return [ROW_SCHEMAS[table_key].from_mapping(row) for row in data]
+
+
+ORDERS_CSV = _rows('orders', [
+    {'Order Number': 'O1', 'Member Code': 'M001', 'Product name': 'P1', 'Price': '1,000'},
+    {'Order Number': 'O2', 'Member Code': 'M002', 'Product name': 'P1', 'Price': '2,000'},
+    {'Order Number': 'O3', 'Member Code': 'M001', 'Product name': 'P1', 'Price': '1,000'},
+])
+
+
+def _table(records: list[dict]) -> MagicMock:
+    table = MagicMock()
+    table.all.return_value = records
+
+    def iterate(*args, **kwargs):
+        yield list(table.all(*args, **kwargs))
+
+    table.iterate.side_effect = iterate
+    table.batch_create.side_effect = lambda records: [
+        {'id': f"recNew{i}", 'fields': fields} for i, fields in enumerate(records)
+    ]
+    table.batch_update.side_effect = lambda records: records
+    return table
+
+
+@pytest.fixture
+def tables():
+    """테이블 키 -> Mock 테이블 (api.table()이 이름으로 반환)"""
+    result = {
+        'members': _table([
+            {'id': 'recM1', 'fields': {'Member Code': 'M001'}},
+            {'id': 'recM2', 'fields': {'Member Code': 'M002'}},
+        ]),
+        'products': _table([{'id': 'recP1', 'fields': {'Product Code': 'P1'}}]),
+        'member_products': _table([
+            {'id': 'recMP1', 'fields': {'MemberProducts Code': 'M001_P1'}},
+        ]),
+        'orders': _table([{'id': 'recO1', 'fields': {
+            'Order Number': 'O1', SYNC_HASH_FIELD: content_hash(_order_csv_fields(ORDERS_CSV[0])),
+        }}]),
+    }
+    for key, table in result.items():
+        table.name = config.AIRTABLE_TABLES[key]
+    return result
+
+
+@pytest.fixture
+def api(tables):
+    by_name = {table.name: table for table in tables.values()}
+    client = MagicMock()
+    client.table.side_effect = lambda base_id, name: by_name[name]
+    return client
+
+
+@pytest.fixture(autouse=True)
+def orders_csv():
+    with patch('src.airtable.sync.member_products.find_csv', return_value='x/orders.csv'), \
+         patch('src.airtable.sync.member_products.csv_cache', ParsedCsvCache()), \
+         patch.object(ParsedCsvCache, '_signature', return_value=(1, 0)), \
+         patch('src.airtable.csv_reader._read_rows', side_effect=lambda *args: iter(ORDERS_CSV)), \
+         patch('src.airtable.sync.orders.find_csv', return_value='x/orders.csv'), \
+         patch('src.airtable.sync.orders.iter_rows', return_value=ORDERS_CSV), \
+         patch.dict('src.config.AIRTABLE_UPSERT', {'orders': False, 'members': False}), \
+         patch.object(config, 'SYNC_DETECT_CHANGES', True):
+        yield
+
+
+class TestMemberProductsFromCsv:
+    """sync_member_products 함수 테스트"""
+
+    def test_combos_come_from_csv_not_orders_table(self, api, tables):
+        """Orders 테이블을 조회하지 않고 CSV 조합으로 신규 생성"""
+        result = sync_member_products(api, TableSnapshot())
+
+        assert result == {'new': 1}
+        created = tables['member_products'].batch_create.call_args.args[0]
+        assert created == [{
+            'MemberProducts Code': 'M002_P1',
+            'Member': ['recM2'],
+            'Product': ['recP1'],
+            'Welcome Sent': False,
+        }]
+        tables['orders'].iterate.assert_not_called()
+
+
+class TestOrdersCreatedWithLinks:
+    """sync_orders 함수 테스트"""
+
+    def test_new_orders_carry_member_products_link(self, api, tables):
+        """MemberProducts 동기화 후 신규 주문은 연결과 함께 한 번에 생성"""
+        snapshot = TableSnapshot()
+        sync_member_products(api, snapshot)
+
+        result = sync_orders(api, snapshot)
+
+        assert result == {'new': 2, 'updated': 0}
+        created = {
+            fields['Order Number']: fields
+            for fields in tables['orders'].batch_create.call_args.args[0]
+        }
+        assert created['O2']['Member'] == ['recM2']
+        assert created['O2']['MemberProducts'] == ['recNew0']
+        assert created['O3']['MemberProducts'] == ['recMP1']
+        tables['orders'].batch_update.assert_not_called()
+        assert SYNC_HASH_FIELD in created['O2']
+
+    def test_new_orders_created_in_batches(self, api, tables):
+        """신규 주문은 batch_rows개씩 연결을 붙여 바로 생성 (전체 이력 CSV를 모으지 않음)"""
+        with patch.object(config, 'CSV_COLUMNAR_BATCH_ROWS', 1):
+            result = sync_orders(api, TableSnapshot())
+
+        assert result == {'new': 2, 'updated': 0}
+        batches = [call.args[0] for call in tables['orders'].batch_create.call_args_list]
+        assert [[fields['Order Number'] for fields in batch] for batch in batches] == [['O2'], ['O3']]
+        assert batches[1][0]['MemberProducts'] == ['recMP1']
+
+
+class TestChangeDetection:
+    """Sync Hash 기반 변경 감지 테스트"""
+
+    def test_only_changed_orders_updated(self, api, tables):
+        """해시가 같은 주문은 건너뛰고, 바뀐 주문만 CSV 필드 + 새 해시로 업데이트"""
+        changed = [ORDERS_CSV[0]._replace(email='new@example.com'), *ORDERS_CSV[1:]]
+        with patch('src.airtable.sync.orders.iter_rows', return_value=changed):
+            result = sync_orders(api, TableSnapshot())
+
+        assert result == {'new': 2, 'updated': 1}
+        updates = tables['orders'].batch_update.call_args.args[0]
+        assert [record['id'] for record in updates] == ['recO1']
+        fields = updates[0]['fields']
+        assert fields['E-mail'] == 'new@example.com'
+        assert fields[SYNC_HASH_FIELD] == content_hash(_order_csv_fields(changed[0]))
+        assert 'Member' not in fields and 'MemberProducts' not in fields
+
+    def test_members_without_hash_updated_once(self, api, tables):
+        """Sync Hash가 없는 기존 회원은 한 번 업데이트, 같은 내용이면 다음 실행에서 건너뜀"""
+        members_csv = _rows('members', [
+            {'Member Code': 'M001', 'Name': 'Kim'},
+            {'Member Code': 'M002', 'Name': 'Lee'},
+        ])
+        tables['members'].all.return_value = [
+            {'id': 'recM1', 'fields': {'Member Code': 'M001'}},
+            {'id': 'recM2', 'fields': {
+                'Member Code': 'M002', SYNC_HASH_FIELD: content_hash(_member_fields(members_csv[1])),
+            }},
+        ]
+        with patch('src.airtable.sync.members.find_csv', return_value='x/members.csv'), \
+             patch('src.airtable.sync.members.iter_rows', return_value=members_csv):
+            result = sync_members(api, TableSnapshot())
+
+        assert result == {'new': 0, 'updated': 1}
+        updates = tables['members'].batch_update.call_args.args[0]
+        assert updates == [{'id': 'recM1', 'fields': {
+            **_member_fields(members_csv[0]),
+            SYNC_HASH_FIELD: content_hash(_member_fields(members_csv[0])),
+        }}]
+        assert 'Is Active' not in updates[0]['fields']
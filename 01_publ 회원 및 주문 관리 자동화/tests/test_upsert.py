@@ -0,0 +1,81 @@
+"""upsert 모듈 테스트"""
+
+from unittest.mock import MagicMock, patch
+
+from src.airtable.records import TableSnapshot
+from src.airtable.sync.upsert import upsert_enabled, upsert_records
+
+
+def _snapshot(created: set[str]) -> TableSnapshot:
+    snapshot = TableSnapshot()
+    snapshot._writer = MagicMock()
+
+    def upsert(table, records, key_fields):
+        result = [{'id': f"rec{fields[key_fields[0]]}", 'fields': fields} for fields in records]
+        return {
+            'records': result,
+            'createdRecords': [r['id'] for r in result if r['id'] in created],
+            'updatedRecords': [r['id'] for r in result if r['id'] not in created],
+        }
+
+    snapshot._writer.upsert.side_effect = upsert
+    return snapshot
+
+
+class TestUpsertRecords:
+    """upsert_records 함수 테스트"""
+
+    def test_last_row_wins_for_duplicate_keys(self, mock_table):
+        """같은 키는 마지막 행만 전송 (한 요청에 같은 키가 있으면 거부됨)"""
+        snapshot = _snapshot(created=set())
+
+        upsert_records(snapshot, mock_table, [
+            {'Member Code': 'M001', 'Name': 'old'},
+            {'Member Code': 'M002', 'Name': 'B'},
+            {'Member Code': 'M001', 'Name': 'new'},
+        ], 'Member Code')
+
+        sent = snapshot._writer.upsert.call_args.args[1]
+        assert sent == [{'Member Code': 'M001', 'Name': 'new'}, {'Member Code': 'M002', 'Name': 'B'}]
+        assert snapshot._writer.upsert.call_args.args[2] == ['Member Code']
+
+    def test_reports_created_and_updated(self, mock_table):
+        """생성/수정 ID를 그대로 반환"""
+        snapshot = _snapshot(created={'recM002'})
+
+        result = upsert_records(
+            snapshot, mock_table, [{'Member Code': 'M001'}, {'Member Code': 'M002'}], 'Member Code'
+        )
+
+        assert result['createdRecords'] == ['recM002']
+        assert result['updatedRecords'] == ['recM001']
+
+    def test_no_records_no_request(self, mock_table):
+        """보낼 레코드가 없으면 요청 없음"""
+        snapshot = _snapshot(created=set())
+
+        result = upsert_records(snapshot, mock_table, [], 'Member Code')
+
+        assert result == {'records': [], 'createdRecords': [], 'updatedRecords': []}
+        snapshot._writer.upsert.assert_not_called()
+
+    def test_applies_results_to_loaded_table(self, mock_table, sample_airtable_records_no_duplicates):
+        """적재된 테이블에는 결과 레코드 반영"""
+        mock_table.all.return_value = sample_airtable_records_no_duplicates
+        snapshot = _snapshot(created={'recM003'})
+        snapshot.records(mock_table, ['Member Code'])
+
+        upsert_records(snapshot, mock_table, [{'Member Code': 'M003'}], 'Member Code')
+
+        assert snapshot.key_index(mock_table, 'Member Code')['M003'] == 'recM003'
+
+
+class TestUpsertEnabled:
+    """upsert_enabled 함수 테스트"""
+
+    def test_per_table_setting(self):
+        """테이블별 설정, 없는 테이블은 False"""
+        with patch.dict('src.config.AIRTABLE_UPSERT', {'members': True, 'orders': False}):
+            assert upsert_enabled('members') is True
+            assert upsert_enabled('orders') is False
+            assert upsert_enabled('unknown') is False
@@ -2,12 +2,16 @@
 
 import pytest
 
+from src import config
 from src.utils import (
+    BoundedMemo,
     parse_price,
     safe_get,
     batch_iterator,
     to_iso_datetime,
     parse_iso_datetime,
+    normalize_datetimes,
+    normalize_prices,
 )
 
 
@@ -159,6 +163,69 @@ class TestToIsoDatetime:
 
         assert result == "2024-12-27T15:30:45+09:00"
 
+    def test_returns_none_for_impossible_dates(self):
+        """고정폭 형식이어도 없는 날짜/시각은 None (strptime과 같음)"""
+        assert to_iso_datetime("2023-02-29 10:00") is None
+        assert to_iso_datetime("2024-04-31 10:00") is None
+        assert to_iso_datetime("2024-12-27 24:00") is None
+        assert to_iso_datetime("2024-02-29 10:00") == "2024-02-29T10:00:00+09:00"
+
+    def test_uses_configured_timezone(self, monkeypatch):
+        """타임존은 인자 또는 config.TIMEZONE (settings.yaml의 sync.timezone)"""
+        assert to_iso_datetime("2024-12-27 15:30", tz="-05:00") == "2024-12-27T15:30:00-05:00"
+
+        monkeypatch.setattr(config, 'TIMEZONE', '+00:00')
+
+        assert to_iso_datetime("2024-12-27 15:30") == "2024-12-27T15:30:00+00:00"
+
+
+class TestNormalize:
+    """normalize_prices / normalize_datetimes 함수 테스트"""
+
+    def test_prices_match_parse_price(self):
+        """열 변환 결과는 셀 단위 parse_price와 같음"""
+        values = ["1,000원", "500", "", None, "1,000원", " 2,000 "]
+
+        assert normalize_prices(values) == [parse_price(value) for value in values]
+
+    def test_invalid_price_raises(self):
+        """숫자로 읽을 수 없는 가격은 parse_price처럼 ValueError"""
+        with pytest.raises(ValueError):
+            normalize_prices(["1,000", "abc"])
+
+    def test_datetimes_match_to_iso_datetime(self):
+        """열 변환 결과는 셀 단위 to_iso_datetime과 같음"""
+        values = ["2024-12-27 15:30", "2024-12-27 15:30:45", "", None, "2024/12/27", "2023-02-29 10:00"]
+
+        assert normalize_datetimes(values) == [to_iso_datetime(value) for value in values]
+
+    def test_datetimes_memo_per_timezone(self):
+        """같은 값이라도 타임존이 다르면 따로 변환"""
+        assert normalize_datetimes(["2024-12-27 15:30"], tz="+09:00") == ["2024-12-27T15:30:00+09:00"]
+        assert normalize_datetimes(["2024-12-27 15:30"], tz="-05:00") == ["2024-12-27T15:30:00-05:00"]
+
+
+class TestBoundedMemo:
+    """BoundedMemo 클래스 테스트"""
+
+    def test_converts_each_value_once(self):
+        """반복 값은 메모에서 조회"""
+        calls = []
+        memo = BoundedMemo(lambda value: calls.append(value) or value * 2)
+
+        assert memo.map([1, 2, 1, 1, 2]) == [2, 4, 2, 2, 4]
+        assert calls == [1, 2]
+
+    def test_cleared_when_full(self):
+        """max_size개가 차면 비우고 다시 채움 (크기 제한)"""
+        calls = []
+        memo = BoundedMemo(lambda value: calls.append(value) or value, max_size=2)
+
+        assert memo.map([1, 2, 3, 3, 1]) == [1, 2, 3, 3, 1]
+
+        assert len(memo) == 2
+        assert calls == [1, 2, 3, 1]
+
 
 class TestParseIsoDatetime:
     """parse_iso_datetime 함수 테스트"""
@@ -171,6 +238,14 @@ class TestParseIsoDatetime:
 
         assert result == datetime(2024, 12, 27, 15, 30, 45)
 
+    def test_parses_iso_with_negative_offset(self):
+        """음수 오프셋 타임존 파싱 (sync.timezone 설정)"""
+        from datetime import datetime
+
+        result = parse_iso_datetime("2024-12-27T15:30:45-05:00")
+
+        assert result == datetime(2024, 12, 27, 15, 30, 45)
+
     def test_parses_iso_with_z(self):
         """Z 타임존 파싱"""
         from datetime import datetime
@@ -179,6 +254,14 @@ class TestParseIsoDatetime:
 
         assert result == datetime(2024, 12, 27, 15, 30, 45)
 
+    def test_parses_airtable_created_time(self):
+        """밀리초 + Z 형식 파싱 (Airtable createdTime)"""
+        from datetime import datetime
+
+        result = parse_iso_datetime("2024-12-27T15:30:45.000Z")
+
+        assert result == datetime(2024, 12, 27, 15, 30, 45)
+
     def test_returns_none_for_none(self):
         """None 입력"""
         assert parse_iso_datetime(None) is None
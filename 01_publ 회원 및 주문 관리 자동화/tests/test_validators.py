@@ -3,7 +3,7 @@
 import pytest
 from unittest.mock import MagicMock
 
-from src.airtable.validators import check_csv_duplicates, check_airtable_duplicates
+from src.airtable.validators import check_csv_duplicates, check_airtable_duplicates, verify_inserts
 
 
 class TestCheckCsvDuplicates:
@@ -90,3 +90,36 @@ class TestCheckAirtableDuplicates:
         result = check_airtable_duplicates(mock_table, 'Member Code')
 
         assert result == {}  # M001은 1번만 등장
+
+
+class TestVerifyInserts:
+    """verify_inserts 함수 테스트"""
+
+    def test_queries_only_inserted_keys(self, mock_table):
+        """삽입한 키만 formula로 조회 (테이블 전체 조회 없음)"""
+        created = [{'id': 'rec9', 'fields': {'Member Code': 'M009'}}]
+        mock_table.all.return_value = created
+
+        result = verify_inserts(mock_table, 'Member Code', ['M009'], created)
+
+        kwargs = mock_table.all.call_args.kwargs
+        assert "'M009'" in kwargs['formula']
+        assert kwargs['fields'] == ['Member Code']
+        assert result == {'confirmed': 1, 'missing': [], 'duplicates': {}, 'unconfirmed_ids': []}
+
+    def test_reports_missing_and_duplicate_keys(self, mock_table):
+        """서버에 없는 키와 중복 생성된 키를 구분하여 보고"""
+        created = [
+            {'id': 'rec8', 'fields': {'Member Code': 'M008'}},
+            {'id': 'rec9', 'fields': {'Member Code': 'M009'}},
+        ]
+        mock_table.all.return_value = [
+            {'id': 'rec9', 'fields': {'Member Code': 'M009'}},
+            {'id': 'recX', 'fields': {'Member Code': 'M009'}},
+        ]
+
+        result = verify_inserts(mock_table, 'Member Code', ['M007', 'M008', 'M009'], created)
+
+        assert result['missing'] == ['M007', 'M008']
+        assert result['duplicates'] == {'M009': ['rec9', 'recX']}
+        assert result['unconfirmed_ids'] == ['rec8']
@@ -0,0 +1,209 @@
+"""writer 모듈 테스트"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.airtable.quarantine import Quarantine
+from src.airtable.ratelimit import RateLimitedApi
+from src.airtable.records import TableSnapshot
+from src.airtable.writer import BatchWriteError, BatchWriter
+
+from .conftest import echo_create, record_error
+
+
+@pytest.fixture
+def writer():
+    """속도 제한 대기 없는 BatchWriter"""
+    batch_writer = BatchWriter(max_workers=4)
+    batch_writer.limiter = MagicMock()
+    return batch_writer
+
+
+class TestBatchWriter:
+    """BatchWriter 클래스 테스트"""
+
+    def test_splits_into_batches_of_ten(self, mock_table, writer):
+        """10개 단위로 나누어 전송"""
+        mock_table.batch_create.side_effect = echo_create()
+
+        created = writer.create(mock_table, [{'n': i} for i in range(25)])
+
+        sizes = sorted(len(call.args[0]) for call in mock_table.batch_create.call_args_list)
+        assert sizes == [5, 10, 10]
+        assert len(created) == 25
+
+    def test_results_keep_input_order(self, mock_table, writer):
+        """먼저 보낸 배치가 늦게 끝나도 결과는 입력 순서"""
+        def slow_first(records):
+            if records[0]['n'] == 0:
+                time.sleep(0.05)
+            return echo_create()(records)
+
+        mock_table.batch_create.side_effect = slow_first
+
+        created = writer.create(mock_table, [{'n': i} for i in range(30)])
+
+        assert [record['id'] for record in created] == [f"rec{i}" for i in range(30)]
+
+    def test_batches_run_concurrently(self, mock_table, writer):
+        """배치 요청이 동시에 진행됨 (모두 만나야 통과하는 Barrier)"""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def wait_for_others(records):
+            barrier.wait()
+            return echo_create()(records)
+
+        mock_table.batch_create.side_effect = wait_for_others
+
+        created = writer.create(mock_table, [{'n': i} for i in range(30)])
+
+        assert len(created) == 30
+
+    def test_failed_batch_reported_after_others_finish(self, mock_table, writer):
+        """실패한 배치가 있어도 나머지 배치는 전송하고 함께 보고"""
+        def fail_second(records):
+            if records[0]['n'] == 10:
+                raise Exception('422 INVALID_MULTIPLE_CHOICE_OPTIONS')
+            return echo_create()(records)
+
+        mock_table.batch_create.side_effect = fail_second
+
+        with pytest.raises(BatchWriteError) as exc_info:
+            writer.create(mock_table, [{'n': i} for i in range(25)])
+
+        error = exc_info.value
+        assert [record['id'] for record in error.records] == (
+            [f"rec{i}" for i in range(10)] + [f"rec{i}" for i in range(20, 25)]
+        )
+        assert [record['n'] for record in error.failed_records] == list(range(10, 20))
+
+    def test_limits_plain_api(self, mock_table, writer):
+        """속도 제한 없는 API 클라이언트는 배치마다 토큰 사용"""
+        mock_table.batch_update.side_effect = lambda records: records
+
+        writer.update(mock_table, [{'id': f"rec{i}", 'fields': {}} for i in range(25)])
+
+        assert writer.limiter.acquire.call_count == 3
+
+    def test_rate_limited_api_not_limited_twice(self, mock_table, writer):
+        """RateLimitedApi는 요청마다 토큰을 받으므로 추가 제한 없음"""
+        mock_table.api = RateLimitedApi('test-key')
+        mock_table.batch_update.side_effect = lambda records: records
+
+        writer.update(mock_table, [{'id': f"rec{i}", 'fields': {}} for i in range(25)])
+
+        writer.limiter.acquire.assert_not_called()
+
+    def test_upsert_splits_created_and_updated(self, mock_table, writer):
+        """업서트 결과를 생성/수정 레코드 ID로 구분"""
+        def upsert(records, key_fields):
+            assert key_fields == ['Member Code']
+            result = [{'id': f"rec{r['fields']['n']}", 'fields': r['fields']} for r in records]
+            return {
+                'records': result,
+                'createdRecords': [r['id'] for r in result if r['fields']['n'] % 2 == 0],
+                'updatedRecords': [r['id'] for r in result if r['fields']['n'] % 2 == 1],
+            }
+
+        mock_table.batch_upsert.side_effect = upsert
+
+        result = writer.upsert(mock_table, [{'n': i} for i in range(25)], ['Member Code'])
+
+        assert [record['id'] for record in result['records']] == [f"rec{i}" for i in range(25)]
+        assert result['createdRecords'] == [f"rec{i}" for i in range(0, 25, 2)]
+        assert result['updatedRecords'] == [f"rec{i}" for i in range(1, 25, 2)]
+
+    def test_upsert_partial_failure_keeps_created_ids(self, mock_table, writer):
+        """업서트 일부 실패 시 성공 배치의 생성 ID 보고"""
+        def upsert(records, key_fields):
+            if records[0]['fields']['n'] == 10:
+                raise Exception('422')
+            result = [{'id': f"rec{r['fields']['n']}", 'fields': r['fields']} for r in records]
+            return {'records': result, 'createdRecords': [result[0]['id']], 'updatedRecords': []}
+
+        mock_table.batch_upsert.side_effect = upsert
+
+        with pytest.raises(BatchWriteError) as exc_info:
+            writer.upsert(mock_table, [{'n': i} for i in range(25)], ['Member Code'])
+
+        assert exc_info.value.created_ids == {'rec0', 'rec20'}
+        assert len(exc_info.value.records) == 15
+
+    def test_bisects_record_error_to_offending_rows(self, mock_table, writer):
+        """값 오류 배치는 나누어 재전송하여 문제 레코드만 실패"""
+        def reject_bad(records):
+            if any(fields['n'] in (3, 17) for fields in records):
+                raise record_error()
+            return echo_create()(records)
+
+        mock_table.batch_create.side_effect = reject_bad
+
+        with pytest.raises(BatchWriteError) as exc_info:
+            writer.create(mock_table, [{'n': i} for i in range(20)])
+
+        error = exc_info.value
+        assert [record['n'] for record in error.failed_records] == [3, 17]
+        assert all(len(batch) == 1 for batch, _ in error.failures)
+        assert [record['id'] for record in error.records] == [f"rec{i}" for i in range(20) if i not in (3, 17)]
+
+    def test_transient_error_not_bisected(self, mock_table, writer):
+        """값 오류가 아닌 실패는 나누지 않고 배치 전체를 보고"""
+        mock_table.batch_create.side_effect = Exception('503')
+
+        with pytest.raises(BatchWriteError) as exc_info:
+            writer.create(mock_table, [{'n': i} for i in range(10)])
+
+        assert mock_table.batch_create.call_count == 1
+        assert len(exc_info.value.failures) == 1
+
+    def test_dead_rows_quarantined(self, mock_table, tmp_path):
+        """끝까지 거부된 레코드는 오류와 함께 격리 파일에 기록"""
+        def reject_bad(records):
+            if any(fields['n'] == 4 for fields in records):
+                raise record_error()
+            return echo_create()(records)
+
+        mock_table.name = 'Refunds'
+        mock_table.batch_create.side_effect = reject_bad
+        quarantine = Quarantine(tmp_path / 'quarantine.jsonl')
+        batch_writer = BatchWriter(max_workers=1, quarantine=quarantine)
+        batch_writer.limiter = MagicMock()
+
+        with pytest.raises(BatchWriteError):
+            batch_writer.create(mock_table, [{'n': i} for i in range(10)])
+
+        entries = quarantine.entries()
+        assert [entry['records'] for entry in entries] == [[{'n': 4}]]
+        assert entries[0]['op'] == 'create'
+        assert 'INVALID_MULTIPLE_CHOICE_OPTIONS' in entries[0]['error']
+        assert quarantine.close() == 1
+
+    def test_empty_records(self, mock_table, writer):
+        """빈 입력은 요청 없음"""
+        assert writer.create(mock_table, []) == []
+        mock_table.batch_create.assert_not_called()
+
+
+class TestSnapshotWrites:
+    """TableSnapshot 배치 쓰기 테스트"""
+
+    def test_partial_failure_applies_written_records(self, mock_table, writer):
+        """일부 실패 시 성공한 레코드는 스냅샷에 반영 후 예외 전달"""
+        mock_table.all.return_value = []
+        snapshot = TableSnapshot(writer=writer)
+        snapshot.records(mock_table, ['n'])
+
+        def fail_second(records):
+            if records[0]['n'] == 10:
+                raise Exception('500')
+            return echo_create()(records)
+
+        mock_table.batch_create.side_effect = fail_second
+
+        with pytest.raises(BatchWriteError):
+            snapshot.batch_create(mock_table, [{'n': i} for i in range(15)])
+
+        assert snapshot.loaded_count(mock_table) == 10